@@ -0,0 +1,27 @@
+"""One module per sidebar topic.
+
+Each module exposes ``render()`` and imports only what its page needs; the
+main script imports a page module the first time its topic is selected.
+"""
+
+# Sidebar topic -> page module, in sidebar order.
+PAGES = {
+    "Overview of Maintenance Types": "app_pages.overview",
+    "Strategy Recommendation Tool": "app_pages.strategy",
+    "Condition Monitoring Techniques": "app_pages.condition_monitoring",
+    "Transformer DGA": "app_pages.dga",
+    "D-I-P-F Curve": "app_pages.dipf",
+    "RUL Prediction": "app_pages.rul",
+    "Bathtub Curve": "app_pages.bathtub",
+    "Optimal PM Interval": "app_pages.pm_interval",
+    "Maintenance KPIs Calculator": "app_pages.kpis",
+    "PM Work Scheduler": "app_pages.pm_schedule",
+    "System Availability (RBD)": "app_pages.rbd",
+    "Maintenance Quiz": "app_pages.quiz",
+    "About": "app_pages.about",
+}
+
+# Shown only with the admin link, see ``app_pages.instrumentation.admin_enabled``.
+ADMIN_PAGES = {
+    "Admin: Metrics": "app_pages.admin_metrics",
+}
@@ -0,0 +1,18 @@
+"""About page."""
+
+import streamlit as st
+
+
+def render():
+    st.header("ℹ️ About This App")
+    st.markdown("""
+    This educational application was built to help engineers understand maintenance types, select appropriate strategies,
+    and visualize key reliability concepts.
+
+    👤 Developed by **Eng. Mohammed Assaf – CMRP, CEPSS**  
+    ⚡ **Power Plant Electrical Maintenance Engineer**  
+    🏭 **Attarat Operation and Maintenance Company (OMCO), Jordan**
+
+    📧 Email: [Mo7ammed.assaf1@gmail.com](mailto:Mo7ammed.assaf1@gmail.com)  
+    🔗 LinkedIn: [linkedin.com/in/mohammed-assaf](https://linkedin.com/in/mohammed-assaf)
+    """)
@@ -0,0 +1,128 @@
+"""Admin: Metrics page (hidden; see ``admin_enabled``)."""
+
+import importlib.util
+import time
+
+import streamlit as st
+
+from app_pages.datasets import get_dataset_store
+from app_pages.instrumentation import get_metrics
+from app_pages.jobs import get_job_runner
+from maint_advisor.metrics import PROFILERS, memory_breakdown, resident_memory
+
+
+def _set_profiler():
+    # Copied out of the widget state, which Streamlit drops when another topic is shown.
+    st.session_state.metrics_profiler = st.session_state.metrics_profiler_choice
+
+
+def render():
+    import pandas as pd
+
+    metrics = get_metrics()
+    st.header("📈 Render Metrics")
+    st.caption("Collected in memory by this server process since it started; not shown in the Topics menu "
+               "without the admin link.")
+
+    uptime = time.time() - metrics.started
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Uptime", f"{uptime / 3600:.1f} h")
+    col2.metric("Sessions", f"{metrics.sessions:,}")
+    col3.metric("Renders", f"{sum(n for n, *_ in metrics.page_totals().values()):,}")
+    col4.metric("Resident memory", f"{resident_memory() / 2 ** 20:,.0f} MB")
+
+    samples = metrics.frame()
+    st.subheader("Pages")
+    st.caption(f"Percentiles over the last {len(samples):,} renders in the ring buffer "
+               f"(capacity {metrics.samples.maxlen:,}); renders and mean CPU time since start.")
+    totals = pd.DataFrame(
+        [(page, n, cpu / n * 1e3) for page, (n, _, cpu, _) in metrics.page_totals().items()],
+        columns=["page", "renders", "mean CPU (ms)"],
+    ).set_index("page")
+    if not samples.empty:
+        wall = samples.groupby("page")["wall"]
+        totals["p50 wall (ms)"] = wall.median() * 1e3
+        totals["p95 wall (ms)"] = wall.quantile(0.95) * 1e3
+        totals["cache hits"] = samples.groupby("page")["cache_hits"].sum()
+        totals["cache misses"] = samples.groupby("page")["cache_misses"].sum()
+    st.dataframe(totals.sort_values("renders", ascending=False), use_container_width=True)
+
+    st.subheader("Caches")
+    caches = pd.DataFrame([(name, hits, misses) for name, (hits, misses) in sorted(metrics.cache_totals().items())],
+                          columns=["cache", "hits", "misses"])
+    lookups = caches["hits"] + caches["misses"]
+    caches["hit ratio"] = (caches["hits"] / lookups.where(lookups > 0)).round(3)
+    st.dataframe(caches, hide_index=True, use_container_width=True)
+
+    if not samples.empty:
+        st.subheader("Sessions")
+        sessions = samples.groupby("session").agg(reruns=("rerun", "max"), last_page=("page", "last"),
+                                                  last_seen=("timestamp", "max"))
+        sessions["last_seen"] = pd.to_datetime(sessions["last_seen"], unit="s")
+        st.dataframe(sessions.sort_values("last_seen", ascending=False), use_container_width=True)
+
+        st.subheader("Recent renders")
+        st.line_chart(samples.assign(rss_mb=samples["rss"] / 2 ** 20).set_index("timestamp")["rss_mb"],
+                      y_label="RSS (MB)")
+        recent = samples.tail(200).iloc[::-1].assign(
+            time=lambda d: pd.to_datetime(d["timestamp"], unit="s"),
+            wall_ms=lambda d: (d["wall"] * 1e3).round(1),
+            cpu_ms=lambda d: (d["cpu"] * 1e3).round(1),
+            rss_mb=lambda d: (d["rss"] / 2 ** 20).round(1),
+        )
+        st.dataframe(recent[["time", "page", "session", "rerun", "wall_ms", "cpu_ms", "rss_mb",
+                             "cache_hits", "cache_misses"]], hide_index=True, use_container_width=True)
+
+    st.subheader("Datasets")
+    store = get_dataset_store()
+    memory = memory_breakdown()
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Stored", f"{len(store):,} datasets")
+    col2.metric("On disk", f"{store.total_bytes / 2 ** 20:,.0f} / {store.budget_bytes / 2 ** 20:,.0f} MB")
+    if memory is not None:
+        col3.metric("Anonymous memory", f"{memory['anonymous'] / 2 ** 20:,.0f} MB",
+                    help="Heap of this process: Python objects and copied DataFrames")
+        col4.metric("File-backed memory", f"{memory['file'] / 2 ** 20:,.0f} MB",
+                    help="Mapped files, including the datasets; shared with other processes and reclaimable")
+    st.caption(f"Uploads and large results in `{store.root}`, memory-mapped and shared by all sessions; "
+               f"{store.evictions:,} evicted since start to stay under the budget.")
+    usage = store.usage()
+    for column in ("disk_bytes", "resident_bytes"):
+        usage[column.replace("bytes", "MB")] = (usage.pop(column).astype(float) / 2 ** 20).round(1)
+    st.dataframe(usage, hide_index=True, use_container_width=True)
+
+    st.subheader("Jobs")
+    runner = get_job_runner()
+    st.caption(f"Background jobs of all sessions: {runner.workers} workers, at most {runner.per_owner} running "
+               f"and {runner.max_queued} waiting per session. {runner.executed:,} run and {runner.deduplicated:,} "
+               "served from a shared or stored result since start.")
+    st.dataframe(runner.jobs(), hide_index=True, use_container_width=True)
+
+    with st.expander("Prometheus text format"):
+        text = metrics.prometheus_text()
+        st.code(text, language="text")
+        st.download_button("⬇️ Download metrics.prom", text, file_name="metrics.prom", mime="text/plain")
+
+    st.subheader("Profiling")
+    st.markdown("Profile every page render of **this session only** until switched off. Other sessions are "
+                "not affected.")
+    options = [None, *(p for p in PROFILERS if p == "cProfile" or importlib.util.find_spec(p) is not None)]
+    current = st.session_state.get("metrics_profiler")
+    st.radio("Profiler", options, index=options.index(current) if current in options else 0, horizontal=True,
+             format_func=lambda p: p or "Off", key="metrics_profiler_choice", on_change=_set_profiler)
+    if "pyinstrument" not in options:
+        st.caption("Install pyinstrument (`pip install pyinstrument`) for a statistical profiler with a call tree.")
+
+    for index, capture in enumerate(reversed(metrics.profiles)):
+        stamp = time.strftime("%H:%M:%S", time.localtime(capture.timestamp))
+        with st.expander(f"{stamp} · {capture.page} · session {capture.session} · {capture.profiler}"):
+            st.code(capture.report, language="text")
+            st.download_button("⬇️ Download profile", capture.data, key=f"profile_{index}_{capture.timestamp}",
+                               file_name=f"profile-{capture.session}-{int(capture.timestamp)}.{capture.extension}")
+    if not metrics.profiles:
+        st.info("No profiles captured yet.")
+
+    st.markdown("""
+    ---
+    👤 Developed by **Eng. Mohammed Assaf - CMPR, CEPSS**
+    """)
@@ -0,0 +1,74 @@
+"""Bathtub Curve page."""
+
+import streamlit as st
+
+from app_pages.datasets import upload_dataset
+from app_pages.jobs import dataset_path, run_job
+from maint_advisor import curves, jobs
+
+
+def render():
+    st.header("🛁 Bathtub Curve")
+    st.markdown("""
+    The **Bathtub curve** is a visual representation of the failure rate of a product or group of products over time and guides maintenance strategy.
+    By plotting the occurrences of failure over time, a bathtub curve maps out three phases that an asset experiences within its lifetime: Infant mortality phase, Useful life pase, and Wear-out phase.
+
+    ### Lifecycle Phases:
+
+    1. **Infant Mortality** (High failure rate)
+       - Causes: Design or Manufacturing flaws, installation defects, improper commissioning.
+       - Overcome by: Early inspections/testing, burn-in
+
+
+    2. **Useful Life** (Constant, low rate)
+       - Causes: Random, external events, process upsets, improper maintenance/operation, random failures, human errors.
+       - Action: Condition monitoring, scheduled PM, proper operation, training.
+
+
+    3. **Wear-Out Phase** (Increasing failures)
+       - Causes: Fatigue, aging, erosion, corrosion.
+       - Overcome by: Overhaul, replacement, RCM.
+
+    ✅ Use this curve to match strategy with lifecycle stage.
+    """)
+    with st.expander("⚙️ Adjust the curve"):
+        col1, col2 = st.columns(2)
+        infant_end, wearout_start = col1.slider("Useful life period (years)", 0.5, 29.5, (3.0, 14.0), 0.5)
+        horizon = col1.slider("Horizon (years)", 5.0, 30.0, 20.0, 0.5)
+        wearout_beta = col1.slider("Wear-out shape β", 1.5, 8.0, 4.0, 0.5)
+        random_rate = col2.slider("Random failure rate (per year)", 0.05, 1.0, 0.2, 0.05)
+        infant_rate = col2.slider("Extra infant mortality rate at start (per year)", 0.0, 3.0, 0.8, 0.1)
+    params = curves.BathtubParams(infant_end, wearout_start, horizon, random_rate, infant_rate, wearout_beta)
+    try:
+        st.image(curves.bathtub_png(params), caption="Bathtub Curve with Maintenance Zones")
+    except ValueError as exc:
+        st.error(f"Cannot draw the curve: {exc}")
+
+    st.subheader("📈 Where Are Your Assets on the Curve? (Weibull Analysis)")
+    st.markdown("""
+    Upload failure and suspension times (**CSV** or **Parquet**) with the columns `asset_class`,
+    `time` (operating hours, cycles, ...) and `failed` (1 = failure, 0 = suspension / still running).
+    A Weibull model is fitted to every asset class; its shape parameter **β** tells the phase:
+    β < 1 infant mortality, β ≈ 1 useful life, β > 1 wear-out.
+    """)
+    life_file = st.file_uploader("Life data", type=["csv", "parquet"])
+    col1, col2 = st.columns(2)
+    three_parameter = col1.checkbox("3-parameter model (failure-free period γ)")
+    resamples = col2.selectbox("Bootstrap resamples for 90% bounds", [0, 200, 1000], index=1)
+    if life_file is not None:
+        try:
+            fits = run_job("Fitting Weibull models", jobs.life_data_analysis, dataset_path(upload_dataset(life_file)),
+                           three_parameter, resamples)
+        except ValueError as exc:
+            st.error(f"Could not analyze the life data: {exc}")
+            fits = None
+        if fits is not None:
+            st.dataframe(fits["phase"].value_counts().rename("Asset classes"), use_container_width=True)
+            st.dataframe(fits, use_container_width=True)
+            st.download_button("⬇️ Download Weibull Results (CSV)", fits.to_csv(),
+                               file_name="weibull_fits.csv", mime="text/csv")
+
+    st.markdown("""
+    ---
+    👤 Developed by **Eng. Mohammed Assaf - CMPR, CEPSS**
+    """)
@@ -0,0 +1,128 @@
+"""Condition Monitoring Techniques page."""
+
+import streamlit as st
+
+from app_pages.datasets import upload_digest
+from app_pages.instrumentation import cache_data
+
+
+# Keyed on the file's SHA-256, hashed once per upload, so widget reruns never re-read the upload.
+@cache_data(show_spinner="Computing spectra...", max_entries=8)
+def vibration_spectra(digest, _file, name, sample_rate, dtype, band):
+    from maint_advisor.vibration import analyze_vibration, open_signal
+
+    _file.seek(0)
+    samples, rate, scale = open_signal(_file, name, sample_rate, dtype)
+    return analyze_vibration(samples, rate, scale, band=band)
+
+
+def vibration_section():
+    import numpy as np
+    import pandas as pd
+
+    from maint_advisor.vibration import fault_frequencies, match_fault_frequencies
+
+    st.subheader("🔬 Analyze a Vibration Recording")
+    st.markdown("""
+    Upload an accelerometer recording: **WAV**, **CSV** (one value column; the last column is used) or headerless
+    **raw binary** samples (float32 or int16). The signal is processed block by block into an averaged
+    **Welch PSD** and an **envelope spectrum**, which is then searched for the bearing defect frequencies.
+    """)
+    col1, col2, col3 = st.columns(3)
+    sample_rate = col1.number_input("Sample rate (Hz, CSV and raw only)", 1_000, 200_000, 25_600, 100)
+    dtype = col1.selectbox("Raw sample format", ["float32", "int16"])
+    band_khz = col1.slider("Demodulation band (kHz)", 0.5, 100.0, (5.0, 10.0), 0.5,
+                           help="A resonance band excited by the bearing impacts.")
+    rpm = col2.number_input("Shaft speed (RPM)", 1.0, 100_000.0, 1_800.0, 10.0)
+    n_balls = col2.number_input("Number of rolling elements", 1, 100, 9)
+    contact_angle = col2.number_input("Contact angle (°)", 0.0, 60.0, 0.0, 1.0)
+    ball_diameter = col3.number_input("Rolling element diameter (mm)", 0.1, 500.0, 7.94)
+    pitch_diameter = col3.number_input("Pitch diameter (mm)", 0.2, 2_000.0, 39.04)
+    recording = st.file_uploader("Vibration recording", type=["wav", "csv", "bin", "raw", "dat", "f32", "i16"])
+    if recording is None:
+        return
+    try:
+        faults = fault_frequencies(rpm / 60, n_balls, ball_diameter, pitch_diameter, contact_angle)
+        spectra = vibration_spectra(upload_digest(recording), recording, recording.name, sample_rate, dtype,
+                                    (band_khz[0] * 1e3, band_khz[1] * 1e3))
+    except ValueError as exc:
+        st.error(f"Could not analyze the recording: {exc}")
+        return
+
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Samples analyzed", f"{spectra.samples / 1e6:,.1f} M")
+    col2.metric("Welch segments", f"{spectra.segments:,}")
+    col3.metric("Throughput", f"{spectra.samples / spectra.elapsed / 1e6:,.1f} MSamples/s")
+
+    st.markdown("**Power spectral density (dB re 1 unit²/Hz)**")
+    psd_db = 10 * np.log10(np.maximum(spectra.psd, 1e-20))
+    st.line_chart(pd.Series(psd_db, index=pd.Index(spectra.frequencies, name="Hz"), name="PSD"))
+
+    top = min(spectra.envelope_frequencies[-1], 4 * max(faults.values()))
+    envelope = pd.Series(spectra.envelope, index=pd.Index(spectra.envelope_frequencies, name="Hz"))
+    st.markdown(f"**Envelope spectrum** (band {spectra.band[0]:,.0f}–{spectra.band[1]:,.0f} Hz)")
+    st.line_chart(envelope[envelope.index <= top].rename("Envelope amplitude"))
+
+    matches = match_fault_frequencies(spectra.envelope_frequencies, spectra.envelope, faults)
+    found = matches.groupby("fault", sort=False)["detected"].sum()
+    for fault, count in found.items():
+        if count >= 2:
+            st.warning(f"**{fault}** ({faults[fault]:.1f} Hz): {count} harmonics stand out in the envelope "
+                       "spectrum — a developing bearing defect is likely.")
+    if found.max() < 2:
+        st.success("No bearing defect frequency stands out in the envelope spectrum.")
+    st.dataframe(matches.style.format({"expected_hz": "{:.1f}", "peak_hz": "{:.1f}", "amplitude": "{:.3g}",
+                                       "snr_db": "{:.1f}"}), use_container_width=True)
+
+
+def render():
+    st.header("📊 Condition Monitoring Techniques")
+    st.markdown("""
+    Condition monitoring is a key component of modern maintenance strategies, enabling the early detection of faults and degradation in assets before failures occur. It involves the continuous or periodic measurement and analysis of specific parameters that reflect the health and performance of equipment. By monitoring variables such as vibration, temperature, oil quality, acoustic emissions, and electrical signals, condition monitoring techniques help identify abnormal conditions, wear, or potential failures in advance. 
+
+    **This proactive approach helps to:**
+    - Support predictive maintenance
+    - Reduce unplanned downtime
+    - Enhances safety
+    - Extends asset life
+    - Detect developing faults
+    - Prevent catastrophic failures
+
+    ### Techniques & Tools:
+
+    #### 1. **Vibration Analysis**
+    - Detects: Imbalance, misalignment, bearing failure
+    - Used with FFT to view frequency spectrum
+    - Tools: Accelerometers, online monitoring systems
+    - Applications: Generators, Turbines, Motors, Pumps 
+
+    #### 2. **Infrared Thermography**
+    - Detects: Overheating, phase imbalance, loose connections
+    - Tools: Thermal cameras
+    - Applications: Transformers, Switchgears, Motors
+
+    #### 3. **Oil Analysis (including DGA)**
+    - Detects: Vescosity, density, flash point, moisture, oxidation, breakdown voltage, gas generation,... etc
+    - Tools: Lab. instruments
+    - Applications: Transformers, turbines, engines, gearboxes,... etc
+
+    #### 4. **Ultrasound Monitoring**
+    - Detects: Air/gas leaks, bearing wear, arcing
+    - Tools: Ultrasonic detectors
+    - Applications: Pneumatic circuits, electrical cabinets
+
+    #### 5. **Electrical Signature Analysis (ESA)**
+    - Detects: Rotor bar faults, stator issues
+    - Applications: Motors, generators
+
+    ✅ Best Practice:
+    - Combine techniques for reliability
+    - Train technicians and analyze trends over time
+    """)
+
+    vibration_section()
+
+    st.markdown("""
+    ---
+    👤 Developed by **Eng. Mohammed Assaf - CMPR, CEPSS**
+    """)
@@ -0,0 +1,53 @@
+"""Table uploads through the shared dataset store.
+
+Pages store each CSV or Parquet upload once with ``upload_dataset`` and
+pass its digest around, so cached functions are keyed on a short string
+instead of the file bytes, and ``dataset(digest)`` returns a DataFrame over
+the memory-mapped file that all sessions share (see
+``maint_advisor.datasets``).
+
+``MAINT_ADVISOR_DATASET_DIR`` (default ``datasets``) sets where the files
+go and ``MAINT_ADVISOR_DATASET_BUDGET_MB`` (default 4096) their total size.
+"""
+
+import os
+
+import streamlit as st
+
+from app_pages.instrumentation import cache_data, get_metrics
+
+
+@st.cache_resource
+def get_dataset_store():
+    from maint_advisor.datasets import DEFAULT_BUDGET_BYTES, DatasetStore
+
+    budget = os.environ.get("MAINT_ADVISOR_DATASET_BUDGET_MB")
+    store = DatasetStore(os.environ.get("MAINT_ADVISOR_DATASET_DIR", "datasets"),
+                         float(budget) * 2 ** 20 if budget else DEFAULT_BUDGET_BYTES)
+    get_metrics().cache_sources["datasets"] = lambda: (store.hits, store.misses)
+    return store
+
+
+def upload_dataset(upload, csv_options=None):
+    """Digest of an uploaded CSV or Parquet file, storing it on first use.
+
+    ``csv_options`` are pyarrow ``ConvertOptions`` arguments for reading a CSV upload.
+    """
+    return get_dataset_store().put(upload, upload.name, key=upload.file_id, csv_options=csv_options)
+
+
+@cache_data(show_spinner=False, max_entries=256)
+def _upload_digest(file_id, _upload):
+    from maint_advisor.work_orders import file_digest
+
+    return file_digest(_upload)
+
+
+def upload_digest(upload):
+    """SHA-256 of an uploaded file, read once per upload (keyed on its file id) rather than every rerun."""
+    return _upload_digest(upload.file_id, upload)
+
+
+def dataset(digest, columns=None):
+    """The stored dataset as a read-only DataFrame shared with the other sessions."""
+    return get_dataset_store().frame(digest, columns)
@@ -0,0 +1,96 @@
+"""Transformer DGA page."""
+
+import streamlit as st
+
+from app_pages.datasets import dataset, upload_dataset
+from app_pages.instrumentation import cache_data
+from maint_advisor.recommendation import CRITICALITY, DOWNTIME_COST, ENVIRONMENT, MAINTENANCE_COST
+
+
+@cache_data(show_spinner="Classifying oil samples...", max_entries=8)
+def dga_results(digest):
+    from maint_advisor.dga import classify_samples, read_dga_samples, transformer_failure_history
+
+    samples = classify_samples(read_dga_samples(dataset(digest)))
+    latest = transformer_failure_history(samples) if "transformer" in samples.columns else None
+    return samples, latest
+
+
+@cache_data(max_entries=16)
+def transformer_strategies(latest, defaults):
+    import pandas as pd
+
+    from maint_advisor.recommendation import recommend_fleet
+
+    register = latest.copy()
+    for column, value in defaults.items():
+        register[column] = register[column].fillna(value) if column in register.columns else value
+    return pd.concat([register, recommend_fleet(register)], axis=1)
+
+
+def render():
+    from maint_advisor.dga import DUVAL_DESCRIPTIONS
+
+    st.header("🛢️ Transformer Dissolved Gas Analysis (DGA)")
+    st.markdown("""
+    Faults inside an oil-filled transformer decompose the oil and produce characteristic gases. Upload the lab
+    results of your oil samples (**CSV** or **Parquet**) with the gas columns `h2`, `ch4`, `c2h6`, `c2h4` and
+    `c2h2` in ppm (`hydrogen`, `methane`, ... also work), plus `transformer` and `sample_date` to follow each unit
+    over time. Every sample is interpreted with three methods:
+
+    - **Duval Triangle 1**: relative shares of CH₄, C₂H₄ and C₂H₂.
+    - **Rogers ratios** (IEEE C57.104): CH₄/H₂, C₂H₂/C₂H₄, C₂H₄/C₂H₆.
+    - **IEC 60599 ratios**: the same ratios against the IEC fault table.
+    """)
+    with st.expander("Duval Triangle 1 zones"):
+        st.table({"Zone": list(DUVAL_DESCRIPTIONS), "Fault": list(DUVAL_DESCRIPTIONS.values())})
+
+    dga_file = st.file_uploader("Oil sample results", type=["csv", "parquet"])
+    if dga_file is not None:
+        show_results(dga_file)
+
+    st.markdown("""
+    ---
+    👤 Developed by **Eng. Mohammed Assaf - CMPR, CEPSS**
+    """)
+
+
+def show_results(dga_file):
+    try:
+        samples, latest = dga_results(upload_dataset(dga_file))
+    except ValueError as exc:
+        st.error(f"Could not interpret the DGA results: {exc}")
+        return
+
+    st.success(f"Classified **{len(samples):,}** samples; **{samples['above_limits'].sum():,}** exceed the "
+               "IEEE C57.104 condition 1 limits.")
+    col1, col2, col3 = st.columns(3)
+    col1.markdown("**Duval Triangle 1**")
+    col1.bar_chart(samples["duval"].value_counts(sort=False))
+    col2.markdown("**Rogers ratios**")
+    col2.dataframe(samples["rogers"].value_counts().rename("Samples"), use_container_width=True)
+    col3.markdown("**IEC 60599 ratios**")
+    col3.dataframe(samples["iec"].value_counts().rename("Samples"), use_container_width=True)
+    st.dataframe(samples.head(1000), use_container_width=True)
+    st.download_button("⬇️ Download Sample Diagnoses (CSV)", samples.to_csv(index=False),
+                       file_name="dga_diagnoses.csv", mime="text/csv")
+
+    if latest is not None:
+        st.subheader("🧩 From DGA to Maintenance Strategy")
+        st.markdown("""
+        The latest sample of each transformer sets its **failure history** for the Strategy Recommendation rules:
+        below all gas limits → *Rare*; high-energy discharges (D2) or hot spots above 700 °C (T3) → *Frequent*;
+        any other fault → *Occasional*. The other factors come from the file if present, otherwise from below.
+        """)
+        col1, col2, col3, col4 = st.columns(4)
+        defaults = {
+            "criticality": col1.selectbox("Criticality", CRITICALITY),
+            "environment": col2.selectbox("Environment", ENVIRONMENT, index=1),
+            "maintenance_cost": col3.selectbox("Maintenance cost", MAINTENANCE_COST),
+            "downtime_cost": col4.selectbox("Downtime cost", DOWNTIME_COST),
+        }
+        fleet = transformer_strategies(latest, defaults)
+        st.dataframe(fleet["recommendation"].value_counts().rename("Transformers"), use_container_width=True)
+        st.dataframe(fleet.head(1000), use_container_width=True)
+        st.download_button("⬇️ Download Transformer Strategies (CSV)", fleet.to_csv(index=False),
+                           file_name="transformer_strategies.csv", mime="text/csv")
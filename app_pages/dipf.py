@@ -0,0 +1,57 @@
+"""D-I-P-F Curve page."""
+
+import streamlit as st
+
+from maint_advisor import curves
+
+
+def render():
+    st.header("📉 D-I-P-F Curve: Detection, Indication, Prediction, and Failure")
+    
+    st.markdown("""
+    ### 🧠 Introduction
+    The **D-I-P-F curve** represents a modern approach to asset failure progression, commonly used in condition-based and predictive maintenance frameworks. It breaks down the failure process into four key stages:
+    
+    - **D (Detection)**: Early changes or weak signals are detected—often invisible to operators. Detected by advanced condition monitoring or machine learning.
+    - **I (Indication)**: Observable symptoms begin to appear, such as noise, heat, or vibration. Alerts may be triggered.
+    - **P (Prediction)**: Sufficient data is available to estimate remaining useful life (RUL) or time to failure with predictive models.
+    - **F (Failure)**: The asset fails or reaches a critical point where performance is lost or unsafe.
+
+    This curve emphasizes the **window of opportunity** between detection and failure, during which maintenance can be performed proactively to avoid unplanned downtime.
+    """)
+
+    with st.expander("⚙️ Adjust the curve"):
+        col1, col2 = st.columns(2)
+        onset, failure = col1.slider("Degradation onset → functional failure (% of horizon)", 0, 100, (20, 90))
+        shape = col1.slider("Degradation shape (higher = slower start, faster end)", 1.0, 5.0, 2.5, 0.5)
+        col2.caption("Stages as % of the way from onset to failure")
+        shares = (col2.slider("Detection", 1, 98, 20),
+                  col2.slider("Indication", 1, 98, 45),
+                  col2.slider("Prediction", 1, 98, 70))
+    stages = [onset + (failure - onset) * share / 100 for share in shares]
+    params = curves.DipfParams(onset, *stages, failure, shape)
+    try:
+        st.image(curves.dipf_png(params), caption="Illustrative DIPF Curve", use_container_width=True)
+    except ValueError as exc:
+        st.error(f"Cannot draw the curve: {exc}")
+
+    st.markdown("""
+    ### 📌 Key Insights
+    - 📍 The earlier the detection, the wider the window for predictive maintenance.
+    - 🔍 Predictive models and condition monitoring can significantly shift interventions earlier in the curve.
+    - 🧠 Understanding DIPF improves decision-making in AI-based maintenance strategies.
+
+    ### 🔧 Applications
+    - Rotating equipment health monitoring
+    - Transformer DGA interpretation
+    - Predictive maintenance using IoT/ML
+    - Failure mode tracking in RCM
+
+    """)
+
+    st.success("DIPF is foundational to building effective predictive maintenance systems.")
+
+    st.markdown("""
+    ---
+    👤 Developed by **Eng. Mohammed Assaf - CMPR, CEPSS**
+    """)
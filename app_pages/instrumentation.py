@@ -0,0 +1,121 @@
+"""Render instrumentation for the main script and the pages.
+
+``instrumented(page)`` wraps one page render and records its wall and CPU
+time, the session's rerun count, the process RSS and the cache lookups made
+during the render into the process-wide ``RenderMetrics``. Pages use
+``cache_data`` from here instead of ``st.cache_data`` so their lookups are
+counted as hits or misses. Sessions that switched profiling on in the admin
+page also get each render profiled.
+
+Setting ``MAINT_ADVISOR_METRICS_FILE`` makes the server write the metrics
+to that file in the Prometheus text format every
+``MAINT_ADVISOR_METRICS_INTERVAL`` seconds (default 15), e.g. for the
+node_exporter textfile collector.
+"""
+
+import contextlib
+import functools
+import hmac
+import os
+import sys
+import threading
+import time
+import uuid
+
+import streamlit as st
+
+from maint_advisor.metrics import Profile, RenderMetrics, RenderSample, profile, resident_memory
+
+# Lookups made by the current script run; each session's script runs in its own thread.
+_local = threading.local()
+
+
+def _lru_source(module, name):
+    """Hits and misses of ``module.cache_info()[name]``, zero until the module is imported."""
+    def totals():
+        loaded = sys.modules.get(module)
+        if loaded is None:
+            return 0, 0
+        info = loaded.cache_info()[name]
+        return info.hits, info.misses
+    return totals
+
+
+@st.cache_resource
+def get_metrics():
+    metrics = RenderMetrics()
+    for curve in ("bathtub", "dipf"):
+        metrics.cache_sources[f"curves.{curve}"] = _lru_source("maint_advisor.curves", curve)
+    path = os.environ.get("MAINT_ADVISOR_METRICS_FILE")
+    if path:
+        metrics.start_exporter(path, float(os.environ.get("MAINT_ADVISOR_METRICS_INTERVAL", 15)))
+    return metrics
+
+
+def cache_data(func=None, **kwargs):
+    """``st.cache_data`` that counts hits and misses; takes the same arguments."""
+    if func is None:
+        return functools.partial(cache_data, **kwargs)
+    name = f"{func.__module__.rpartition('.')[2]}.{func.__qualname__}"
+
+    @functools.wraps(func)
+    def compute(*args, **kw):
+        _local.missed = True
+        return func(*args, **kw)
+
+    cached = st.cache_data(compute, **kwargs)
+
+    @functools.wraps(func)
+    def lookup(*args, **kw):
+        outer = getattr(_local, "missed", False)
+        _local.missed = False
+        try:
+            return cached(*args, **kw)
+        finally:
+            hit = not _local.missed
+            _local.missed = outer
+            get_metrics().cache_lookup(name, hit)
+            counts = getattr(_local, "counts", None)
+            if counts is not None:
+                counts[0 if hit else 1] += 1
+
+    lookup.clear = cached.clear
+    return lookup
+
+
+def admin_enabled():
+    """Whether the URL carries the admin link, ``?admin=<MAINT_ADVISOR_ADMIN_TOKEN>``.
+
+    Without the environment variable the admin pages are disabled.
+    """
+    given = st.query_params.get("admin")
+    token = os.environ.get("MAINT_ADVISOR_ADMIN_TOKEN")
+    return bool(token) and given is not None and hmac.compare_digest(given.encode(), token.encode())
+
+
+@contextlib.contextmanager
+def instrumented(page):
+    """Record the render of ``page`` in this script run."""
+    metrics = get_metrics()
+    state = st.session_state
+    if "metrics_session" not in state:
+        state.metrics_session = uuid.uuid4().hex[:8]
+        state.metrics_reruns = 0
+        metrics.session_started()
+    state.metrics_reruns += 1
+    profiler = state.get("metrics_profiler")
+    counts = _local.counts = [0, 0]
+    with contextlib.ExitStack() as stack:
+        if profiler:
+            capture = stack.enter_context(profile(profiler))
+        wall, cpu = time.perf_counter(), time.thread_time()
+        try:
+            yield
+        finally:
+            wall, cpu = time.perf_counter() - wall, time.thread_time() - cpu
+            _local.counts = None
+            metrics.record(RenderSample(time.time(), page, state.metrics_session, state.metrics_reruns,
+                                        wall, cpu, resident_memory(), *counts))
+    if profiler:
+        metrics.profiles.append(Profile(time.time(), page, state.metrics_session, profiler,
+                                        capture.report, capture.data, capture.extension))
@@ -0,0 +1,103 @@
+"""Long computations as background jobs with a progress bar.
+
+``run_job(label, function, *args)`` submits ``function(progress, *args)``
+(a job function from ``maint_advisor.jobs``) for this session and returns
+its result once it is done. Until then it shows the job's progress, polled
+by a fragment every ``POLL_SECONDS`` without rerunning the page, and a
+Cancel button; the page is rerun when the job finishes. A failed job is
+shown as an error with a button to run it again. Because the job
+runs outside the script, widget changes meanwhile do not restart it, and
+a session that asks for the same job again (or another session asking for
+an identical one) gets the running job or its stored result.
+
+``MAINT_ADVISOR_JOB_DIR`` (default ``jobs``) sets where results are kept
+and ``MAINT_ADVISOR_JOB_WORKERS`` (default: one per CPU) how many jobs run
+at a time.
+"""
+
+import os
+import uuid
+
+import streamlit as st
+
+from app_pages.datasets import get_dataset_store
+
+POLL_SECONDS = 1.0
+
+
+@st.cache_resource
+def get_job_runner():
+    from maint_advisor.jobs import JobRunner
+
+    return JobRunner(os.environ.get("MAINT_ADVISOR_JOB_DIR", "jobs"),
+                     workers=int(os.environ.get("MAINT_ADVISOR_JOB_WORKERS", 0)) or None)
+
+
+def _owner():
+    if "job_owner" not in st.session_state:
+        st.session_state.job_owner = uuid.uuid4().hex
+    return st.session_state.job_owner
+
+
+def dataset_path(digest):
+    """The stored file of a dataset, to pass it to a job."""
+    return get_dataset_store().path(digest)
+
+
+@st.fragment(run_every=POLL_SECONDS)
+def _progress(id, label):
+    runner = get_job_runner()
+    job = runner.status(id)
+    if job.finished:
+        st.rerun()
+    st.progress(job.progress, text=f"{label}: {job.message or job.state}")
+    if st.button("✖️ Cancel", key=f"cancel_{id}"):
+        runner.cancel(id, _owner())
+        st.session_state.setdefault("cancelled_jobs", set()).add(id)
+        st.rerun()
+
+
+def _retry_button(id, function, args, label):
+    if st.button("🔁 Run again", key=f"retry_{id}"):
+        st.session_state.cancelled_jobs.discard(id)
+        st.session_state.failed_jobs.pop(id, None)
+        get_job_runner().submit(function, *args, owner=_owner(), name=label, retry=True)
+        st.rerun()
+
+
+def run_job(label, function, *args):
+    """The result of ``function(progress, *args)``, or None while the job is queued, running, cancelled or failed.
+
+    A failed job is shown as an error with a button to run it again, and is
+    not raised. Raises ValueError if this session already has too many jobs
+    waiting.
+    """
+    from maint_advisor.jobs import DONE, FAILED, job_id
+
+    runner = get_job_runner()
+    id = job_id(function, args)
+    cancelled = st.session_state.setdefault("cancelled_jobs", set())
+    # The error of each failed job, kept here so the runner may forget the job.
+    failed = st.session_state.setdefault("failed_jobs", {})
+    if id in cancelled:
+        st.info(f"{label}: cancelled.")
+        _retry_button(id, function, args, label)
+        return None
+    if id not in failed:
+        runner.submit(function, *args, owner=_owner(), name=label)
+        job = runner.status(id)
+        if job.state == DONE:
+            return runner.result(id)
+        if job.state == FAILED:
+            failed[id] = str(job.error)
+        elif not job.finished:
+            _progress(id, label)
+            return None
+        else:
+            # Cancelled by every other session that was waiting for it.
+            runner.submit(function, *args, owner=_owner(), name=label, retry=True)
+            _progress(id, label)
+            return None
+    st.error(f"{label} failed: {failed[id]}")
+    _retry_button(id, function, args, label)
+    return None
@@ -0,0 +1,185 @@
+"""Maintenance KPIs Calculator page."""
+
+import streamlit as st
+
+from app_pages.datasets import upload_dataset, upload_digest
+from app_pages.instrumentation import cache_data
+from app_pages.jobs import dataset_path, run_job
+from maint_advisor import jobs, kpi
+
+
+@st.cache_resource
+def get_trend_store():
+    from maint_advisor.kpi_trends import KpiTrendStore
+
+    return KpiTrendStore()
+
+
+# The trend functions take the store version, so they recompute only after a fold.
+@cache_data(max_entries=4)
+def rolling_kpis(version):
+    store = get_trend_store()
+    return store.current(), store.assets()
+
+
+@cache_data(show_spinner="Computing KPI trends...", max_entries=32)
+def kpi_trend(version, assets, asset_class):
+    return get_trend_store().trend(assets, asset_class)
+
+
+def render():
+    st.header("📈 Maintenance KPIs Calculator — Interactive Dashboard")
+    st.markdown("""
+    KPIs provide a measurable way to assess and improve your maintenance program.
+    Enter data below to calculate:
+    """)
+
+    st.subheader("1. 🔁 MTBF (Mean Time Between Failures)")
+    st.markdown(r"""
+    **Formula:**
+    $$\text{MTBF} = \frac{\text{Total Uptime}}{\text{Number of Failures}}$$
+    """)
+    uptime = st.number_input("Total Uptime (hours)", value=1000)
+    failures = st.number_input("Number of Failures", value=5)
+    if failures > 0:
+        st.success(f"MTBF = {kpi.mtbf(uptime, failures):.2f} hours")
+
+    st.subheader("2. 🔧 MTTR (Mean Time to Repair)")
+    st.markdown(r"""
+    **Formula:**
+    $$\text{MTTR} = \frac{\text{Total Downtime}}{\text{Number of Repairs}}$$
+    """)
+    downtime = st.number_input("Total Downtime (hours)", value=50)
+    repairs = st.number_input("Number of Repairs", value=5)
+    if repairs > 0:
+        st.success(f"MTTR = {kpi.mttr(downtime, repairs):.2f} hours")
+
+    st.subheader("3. ⚙️ Availability")
+    st.markdown(r"""
+    **Formula:**
+    $$\text{Availability} = \frac{\text{MTBF}}{\text{MTBF} + \text{MTTR}}$$
+    or equivalently:
+    $$\text{Availability} = \frac{\text{Uptime}}{\text{Uptime} + \text{Downtime}}$$
+    """)
+    if (uptime + downtime) > 0:
+        availability = kpi.availability(uptime, downtime)
+        st.success(f"Availability = {availability:.2%}")
+
+    st.subheader("4. 📦 Maintenance Cost per Unit Output")
+    st.markdown(r"""
+    **Formula:**
+    $$\text{Cost per Unit} = \frac{\text{Total Maintenance Cost}}{\text{Total Output}}$$
+    """)
+    cost = st.number_input("Total Maintenance Cost ($)", value=15000)
+    output = st.number_input("Total Output (e.g., MWh, Tons)", value=1000)
+    if output > 0:
+        st.success(f"Cost per unit = ${kpi.cost_per_unit(cost, output):.2f}")
+
+    st.subheader("5. 📅 Schedule Compliance (%)")
+    st.markdown(r"""
+    **Formula:**
+    $$\text{Schedule Compliance} = \frac{\text{Completed On Time}}{\text{Scheduled Jobs}} \times 100$$
+    """)
+    scheduled = st.number_input("Scheduled Jobs", value=120)
+    completed = st.number_input("Completed On Time", value=108)
+    if scheduled > 0:
+        st.success(f"Schedule Compliance = {kpi.schedule_compliance(completed, scheduled):.2f}%")
+
+    st.subheader("6. 💰 Maintenance Budget Adherence")
+    st.markdown(r"""
+    **Formula:**
+    $$\text{Budget Variance} = \frac{\text{Actual Spend} - \text{Planned Budget}}{\text{Planned Budget}} \times 100$$
+    """)
+    budget = st.number_input("Planned Budget ($)", value=20000)
+    actual = st.number_input("Actual Spend ($)", value=18500)
+    if budget > 0:
+        variance = kpi.budget_variance(actual, budget)
+        st.success(f"Budget Variance = {variance:.2f}%")
+
+    st.subheader("7. 📂 KPIs per Asset from a CMMS Work-Order Export")
+    st.markdown("""
+    Upload a work-order export (**CSV** or **Parquet**) with one row per failure and the columns
+    `asset`, `failure_start`, `restore_time` and optionally `asset_class`, `cost` and `output`.
+    The file is read in chunks, and the formulas above are applied to every asset and asset class.
+    Uptime is the reporting period minus each asset's downtime.
+    """)
+    work_order_file = st.file_uploader("Work-order export", type=["csv", "parquet"])
+    if work_order_file is not None:
+        from maint_advisor.work_orders import csv_convert_options
+
+        try:
+            # Stored with the work-order column types, so day-first dates are not guessed later.
+            csv_options = (None if work_order_file.name.lower().endswith(".parquet")
+                           else csv_convert_options(work_order_file))
+            # A background job keyed on the stored export, so widget reruns never re-read the upload.
+            kpis = run_job("Reading work-order export", jobs.work_order_kpis,
+                           dataset_path(upload_dataset(work_order_file, csv_options)))
+        except ValueError as exc:
+            st.error(f"Could not process the work-order export: {exc}")
+            kpis = None
+        if kpis is not None:
+            per_asset, per_class, period = kpis
+            st.caption(f"Reporting period: {period[0]} → {period[1]}")
+            st.markdown("**Per asset class**")
+            st.dataframe(per_class, use_container_width=True)
+            st.markdown("**Per asset**")
+            st.dataframe(per_asset.head(1000), use_container_width=True)
+            st.download_button("⬇️ Download Per-Asset KPIs (CSV)", per_asset.to_csv(),
+                               file_name="asset_kpis.csv", mime="text/csv")
+
+    st.subheader("8. 📉 Rolling KPI Trends")
+    st.markdown("""
+    Work-order exports added here are appended to an event log on the server, and rolling **30/90/365-day**
+    MTBF, MTTR, availability, schedule compliance and budget variance are kept up to date per asset as new work
+    orders arrive. Besides the columns above, `due_date` (scheduled jobs; on time if restored by then) and
+    `budget` (planned cost per work order) feed schedule compliance and budget variance. The windows end on the
+    day of the latest work order. An export is only added once, however often it is uploaded.
+    """)
+    from maint_advisor.kpi_trends import KPI_COLUMNS
+
+    store = get_trend_store()
+    log_file = st.file_uploader("Add work orders to the event log", type=["csv", "parquet"], key="trend_upload")
+    if log_file is not None:
+        digest = upload_digest(log_file)
+        if store.has_batch(digest):
+            st.caption(f"`{log_file.name}` is already in the event log.")
+        else:
+            try:
+                with st.spinner("Appending work orders..."):
+                    log_file.seek(0)
+                    rows = store.ingest(log_file, log_file.name, digest)
+            except ValueError as exc:
+                st.error(f"Could not add the work-order export: {exc}")
+            else:
+                st.success(f"Added {rows:,} work orders from `{log_file.name}`.")
+
+    version = store.version()
+    if not version:
+        st.info("The event log is empty. Add a work-order export to start the trends.")
+    else:
+        current, assets = rolling_kpis(version)
+        st.caption(f"{version:,} work orders for {len(assets):,} assets, up to {store.last_day():%Y-%m-%d}.")
+        col1, col2, col3 = st.columns(3)
+        scope = col1.selectbox("Trend for", ["Whole fleet", "Asset class", "Asset"])
+        selected_assets = selected_class = None
+        if scope == "Asset class":
+            selected_class = col2.selectbox("Asset class", sorted(assets.unique()))
+        elif scope == "Asset":
+            selected_assets = (col2.selectbox("Asset", assets.index),)
+        kpi_name = col3.selectbox("KPI", KPI_COLUMNS)
+
+        trend = kpi_trend(version, selected_assets, selected_class)
+        chart = trend[kpi_name].unstack("window").rename(columns=lambda w: f"{w} days")
+        st.line_chart(chart, y_label=kpi_name)
+
+        st.markdown(f"**{kpi_name} per asset**")
+        table = current[kpi_name].unstack("window").rename(columns=lambda w: f"{w} days")
+        table.insert(0, "asset_class", assets.reindex(table.index))
+        st.dataframe(table.head(1000), use_container_width=True)
+        st.download_button("⬇️ Download Rolling KPIs (CSV)", current.to_csv(),
+                           file_name="rolling_kpis.csv", mime="text/csv")
+
+    st.markdown("""
+    ---
+    👤 Developed by **Eng. Mohammed Assaf - CMPR, CEPSS**
+    """)
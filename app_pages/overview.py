@@ -0,0 +1,80 @@
+"""Overview of Maintenance Types page."""
+
+import pandas as pd
+import streamlit as st
+
+from maint_advisor.content import COMPARISON_DATA
+
+
+@st.cache_resource
+def comparison_table():
+    return pd.DataFrame(COMPARISON_DATA)
+
+
+def render():
+    st.header("📘 Types of Maintenance")
+    st.markdown("""
+    ### 🧠 Introduction
+    Maintenance strategies are essential for ensuring the reliability, safety, and cost-effectiveness of equipment and systems across various industries.     These strategies define how maintenance activities are planned and executed to prevent failures, extend asset life, and optimize operational performance. The main types of maintenance strategies include **Corrective Maintenance (Run to Failure)**, **Preventive Maintenance (Time-Based)**, **Predictive Maintenance (Condition-Based)**, **Proactive Maintenance**, **Prescriptive Maintenace**, and **Reliability-Centered Maintenance (RCM)**. Each approach differs in terms of complexity, cost, required resources, and effectiveness in minimizing downtime. Understanding these strategies is crucial for selecting the most appropriate method based on equipment criticality, failure consequences, and operational context. 
+    **Below are the most widely used strategies in engineering industries:**
+
+    ### 1. 🛑 Corrective Maintenance (CM) — Also called Breakdown or Run-to-Failure
+    - **Definition**: Maintenance performed only after equipment fails.
+    - **Goal**: Restore functionality post-failure.
+    - **Advantages**: No planning cost, simple.
+    - **Disadvantages**: High risk, unplanned downtime, costly in critical systems.
+    - **Best for**: Low-value, non-critical assets.
+    - **Examples**: Light bulbs, decorative motors.
+
+    ### 2. 🔁 Preventive Maintenance (PM)
+    - **Definition**: Periodic maintenance at fixed time or usage intervals regardless of asset condition.
+    - **Goal**: Prevent unexpected failures.
+    - **Advantages**: Reduces failure risk, easy to plan.
+    - **Disadvantages**: May result in unnecessary maintenance and costs.
+    - **Best for**: Assets with predictable wear.
+    - **Examples**: Replacing filters, monthly cleaning, oil changes.
+
+    ### 3. 📊 Predictive Maintenance (PdM or CBM)
+    - **Definition**: Uses real-time condition monitoring (vibration, temperature, oil analysis) to decide when to maintain.
+    - **Goal**: Optimize timing of interventions.
+    - **Advantages**: Prevents both under- and over-maintenance.
+    - **Disadvantages**: Requires sensors and diagnostics.
+    - **Best for**: High-value, rotating, or critical machines.
+    - **Examples**: Vibration analysis for motors, DGA for transformers.
+
+    ### 4. 🧠 Proactive Maintenance
+    - **Definition**: Focuses on root cause elimination — redesigns, training, better lubrication, etc.
+    - **Goal**: Stop failure before it begins.
+    - **Advantages**: Long-term reliability improvement.
+    - **Disadvantages**: Requires deep failure analysis.
+    - **Best for**: Plants with high reliability goals.
+
+    ### 5. 🔄 Reliability-Centered Maintenance (RCM)
+    - **Definition**: Structured analysis method to select the best maintenance approach for each failure mode.
+    - **Goal**: Balance safety, availability, and cost.
+    - **Advantages**: Risk-based, asset-specific.
+    - **Disadvantages**: Time-consuming and analytical.
+    - **Best for**: Critical industries (power, aviation, oil & gas).
+
+    ### 6. 🤖 Prescriptive Maintenance (AI-driven)
+    - **Definition**: Uses machine learning to recommend what action to take based on data.
+    - **Goal**: Automate decisions using historical and real-time data.
+    - **Advantages**: High efficiency, ideal for digital plants.
+    - **Disadvantages**: Requires data integration, algorithm training.
+    - **Best for**: Industry 4.0, digital twins.
+
+    ---
+    **Choosing the right strategy** depends on asset criticality, failure behavior, cost, and available technology. Use the selector in this app to help guide your decision.
+    """)
+
+    # --- Add comparison table ---
+    st.markdown("### 🧾 Comparative Table of Maintenance Strategies")
+    st.markdown("**Scroll the table to the right** to view all details. ➡️ ")  # <--- this line
+
+    st.dataframe(comparison_table(), use_container_width=True)
+
+
+    st.markdown("""
+    ---
+    👤 Developed by **Eng. Mohammed Assaf - CMPR, CEPSS**
+    """)
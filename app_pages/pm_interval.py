@@ -0,0 +1,90 @@
+"""Optimal PM Interval page."""
+
+import streamlit as st
+
+from app_pages.datasets import dataset, upload_dataset
+from app_pages.instrumentation import cache_data
+
+
+@cache_data(max_entries=64)
+def single_asset(beta, eta, pm_cost, failure_cost):
+    from maint_advisor.replacement import cost_rate_curves, optimal_intervals
+
+    return (optimal_intervals(beta, eta, pm_cost, failure_cost).iloc[0],
+            cost_rate_curves(beta, eta, pm_cost, failure_cost))
+
+
+# Keyed on the stored file's digest and the default costs, so changing a cost
+# re-optimizes the fleet once and switching back is free.
+@cache_data(show_spinner="Optimizing replacement intervals...", max_entries=16)
+def fleet_intervals(digest, pm_cost, failure_cost):
+    from maint_advisor.replacement import optimize_fleet
+
+    return optimize_fleet(dataset(digest), pm_cost, failure_cost)
+
+
+def _interval(value):
+    return "Run to failure" if value == float("inf") else f"{value:,.0f}"
+
+
+def render():
+    st.header("⏱️ Optimal Preventive Maintenance Interval")
+    st.markdown("""
+    Preventive maintenance done too often wastes money; done too rarely, it lets failures through. For an asset whose
+    failure rate increases with age (Weibull shape **β > 1**) and whose failure costs more than a planned replacement,
+    there is an interval that minimizes the long-run **cost per unit of time**:
+
+    - **Age replacement**: replace at failure or when the asset reaches age *T*, whichever comes first.
+    - **Block replacement**: replace at failure and at every fixed time *T*, regardless of age (easier to schedule).
+
+    Times are in the same unit as the Weibull scale η (hours, cycles, ...). Costs should include downtime.
+    """)
+
+    st.subheader("1. 🔧 Single Asset")
+    col1, col2 = st.columns(2)
+    beta = col1.number_input("Weibull shape β", 0.3, 20.0, 2.5, 0.1)
+    eta = col1.number_input("Weibull scale η", 1.0, 1e7, 10_000.0, 500.0)
+    pm_cost = col2.number_input("Preventive replacement cost", 0.0, value=1_000.0, step=100.0)
+    failure_cost = col2.number_input("Failure replacement cost", 0.0, value=8_000.0, step=500.0)
+    best, curves = single_asset(beta, eta, pm_cost, failure_cost)
+
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Age replacement interval", _interval(best["age_interval"]),
+                f"{best['age_saving']:.1%} cheaper than run-to-failure", delta_color="off")
+    col2.metric("Block replacement interval", _interval(best["block_interval"]),
+                f"{best['block_saving']:.1%} cheaper than run-to-failure", delta_color="off")
+    col3.metric("Run-to-failure cost rate", f"{best['rtf_cost_rate']:.4g}")
+    if best["age_interval"] == float("inf"):
+        st.info("No preventive interval pays off: the failure rate does not increase enough with age "
+                "(β ≤ 1) or a failure is not more expensive than a planned replacement.")
+    # Very short intervals cost far more than any sensible choice; cut them off the chart.
+    st.line_chart(curves.clip(upper=3 * best["rtf_cost_rate"]), x_label="Replacement interval T",
+                  y_label="Cost per unit of time")
+
+    st.subheader("2. 📦 Whole Fleet")
+    st.markdown("""
+    Upload a **CSV** or **Parquet** file with one row per asset or asset class and the columns `beta` and `eta`
+    (for example the Weibull results downloaded from the **Bathtub Curve** page). Optional `pm_cost` and
+    `failure_cost` columns override the default costs below for individual rows.
+    """)
+    col1, col2 = st.columns(2)
+    default_pm = col1.number_input("Default preventive cost", 0.0, value=1_000.0, step=100.0)
+    default_failure = col2.number_input("Default failure cost", 0.0, value=8_000.0, step=500.0)
+    fleet_file = st.file_uploader("Weibull parameters per asset", type=["csv", "parquet"])
+    if fleet_file is not None:
+        try:
+            fleet = fleet_intervals(upload_dataset(fleet_file), default_pm, default_failure)
+        except ValueError as exc:
+            st.error(f"Could not optimize the fleet: {exc}")
+        else:
+            finite = fleet["age_interval"] < float("inf")
+            st.success(f"Optimized **{len(fleet):,}** rows: **{finite.sum():,}** benefit from age replacement, "
+                       f"**{(~finite & fleet['age_interval'].notna()).sum():,}** are best run to failure.")
+            st.dataframe(fleet.head(1000), use_container_width=True)
+            st.download_button("⬇️ Download Optimal Intervals (CSV)", fleet.to_csv(index=False),
+                               file_name="optimal_pm_intervals.csv", mime="text/csv")
+
+    st.markdown("""
+    ---
+    👤 Developed by **Eng. Mohammed Assaf - CMPR, CEPSS**
+    """)
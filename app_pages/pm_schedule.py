@@ -0,0 +1,147 @@
+"""PM Work Scheduler page."""
+
+import datetime
+
+import streamlit as st
+
+from app_pages.datasets import dataset, upload_dataset
+from app_pages.instrumentation import cache_data
+
+# Example week shown until files are uploaded; day 0 is the Monday.
+SAMPLE_JOBS = {
+    "job": ["PM-1001", "PM-1002", "PM-1003", "PM-1004", "PM-1005", "PM-1006", "PM-1007", "PM-1008", "PM-1009",
+            "PM-1010", "PM-1011", "PM-1012", "PM-1013", "PM-1014", "PM-1015", "PM-1016", "PM-1017", "PM-1018",
+            "PM-1019"],
+    "asset": ["P-101A", "P-101A", "P-101A", "C-201", "C-201", "M-410", "M-410", "F-305", "TR-01",
+              "TR-01", "AHU-3", "P-101B", "P-101B", "V-220", "LT-07", "AHU-4", "CV-12", "MCC-2",
+              "K-301"],
+    "craft": ["Mechanical", "Electrical", "Instrumentation", "Mechanical", "Lubrication", "Electrical", "Mechanical",
+              "Mechanical", "Electrical", "Electrical", "Mechanical", "Mechanical", "Lubrication", "Mechanical",
+              "Instrumentation", "Electrical", "Mechanical", "Electrical", "Mechanical"],
+    "duration": [6.0, 3.0, 2.0, 8.0, 1.0, 4.0, 2.0, 3.0, 6.0, 2.0, 4.0, 5.0, 1.0, 7.0, 3.0, 2.0, 6.0, 8.0, 8.0],
+    "technicians": [2, 1, 1, 2, 1, 1, 1, 1, 2, 1, 1, 1, 1, 1, 1, 1, 1, 1, 2],
+    "earliest": [1, 1, 1, 0, 0, 0, 0, 2, 3, 3, 0, 2, 2, 0, 1, 3, 1, 3, 2],
+    "due": [1, 1, 1, 2, 4, 1, 4, 4, 3, 3, 4, 4, 4, 2, 2, 4, 1, 3, 3],
+    "priority": [1, 2, 2, 1, 3, 2, 4, 3, 1, 2, 5, 3, 4, 3, 2, 5, 2, 3, 2],
+    "outage_group": ["P-101A outage", "P-101A outage", "P-101A outage", None, None, None, None, None,
+                     "TR-01 outage", "TR-01 outage", None, None, None, None, None, None, None, None, None],
+}
+SAMPLE_TECHNICIANS = {
+    "technician": ["Ahmad", "Sara", "Omar", "Lina", "Yousef", "Rami"],
+    "craft": ["Mechanical", "Mechanical", "Electrical", "Electrical", "Instrumentation", "Lubrication"],
+    "hours": [8, 8, 8, 8, 8, 4],
+}
+MAX_ROWS = 5000
+
+
+@cache_data(show_spinner="Building the schedule...", max_entries=4)
+def weekly_schedule(jobs, technicians, start, working_days):
+    from maint_advisor.scheduling import WeeklySchedule
+
+    return WeeklySchedule(jobs, technicians, start=start, working_days=working_days)
+
+
+@cache_data(show_spinner="Rescheduling...", max_entries=4)
+def rescheduled(jobs, technicians, start, working_days, slipped, today):
+    # The cached schedule comes back as a copy, so rescheduling it leaves the base schedule alone.
+    schedule = weekly_schedule(jobs, technicians, start, working_days)
+    moved = schedule.reschedule(dict(slipped), today=today)
+    return schedule, moved
+
+
+def _table(upload, sample, label):
+    import pandas as pd
+
+    if upload is not None:
+        from maint_advisor.scheduling import read_table
+
+        return read_table(dataset(upload_dataset(upload)))
+    st.caption(f"No {label} uploaded: edit the example below.")
+    return st.data_editor(pd.DataFrame(sample), num_rows="dynamic", use_container_width=True, key=f"{label}_editor")
+
+
+def _kpi_metrics(kpis, before=None):
+    col1, col2, col3, col4 = st.columns(4)
+    delta = None if before is None else f"{kpis['schedule_compliance'] - before['schedule_compliance']:+.1f} pp"
+    col1.metric("Projected Schedule Compliance", f"{kpis['schedule_compliance']:.1f}%", delta=delta)
+    col2.metric("On time", f"{kpis['on_time']:,} / {kpis['jobs']:,}")
+    col3.metric("Late / unscheduled", f"{kpis['late']:,} / {kpis['unscheduled']:,}")
+    col4.metric("Crew utilization", f"{kpis['utilization']:.1f}%")
+
+
+def render():
+    st.header("🗓️ PM Work Scheduler")
+    st.markdown("""
+    **Schedule Compliance** measures how much of the scheduled work is done on time, and most of it is decided
+    when the week is planned. Give the PM jobs (craft, duration, number of technicians, the window of days they
+    must be done in, priority and outage group) and the crew calendar, and the scheduler builds the week:
+
+    - jobs are taken **earliest due day first**, then by priority (1 is the most urgent), and given to the
+      technicians of the right craft whose free time fits best;
+    - jobs of the same **outage group** need the same equipment outage and are done on the same day;
+    - a **local search** then moves blocking jobs to other days of their windows to bring late jobs on time.
+
+    Windows are day numbers (0 is the first day) or dates. The crew table gives each technician's hours per
+    working day, or one row per technician and day (`day` column) for rosters with leave and shifts.
+    """)
+
+    col1, col2 = st.columns(2)
+    jobs_file = col1.file_uploader("PM jobs (CSV or Parquet)", type=["csv", "parquet"])
+    crew_file = col2.file_uploader("Crew calendar (CSV or Parquet)", type=["csv", "parquet"])
+    today = datetime.date.today()
+    col1, col2 = st.columns(2)
+    start = col1.date_input("First day of the schedule (day 0)", today + datetime.timedelta(days=-today.weekday() % 7))
+    working_days = col2.slider("Working days per week", 1, 7, 5,
+                               help="Counted from day 0, for crew tables without a `day` column")
+    try:
+        jobs = _table(jobs_file, SAMPLE_JOBS, "jobs")
+        technicians = _table(crew_file, SAMPLE_TECHNICIANS, "crew")
+        schedule = weekly_schedule(jobs, technicians, start, working_days)
+    except ValueError as exc:
+        st.error(f"Cannot build the schedule: {exc}")
+        return
+    base = schedule.compliance()
+
+    st.subheader("🔁 Slipped Jobs")
+    st.markdown("Jobs that could not be done on their day are re-planned, from the day after it and not before the "
+                "chosen day; the rest of the week stays as it is, and only the jobs that make room for them move.")
+    assignments = schedule.assignments()
+    booked = assignments.loc[assignments["day"] >= 0, "job"]
+    col1, col2 = st.columns([3, 1])
+    slipped = col1.multiselect("Jobs that slipped", booked, max_selections=200)
+    replan_day = col2.number_input("Re-plan from day", 0, schedule.days - 1, 1)
+    if slipped:
+        # A slipped job can be done from the day after its planned day at the earliest.
+        slipped_days = assignments.set_index("job").loc[slipped, "day"]
+        try:
+            schedule, moved = rescheduled(jobs, technicians, start, working_days,
+                                          tuple((job, max(int(day) + 1, int(replan_day))) for job, day in
+                                                slipped_days.items()), int(replan_day))
+        except ValueError as exc:
+            st.error(f"Cannot reschedule: {exc}")
+            return
+        assignments = schedule.assignments()
+        st.caption(f"{len(moved):,} jobs moved.")
+        st.dataframe(moved.head(MAX_ROWS), hide_index=True, use_container_width=True)
+
+    st.subheader("📊 Projected KPIs")
+    _kpi_metrics(schedule.compliance(), base if slipped else None)
+
+    st.subheader("📋 Schedule")
+    st.dataframe(assignments.sort_values(["day", "job"]).head(MAX_ROWS), hide_index=True, use_container_width=True)
+    if len(assignments) > MAX_ROWS:
+        st.caption(f"Showing {MAX_ROWS:,} of {len(assignments):,} jobs; download the CSV for all of them.")
+    st.download_button("⬇️ Download Schedule (CSV)", assignments.to_csv(index=False),
+                       file_name="pm_schedule.csv", mime="text/csv")
+
+    st.subheader("👷 Crew Utilization")
+    by_day = schedule.utilization("day").pivot(index="craft", columns="day", values="utilization")
+    st.markdown("**Booked hours as % of available hours, per craft and day**")
+    st.dataframe(by_day.round(1), use_container_width=True)
+    st.dataframe(schedule.utilization("technician").round(1).head(MAX_ROWS), hide_index=True,
+                 use_container_width=True)
+
+    st.markdown("""
+    ---
+    👤 Developed by **Eng. Mohammed Assaf - CMPR, CEPSS**
+    """)
@@ -0,0 +1,79 @@
+"""Maintenance Quiz page."""
+
+import os
+import uuid
+
+import streamlit as st
+
+from app_pages.instrumentation import cache_data
+from maint_advisor.content import QUIZ_QUESTIONS
+from maint_advisor.quiz_results import QuizStore, item_statistics
+
+
+@st.cache_resource
+def get_quiz_store():
+    return QuizStore()
+
+
+# Recomputed only when a new attempt has been stored.
+@cache_data(max_entries=4)
+def item_analysis(version):
+    responses = get_quiz_store().response_matrix()
+    if not len(responses):
+        return 0, None
+    stats = item_statistics(responses)
+    stats.insert(0, "Question", [q[0] for q in QUIZ_QUESTIONS])
+    return len(responses), stats
+
+
+def render():
+    st.header("🧠 Maintenance Knowledge Quiz")
+    st.markdown("""
+    Test your knowledge on maintenance strategies, reliability metrics, and condition monitoring. Select the best answer for each question. Click the button below to evaluate all answers at once.
+    """)
+
+    if "quiz_session" not in st.session_state:
+        st.session_state.quiz_session = uuid.uuid4().hex
+
+    # Answers inside the form are only sent when it is submitted, so picking
+    # an option does not rerun the script.
+    with st.form("quiz_form"):
+        submitted = st.form_submit_button("📊 Submit All Answers")
+
+        answers = []
+        for i, (question, options, correct_idx, explanation) in enumerate(QUIZ_QUESTIONS):
+            st.subheader(f"Q{i+1}: {question}")
+            answers.append(st.radio("Select one:", options, key=f"quiz_{i}"))
+
+            if submitted:
+                correct_answer = options[correct_idx]
+                if answers[i] == correct_answer:
+                    st.success(f"✅ Correct — {explanation}")
+                else:
+                    st.error(f"❌ Incorrect. Correct answer: {correct_answer} — {explanation}")
+
+    if submitted:
+        score, _ = get_quiz_store().record_attempt(answers, session=st.session_state.quiz_session)
+        st.info(f"🏁 Final Score: {score} out of {len(QUIZ_QUESTIONS)}")
+
+    with st.expander("🎓 Instructor View — Item Analysis"):
+        password = os.environ.get("QUIZ_INSTRUCTOR_PASSWORD")
+        if password and st.text_input("Instructor password", type="password") != password:
+            st.caption("Enter the instructor password to view the statistics.")
+        else:
+            attempts, stats = item_analysis(get_quiz_store().version())
+            st.markdown(f"""
+            Based on **{attempts:,}** stored attempts.
+            - **Difficulty**: share of attempts answering correctly (low = hard).
+            - **Discrimination**: difficulty in the top 27% of scores minus the bottom 27% (below 0.2 = weak item).
+            - **Point-biserial**: correlation of the item with the score on the other items.
+            """)
+            if attempts:
+                st.dataframe(stats.style.format({"difficulty": "{:.2f}", "discrimination": "{:.2f}",
+                                                 "point_biserial": "{:.2f}"}),
+                             use_container_width=True)
+
+    st.markdown("""
+    ---
+    👤 Developed by **Eng. Mohammed Assaf - CMPR, CEPSS**
+    """)
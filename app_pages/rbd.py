@@ -0,0 +1,159 @@
+"""System Availability (Reliability Block Diagram) page."""
+
+import hashlib
+import json
+
+import streamlit as st
+
+from app_pages.datasets import dataset, upload_dataset
+
+# Example diagram shown until files are uploaded.
+SAMPLE_STRUCTURE = {
+    "name": "Feedwater System",
+    "type": "series",
+    "children": [
+        {"name": "Feed pumps", "type": "k_of_n", "k": 2, "children": ["FP-1", "FP-2", "FP-3"]},
+        {"name": "Pump drives", "type": "parallel", "children": ["VFD-A", "VFD-B"]},
+        "DEA-01",
+        {"name": "Flow control", "type": "parallel", "children": [
+            "FCV-101",
+            {"name": "Bypass line", "type": "series", "children": ["BV-101", "MOV-101"]},
+        ]},
+        "DCS-CTRL",
+    ],
+}
+SAMPLE_COMPONENTS = {
+    "component": ["FP-1", "FP-2", "FP-3", "VFD-A", "VFD-B", "DEA-01", "FCV-101", "BV-101", "MOV-101", "DCS-CTRL"],
+    "mtbf": [8_000, 8_000, 8_000, 25_000, 25_000, 60_000, 12_000, 40_000, 15_000, 80_000],
+    "mttr": [48, 48, 48, 12, 12, 120, 8, 6, 10, 4],
+}
+SWEEP_POINTS = 200
+
+
+def _build_diagram(structure_bytes, structure_name, components, components_key):
+    """The session's diagram, rebuilt only when its inputs change.
+
+    Kept in session state rather than a shared cache because what-if edits
+    update it in place.
+    """
+    from maint_advisor.rbd import ReliabilityBlockDiagram, load_structure
+
+    key = hashlib.sha256(structure_bytes + components_key.encode()).hexdigest()
+    if st.session_state.get("rbd_key") != key:
+        import io
+
+        diagram = ReliabilityBlockDiagram(load_structure(io.BytesIO(structure_bytes), structure_name), components)
+        st.session_state.rbd_diagram = diagram
+        st.session_state.rbd_baseline = diagram.system()
+        st.session_state.rbd_key = key
+    return st.session_state.rbd_diagram
+
+
+def render():
+    import numpy as np
+    import pandas as pd
+
+    from maint_advisor.rbd import read_components
+
+    st.header("🧩 System Availability — Reliability Block Diagram")
+    st.markdown("""
+    The KPIs Calculator gives the availability of one item, $A = \\frac{MTBF}{MTBF + MTTR}$. A unit is made of
+    many items arranged in **series** (all must work), **parallel** (one is enough) and **k-out-of-n** (k of n
+    must work) blocks. Describe the structure as **JSON** or **YAML** and give each component its MTBF and MTTR
+    in hours; availability, MTBF and MTTR are then computed for every block up to the whole system.
+
+    The **Birnbaum importance** of a component is how much the system availability changes per unit change of the
+    component's availability: improving the components at the top of that ranking pays off most.
+    """)
+
+    col1, col2 = st.columns(2)
+    structure_file = col1.file_uploader("Structure (JSON or YAML)", type=["json", "yaml", "yml"])
+    components_file = col2.file_uploader("Components (CSV or Parquet: component, mtbf, mttr)",
+                                         type=["csv", "parquet"])
+    if structure_file is not None:
+        structure_bytes, structure_name = structure_file.getvalue(), structure_file.name
+    else:
+        st.caption("No structure uploaded: edit the example below.")
+        text = st.text_area("Structure (JSON)", json.dumps(SAMPLE_STRUCTURE, indent=2), height=220)
+        structure_bytes, structure_name = text.encode(), "structure.json"
+    try:
+        if components_file is not None:
+            components_key = upload_dataset(components_file)
+            components = read_components(dataset(components_key))
+        else:
+            st.caption("No component table uploaded: edit the example below.")
+            components = st.data_editor(pd.DataFrame(SAMPLE_COMPONENTS), num_rows="dynamic",
+                                        use_container_width=True)
+            components_key = components.to_csv(index=False)
+        diagram = _build_diagram(structure_bytes, structure_name, components, components_key)
+    except ValueError as exc:
+        st.error(f"Could not evaluate the diagram: {exc}")
+        return
+
+    baseline = st.session_state.rbd_baseline
+    blocks = int((diagram.kinds != 0).sum())
+    st.subheader("📊 System")
+    st.caption(f"{len(diagram.leaves):,} components in {blocks:,} blocks.")
+
+    st.markdown("**What-if: change one component**")
+    ranking = diagram.importance()
+    col1, col2, col3 = st.columns(3)
+    component = col1.selectbox("Component", ranking["component"], help="Ordered by Birnbaum importance")
+    row = ranking.set_index("component").loc[component]
+    mtbf = col2.number_input("MTBF (h)", min_value=0.1, value=float(row["mtbf"]))
+    mttr = col3.number_input("MTTR (h)", min_value=0.0, value=float(row["mttr"]))
+    if (mtbf, mttr) != (row["mtbf"], row["mttr"]):
+        # Only the blocks between the component and the system are re-evaluated.
+        diagram.update(component, mtbf=mtbf, mttr=mttr)
+        ranking = diagram.importance()
+    if st.button("Reset to the input values"):
+        st.session_state.pop("rbd_key", None)
+        st.rerun()
+
+    system = diagram.system()
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Availability", f"{system['availability']:.4%}",
+                delta=f"{(system['availability'] - baseline['availability']) * 100:+.4f} pp")
+    col2.metric("MTBF", f"{system['mtbf']:,.0f} h", delta=f"{system['mtbf'] - baseline['mtbf']:+,.0f} h")
+    col3.metric("MTTR", f"{system['mttr']:,.1f} h", delta=f"{system['mttr'] - baseline['mttr']:+,.1f} h",
+                delta_color="inverse")
+    col4.metric("Failures per year", f"{system['failures_per_year']:,.2f}")
+
+    st.subheader("🏅 Component Importance")
+    st.markdown("""
+    - **Birnbaum**: change of system availability per unit change of the component's availability.
+    - **Criticality**: probability that the component is down when the system is down.
+    - **Failure share**: share of system failures caused by the component's failures.
+    """)
+    st.dataframe(ranking.head(1000), hide_index=True, use_container_width=True)
+    st.download_button("⬇️ Download Importance Ranking (CSV)", ranking.to_csv(index=False),
+                       file_name="component_importance.csv", mime="text/csv")
+
+    st.subheader("📈 MTBF Sweep")
+    col1, col2 = st.columns(2)
+    swept = col1.selectbox("Component to sweep", ranking["component"], key="rbd_sweep_component")
+    low, high = col2.select_slider("MTBF range (× current)", options=[0.1, 0.25, 0.5, 1.0, 2.0, 4.0, 10.0],
+                                   value=(0.25, 4.0))
+    current = float(ranking.set_index("component").loc[swept, "mtbf"])
+    values = current * np.geomspace(low, high, SWEEP_POINTS)
+    sweep = diagram.sweep({swept: {"mtbf": values}})
+    # A plain Vega-Lite spec: st.line_chart goes through Altair, which costs
+    # about 100 ms per rerun for this one small chart.
+    st.vega_lite_chart(sweep.assign(component_mtbf=values), {
+        "mark": "line",
+        "encoding": {
+            "x": {"field": "component_mtbf", "type": "quantitative", "title": f"{swept} MTBF (h)",
+                  "scale": {"type": "log"}},
+            "y": {"field": "availability", "type": "quantitative", "title": "System availability",
+                  "scale": {"zero": False}, "axis": {"format": ".3%"}},
+        },
+    }, use_container_width=True)
+
+    with st.expander("Blocks"):
+        nodes = diagram.nodes()
+        st.dataframe(nodes[nodes["type"] != "component"].head(1000), use_container_width=True)
+
+    st.markdown("""
+    ---
+    👤 Developed by **Eng. Mohammed Assaf - CMPR, CEPSS**
+    """)
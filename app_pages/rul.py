@@ -0,0 +1,109 @@
+"""RUL Prediction page."""
+
+import streamlit as st
+
+from app_pages.datasets import dataset, upload_dataset
+from app_pages.instrumentation import cache_data
+from maint_advisor import curves
+
+# Example condition readings shown until a file is uploaded.
+SAMPLE_ASSETS = {
+    "asset": ["P-101A", "P-101B", "C-201", "F-305", "M-410"],
+    "operating_hours": [4_200, 31_500, 18_000, 52_000, 9_800],
+    "vibration_rms": [1.2, 4.6, 2.5, 7.1, 1.9],
+    "bearing_temperature": [58, 78, 66, 92, 61],
+    "health_index": [96, 62, 81, 35, 90],
+}
+MAX_MARKED = 15
+
+
+@st.cache_resource
+def get_rul_predictor():
+    from maint_advisor.rul import RulPredictor
+
+    return RulPredictor()
+
+
+def predict_rul(assets):
+    """The assets with a ``rul_<unit>`` column, shortest remaining life first."""
+    predictor = get_rul_predictor()
+    column = f"rul_{predictor.unit}"
+    results = assets.copy()
+    results[column] = predictor.predict(assets).round(0)
+    return results.sort_values(column, kind="stable")
+
+
+@cache_data(show_spinner="Predicting remaining life...", max_entries=8)
+def uploaded_rul(digest):
+    return predict_rul(dataset(digest))
+
+
+def render():
+    import pandas as pd
+
+    from maint_advisor.rul import timeline_positions
+
+    st.header("⏳ Remaining Useful Life (RUL) Prediction")
+    st.markdown("""
+    At the **P (Prediction)** point of the D-I-P-F curve there is enough condition data to estimate how long an
+    asset has left before it fails. This page runs a machine-learning model (ONNX format) on the latest condition
+    readings of each asset and places it on the curve.
+
+    The bundled model is a **small demonstration model** trained on a synthetic degradation law; it takes
+    operating hours since overhaul, vibration velocity (mm/s RMS), bearing temperature (°C) and a 0–100 health
+    index. Replace `maint_advisor/models/rul_model.onnx` with your own model trained on your failure data for
+    real decisions.
+    """)
+
+    try:
+        predictor = get_rul_predictor()
+    except Exception as exc:
+        st.error(f"Could not load the RUL model: {exc}")
+        return
+
+    upload = st.file_uploader(f"Condition data (CSV or Parquet with columns: {', '.join(predictor.features)})",
+                              type=["csv", "parquet"])
+    try:
+        if upload is not None:
+            try:
+                digest = upload_dataset(upload)
+            except ValueError as exc:
+                st.error(f"Could not read the file: {exc}")
+                return
+            # Predicted once per dataset, not on every rerun of the page.
+            results = uploaded_rul(digest)
+        else:
+            st.caption("No file uploaded: edit the example fleet below.")
+            results = predict_rul(st.data_editor(pd.DataFrame(SAMPLE_ASSETS), num_rows="dynamic",
+                                                 use_container_width=True))
+    except ValueError as exc:
+        st.error(f"Cannot predict: {exc}")
+        return
+
+    st.subheader("📍 Assets on the D-I-P-F Curve")
+    degradation = st.number_input(f"Degradation period: {predictor.unit} from onset to functional failure",
+                                  min_value=100, value=40_000, step=1_000)
+    params = curves.DipfParams()
+    urgent = results.head(MAX_MARKED)
+    labels = urgent["asset"] if "asset" in urgent.columns else urgent.index
+    marks = zip(labels.astype(str), timeline_positions(urgent[f"rul_{predictor.unit}"], degradation, params))
+    st.image(curves.dipf_png(params, marks), use_container_width=True,
+             caption=f"The {len(urgent)} assets with the shortest remaining life"
+                     if len(results) > MAX_MARKED else "Predicted position of each asset")
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Assets", f"{len(results):,}")
+    col2.metric(f"Failing within {degradation:,} {predictor.unit}",
+                f"{(results[f'rul_{predictor.unit}'] < degradation).sum():,}")
+    col3.metric("Shortest RUL", f"{results[f'rul_{predictor.unit}'].min():,.0f} {predictor.unit}"
+                if len(results) else "–")
+    st.dataframe(results.head(1000), use_container_width=True)
+    # Written when the button is clicked, not on every rerun.
+    st.download_button("⬇️ Download RUL Predictions (CSV)", lambda: results.to_csv(index=False),
+                       file_name="rul_predictions.csv", mime="text/csv")
+    st.caption(f"Shared ONNX Runtime session: {predictor.batches:,} batched runs for {predictor.rows:,} rows "
+               "across all sessions.")
+
+    st.markdown("""
+    ---
+    👤 Developed by **Eng. Mohammed Assaf - CMPR, CEPSS**
+    """)
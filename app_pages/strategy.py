@@ -0,0 +1,135 @@
+"""Strategy Recommendation Tool page."""
+
+import streamlit as st
+
+from app_pages.datasets import dataset, upload_dataset
+from app_pages.jobs import dataset_path, run_job
+from maint_advisor import jobs
+from maint_advisor.recommendation import recommend
+
+
+def fleet_recommendations(digest):
+    import pandas as pd
+
+    # Only the new columns come from the job; the register itself is read from its shared mapping.
+    recommendations = run_job("Applying strategy rules to the asset register", jobs.fleet_recommendations,
+                              dataset_path(digest))
+    if recommendations is None:
+        return None
+    return pd.concat([dataset(digest), recommendations], axis=1)
+
+
+def render():
+    st.header("🧩 Maintenance Strategy Selector")
+    st.markdown("""
+    Answer the following questions to get a strategy recommendation based on asset criticality, cost, and environment.
+    """)
+
+    criticality = st.selectbox("1️⃣ Asset Criticality", ["High", "Medium", "Low"],
+        help="**Definition**: Importance of the asset to safety, production, or legal compliance.\n- High: Generator, main transformer, turbine\n- Medium: HVAC motor, feedwater pump, coolling fan\n- Low: Lights, admin printers")
+
+    environment = st.selectbox("2️⃣ Operating Environment", ["Harsh", "Normal", "Clean"],
+        help="**Definition**: Physical conditions around the asset.\n- Harsh: Heat, vibration, dust, chemicals\n- Clean: Lab or server room\n- Normal: Typical plant conditions")
+
+    failure_history = st.selectbox("3️⃣ Failure History", ["Frequent", "Occasional", "Rare"],
+        help="**Definition**: How often this asset fails.\nUse historical CMMS data if available.")
+
+    maintenance_cost = st.selectbox("4️⃣ Maintenance Cost", ["High", "Medium", "Low"],
+        help="**Definition**: Cost to repair, including labor, tools, spares, downtime.")
+
+    downtime_cost = st.selectbox("5️⃣ Downtime Cost", ["High", "Medium", "Low"],
+        help="**Definition**: Cost of system unavailability in terms of production, safety, or compliance.")
+
+    recommendation, reason, examples = recommend(
+        criticality, environment, failure_history, maintenance_cost, downtime_cost)
+
+    st.success(f"Recommended Strategy: **{recommendation}**")
+    st.markdown(f"**Why:** {reason}")
+    st.markdown(f"**Examples:** {examples}")
+
+    st.subheader("💰 Check the Recommendation with a Cost Simulation")
+    st.markdown("""
+    Simulate run-to-failure, time-based, condition-based and RCM-style policies for a fleet of identical
+    assets (Monte Carlo, Weibull failures, repairs restore the asset as good as new) and compare the
+    expected cost and availability. Times are in operating hours.
+    """)
+    with st.form("simulation_form"):
+        col1, col2, col3 = st.columns(3)
+        beta = col1.number_input("Weibull shape β", 0.3, 10.0, 2.5, 0.1)
+        eta = col1.number_input("Weibull scale η (h)", 100.0, 500_000.0, 20_000.0, 1_000.0)
+        repair_hours = col1.number_input("Repair time after failure (h)", 0.0, 5_000.0, 48.0)
+        corrective_cost = col1.number_input("Corrective repair cost", 0.0, value=15_000.0, step=1_000.0)
+        pm_hours = col2.number_input("Planned action duration (h)", 0.0, 5_000.0, 8.0)
+        pm_cost = col2.number_input("Planned action cost", 0.0, value=3_000.0, step=500.0)
+        pm_interval = col2.number_input("PM / overhaul interval (h)", 100.0, 500_000.0, 12_000.0, 500.0)
+        downtime_cost_per_hour = col2.number_input("Downtime cost per hour", 0.0, value=500.0, step=50.0)
+        inspection_interval = col3.number_input("Inspection interval (h)", 1.0, 50_000.0, 720.0, 24.0)
+        inspection_cost = col3.number_input("Inspection cost", 0.0, value=150.0, step=10.0)
+        detection_probability = col3.slider("CBM detection probability", 0.0, 1.0, 0.8, 0.05)
+        pf_interval = col3.number_input("P-F interval (h)", 0.0, 50_000.0, 2_000.0, 100.0)
+        col1, col2, col3 = st.columns(3)
+        fleet_size = col1.number_input("Assets in the fleet", 1, 100_000, 100)
+        horizon_years = col2.number_input("Horizon (years)", 1, 50, 10)
+        replications = col3.number_input("Replications", 1, 1_000, 100)
+        simulate = st.form_submit_button("▶️ Run Simulation")
+
+    if simulate:
+        from maint_advisor.simulation import SimulationInputs
+
+        inputs = SimulationInputs(beta, eta, repair_hours, corrective_cost, pm_hours, pm_cost, pm_interval,
+                                  inspection_interval, inspection_cost, detection_probability, pf_interval,
+                                  downtime_cost_per_hour)
+        # Kept until the next submit, so the running job and its result survive other widget changes.
+        st.session_state.simulation_request = (inputs, fleet_size, horizon_years, replications)
+    if "simulation_request" in st.session_state:
+        inputs, fleet_size, horizon_years, replications = st.session_state.simulation_request
+        try:
+            results = run_job("Simulating maintenance policies", jobs.policy_simulation, inputs, fleet_size,
+                              horizon_years, replications)
+        except ValueError as exc:
+            st.error(f"Could not run the simulation: {exc}")
+            results = None
+        if results is not None:
+            from maint_advisor.simulation import simulated_policy
+
+            cheapest = results.index[0]
+            st.dataframe(results.style.format({
+                "cost_per_asset_year": "{:,.0f}", "cost_std_error": "{:,.0f}", "fleet_cost": "{:,.0f}",
+                "availability": "{:.4%}", "failures_per_asset_year": "{:.3f}",
+                "planned_per_asset_year": "{:.3f}", "inspections_per_asset_year": "{:.1f}",
+            }), use_container_width=True)
+            st.caption(f"{fleet_size * replications * horizon_years:,} asset-years simulated per policy.")
+            # Scheduled PM has no policy of its own; it is simulated as time-based replacement.
+            simulated = simulated_policy(recommendation)
+            if simulated != recommendation:
+                st.caption(f"{recommendation} is simulated as {simulated}.")
+            if cheapest == simulated:
+                st.success(f"The simulation agrees: **{cheapest}** has the lowest expected cost.")
+            else:
+                st.warning(f"Lowest expected cost with these assumptions: **{cheapest}** "
+                           f"(the rules suggest {recommendation}).")
+
+    st.subheader("📦 Fleet Mode: Upload an Asset Register")
+    st.markdown("""
+    Upload a **CSV** or **Parquet** file with one row per asset and the columns
+    `criticality`, `environment`, `failure_history`, `maintenance_cost` and `downtime_cost`,
+    using the same values as the selectors above. The same rules are applied to every asset.
+    """)
+    register_file = st.file_uploader("Asset register", type=["csv", "parquet"])
+    if register_file is not None:
+        try:
+            fleet = fleet_recommendations(upload_dataset(register_file))
+        except ValueError as exc:
+            st.error(f"Could not process the asset register: {exc}")
+            fleet = None
+        if fleet is not None:
+            st.success(f"Recommendations computed for **{len(fleet):,}** assets.")
+            st.dataframe(fleet["recommendation"].value_counts().rename("Assets"), use_container_width=True)
+            st.dataframe(fleet.head(1000), use_container_width=True)
+            st.download_button("⬇️ Download Recommendations (CSV)", fleet.to_csv(index=False),
+                               file_name="fleet_recommendations.csv", mime="text/csv")
+
+    st.markdown("""
+    ---
+    👤 Developed by **Eng. Mohammed Assaf - CMPR, CEPSS**
+    """)
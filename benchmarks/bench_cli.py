@@ -0,0 +1,100 @@
+"""Benchmark for the ``maint-advisor`` command line.
+
+* startup: median wall time of ``python -m maint_advisor --help`` over a
+  few runs, and a check that neither pandas nor NumPy is imported on that
+  path (budget: 150 ms);
+* streaming: ``recommend`` on synthetic asset registers of two sizes, with
+  one worker and with one per core, reporting rows/s and the peak RSS of
+  the command. Peak memory should stay flat as the input grows.
+
+Run from the repository root::
+
+    python benchmarks/bench_cli.py [rows]
+"""
+
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from maint_advisor.recommendation import FACTORS  # noqa: E402
+
+STARTUP_BUDGET_MS = 150
+ENV = dict(os.environ, PYTHONPATH=ROOT)
+
+
+def cli(*args):
+    return subprocess.run([sys.executable, "-m", "maint_advisor", *args], env=ENV, check=True,
+                          capture_output=True)
+
+
+def startup(runs=7):
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        cli("--help")
+        times.append((time.perf_counter() - start) * 1e3)
+    probe = subprocess.run(
+        [sys.executable, "-c",
+         "import sys; from maint_advisor.cli import build_parser; build_parser(); "
+         "print(','.join(m for m in ('pandas', 'numpy', 'pyarrow') if m in sys.modules))"],
+        env=ENV, check=True, capture_output=True, text=True)
+    return statistics.median(times), probe.stdout.strip()
+
+
+def write_register(path, rows, seed=0, block=1_000_000):
+    rng = np.random.default_rng(seed)
+    for start in range(0, rows, block):
+        n = min(block, rows - start)
+        chunk = pd.DataFrame({
+            "asset": np.char.add("A", np.arange(start, start + n).astype(str)),
+            **{name: rng.choice(levels, n) for name, levels in FACTORS.items()},
+        })
+        chunk.to_csv(path, mode="a", header=start == 0, index=False)
+
+
+def peak_rss_run(*args):
+    """Run the CLI and return (seconds, peak RSS in MB of the command and its workers).
+
+    The command runs under a fresh wrapper process, so the RUSAGE_CHILDREN
+    high-water mark covers this run only.
+    """
+    wrapper = ("import resource, subprocess, sys; "
+               "subprocess.run(sys.argv[1:], check=True, stdout=subprocess.DEVNULL); "
+               "print(resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)")
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, "-c", wrapper, sys.executable, "-m", "maint_advisor", *args],
+                            env=ENV, check=True, capture_output=True, text=True)
+    return time.perf_counter() - start, int(result.stdout) / 1024
+
+
+def main():
+    rows = int(float(sys.argv[1])) if len(sys.argv) > 1 else 2_000_000
+    median, heavy = startup()
+    print(f"--help: median {median:.0f} ms (budget {STARTUP_BUDGET_MS} ms), "
+          f"heavy modules imported: {heavy or 'none'}")
+    assert not heavy, f"--help imports {heavy}"
+
+    with tempfile.TemporaryDirectory() as workdir:
+        for n in (rows // 4, rows):
+            path = os.path.join(workdir, f"register_{n}.csv")
+            write_register(path, n)
+            for workers in sorted({1, os.cpu_count()}):
+                out = os.path.join(workdir, "out.csv")
+                elapsed, peak = peak_rss_run("recommend", path, "-o", out, "--workers", str(workers))
+                print(f"{n:>10,} rows, {workers} worker(s): {elapsed:6.2f} s, {n / elapsed / 1e3:7.0f} k rows/s, "
+                      f"peak RSS {peak:5.0f} MB")
+    if median > STARTUP_BUDGET_MS:
+        sys.exit(f"--help took {median:.0f} ms, over the {STARTUP_BUDGET_MS} ms budget")
+
+
+if __name__ == "__main__":
+    main()
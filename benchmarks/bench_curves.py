@@ -0,0 +1,72 @@
+"""Render latency of the parametric curves.
+
+For both curves, draws a sweep of distinct parameter tuples (cache misses)
+and then requests them again (cache hits). Also renders a few hundred more
+figures to check that no figure stays registered with pyplot and that
+memory does not keep growing.
+
+Run from the repository root::
+
+    python benchmarks/bench_curves.py [renders]
+"""
+
+import os
+import resource
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from maint_advisor import curves  # noqa: E402
+
+
+def bathtub_sweep(n):
+    return [curves.BathtubParams(infant_end=1.0 + i * 0.01) for i in range(n)]
+
+
+def dipf_sweep(n):
+    return [curves.DipfParams(shape=1.0 + i * 0.01) for i in range(n)]
+
+
+def timed(render, params):
+    start = time.perf_counter()
+    for p in params:
+        render(p)
+    return (time.perf_counter() - start) / len(params)
+
+
+def max_rss_mb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def main():
+    renders = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    import matplotlib._pylab_helpers
+
+    # Warm up imports and fonts so the first miss is not an outlier.
+    curves.bathtub_png(curves.BathtubParams(infant_end=0.5))
+    curves.dipf_png(curves.DipfParams(shape=0.5))
+    print(f"{'curve':8} {'miss ms':>9} {'hit us':>8}  PNG KB")
+    for name, render, sweep in (("bathtub", curves.bathtub_png, bathtub_sweep),
+                                ("dipf", curves.dipf_png, dipf_sweep)):
+        params = sweep(min(renders, curves.RENDER_CACHE_SIZE - 1))
+        miss = timed(render, params)
+        hit = timed(render, params * 20)
+        size = len(render(params[0])) / 1024
+        print(f"{name:8} {miss * 1e3:9.1f} {hit * 1e6:8.2f}  {size:6.0f}")
+    print(curves.cache_info())
+
+    # Long-running server: renders far beyond the cache size must not leak.
+    rss = []
+    for round_ in range(3):
+        for i in range(curves.RENDER_CACHE_SIZE):
+            curves.bathtub_png(curves.BathtubParams(wearout_beta=2.0 + round_ + i / 1000))
+        rss.append(max_rss_mb())
+    print(f"open pyplot figures: {matplotlib._pylab_helpers.Gcf.get_num_fig_managers()}; "
+          f"max RSS after each {curves.RENDER_CACHE_SIZE} renders: "
+          + ", ".join(f"{mb:.0f} MB" for mb in rss))
+
+
+if __name__ == "__main__":
+    main()
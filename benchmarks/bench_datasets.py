@@ -0,0 +1,169 @@
+"""Benchmark for the shared dataset store.
+
+Writes a synthetic asset register of about ``size_mb`` MB (default 2048) as
+Parquet, stores it once, then has 50 simulated sessions (threads) open it
+from the store and aggregate it while holding on to their DataFrames. The
+growth of the process's anonymous memory is compared with one session's
+private pandas copy of the same file, which is what every session would
+hold without the store. Budgets: storing the file grows anonymous memory by
+at most ``PUT_BUDGET_MB`` whatever its size, and the 50 sessions together
+stay under 10% of the size of one copy. Linux only (reads
+/proc/self/status).
+
+Run from the repository root::
+
+    python benchmarks/bench_datasets.py [size_mb] [sessions]
+"""
+
+import ctypes
+import gc
+import os
+import sys
+import tempfile
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from maint_advisor.datasets import DatasetStore  # noqa: E402
+from maint_advisor.metrics import memory_breakdown  # noqa: E402
+from maint_advisor.recommendation import FACTORS  # noqa: E402
+
+SHARED_BUDGET = 0.10
+PUT_BUDGET_MB = 512
+BLOCK_ROWS = 1_000_000
+# Approximate Arrow bytes per row of the register below.
+ROW_BYTES = 80
+
+
+def write_register(path, rows, seed=0):
+    """A Parquet asset register: an id, the recommendation factors and four numeric columns."""
+    rng = np.random.default_rng(seed)
+    writer = None
+    for offset in range(0, rows, BLOCK_ROWS):
+        n = min(BLOCK_ROWS, rows - offset)
+        columns = {"asset": pa.array(np.char.add("A", np.arange(offset, offset + n).astype(str)))}
+        for name, levels in FACTORS.items():
+            columns[name] = pa.DictionaryArray.from_arrays(
+                pa.array(rng.integers(0, len(levels), n, dtype=np.int32)), pa.array(levels)).cast(pa.string())
+        columns["age_years"] = pa.array(rng.uniform(0, 40, n))
+        columns["mtbf_hours"] = pa.array(rng.gamma(2.0, 4_000.0, n))
+        columns["repair_cost"] = pa.array(rng.gamma(2.0, 500.0, n))
+        columns["criticality_score"] = pa.array(rng.uniform(0, 10, n))
+        table = pa.table(columns)
+        if writer is None:
+            writer = pq.ParquetWriter(path, table.schema, compression="snappy")
+        writer.write_table(table)
+    writer.close()
+
+
+def timed(function, *args):
+    start = time.perf_counter()
+    function(*args)
+    return time.perf_counter() - start
+
+
+def allocated():
+    """Anonymous memory of the process and the memory Arrow has allocated, after returning freed memory.
+
+    Freed scratch memory (kept by Arrow's pool and glibc's per-thread
+    arenas) is given back first, so the numbers are what is still held.
+    """
+    gc.collect()
+    pa.default_memory_pool().release_unused()
+    try:
+        ctypes.CDLL("libc.so.6").malloc_trim(0)
+    except (OSError, AttributeError):
+        pass
+    return memory_breakdown()["anonymous"], pa.total_allocated_bytes()
+
+
+def peak_anonymous(function, *args, interval=0.01):
+    """Run ``function`` and return its result and the highest anonymous memory seen meanwhile."""
+    peak = [memory_breakdown()["anonymous"]]
+    done = threading.Event()
+
+    def sample():
+        while not done.wait(interval):
+            peak[0] = max(peak[0], memory_breakdown()["anonymous"])
+
+    sampler = threading.Thread(target=sample)
+    sampler.start()
+    try:
+        return function(*args), peak[0]
+    finally:
+        done.set()
+        sampler.join()
+
+
+def main():
+    size_mb = float(sys.argv[1]) if len(sys.argv) > 1 else 2048
+    sessions = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    if memory_breakdown() is None:
+        sys.exit("needs /proc/self/status (Linux)")
+    rows = int(size_mb * 2 ** 20 / ROW_BYTES)
+    with tempfile.TemporaryDirectory() as tmp:
+        source = os.path.join(tmp, "register.parquet")
+        start = time.perf_counter()
+        write_register(source, rows)
+        print(f"register: {rows:,} rows, {os.path.getsize(source) / 2 ** 20:,.0f} MB Parquet "
+              f"(written in {time.perf_counter() - start:.1f} s)")
+
+        store = DatasetStore(os.path.join(tmp, "store"), budget_bytes=4 * size_mb * 2 ** 20)
+        before = allocated()[0]
+        start = time.perf_counter()
+        digest, peak = peak_anonymous(store.put, source, "register.parquet")
+        put_bytes = peak - before
+        stored = store.total_bytes
+        print(f"store: {stored / 2 ** 20:,.0f} MB Arrow IPC in {time.perf_counter() - start:.1f} s, "
+              f"peak {put_bytes / 2 ** 20:,.0f} MB anonymous (budget {PUT_BUDGET_MB} MB); "
+              f"again (hash only) in {timed(store.put, source, 'register.parquet'):.2f} s")
+        if put_bytes > PUT_BUDGET_MB * 2 ** 20:
+            sys.exit(f"storing the register grew anonymous memory by {put_bytes / 2 ** 20:,.0f} MB, over the "
+                     f"{PUT_BUDGET_MB} MB budget")
+
+        frames = [None] * sessions
+        barrier = threading.Barrier(sessions)
+
+        def session(index):
+            barrier.wait()
+            frame = store.frame(digest)
+            frame["repair_cost"].sum(), frame["criticality"].value_counts()
+            frames[index] = frame
+
+        before = allocated()
+        start = time.perf_counter()
+        threads = [threading.Thread(target=session, args=(i,)) for i in range(sessions)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+        after = allocated()
+        shared_bytes = max(after[0] - before[0], after[1] - before[1])
+        memory = memory_breakdown()
+        print(f"{sessions} sessions on the store: {shared_bytes / 2 ** 20:,.1f} MB anonymous, "
+              f"{memory['file'] / 2 ** 20:,.0f} MB file-backed (shared), {elapsed:.2f} s; "
+              f"{store.hits:,} hits, {store.misses:,} misses")
+        if any(frame is None or len(frame) != rows for frame in frames):
+            sys.exit("a session did not get the whole register")
+        del frames
+
+        copy = pd.read_parquet(source)
+        copy_bytes = int(copy.memory_usage(deep=True).sum())
+        del copy
+        print(f"one private pandas copy: {copy_bytes / 2 ** 20:,.0f} MB "
+              f"(x{sessions} sessions = {copy_bytes * sessions / 2 ** 30:,.1f} GB)")
+        if shared_bytes > SHARED_BUDGET * copy_bytes:
+            sys.exit(f"{sessions} sessions grew anonymous memory by {shared_bytes / 2 ** 20:,.0f} MB, over "
+                     f"{SHARED_BUDGET:.0%} of one private copy ({copy_bytes / 2 ** 20:,.0f} MB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""Benchmark for the batch DGA interpretation.
+
+Builds a synthetic survey (quarterly samples of many transformers), checks
+the vectorized Duval Triangle 1 zones against a per-row reference on a
+subset, then times the classification of all samples, the gas generation
+rates and the per-transformer strategy recommendation.
+
+Run from the repository root::
+
+    python benchmarks/bench_dga.py [samples]
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from maint_advisor.dga import DUVAL_ZONES, GASES, classify_samples, duval_triangle1, transformer_failure_history  # noqa: E402
+from maint_advisor.recommendation import recommend_fleet  # noqa: E402
+
+
+def duval_zone_row(ch4, c2h4, c2h2):
+    """Per-row Duval Triangle 1, straight from the zone table."""
+    total = ch4 + c2h4 + c2h2
+    if total <= 0:
+        return None
+    ch4, c2h4, c2h2 = (100 * g / total for g in (ch4, c2h4, c2h2))
+    if ch4 >= 98:
+        return "PD"
+    if c2h4 < 23 and c2h2 > 13:
+        return "D1"
+    if (c2h4 >= 23 and c2h2 >= 29) or (23 <= c2h4 <= 40 and 13 <= c2h2 <= 29):
+        return "D2"
+    if c2h4 < 20 and c2h2 < 4:
+        return "T1"
+    if 20 <= c2h4 <= 50 and c2h2 < 4:
+        return "T2"
+    if c2h4 > 50 and c2h2 < 15:
+        return "T3"
+    return "DT"
+
+
+def survey(samples, per_transformer=4, seed=0):
+    rng = np.random.default_rng(seed)
+    transformers = max(1, samples // per_transformer)
+    data = pd.DataFrame({
+        "transformer": np.char.add("TR", rng.integers(0, transformers, samples).astype(str)),
+        "sample_date": pd.Timestamp("2022-01-01") + pd.to_timedelta(rng.integers(0, 4 * 365, samples), unit="D"),
+        "criticality": rng.choice(["High", "Medium", "Low"], samples),
+        "environment": "Normal",
+        "maintenance_cost": "Medium",
+        "downtime_cost": "High",
+    })
+    for gas in GASES:
+        data[gas] = rng.lognormal(3.0, 1.5, samples).round(1)
+    return data
+
+
+def main():
+    samples = int(float(sys.argv[1])) if len(sys.argv) > 1 else 1_000_000
+    data = survey(samples)
+
+    subset = data.head(20_000)
+    start = time.perf_counter()
+    expected = [duval_zone_row(*row) for row in subset[["ch4", "c2h4", "c2h2"]].itertuples(index=False)]
+    row_time = time.perf_counter() - start
+    codes = duval_triangle1(subset["ch4"], subset["c2h4"], subset["c2h2"])
+    assert [DUVAL_ZONES[c] if c >= 0 else None for c in codes] == expected
+    print(f"Duval zones match the per-row reference ({row_time / len(subset) * 1e6:.1f} us/row in Python)")
+
+    start = time.perf_counter()
+    results = classify_samples(data)
+    classified = time.perf_counter() - start
+    start = time.perf_counter()
+    latest = transformer_failure_history(results)
+    fleet = recommend_fleet(latest)
+    recommended = time.perf_counter() - start
+    print(f"{samples:,} samples classified (Duval, Rogers, IEC, gas rates) in {classified:.2f} s "
+          f"({samples / classified / 1e6:.2f} M samples/s)")
+    print(f"{len(latest):,} transformers summarized and recommended in {recommended:.2f} s")
+    print(results["duval"].value_counts().to_string())
+    print(fleet["recommendation"].value_counts().to_string())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""Benchmark for the vectorized fleet recommendation.
+
+Checks that ``recommend_fleet`` agrees with the single-asset rule chain for
+all 243 input combinations and a random register, then times it against a
+per-row Python loop.
+
+Run from the repository root::
+
+    python benchmarks/bench_fleet_recommendation.py [rows]
+"""
+
+import itertools
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from maint_advisor.recommendation import FACTORS, recommend, recommend_fleet  # noqa: E402
+
+
+def random_register(rows, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        name: np.asarray(levels, dtype=object)[rng.integers(0, len(levels), rows)]
+        for name, levels in FACTORS.items()
+    })
+
+
+def per_row(register):
+    return [recommend(*row)[0] for row in register[list(FACTORS)].itertuples(index=False)]
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+
+    combos = pd.DataFrame(list(itertools.product(*FACTORS.values())), columns=list(FACTORS))
+    assert (recommend_fleet(combos)["recommendation"].astype(str).tolist() == per_row(combos))
+    print(f"all {len(combos)} combinations match the interactive rule chain")
+
+    register = random_register(rows)
+    start = time.perf_counter()
+    result = recommend_fleet(register)
+    vectorized = time.perf_counter() - start
+    print(f"recommend_fleet: {rows:,} rows in {vectorized:.3f} s "
+          f"({rows / vectorized / 1e6:.2f} M rows/s)")
+
+    sample = register.iloc[:50_000]
+    start = time.perf_counter()
+    expected = per_row(sample)
+    loop = time.perf_counter() - start
+    assert result["recommendation"].iloc[:len(sample)].astype(str).tolist() == expected
+    print(f"per-row loop: {len(sample):,} rows in {loop:.3f} s "
+          f"(~{loop / len(sample) * rows:.1f} s extrapolated to {rows:,} rows)")
+
+
+if __name__ == "__main__":
+    main()
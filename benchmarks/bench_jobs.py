@@ -0,0 +1,90 @@
+"""Benchmark for the background job runner.
+
+With ``workers`` workers (default 2) and one running job per session:
+
+* 50 sessions submit the same policy simulation; it must run once;
+* a session queues 4 jobs of 1 s, then 3 other sessions one each; every
+  other session's job must start before the first session's second one;
+* polling a running job (``status``) must take under 1 ms (budget), as
+  every open page polls once a second;
+* cancelling a running simulation must stop it within 1 s.
+
+Run from the repository root::
+
+    python benchmarks/bench_jobs.py [workers]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from maint_advisor import jobs  # noqa: E402
+from maint_advisor.jobs import JobRunner  # noqa: E402
+from maint_advisor.simulation import SimulationInputs  # noqa: E402
+
+POLL_BUDGET_MS = 1.0
+CANCEL_BUDGET_S = 1.0
+
+
+def sleeping_job(progress, seconds, tag):
+    steps = 20
+    for step in range(steps):
+        time.sleep(seconds / steps)
+        progress((step + 1) / steps, f"{tag}: step {step + 1} of {steps}")
+    return tag
+
+
+def main():
+    workers = int(sys.argv[1]) if len(sys.argv) > 1 else 2
+    failures = []
+    with tempfile.TemporaryDirectory() as tmp:
+        runner = JobRunner(tmp, workers=workers, per_owner=1, max_queued=4)
+
+        request = (SimulationInputs(), 200, 10, 100)
+        start = time.perf_counter()
+        ids = {runner.submit(jobs.policy_simulation, *request, owner=f"session {i}") for i in range(50)}
+        runner.wait(ids.pop())
+        print(f"50 identical requests: {runner.executed} run, {runner.deduplicated} shared, "
+              f"{time.perf_counter() - start:.2f} s (includes starting the workers)")
+        if ids or runner.executed != 1:
+            failures.append("identical requests were not deduplicated")
+
+        greedy = [runner.submit(sleeping_job, 1.0, f"greedy {i}", owner="greedy") for i in range(4)]
+        others = [runner.submit(sleeping_job, 1.0, f"other {i}", owner=f"other {i}") for i in range(3)]
+        time.sleep(0.5)
+        polls = 2000
+        start = time.perf_counter()
+        for _ in range(polls):
+            runner.status(greedy[0])
+        poll_ms = (time.perf_counter() - start) / polls * 1e3
+        for id in greedy + others:
+            runner.wait(id)
+        order = [runner.status(id).args[1] for id in sorted(greedy + others, key=lambda i: runner.status(i).started)]
+        print(f"start order: {', '.join(order)}")
+        print(f"status poll of a running job: {poll_ms * 1e3:.0f} µs (budget {POLL_BUDGET_MS:.0f} ms)")
+        if max(runner.status(id).started for id in others) > runner.status(greedy[1]).started:
+            failures.append("a session waited behind the second job of a session with more jobs")
+        if poll_ms > POLL_BUDGET_MS:
+            failures.append(f"polling took {poll_ms:.2f} ms, over the {POLL_BUDGET_MS:.0f} ms budget")
+
+        long = runner.submit(jobs.policy_simulation, SimulationInputs(), 1000, 20, 500, owner="greedy")
+        while runner.status(long).progress < 0.05:
+            time.sleep(0.05)
+        start = time.perf_counter()
+        runner.cancel(long)
+        job = runner.wait(long, timeout=60)
+        cancel_s = time.perf_counter() - start
+        print(f"cancel a running simulation at {job.progress:.0%}: {job.state} after {cancel_s:.2f} s")
+        if job.state != jobs.CANCELLED or cancel_s > CANCEL_BUDGET_S:
+            failures.append(f"cancelling took {cancel_s:.2f} s, over the {CANCEL_BUDGET_S:.0f} s budget")
+        runner.shutdown()
+    if failures:
+        sys.exit("; ".join(failures))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""Benchmark for the rolling KPI trend store.
+
+Builds an event log of ``events`` work orders (default 10M) spread over
+200 days and 20,000 assets, folds it, then times the daily refresh: one
+more day of 50,000 work orders appended and folded (budget: 10 s), the
+per-asset 30/90/365-day table and the fleet trend.
+
+Run from the repository root::
+
+    python benchmarks/bench_kpi_trends.py [events] [new_per_day]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from maint_advisor.kpi_trends import KpiTrendStore  # noqa: E402
+
+REFRESH_BUDGET_S = 10.0
+ASSETS = 20_000
+DAYS = 200
+CLASSES = np.array(["Pump", "Motor", "Compressor", "Fan", "Transformer"])
+EPOCH = pd.Timestamp("2024-01-01").value // 10 ** 9
+
+
+def work_orders(rng, n, first_day, days):
+    asset = rng.integers(0, ASSETS, n)
+    start = EPOCH + (first_day + rng.random(n) * days) * 86_400
+    restore = start + rng.exponential(6 * 3600, n)
+    due = np.where(rng.random(n) < 0.3, start + rng.uniform(0, 2 * 86_400, n), np.nan)
+    cost = rng.gamma(2.0, 500.0, n)
+    return pd.DataFrame({
+        "asset": np.char.add("A", asset.astype(str)),
+        "asset_class": CLASSES[asset % len(CLASSES)],
+        "failure_start": pd.to_datetime(start, unit="s"),
+        "restore_time": pd.to_datetime(np.where(rng.random(n) < 0.98, restore, np.nan), unit="s"),
+        "due_date": pd.to_datetime(due, unit="s"),
+        "cost": cost,
+        "budget": cost * rng.uniform(0.8, 1.2, n),
+    })
+
+
+def timed(function, *args, **kwargs):
+    start = time.perf_counter()
+    result = function(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def main():
+    events = int(float(sys.argv[1])) if len(sys.argv) > 1 else 10_000_000
+    per_day = int(float(sys.argv[2])) if len(sys.argv) > 2 else 50_000
+    rng = np.random.default_rng(0)
+    with tempfile.TemporaryDirectory() as workdir:
+        store = KpiTrendStore(os.path.join(workdir, "events.db"))
+        start = time.perf_counter()
+        block = 1_000_000
+        for offset in range(0, events, block):
+            n = min(block, events - offset)
+            store.append(work_orders(rng, n, offset / events * DAYS, n / events * DAYS))
+        appended = time.perf_counter() - start
+        folded, fold_s = timed(store.fold)
+        print(f"history: {events:,} events appended in {appended:.1f} s, first fold {fold_s:.1f} s "
+              f"({folded / fold_s / 1e3:.0f} k events/s)")
+
+        new_day = work_orders(rng, per_day, DAYS, 1)
+        _, append_s = timed(store.append, new_day, digest="day-201")
+        folded, fold_s = timed(store.fold)
+        refresh = append_s + fold_s
+        table, current_s = timed(store.current)
+        trend, trend_s = timed(store.trend)
+        size = sum(os.path.getsize(os.path.join(workdir, f)) for f in os.listdir(workdir)) / 2 ** 20
+        print(f"daily refresh: {folded:,} events, append {append_s:.2f} s + fold {fold_s:.2f} s = {refresh:.2f} s "
+              f"(budget {REFRESH_BUDGET_S:.0f} s)")
+        print(f"per-asset table: {len(table):,} rows in {current_s:.2f} s; "
+              f"fleet trend: {len(trend):,} rows in {trend_s:.2f} s; database {size:,.0f} MB")
+        store.close()
+    if refresh > REFRESH_BUDGET_S:
+        sys.exit(f"daily refresh took {refresh:.1f} s, over the {REFRESH_BUDGET_S:.0f} s budget")
+
+
+if __name__ == "__main__":
+    main()
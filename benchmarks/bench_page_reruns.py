@@ -0,0 +1,66 @@
+"""Per-page rerun cost of the Streamlit app.
+
+Each sidebar topic is selected once through ``streamlit.testing`` and then
+rerun repeatedly, as happens on every widget change. Reports CPU time per
+rerun and the memory allocated per rerun (tracemalloc peak).
+
+Run from the repository root::
+
+    python benchmarks/bench_page_reruns.py [reruns]
+"""
+
+import logging
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP = os.path.join(ROOT, "Maintenace_strategy_APP1.py")
+
+
+def measure_page(at, topic, reruns):
+    """Return (CPU seconds, peak traced bytes) per rerun of ``topic``.
+
+    CPU time and allocations are measured in separate passes because
+    tracemalloc itself inflates CPU time several times over.
+    """
+    at.sidebar.radio[0].set_value(topic).run()
+    start = time.process_time()
+    for _ in range(reruns):
+        at.run()
+    cpu = (time.process_time() - start) / reruns
+    peaks = []
+    for _ in range(reruns):
+        tracemalloc.start()
+        at.run()
+        peaks.append(tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+    assert not at.exception, at.exception
+    return cpu, sum(peaks) / len(peaks)
+
+
+def main():
+    reruns = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    logging.disable(logging.WARNING)
+    from streamlit.testing.v1 import AppTest
+
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as workdir:
+        # The app keeps its databases in the working directory; run in a
+        # scratch directory so the real visit counter is not touched.
+        os.chdir(workdir)
+        try:
+            at = AppTest.from_file(APP, default_timeout=60)
+            at.run()
+            print(f"{'page':34} {'CPU ms/rerun':>13} {'alloc KB/rerun':>15}")
+            for topic in at.sidebar.radio[0].options:
+                cpu, peak = measure_page(at, topic, reruns)
+                print(f"{topic:34} {cpu * 1e3:13.2f} {peak / 1024:15.0f}")
+        finally:
+            os.chdir(cwd)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Cold-start cost of each page.
+
+Every measurement runs in a fresh interpreter so module caches are empty:
+
+* import time of the page module after Streamlit itself is loaded, and which
+  heavy libraries that import pulls in;
+* time to first paint: wall time of the first ``AppTest`` run with the topic
+  already selected, which includes the visit counter, the page import and
+  rendering.
+
+Run from the repository root::
+
+    python benchmarks/bench_page_startup.py
+"""
+
+import json
+import logging
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP = os.path.join(ROOT, "Maintenace_strategy_APP1.py")
+HEAVY = ("pandas", "numpy", "pyarrow", "PIL", "matplotlib", "onnxruntime")
+
+
+def child(mode, topic):
+    sys.path.insert(0, ROOT)
+    logging.disable(logging.WARNING)
+    import importlib
+
+    import streamlit  # noqa: F401
+    from streamlit.testing.v1 import AppTest
+
+    from app_pages import PAGES
+
+    if mode == "import":
+        loaded = set(sys.modules)
+        start = time.perf_counter()
+        importlib.import_module(PAGES[topic])
+        elapsed = time.perf_counter() - start
+        heavy = sorted(m for m in HEAVY if m in sys.modules and m not in loaded)
+        print(json.dumps({"import": elapsed, "heavy": heavy}))
+    else:
+        at = AppTest.from_file(APP, default_timeout=120)
+        at.session_state["topic"] = topic
+        start = time.perf_counter()
+        at.run()
+        elapsed = time.perf_counter() - start
+        assert not at.exception, at.exception
+        print(json.dumps({"first_paint": elapsed}))
+
+
+def _run_child(mode, topic, cwd):
+    out = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--child", mode, topic],
+        cwd=cwd, capture_output=True, text=True, check=True,
+    ).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main():
+    sys.path.insert(0, ROOT)
+    from app_pages import PAGES
+
+    print(f"{'page':34} {'import ms':>10} {'first paint ms':>15}  heavy imports")
+    with tempfile.TemporaryDirectory() as workdir:
+        # The app keeps its databases in the working directory.
+        for topic in PAGES:
+            result = _run_child("import", topic, workdir)
+            result.update(_run_child("paint", topic, workdir))
+            print(f"{topic:34} {result['import'] * 1e3:10.1f} {result['first_paint'] * 1e3:15.1f}  "
+                  f"{', '.join(result['heavy']) or '-'}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 3 and sys.argv[1] == "--child":
+        child(sys.argv[2], sys.argv[3])
+    else:
+        main()
@@ -0,0 +1,65 @@
+"""Benchmark for the optimal replacement-interval calculator.
+
+Checks a few age-replacement optima against a dense brute-force search,
+then times the renewal-function table (built once per process) and the
+optimization of a whole fleet with random Weibull parameters and costs.
+
+Run from the repository root::
+
+    python benchmarks/bench_pm_interval.py [assets]
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from maint_advisor.replacement import optimal_intervals, renewal_table  # noqa: E402
+
+
+def brute_force_age(beta, eta, pm_cost, failure_cost, points=400_001):
+    t = np.linspace(0.0, 3 * eta, points)
+    survival = np.exp(-(t / eta) ** beta)
+    integral = np.concatenate([[0.0], np.cumsum(0.5 * (survival[1:] + survival[:-1]) * np.diff(t))])
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rate = (pm_cost * survival + failure_cost * (1 - survival)) / integral
+    k = np.nanargmin(rate[1:]) + 1
+    return t[k], rate[k]
+
+
+def check_accuracy():
+    cases = [(2.5, 1000.0, 100.0, 1000.0), (1.5, 20_000.0, 500.0, 5000.0), (4.0, 300.0, 50.0, 200.0)]
+    result = optimal_intervals(*np.array(cases).T)
+    for (beta, eta, cp, cf), (_, row) in zip(cases, result.iterrows()):
+        t, rate = brute_force_age(beta, eta, cp, cf)
+        assert abs(row["age_interval"] - t) / t < 5e-3, (row["age_interval"], t)
+        assert abs(row["age_cost_rate"] - rate) / rate < 1e-4, (row["age_cost_rate"], rate)
+    print(f"age-replacement optima match a brute-force search for {len(cases)} assets")
+
+
+def main():
+    assets = int(float(sys.argv[1])) if len(sys.argv) > 1 else 100_000
+    start = time.perf_counter()
+    renewal_table()
+    print(f"renewal-function table: {time.perf_counter() - start:.2f} s (once per process)")
+    check_accuracy()
+
+    rng = np.random.default_rng(0)
+    beta = rng.uniform(0.8, 6.0, assets)
+    eta = rng.uniform(100.0, 1e5, assets)
+    pm_cost = rng.uniform(100.0, 1_000.0, assets)
+    failure_cost = pm_cost * rng.uniform(0.5, 20.0, assets)
+    start = time.perf_counter()
+    result = optimal_intervals(beta, eta, pm_cost, failure_cost)
+    elapsed = time.perf_counter() - start
+    finite = np.isfinite(result["age_interval"]).mean()
+    print(f"{assets:,} assets optimized in {elapsed:.2f} s ({assets / elapsed:,.0f} assets/s); "
+          f"{finite:.0%} with a finite age-replacement interval")
+
+
+if __name__ == "__main__":
+    main()
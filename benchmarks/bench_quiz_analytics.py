@@ -0,0 +1,64 @@
+"""Benchmark for the quiz results store and instructor statistics.
+
+Fills a store with simulated attempts (a simple ability/difficulty model so
+the statistics are meaningful) and times loading the response matrix plus
+the item analysis, which is what the instructor view does on each refresh.
+
+Run from the repository root::
+
+    python benchmarks/bench_quiz_analytics.py [attempts]
+"""
+
+import json
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from maint_advisor.content import QUIZ_QUESTIONS  # noqa: E402
+from maint_advisor.quiz_results import QuizStore, item_statistics  # noqa: E402
+
+
+def simulated_rows(attempts, seed=0):
+    rng = np.random.default_rng(seed)
+    n_items = len(QUIZ_QUESTIONS)
+    ability = rng.normal(size=(attempts, 1))
+    difficulty = np.linspace(-1.5, 1.5, n_items)
+    correct = rng.random((attempts, n_items)) < 1 / (1 + np.exp(-(ability - difficulty)))
+    masks = (correct.astype(np.int64) << np.arange(n_items)).sum(axis=1)
+    answers = json.dumps([q[1][q[2]] for q in QUIZ_QUESTIONS])
+    now = time.time()
+    return [(now, None, int(s), int(m), answers) for s, m in zip(correct.sum(axis=1), masks)]
+
+
+def main():
+    attempts = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    with tempfile.TemporaryDirectory() as workdir:
+        store = QuizStore(os.path.join(workdir, "quiz.db"))
+        start = time.perf_counter()
+        store.record_many(simulated_rows(attempts))
+        print(f"stored {attempts:,} attempts in {time.perf_counter() - start:.2f} s")
+
+        start = time.perf_counter()
+        store.record_attempt([q[1][0] for q in QUIZ_QUESTIONS], session="bench")
+        print(f"single submit: {(time.perf_counter() - start) * 1e3:.2f} ms")
+
+        for _ in range(3):
+            start = time.perf_counter()
+            responses = store.response_matrix()
+            loaded = time.perf_counter() - start
+            stats = item_statistics(responses)
+            total = time.perf_counter() - start
+            print(f"instructor view: load {loaded * 1e3:.0f} ms, "
+                  f"load + item analysis {total * 1e3:.0f} ms for {len(responses):,} attempts")
+        print(stats.round(2).head())
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""Benchmark for RUL inference with the bundled ONNX model.
+
+First times direct ``run()`` calls at several batch sizes (p50/p99 latency
+per call and rows/s). Then simulates many sessions asking for one asset at
+a time from concurrent threads, once with every request calling ``run()``
+on the shared session and once through the micro-batching queue, and
+reports request latency, requests/s and the average batch size.
+
+Run from the repository root::
+
+    python benchmarks/bench_rul.py [clients] [requests_per_client]
+"""
+
+import os
+import sys
+import threading
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from maint_advisor.rul import RulPredictor  # noqa: E402
+
+BATCH_SIZES = (1, 8, 64, 512, 4096)
+
+
+def features(rows, seed=0):
+    rng = np.random.default_rng(seed)
+    return np.column_stack([
+        rng.uniform(0, 60_000, rows),
+        rng.gamma(2.0, 1.5, rows),
+        rng.normal(65, 10, rows),
+        rng.uniform(5, 100, rows),
+    ]).astype(np.float32)
+
+
+def percentiles(latencies):
+    return np.percentile(np.asarray(latencies) * 1e3, [50, 99])
+
+
+def direct_batches(predictor, calls=2000):
+    for size in BATCH_SIZES:
+        x = features(size)
+        n = max(20, min(calls, 2_000_000 // size))
+        latencies = []
+        for _ in range(n):
+            start = time.perf_counter()
+            predictor.run(x)
+            latencies.append(time.perf_counter() - start)
+        p50, p99 = percentiles(latencies)
+        print(f"batch {size:>5,}: p50 {p50:7.3f} ms, p99 {p99:7.3f} ms, "
+              f"{size * n / sum(latencies) / 1e6:6.2f} M rows/s")
+
+
+def concurrent_clients(call, clients, requests):
+    x = features(clients * requests)
+    latencies = [[] for _ in range(clients)]
+    barrier = threading.Barrier(clients + 1)
+
+    def client(i):
+        rows = x[i * requests:(i + 1) * requests]
+        barrier.wait()
+        for row in range(requests):
+            start = time.perf_counter()
+            call(rows[row:row + 1])
+            latencies[i].append(time.perf_counter() - start)
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(clients)]
+    for t in threads:
+        t.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+    p50, p99 = percentiles([lat for per_client in latencies for lat in per_client])
+    return p50, p99, clients * requests / elapsed
+
+
+def main():
+    clients = int(sys.argv[1]) if len(sys.argv) > 1 else 32
+    requests = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+    predictor = RulPredictor()
+
+    x = features(100_000)
+    batched = predictor.predict(x)
+    assert np.allclose(batched, predictor.run(x), rtol=1e-5), "batched predictions differ"
+    print(f"model features: {', '.join(predictor.features)} -> RUL in {predictor.unit}")
+    direct_batches(predictor)
+
+    print(f"\n{clients} concurrent clients x {requests:,} single-asset requests")
+    p50, p99, rate = concurrent_clients(predictor.run, clients, requests)
+    print(f"one run() per request: p50 {p50:6.3f} ms, p99 {p99:6.3f} ms, {rate:9,.0f} requests/s")
+    batches, rows = predictor.batches, predictor.rows
+    p50, p99, rate = concurrent_clients(predictor.predict, clients, requests)
+    batches, rows = predictor.batches - batches, predictor.rows - rows
+    print(f"micro-batched:         p50 {p50:6.3f} ms, p99 {p99:6.3f} ms, {rate:9,.0f} requests/s "
+          f"({batches:,} run() calls, {rows / batches:.1f} rows per batch)")
+    predictor.close()
+
+
+if __name__ == "__main__":
+    main()
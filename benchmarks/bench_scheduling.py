@@ -0,0 +1,99 @@
+"""Benchmark for the weekly PM scheduler.
+
+A synthetic week of ``jobs`` PM jobs (default 20,000) for ``technicians``
+technicians (default 200) in six crafts, Monday to Friday, 8 h a day. The
+job hours are about 105% of the crew's hours, so some jobs must slip;
+windows are one to five days, 10% of the jobs need two technicians and
+15% are in outage groups of about three jobs sharing a window. It times the list
+scheduling, the local search (budget: 10 s for both) and the
+rescheduling of 20 slipped jobs, and checks that no technician is booked
+over their hours.
+
+Run from the repository root::
+
+    python benchmarks/bench_scheduling.py [jobs] [technicians]
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from maint_advisor.scheduling import WeeklySchedule  # noqa: E402
+
+SCHEDULE_BUDGET_S = 10.0
+CRAFTS = np.array(["Mechanical", "Electrical", "Instrumentation", "Lubrication", "Welding", "HVAC"])
+CRAFT_SHARE = np.array([0.35, 0.25, 0.15, 0.1, 0.08, 0.07])
+
+
+def synthetic_week(jobs, technicians, load=1.05, seed=0):
+    """A ``(jobs, technicians)`` pair of tables for a five-day week."""
+    rng = np.random.default_rng(seed)
+    crew = pd.DataFrame({
+        "technician": [f"T{i:03d}" for i in range(technicians)],
+        "craft": CRAFTS[np.minimum(np.searchsorted(np.cumsum(CRAFT_SHARE), (np.arange(technicians) + 0.5)
+                                                   / technicians), len(CRAFTS) - 1)],
+        "hours": 8.0,
+    })
+    craft = rng.choice(CRAFTS, jobs, p=CRAFT_SHARE)
+    need = np.where(rng.random(jobs) < 0.1, 2, 1)
+    earliest = rng.integers(0, 5, jobs)
+    due = np.minimum(earliest + rng.integers(0, 5, jobs), 4)
+    # The jobs of an outage group are on one asset and share its window.
+    outage = np.where(rng.random(jobs) < 0.15, rng.integers(0, int(jobs * 0.15 / 3) + 1, jobs), -1)
+    first = pd.Series(np.arange(jobs)).groupby(outage).transform("first").to_numpy()
+    grouped = outage >= 0
+    earliest[grouped], due[grouped] = earliest[first[grouped]], due[first[grouped]]
+    hours = rng.choice([0.5, 1.0, 1.5, 2.0, 3.0, 4.0], jobs, p=[0.2, 0.3, 0.2, 0.15, 0.1, 0.05])
+    hours *= load * technicians * 8 * 5 / (hours * need).sum()
+    return pd.DataFrame({
+        "job": [f"WO-{i:06d}" for i in range(jobs)],
+        "craft": craft,
+        "duration": np.round(np.minimum(hours, 8.0), 2),
+        "technicians": need,
+        "earliest": earliest,
+        "due": due,
+        "priority": rng.choice([1, 2, 3, 4, 5], jobs, p=[0.05, 0.15, 0.4, 0.3, 0.1]),
+        "outage_group": np.where(grouped, np.char.add("OUT-", outage.astype(str)), None),
+    }), crew
+
+
+def timed(function, *args, **kwargs):
+    start = time.perf_counter()
+    result = function(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def main():
+    jobs = int(float(sys.argv[1])) if len(sys.argv) > 1 else 20_000
+    technicians = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    job_table, crew = synthetic_week(jobs, technicians)
+    greedy, greedy_s = timed(WeeklySchedule, job_table, crew, improve=False)
+    schedule, schedule_s = timed(WeeklySchedule, job_table, crew)
+    for name, result, seconds in (("list scheduling", greedy, greedy_s), ("with local search", schedule, schedule_s)):
+        kpis = result.compliance()
+        print(f"{name}: {kpis['jobs']:,} jobs in {seconds:.2f} s, compliance {kpis['schedule_compliance']:.2f}% "
+              f"({kpis['late']:,} late, {kpis['unscheduled']:,} unscheduled), utilization {kpis['utilization']:.1f}%")
+    if (schedule.free < -1e-6).any():
+        sys.exit("a technician is booked over their hours")
+
+    rng = np.random.default_rng(1)
+    booked = schedule.assignments().query("day >= 1 and day <= 3")
+    slipped = {job: 2 for job in rng.choice(booked["job"].to_numpy(), 20, replace=False)}
+    moved, reschedule_s = timed(schedule.reschedule, slipped, today=1)
+    kpis = schedule.compliance()
+    print(f"reschedule {len(slipped)} slipped jobs: {len(moved)} jobs moved in {reschedule_s * 1e3:.0f} ms, "
+          f"compliance {kpis['schedule_compliance']:.2f}% (budget {SCHEDULE_BUDGET_S:.0f} s for the full schedule)")
+    if (schedule.free < -1e-6).any():
+        sys.exit("a technician is booked over their hours after rescheduling")
+    if schedule_s > SCHEDULE_BUDGET_S:
+        sys.exit(f"scheduling took {schedule_s:.1f} s, over the {SCHEDULE_BUDGET_S:.0f} s budget")
+
+
+if __name__ == "__main__":
+    main()
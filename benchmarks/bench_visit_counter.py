@@ -0,0 +1,151 @@
+"""Benchmark for the batched visit counter.
+
+Checks two things:
+
+1. Ordinary widget reruns do not write to disk. The app is driven through
+   ``streamlit.testing`` and the database files are compared before and after
+   a series of reruns.
+2. No updates are lost under concurrency. 200 sessions increment the counter
+   from threads, and several processes share one database file.
+
+Run from the repository root::
+
+    python benchmarks/bench_visit_counter.py
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from maint_advisor.visit_counter import VisitCounter  # noqa: E402
+
+APP = os.path.join(ROOT, "Maintenace_strategy_APP1.py")
+
+
+def _db_state(path):
+    state = []
+    for suffix in ("", "-wal", "-shm"):
+        try:
+            st = os.stat(path + suffix)
+            state.append((suffix, st.st_size, st.st_mtime_ns))
+        except FileNotFoundError:
+            state.append((suffix, None, None))
+    return state
+
+
+def bench_legacy_rerun(workdir, reruns):
+    """Time the old read/modify/write of visit_counter.txt per rerun."""
+    path = os.path.join(workdir, "legacy_counter.txt")
+    with open(path, "w") as f:
+        f.write("0")
+    start = time.perf_counter()
+    for _ in range(reruns):
+        with open(path, "r") as f:
+            count = int(f.read())
+        count += 1
+        with open(path, "w") as f:
+            f.write(str(count))
+    return (time.perf_counter() - start) / reruns
+
+
+def bench_app_reruns(workdir, reruns):
+    """Drive the app and count disk writes caused by widget reruns.
+
+    Runs last: the audit hook cannot be removed and AppTest replaces
+    ``__main__``, which breaks process pools started afterwards.
+    """
+    from streamlit.testing.v1 import AppTest
+
+    writes = []
+
+    def audit(event, args):
+        if event == "open" and len(args) > 1 and isinstance(args[1], str) and any(c in args[1] for c in "wax+"):
+            writes.append(args[0])
+
+    sys.addaudithook(audit)
+    db = os.path.join(workdir, "visit_counter.db")
+    at = AppTest.from_file(APP, default_timeout=30)
+    at.run()
+    before = _db_state(db)
+    del writes[:]
+    topics = at.sidebar.radio[0].options
+    start = time.perf_counter()
+    for i in range(reruns):
+        at.sidebar.radio[0].set_value(topics[i % len(topics)]).run()
+    elapsed = (time.perf_counter() - start) / reruns
+    after = _db_state(db)
+    app_writes = [w for w in writes if str(w).startswith(workdir)]
+    return before == after, len(app_writes), elapsed
+
+
+def bench_threads(workdir, sessions):
+    """Increment once per session from ``sessions`` concurrent threads."""
+    db = os.path.join(workdir, "threads.db")
+    counter = VisitCounter(db, legacy_file=None)
+    barrier = threading.Barrier(sessions)
+
+    def session():
+        barrier.wait()
+        counter.increment()
+
+    threads = [threading.Thread(target=session) for _ in range(sessions)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+    flushes = counter.flushes
+    counter.close()
+    return VisitCounter(db, legacy_file=None).count, flushes, elapsed
+
+
+def _process_worker(db, sessions):
+    counter = VisitCounter(db, legacy_file=None)
+    for _ in range(sessions):
+        counter.increment()
+    counter.close()
+
+
+def bench_processes(workdir, processes, sessions):
+    """Several server processes sharing one database file."""
+    db = os.path.join(workdir, "processes.db")
+    VisitCounter(db, legacy_file=None).close()
+    with ProcessPoolExecutor(processes) as pool:
+        for f in [pool.submit(_process_worker, db, sessions) for _ in range(processes)]:
+            f.result()
+    return VisitCounter(db, legacy_file=None).count
+
+
+def main():
+    workdir = tempfile.mkdtemp(prefix="visit_counter_bench_")
+    cwd = os.getcwd()
+    try:
+        os.chdir(workdir)
+        legacy = bench_legacy_rerun(workdir, 1000)
+        print(f"legacy text file read/modify/write: {legacy * 1e6:.1f} us per rerun, 2 opens + 1 write")
+
+        total, flushes, elapsed = bench_threads(workdir, 200)
+        print(f"200 concurrent sessions (threads): count={total} (expected 200), "
+              f"flushes={flushes}, {elapsed * 1e3:.1f} ms")
+
+        total = bench_processes(workdir, 4, 200)
+        print(f"4 processes x 200 sessions on one database: count={total} (expected 800)")
+
+        unchanged, n_writes, per_rerun = bench_app_reruns(workdir, 40)
+        print(f"app reruns: database unchanged={unchanged}, files opened for write={n_writes}, "
+              f"{per_rerun * 1e3:.1f} ms per rerun")
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""Benchmark for the Weibull life-data engine.
+
+Generates censored life data for many asset classes, checks that the fitted
+shape parameters recover the true values, and times the point fits and the
+bootstrap confidence bounds on a process pool. The point fits are also timed
+with one class of a million records added, which a padded layout would need
+``classes x 1,000,000`` cells for.
+
+Run from the repository root::
+
+    python benchmarks/bench_weibull.py [classes] [resamples] [workers]
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from maint_advisor.weibull import bootstrap_bounds, fit_rows, pack_groups  # noqa: E402
+
+
+def simulated_life_data(classes, per_class=30, seed=0):
+    rng = np.random.default_rng(seed)
+    beta = rng.choice([0.7, 1.0, 2.5], classes)
+    eta = rng.uniform(500, 5000, classes)
+    group = np.repeat(np.arange(classes), per_class)
+    life = eta[group] * rng.weibull(beta[group])
+    censor = eta[group] * rng.uniform(0.5, 3.0, len(group))
+    return group, np.minimum(life, censor), life <= censor, beta
+
+
+def main():
+    classes = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    resamples = int(sys.argv[2]) if len(sys.argv) > 2 else 1_000
+    workers = int(sys.argv[3]) if len(sys.argv) > 3 else os.cpu_count()
+
+    group, times, failed, true_beta = simulated_life_data(classes)
+    labels, t, f, offsets = pack_groups(group, times, failed)
+
+    start = time.perf_counter()
+    beta, _, _, _ = fit_rows(t, f, offsets)
+    print(f"2-parameter fits: {classes:,} classes in {time.perf_counter() - start:.2f} s, "
+          f"median |beta error| {np.nanmedian(np.abs(beta - true_beta) / true_beta):.1%}")
+
+    start = time.perf_counter()
+    fit_rows(t, f, offsets, three_parameter=True)
+    print(f"3-parameter fits: {classes:,} classes in {time.perf_counter() - start:.2f} s")
+
+    big_group, big_times, big_failed, _ = simulated_life_data(1, per_class=1_000_000, seed=1)
+    _, t_all, f_all, offsets_all = pack_groups(np.concatenate([group, big_group + classes]),
+                                               np.concatenate([times, big_times]),
+                                               np.concatenate([failed, big_failed]))
+    start = time.perf_counter()
+    fit_rows(t_all, f_all, offsets_all)
+    print(f"2-parameter fits with one class of 1,000,000 records: {classes + 1:,} classes in "
+          f"{time.perf_counter() - start:.2f} s")
+
+    start = time.perf_counter()
+    bounds = bootstrap_bounds(t, f, offsets, resamples=resamples, workers=workers)
+    elapsed = time.perf_counter() - start
+    covered = np.nanmean((bounds[:, 0] <= true_beta) & (true_beta <= bounds[:, 1]))
+    print(f"bootstrap: {classes:,} classes x {resamples:,} resamples on {workers} worker(s) "
+          f"in {elapsed:.1f} s; 90% interval covers the true beta for {covered:.0%} of classes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,514 @@
+"""Benchmark suite for every page and engine path, with regression checks.
+
+* pages: every sidebar topic of the app is selected through
+  ``streamlit.testing`` and rerun, as happens on each widget change. Per
+  topic it records the wall time of the first run and the median and p95
+  wall and CPU time of the reruns, the peak memory allocated during a rerun
+  (tracemalloc, in a separate pass) and the file writes the script makes
+  per rerun: write system calls of the script thread from
+  ``/proc/thread-self/io`` where available, which also catches SQLite, and
+  files opened for writing, counted with an audit hook.
+* engine: the computations behind the pages at fleet scale, from the
+  recommendation rule chain, KPI formulas and quiz scoring to DGA, the
+  PM interval optimizer and RUL inference. Best-of-N time and traced peak
+  memory of each.
+
+Results are written as JSON and checked against the budgets in
+``benchmarks/thresholds.json`` and, with ``--baseline``, against an earlier
+results file: a metric more than ``tolerance`` above its baseline (and above
+the noise floor) is a regression. Any regression exits with status 1.
+
+Run from the repository root::
+
+    python benchmarks/suite.py [--only pages|engine] [--reruns N] [--scale F]
+                               [--output FILE] [--baseline FILE]
+"""
+
+import argparse
+import datetime
+import itertools
+import json
+import logging
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+APP = os.path.join(ROOT, "Maintenace_strategy_APP1.py")
+THRESHOLDS = os.path.join(ROOT, "benchmarks", "thresholds.json")
+DEFAULT_OUTPUT = os.path.join(ROOT, "benchmarks", "results.json")
+
+# Metrics checked against thresholds and baselines; for all of them lower is better.
+PAGE_METRICS = ("first_run_ms", "rerun_ms_p50", "rerun_ms_p95", "rerun_cpu_ms_p50", "rerun_peak_mb",
+                "write_syscalls", "files_opened_for_write",
+                "write_syscalls_per_rerun", "files_opened_for_write_per_rerun")
+ENGINE_METRICS = ("seconds", "peak_mb")
+
+
+class WriteCounter:
+    """Counts the file writes of the app's script runs while armed.
+
+    Only the threads that run the script are counted, so writes by
+    Streamlit's and the app's background threads (metrics export, job
+    runners) do not show up as writes per rerun. Write system calls come
+    from ``/proc/thread-self/io`` (Linux only), read as each script run
+    starts and ends; files opened for writing from an audit hook. Audit
+    hooks cannot be removed, so the hook stays installed and only counts
+    between ``start`` and ``stop``.
+    """
+
+    WRITE_FLAGS = os.O_WRONLY | os.O_RDWR | os.O_APPEND | os.O_CREAT
+
+    def __init__(self):
+        from streamlit.testing.v1.local_script_runner import LocalScriptRunner
+
+        self.armed = False
+        self.opened = 0
+        self.syscalls = 0
+        self._script = threading.local()
+        sys.addaudithook(self._hook)
+        run_script = LocalScriptRunner._run_script_thread
+
+        def _run_script_thread(runner):
+            self._script.running = True
+            before = self.write_syscalls()
+            try:
+                run_script(runner)
+            finally:
+                self._script.running = False
+                after = self.write_syscalls()
+                if self.armed:
+                    self.syscalls = (None if before is None or after is None or self.syscalls is None
+                                     else self.syscalls + after - before)
+
+        LocalScriptRunner._run_script_thread = _run_script_thread
+
+    def _hook(self, event, args):
+        if not self.armed or not getattr(self._script, "running", False):
+            return
+        if event == "open":
+            _, mode, flags = args
+            if (mode and any(c in mode for c in "wax+")) or (flags or 0) & self.WRITE_FLAGS:
+                self.opened += 1
+        elif event in ("os.rename", "os.remove", "os.truncate", "shutil.copyfile"):
+            self.opened += 1
+
+    @staticmethod
+    def write_syscalls():
+        """Write system calls of the calling thread so far, or None."""
+        try:
+            with open("/proc/thread-self/io") as f:
+                return int(next(line for line in f if line.startswith("syscw:")).split()[1])
+        except (OSError, StopIteration):
+            return None
+
+    def start(self):
+        self.opened = 0
+        self.syscalls = 0
+        self.armed = True
+
+    def stop(self):
+        self.armed = False
+        return self.syscalls, self.opened
+
+
+def measure_pages(reruns, writes):
+    from streamlit.testing.v1 import AppTest
+
+    logging.disable(logging.WARNING)
+    results = {}
+    at = AppTest.from_file(APP, default_timeout=120)
+    writes.start()
+    start = time.perf_counter()
+    at.run()
+    syscalls, opened = writes.stop()
+    results["(app start)"] = {"first_run_ms": (time.perf_counter() - start) * 1e3,
+                              "write_syscalls": syscalls, "files_opened_for_write": opened}
+    for topic in at.sidebar.radio[0].options:
+        start = time.perf_counter()
+        at.sidebar.radio[0].set_value(topic).run()
+        first = time.perf_counter() - start
+
+        wall, cpu = [], []
+        writes.start()
+        for _ in range(reruns):
+            start, start_cpu = time.perf_counter(), time.process_time()
+            at.run()
+            wall.append(time.perf_counter() - start)
+            cpu.append(time.process_time() - start_cpu)
+        syscalls, opened = writes.stop()
+
+        # Traced separately: tracemalloc slows the reruns down.
+        peaks = []
+        for _ in range(max(1, reruns // 4)):
+            tracemalloc.start()
+            at.run()
+            peaks.append(tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+        if at.exception:
+            raise RuntimeError(f"{topic}: {at.exception[0].value}")
+        results[topic] = {
+            "first_run_ms": first * 1e3,
+            "rerun_ms_p50": float(np.percentile(wall, 50)) * 1e3,
+            "rerun_ms_p95": float(np.percentile(wall, 95)) * 1e3,
+            "rerun_cpu_ms_p50": float(np.percentile(cpu, 50)) * 1e3,
+            "rerun_peak_mb": max(peaks) / 2 ** 20,
+            "write_syscalls_per_rerun": None if syscalls is None else syscalls / reruns,
+            "files_opened_for_write_per_rerun": opened / reruns,
+        }
+        print(f"{topic:34} rerun p50 {results[topic]['rerun_ms_p50']:7.1f} ms, "
+              f"p95 {results[topic]['rerun_ms_p95']:7.1f} ms, peak {results[topic]['rerun_peak_mb']:6.1f} MB, "
+              f"writes/rerun {results[topic]['write_syscalls_per_rerun']}", flush=True)
+    return results
+
+
+# Engine cases: name -> setup(scale), returning (rows, zero-argument callable).
+ENGINE_CASES = {}
+
+
+def engine_case(setup):
+    ENGINE_CASES[setup.__name__] = setup
+    return setup
+
+
+@engine_case
+def recommendation_rule_chain(scale):
+    from maint_advisor.recommendation import FACTORS, recommend
+
+    combos = list(itertools.product(*FACTORS.values())) * max(1, int(400 * scale))
+    return len(combos), lambda: [recommend(*combo) for combo in combos]
+
+
+@engine_case
+def recommendation_fleet(scale):
+    from maint_advisor.recommendation import FACTORS, recommend_fleet
+
+    rows = int(1_000_000 * scale)
+    rng = np.random.default_rng(0)
+    register = pd.DataFrame({name: rng.choice(levels, rows) for name, levels in FACTORS.items()})
+    return rows, lambda: recommend_fleet(register)
+
+
+@engine_case
+def kpi_formulas(scale):
+    from maint_advisor import kpi
+
+    rows = int(1_000_000 * scale)
+    rng = np.random.default_rng(0)
+    a, b = rng.uniform(1, 1_000, (2, rows))
+
+    def run():
+        kpi.mtbf(a, b), kpi.mttr(a, b), kpi.availability(a, b)
+        kpi.cost_per_unit(a, b), kpi.schedule_compliance(a, b), kpi.budget_variance(a, b)
+    return rows, run
+
+
+@engine_case
+def quiz_scoring(scale):
+    from maint_advisor.content import QUIZ_QUESTIONS
+    from maint_advisor.quiz_results import score_attempts
+
+    rows = int(200_000 * scale)
+    rng = np.random.default_rng(0)
+    options = np.array([q[1] for q in QUIZ_QUESTIONS], dtype=object)
+    picks = rng.integers(0, options.shape[1], (rows, len(QUIZ_QUESTIONS)))
+    answers = options[np.arange(len(QUIZ_QUESTIONS)), picks]
+    return rows, lambda: score_attempts(answers)
+
+
+@engine_case
+def quiz_item_statistics(scale):
+    from maint_advisor.quiz_results import item_statistics
+
+    rows = int(200_000 * scale)
+    responses = (np.random.default_rng(0).random((rows, 25)) < 0.7).astype(np.uint8)
+    return rows, lambda: item_statistics(responses)
+
+
+@engine_case
+def dga_classification(scale):
+    from maint_advisor.dga import GASES, classify_samples
+
+    rows = int(200_000 * scale)
+    rng = np.random.default_rng(0)
+    samples = pd.DataFrame({
+        "transformer": np.char.add("TR", rng.integers(0, rows // 4 + 1, rows).astype(str)),
+        "sample_date": pd.Timestamp("2022-01-01") + pd.to_timedelta(rng.integers(0, 1460, rows), unit="D"),
+        **{gas: rng.lognormal(3.0, 1.5, rows) for gas in GASES},
+    })
+    return rows, lambda: classify_samples(samples)
+
+
+@engine_case
+def pm_interval_fleet(scale):
+    from maint_advisor.replacement import optimize_fleet, renewal_table
+
+    rows = int(20_000 * scale)
+    rng = np.random.default_rng(0)
+    fleet = pd.DataFrame({"beta": rng.uniform(1.2, 6, rows), "eta": rng.uniform(1_000, 50_000, rows)})
+    renewal_table()
+    return rows, lambda: optimize_fleet(fleet, pm_cost=1_000, failure_cost=10_000)
+
+
+@engine_case
+def work_order_kpis(scale):
+    from maint_advisor.work_orders import WorkOrderAccumulator
+
+    rows = int(500_000 * scale)
+    rng = np.random.default_rng(0)
+    start = pd.Timestamp("2024-01-01") + pd.to_timedelta(rng.integers(0, 365 * 24 * 60, rows), unit="min")
+    orders = pd.DataFrame({
+        "asset": np.char.add("A", rng.integers(0, 20_000, rows).astype(str)),
+        "asset_class": rng.choice(["Pump", "Motor", "Fan"], rows),
+        "failure_start": start,
+        "restore_time": start + pd.to_timedelta(rng.integers(10, 600, rows), unit="min"),
+        "cost": rng.uniform(50, 5_000, rows),
+        "output": rng.uniform(0, 100, rows),
+    })
+
+    def run():
+        accumulator = WorkOrderAccumulator()
+        accumulator.update(orders)
+        return accumulator.result()
+    return rows, run
+
+
+@engine_case
+def kpi_trend_refresh(scale):
+    from maint_advisor.kpi_trends import KpiTrendStore
+
+    history, per_day = int(500_000 * scale), max(1, int(50_000 * scale))
+    rng = np.random.default_rng(0)
+    workdir = tempfile.TemporaryDirectory()
+    store = KpiTrendStore(os.path.join(workdir.name, "events.db"))
+    days = iter(range(200, 10_000))
+
+    def orders(n, first_day, span):
+        start = pd.Timestamp("2024-01-01") + pd.to_timedelta(first_day + rng.random(n) * span, unit="D")
+        return pd.DataFrame({
+            "asset": np.char.add("A", rng.integers(0, 20_000, n).astype(str)),
+            "failure_start": start,
+            "restore_time": start + pd.to_timedelta(rng.integers(10, 600, n), unit="min"),
+            "cost": rng.uniform(50, 5_000, n),
+        })
+    store.append(orders(history, 0, 200))
+    store.fold()
+
+    def run():
+        # One more day of work orders per run, as in a daily refresh.
+        store.append(orders(per_day, next(days), 1))
+        store.fold()
+        return store.current(), workdir
+    return per_day, run
+
+
+@engine_case
+def weibull_fits(scale):
+    from maint_advisor.weibull import analyze_life_data
+
+    classes = max(1, int(2_000 * scale))
+    rng = np.random.default_rng(0)
+    data = pd.DataFrame({
+        "asset_class": np.repeat([f"C{i}" for i in range(classes)], 30),
+        "time": rng.weibull(2.0, classes * 30) * 10_000,
+        "failed": rng.random(classes * 30) < 0.8,
+    })
+    return len(data), lambda: analyze_life_data(data, workers=1)
+
+
+@engine_case
+def policy_simulation(scale):
+    from maint_advisor.simulation import simulate_policies
+
+    fleet = max(1, int(2_000 * scale))
+    return fleet * 10, lambda: simulate_policies(fleet_size=fleet, horizon_years=10, workers=1)
+
+
+@engine_case
+def vibration_spectra(scale):
+    from maint_advisor.vibration import analyze_vibration
+
+    rows = int(5_000_000 * scale)
+    samples = np.random.default_rng(0).standard_normal(rows).astype(np.float32)
+    return rows, lambda: analyze_vibration(samples, 50_000, workers=1)
+
+
+@engine_case
+def rul_inference(scale):
+    from maint_advisor.rul import RulPredictor
+
+    rows = int(200_000 * scale)
+    predictor = RulPredictor()
+    features = np.random.default_rng(0).uniform(1, 100, (rows, len(predictor.features))).astype(np.float32)
+    return rows, lambda: predictor.predict(features)
+
+
+@engine_case
+def pm_schedule(scale):
+    from bench_scheduling import synthetic_week
+
+    from maint_advisor.scheduling import WeeklySchedule
+
+    jobs = max(100, int(20_000 * scale))
+    job_table, crew = synthetic_week(jobs, max(2, int(200 * scale)))
+    return jobs, lambda: WeeklySchedule(job_table, crew)
+
+
+@engine_case
+def rbd_importance(scale):
+    from bench_rbd import synthetic_plant
+
+    from maint_advisor.rbd import ReliabilityBlockDiagram
+
+    nodes = max(100, int(10_000 * scale))
+    diagram = ReliabilityBlockDiagram(*synthetic_plant(nodes))
+    return nodes, diagram.importance
+
+
+@engine_case
+def curve_render(scale):
+    from maint_advisor import curves
+
+    def run():
+        curves._dipf_png.cache_clear()
+        curves.dipf_png()
+    return 1, run
+
+
+def measure_engine(scale, repeat, cases=None):
+    results = {}
+    for name, setup in ENGINE_CASES.items():
+        if cases and name not in cases:
+            continue
+        rows, run = setup(scale)
+        run()  # warm-up: imports, lazily built tables
+        times = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            run()
+            times.append(time.perf_counter() - start)
+        tracemalloc.start()
+        run()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        best = min(times)
+        results[name] = {"rows": rows, "seconds": best, "rows_per_second": rows / best, "peak_mb": peak / 2 ** 20}
+        print(f"{name:28} {rows:>11,} rows {best:8.3f} s {rows / best:14,.0f} rows/s "
+              f"peak {peak / 2 ** 20:7.1f} MB", flush=True)
+    return results
+
+
+def _unit(metric):
+    if "_ms" in metric:
+        return "ms"
+    if metric.endswith("_mb"):
+        return "mb"
+    return "seconds" if metric == "seconds" else "count"
+
+
+def _limits(thresholds, section, name):
+    limits = dict(thresholds.get(section, {}).get("*", {}))
+    limits.update(thresholds.get(section, {}).get(name, {}))
+    return limits
+
+
+def find_regressions(results, thresholds, baseline=None):
+    """Metrics over their budget, or more than ``tolerance`` above the baseline."""
+    tolerance = thresholds.get("tolerance", 0.3)
+    noise = thresholds.get("noise", {})
+    regressions = []
+    for section, metrics in (("pages", PAGE_METRICS), ("engine", ENGINE_METRICS)):
+        for name, values in results.get(section, {}).items():
+            limits = _limits(thresholds, section, name)
+            before = (baseline or {}).get(section, {}).get(name, {})
+            for metric in metrics:
+                value = values.get(metric)
+                if value is None:
+                    continue
+                if metric in limits and value > limits[metric]:
+                    regressions.append(f"{section}/{name}: {metric} {value:.3g} over the budget {limits[metric]:.3g}")
+                old = before.get(metric)
+                floor = noise.get(_unit(metric), 0)
+                if old is not None and value > old * (1 + tolerance) and value - old > floor:
+                    regressions.append(f"{section}/{name}: {metric} {value:.3g} vs {old:.3g} in the baseline "
+                                       f"(+{(value / old - 1) * 100 if old else float('inf'):.0f} %)")
+    return regressions
+
+
+def metadata(args):
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                                text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "reruns": args.reruns,
+        "scale": args.scale,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--only", choices=("pages", "engine"))
+    parser.add_argument("--case", action="append", help="run only this engine case (repeatable)")
+    parser.add_argument("--reruns", type=int, default=20, help="reruns per page (default: 20)")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per engine case (default: 3)")
+    parser.add_argument("--scale", type=float, default=1.0, help="engine input size factor (default: 1)")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT, help="results JSON file")
+    parser.add_argument("--thresholds", default=THRESHOLDS, help="budgets JSON file")
+    parser.add_argument("--baseline", help="earlier results JSON to compare against")
+    args = parser.parse_args()
+
+    with open(args.thresholds) as f:
+        thresholds = json.load(f)
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if baseline.get("meta", {}).get("scale") != args.scale:
+            print("baseline was run at another --scale; comparing pages only")
+            baseline.pop("engine", None)
+
+    results = {"meta": metadata(args)}
+    if args.only != "engine":
+        writes = WriteCounter()
+        cwd = os.getcwd()
+        with tempfile.TemporaryDirectory() as workdir:
+            # The app keeps its databases in the working directory; run in a
+            # scratch directory so the real visit counter is not touched.
+            os.chdir(workdir)
+            try:
+                results["pages"] = measure_pages(args.reruns, writes)
+            finally:
+                os.chdir(cwd)
+    if args.only != "pages":
+        results["engine"] = measure_engine(args.scale, args.repeat, args.case)
+
+    # Budgets are set for the default scale; other scales are compared to a baseline only.
+    budgets = thresholds if args.scale == 1 else {k: v for k, v in thresholds.items() if k != "engine"}
+    results["regressions"] = find_regressions(results, budgets, baseline)
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"results written to {args.output}")
+    for regression in results["regressions"]:
+        print(f"REGRESSION {regression}")
+    sys.exit(1 if results["regressions"] else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,10 @@
+"""Maintenance Strategy Advisor engine.
+
+The recommendation rules, KPI formulas, quiz scoring and reliability
+calculators behind the Streamlit app, usable without Streamlit. Import the
+submodules directly (``from maint_advisor.recommendation import
+recommend``); this package imports nothing itself, so the command-line
+interface in ``maint_advisor.cli`` starts without loading NumPy or pandas.
+"""
+
+__version__ = "1.0.0"
@@ -0,0 +1,7 @@
+"""``python -m maint_advisor``: same as the ``maint-advisor`` command."""
+
+import sys
+
+from .cli import main
+
+sys.exit(main())
@@ -0,0 +1,433 @@
+"""Command-line interface: ``maint-advisor recommend|kpi|quiz-score|trends``.
+
+Every command reads records from JSONL, CSV or Parquet files, or from
+stdin, in chunks of ``--chunk-rows`` rows and writes each result chunk as
+soon as it is ready, so memory use depends on the chunk size rather than
+the input size. With ``--workers N`` the chunks are processed on a pool of
+N processes, at most two chunks per worker in flight, and results keep the
+input order. The commands call the same engine functions as the Streamlit
+pages. A Parquet file has one schema, so for Parquet output the inputs are
+read once more beforehand for the column types (stdin is copied to a
+temporary file for that).
+
+Only the standard library is imported at startup; NumPy, pandas and
+pyarrow are imported when a command runs, so ``--help`` stays fast.
+"""
+
+import argparse
+import collections
+import os
+import sys
+import tempfile
+
+from . import __version__
+
+FORMATS = ("jsonl", "csv", "parquet")
+DEFAULT_CHUNK_ROWS = 100_000
+
+# KPI -> (numerator, denominator) input columns, as in the KPIs Calculator page.
+KPI_INPUTS = {
+    "mtbf": ("uptime", "failures"),
+    "mttr": ("downtime", "repairs"),
+    "availability": ("uptime", "downtime"),
+    "cost_per_unit": ("cost", "output"),
+    "schedule_compliance": ("completed", "scheduled"),
+    "budget_variance": ("actual", "budget"),
+}
+
+
+def _normalize_column_name(name):
+    return str(name).strip().lower().replace(" ", "_").replace("-", "_")
+
+
+def _format(path, given, default="jsonl"):
+    if given:
+        return given
+    name = str(path).lower()
+    if name.endswith((".parquet", ".pq")):
+        return "parquet"
+    if name.endswith(".csv"):
+        return "csv"
+    return default
+
+
+def read_chunks(sources, input_format=None, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """Yield the records of ``sources`` as DataFrames of at most ``chunk_rows`` rows.
+
+    ``sources`` are paths, with ``-`` for stdin. The format comes from
+    ``input_format`` or the file extension (JSONL otherwise). Parquet needs
+    a seekable file, so Parquet on stdin is read into memory first.
+    """
+    import io
+
+    import pandas as pd
+
+    for source in sources:
+        stdin = source == "-"
+        fmt = _format("" if stdin else source, input_format)
+        file = sys.stdin.buffer if stdin else source
+        if fmt == "parquet":
+            import pyarrow.parquet as pq
+
+            parquet = pq.ParquetFile(io.BytesIO(file.read()) if stdin else file)
+            for batch in parquet.iter_batches(batch_size=chunk_rows):
+                yield batch.to_pandas()
+        elif fmt == "csv":
+            yield from pd.read_csv(file, chunksize=chunk_rows)
+        else:
+            yield from pd.read_json(file, lines=True, chunksize=chunk_rows)
+
+
+def _arrow_array(values):
+    """A pandas column as an Arrow array; columns of mixed values become strings."""
+    import pandas as pd
+    import pyarrow as pa
+
+    try:
+        return pa.array(values, from_pandas=True)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        return pa.array([None if pd.api.types.is_scalar(value) and pd.isna(value) else str(value)
+                         for value in values], pa.string())
+
+
+def _common_type(a, b):
+    """A type that holds the values of both ``a`` and ``b``; null adopts the other type."""
+    import pyarrow as pa
+
+    if a is None or pa.types.is_null(a) or a == b:
+        return b
+    if pa.types.is_null(b):
+        return a
+    if all(pa.types.is_integer(t) or pa.types.is_floating(t) for t in (a, b)):
+        return pa.float64()
+    return pa.string()
+
+
+def column_types(sources, input_format=None, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """Arrow types that hold every value of each input column, from a pass over the inputs.
+
+    The types of Parquet files are taken from their schema. CSV and JSONL
+    are read as ``read_chunks`` reads them, chunk by chunk, so a column that
+    is empty in one chunk, integer in one and float in another, or numbers
+    in one and text in another still gets one type: float64 for mixed
+    numbers, string for other mixes and for columns without any value.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    types = {}
+    for source in sources:
+        if _format(source, input_format) == "parquet":
+            fields = [(field.name, field.type) for field in pq.read_schema(source)]
+        else:
+            fields = [(name, _arrow_array(chunk[name]).type)
+                      for chunk in read_chunks([source], input_format, chunk_rows) for name in chunk.columns]
+        for name, type in fields:
+            types[name] = _common_type(types.get(name), type)
+    return {name: pa.string() if pa.types.is_null(type) else type for name, type in types.items()}
+
+
+class ChunkWriter:
+    """Write result chunks to a path or stdout as JSONL, CSV or Parquet.
+
+    A Parquet file has one schema, fixed when the first chunk is written.
+    ``column_types`` (see ``column_types``) gives the type of each input
+    column for the whole input; other columns take the type of their first
+    chunk, string where that chunk has no values, and later chunks are cast
+    to the schema.
+    """
+
+    def __init__(self, path=None, output_format=None, column_types=None):
+        self.format = _format(path or "", output_format)
+        self.column_types = column_types or {}
+        self._owned = path not in (None, "-")
+        self.stream = open(path, "wb") if self._owned else sys.stdout.buffer
+        self._parquet = None
+        self._started = False
+        self.rows = 0
+
+    def _parquet_table(self, chunk):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        arrays = [_arrow_array(chunk.iloc[:, i]) for i in range(chunk.shape[1])]
+        if self._parquet is None:
+            types = [self.column_types.get(name, pa.string() if pa.types.is_null(array.type) else array.type)
+                     for name, array in zip(chunk.columns, arrays)]
+            self._parquet = pq.ParquetWriter(self.stream, pa.schema(list(zip(map(str, chunk.columns), types))))
+        schema = self._parquet.schema
+        for i, field in enumerate(schema):
+            if arrays[i].type != field.type:
+                try:
+                    arrays[i] = arrays[i].cast(field.type)
+                except (pa.ArrowInvalid, pa.ArrowNotImplementedError) as exc:
+                    message = f"Column {field.name!r} does not fit its Parquet type {field.type}: {exc}"
+                    raise ValueError(message) from None
+        return pa.Table.from_arrays(arrays, schema=schema)
+
+    def write(self, chunk):
+        if self.format == "parquet":
+            table = self._parquet_table(chunk)  # opens the writer on the first chunk
+            self._parquet.write_table(table)
+        elif self.format == "csv":
+            import pyarrow as pa
+            import pyarrow.csv as pv
+
+            # pyarrow's writer is several times faster than DataFrame.to_csv.
+            pv.write_csv(pa.Table.from_pandas(chunk, preserve_index=False), self.stream,
+                         pv.WriteOptions(include_header=not self._started))
+        else:
+            self.stream.write(chunk.to_json(orient="records", lines=True, date_format="iso").encode())
+        self._started = True
+        self.rows += len(chunk)
+
+    def close(self):
+        if self._parquet is not None:
+            self._parquet.close()
+        self.stream.flush()
+        if self._owned:
+            self.stream.close()
+
+
+def recommend_chunk(chunk, options):
+    """Strategy recommendation for every asset of a register chunk."""
+    import pandas as pd
+
+    from .recommendation import recommend_fleet
+
+    result = recommend_fleet(chunk)
+    if options.brief:
+        result = result[["recommendation"]]
+    return pd.concat([chunk, result], axis=1)
+
+
+def kpi_chunk(chunk, options):
+    """KPI formulas for every row that has their input columns.
+
+    Rows with a zero denominator get an empty value instead of infinity.
+    """
+    import numpy as np
+    import pandas as pd
+
+    from . import kpi
+
+    columns = {_normalize_column_name(c): c for c in chunk.columns}
+    values = {}
+    for name, inputs in KPI_INPUTS.items():
+        if all(c in columns for c in inputs):
+            a, b = (pd.to_numeric(chunk[columns[c]], errors="coerce").to_numpy(np.float64) for c in inputs)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                value = getattr(kpi, name)(a, b)
+            values[name] = np.where(np.isfinite(value), value, np.nan)
+    if not values:
+        raise ValueError("No KPI inputs found; expected column pairs "
+                         + ", ".join("/".join(inputs) for inputs in KPI_INPUTS.values()))
+    return pd.concat([chunk, pd.DataFrame(values, index=chunk.index)], axis=1)
+
+
+def quiz_score_chunk(chunk, options):
+    """Score quiz attempts given as an ``answers`` list or ``q1``, ``q2``, ... columns."""
+    import json
+
+    import numpy as np
+    import pandas as pd
+
+    from .content import QUIZ_QUESTIONS
+    from .quiz_results import score_attempts
+
+    n = len(QUIZ_QUESTIONS)
+    if "answers" in chunk.columns:
+        answers = np.full((len(chunk), n), None, dtype=object)
+        for row, attempt in enumerate(chunk["answers"]):
+            if isinstance(attempt, str):
+                attempt = json.loads(attempt)
+            attempt = list(attempt)[:n] if attempt is not None else []
+            answers[row, :len(attempt)] = attempt
+        rest = chunk.drop(columns="answers")
+    else:
+        questions = [f"q{i + 1}" for i in range(n)]
+        present = {_normalize_column_name(c): c for c in chunk.columns}
+        if questions[0] not in present:
+            raise ValueError(f"Quiz attempts need an 'answers' column or columns q1 ... q{n}.")
+        answers = np.column_stack([
+            chunk[present[q]].to_numpy(object) if q in present else np.full(len(chunk), None, dtype=object)
+            for q in questions
+        ])
+        rest = chunk.drop(columns=[present[q] for q in questions if q in present])
+    scores, masks = score_attempts(answers)
+    return rest.assign(score=scores, percent=np.round(scores / n * 100, 1), correct_mask=masks)
+
+
+def process_chunks(function, chunks, options, workers=1):
+    """Apply ``function(chunk, options)`` to every chunk, in order.
+
+    With more than one worker the chunks run on a process pool with at most
+    two chunks per worker queued, so the reader never gets far ahead of the
+    writer.
+    """
+    if workers <= 1:
+        for chunk in chunks:
+            yield function(chunk, options)
+        return
+
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+        pending = collections.deque()
+        for chunk in chunks:
+            pending.append(pool.submit(function, chunk, options))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def work_order_kpis(sources, options):
+    """Per-asset KPIs of CMMS work-order exports, as on the KPIs Calculator page."""
+    from .work_orders import WorkOrderAccumulator, iter_work_order_chunks
+
+    if "-" in sources:
+        raise ValueError("--work-orders reads CSV or Parquet files, not stdin.")
+    accumulator = WorkOrderAccumulator()
+    for source in sources:
+        for chunk in iter_work_order_chunks(source, chunksize=options.chunk_rows):
+            accumulator.update(chunk)
+    per_asset, per_class = accumulator.result()
+    return (per_class if options.by_class else per_asset).reset_index()
+
+
+def rolling_kpis(sources, options):
+    """Add work-order exports to a trend event log and return its rolling per-asset KPIs."""
+    from .kpi_trends import KpiTrendStore
+    from .work_orders import file_digest
+
+    if sources == ["-"]:
+        sources = []
+    elif "-" in sources:
+        raise ValueError("trends reads CSV or Parquet files, not stdin.")
+    store = KpiTrendStore(options.db, options.windows)
+    try:
+        for source in sources:
+            rows = store.ingest(source, digest=file_digest(source))
+            print(f"{source}: {rows:,} work orders added" if rows else f"{source}: already in the log",
+                  file=sys.stderr)
+        return store.current().reset_index()
+    finally:
+        store.close()
+
+
+COMMANDS = {
+    "recommend": recommend_chunk,
+    "kpi": kpi_chunk,
+    "quiz-score": quiz_score_chunk,
+}
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="maint-advisor",
+        description="Maintenance Strategy Advisor calculators for batch runs.",
+    )
+    parser.add_argument("--version", action="version", version=f"%(prog)s {__version__}")
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("inputs", nargs="*", default=["-"], metavar="FILE",
+                        help="JSONL, CSV or Parquet input files; '-' or none reads stdin")
+    common.add_argument("-o", "--output", default="-", help="output file (default: stdout)")
+    common.add_argument("--input-format", choices=FORMATS,
+                        help="input format (default: from the file extension, JSONL for stdin)")
+    common.add_argument("--output-format", choices=FORMATS,
+                        help="output format (default: from the output extension, JSONL for stdout)")
+    common.add_argument("--chunk-rows", type=int, default=DEFAULT_CHUNK_ROWS, metavar="N",
+                        help=f"rows per chunk (default: {DEFAULT_CHUNK_ROWS:,})")
+    common.add_argument("--workers", type=int, default=1, metavar="N",
+                        help="worker processes for the chunks (default: 1, 0 for one per CPU)")
+    commands = parser.add_subparsers(dest="command", required=True, metavar="COMMAND")
+
+    recommend = commands.add_parser(
+        "recommend", parents=[common], help="recommend a maintenance strategy for every asset",
+        description="Recommend a maintenance strategy for every asset of a register with the columns "
+                    "criticality, environment, failure_history, maintenance_cost and downtime_cost.")
+    recommend.add_argument("--brief", action="store_true", help="add the recommendation only, no reason or examples")
+
+    kpi = commands.add_parser(
+        "kpi", parents=[common], help="compute maintenance KPIs",
+        description="Add MTBF, MTTR, availability, cost per unit, schedule compliance and budget variance "
+                    "for every row that has their inputs: " +
+                    ", ".join(f"{name} ({'/'.join(inputs)})" for name, inputs in KPI_INPUTS.items()) + ".")
+    kpi.add_argument("--work-orders", action="store_true",
+                     help="inputs are CMMS work-order exports; output per-asset KPIs instead")
+    kpi.add_argument("--by-class", action="store_true", help="with --work-orders, output per asset class")
+
+    commands.add_parser(
+        "quiz-score", parents=[common], help="score quiz attempts",
+        description="Score quiz attempts given as an 'answers' list (JSON) or q1, q2, ... columns holding "
+                    "the chosen option text; adds score, percent and correct_mask.")
+    trends = commands.add_parser(
+        "trends", parents=[common], help="update rolling KPI trends from work-order exports",
+        description="Append CMMS work-order exports to an event log and output rolling MTBF, MTTR, availability, "
+                    "schedule compliance and budget variance per asset and window. Only the new work orders are "
+                    "folded in and an export already in the log is skipped; with no files, outputs the current "
+                    "KPIs.")
+    trends.add_argument("--db", default="kpi_events.db", help="event log database (default: kpi_events.db)")
+    trends.add_argument("--windows", type=int, nargs="+", default=[30, 90, 365], metavar="DAYS",
+                        help="rolling windows in days (default: 30 90 365)")
+    return parser
+
+
+def _spool_stdin(directory, input_format):
+    """Copy stdin to a file in ``directory``, for inputs that are read twice; returns its path."""
+    import shutil
+
+    path = os.path.join(directory, f"stdin.{_format('', input_format)}")
+    with open(path, "wb") as f:
+        shutil.copyfileobj(sys.stdin.buffer, f)
+    return path
+
+
+def run(args):
+    writer = ChunkWriter(args.output, args.output_format)
+    try:
+        if args.command == "kpi" and args.work_orders:
+            writer.write(work_order_kpis(args.inputs, args))
+        elif args.command == "trends":
+            writer.write(rolling_kpis(args.inputs, args))
+        else:
+            with tempfile.TemporaryDirectory() as directory:
+                inputs = args.inputs
+                if writer.format == "parquet":
+                    # The Parquet schema is fixed by the first chunk written, so the
+                    # column types come from a pass over the whole input first.
+                    inputs = [_spool_stdin(directory, args.input_format) if source == "-" else source
+                              for source in inputs]
+                    writer.column_types = column_types(inputs, args.input_format, args.chunk_rows)
+                chunks = read_chunks(inputs, args.input_format, args.chunk_rows)
+                for result in process_chunks(COMMANDS[args.command], chunks, args, args.workers):
+                    writer.write(result)
+    finally:
+        writer.close()
+    return writer.rows
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.chunk_rows < 1:
+        parser.error("--chunk-rows must be at least 1")
+    if args.workers < 0:
+        parser.error("--workers must not be negative")
+    args.workers = args.workers or os.cpu_count()
+    try:
+        run(args)
+    except (ValueError, OSError) as exc:
+        if isinstance(exc, BrokenPipeError):
+            # The reader went away (e.g. `| head`); exit quietly.
+            os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+            return 0
+        print(f"maint-advisor {args.command}: error: {exc}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,125 @@
+"""Static page content shared by every session.
+
+Kept at module level so it is built once per server process instead of on
+every Streamlit rerun.
+"""
+
+# Both style blocks, injected with a single st.markdown call.
+PAGE_STYLE = """
+    <style>
+    .custom-sidebar-label {
+        position: fixed;
+        top: 13px;
+        left: 50px;
+        z-index: 1001;
+        font-size: 16px;
+        font-weight: bold;
+        color: #444;
+    }
+
+    /* Adjust for dark mode, optional */
+    @media (prefers-color-scheme: dark) {
+        .custom-sidebar-label {
+            color: #eee;
+        }
+    }
+    </style>
+    <div class="custom-sidebar-label">📂 Topics</div>
+    <style>
+    div.stButton > button:first-child {
+        background-color: #007acc;
+        color: white;
+        font-size: 1.1em;
+        font-weight: bold;
+        padding: 0.6em 1.2em;
+        border: none;
+        border-radius: 8px;
+        box-shadow: 1px 1px 3px rgba(0,0,0,0.2);
+    }
+    div.stButton > button:first-child:hover {
+        background-color: #005a99;
+        transition: 0.3s ease;
+    }
+    </style>
+"""
+
+COMPARISON_DATA = {
+    "Strategy": ["Corrective", "Preventive", "Predictive", "Proactive", "Prescriptive", "RCM"],
+    "Definition": [
+        "Performed after failure occurs",
+        "Scheduled at regular intervals",
+        "Based on actual condition data",
+        "Eliminates root causes before failure",
+        "Uses AI to predict & prescribe actions",
+        "Selects best strategy by criticality"
+    ],
+    "Trigger": [
+        "Failure happens",
+        "Time or usage interval",
+        "Condition thresholds",
+        "Root cause identification",
+        "Data-driven prediction",
+        "Function/failure analysis"
+    ],
+    "Tools/Techniques": [
+        "Manual repair, fault diagnosis",
+        "Calendar-based schedules",
+        "Sensors, condition monitoring",
+        "RCA, FMEA, tribology",
+        "Machine learning, digital twins",
+        "FMEA, reliability modeling"
+    ],
+    "Advantages": [
+        "Simple, no upfront cost",
+        "Reduces surprise failures",
+        "Targets real issues, efficient",
+        "Improves long-term reliability",
+        "Optimizes decisions automatically",
+        "Balances risk, cost, and performance"
+    ],
+    "Disadvantages": [
+        "High downtime, costly failures",
+        "Can cause over-maintenance",
+        "Requires instrumentation, analysis",
+        "Needs deep technical insights",
+        "Complex implementation, data needs",
+        "Time-consuming analysis"
+    ],
+    "Best Use Case": [
+        "Low-value, non-critical assets",
+        "Equipment with predictable aging",
+        "Rotating/high-value machinery",
+        "Recurring or systemic issues",
+        "Smart/digitalized operations",
+        "Critical assets with high consequences"
+    ]
+}
+
+# (question, options, index of the correct option, explanation)
+QUIZ_QUESTIONS = (
+    ("Which maintenance strategy involves fixing equipment only after a breakdown?", ["Preventive", "Corrective", "Predictive", "Proactive"], 1, "Corrective maintenance is performed only after a failure occurs."),
+    ("MTBF stands for:", ["Mean Time Before Failure", "Maximum Test Base Factor", "Mean Time Between Failures", "Machine Tolerance Based Function"], 2, "MTBF is the average time between failures, used as a reliability indicator."),
+    ("What does infrared thermography detect in electrical systems?", ["Current leakage", "Oil level", "Overheating or hotspots", "Gas buildup"], 2, "IR thermography identifies heat anomalies that indicate potential failure points."),
+    ("Which method detects bearing wear through sound?", ["Thermal imaging", "Ultrasound monitoring", "Infrared scanning", "Oil sampling"], 1, "Ultrasound detects high-frequency sounds from worn bearings and leaks."),
+    ("CBM stands for:", ["Corrective Based Monitoring", "Condition Based Maintenance", "Continuous Battery Maintenance", "Certified Breakdown Model"], 1, "CBM relies on actual equipment condition to determine maintenance needs."),
+    ("What is the purpose of proactive maintenance?", ["Replace all components regularly", "React after failure", "Eliminate root causes of failure", "Ignore minor defects"], 2, "Proactive maintenance eliminates root causes before failure occurs."),
+    ("A bathtub curve shows:", ["Temperature rise", "Maintenance cost trend", "Failure rate over time", "Lubricant viscosity"], 2, "It represents failure rate across asset lifecycle: early, steady, and wear-out."),
+    ("DGA in transformer oil analysis stands for:", ["Dynamic Gas Analysis", "Dissolved Gas Analysis", "Delayed Gasket Actuation", "Divergent Ground Alignment"], 1, "DGA analyzes gases dissolved in oil to detect incipient transformer faults."),
+    ("The wear-out period of an asset is characterized by:", ["Low failure rate", "Sudden voltage spikes", "High and increasing failure rate", "Noisy operations"], 2, "Failures increase due to age-related wear and fatigue."),
+    ("Which KPI shows how much of the scheduled work was done?", ["MTTR", "MTBF", "Schedule Compliance", "Availability"], 2, "Schedule Compliance measures % of jobs completed on time."),
+    ("RCM aims to:", ["Reduce staffing levels", "Select optimal strategy per failure mode", "Use one strategy for all equipment", "Eliminate the need for monitoring"], 1, "RCM chooses maintenance strategy based on risk and function."),
+    ("Electrical Signature Analysis is mainly used for:", ["Pipe thickness", "Bearing vibration", "Motor diagnostics", "Gas insulation"], 2, "ESA identifies motor faults via voltage/current waveform analysis."),
+    ("Which maintenance type uses AI to decide timing/actions?", ["Prescriptive", "Preventive", "Proactive", "Corrective"], 0, "Prescriptive maintenance uses AI models to recommend actions."),
+    ("Which of the following is NOT a condition monitoring technique?", ["Vibration analysis", "Infrared scan", "Painting", "Oil analysis"], 2, "Painting is not a diagnostic method."),
+    ("Which KPI combines MTTR and MTBF?", ["Efficiency", "Cost ratio", "Availability", "Utilization"], 2, "Availability = MTBF / (MTBF + MTTR), a core reliability metric."),
+    ("Why is MTTR important?", ["It shows productivity", "It tracks job frequency", "It measures repair efficiency", "It increases OEE"], 2, "MTTR indicates how quickly a system is restored after failure."),
+    ("Which curve phase is best for predictive maintenance?", ["Wear-out", "Useful life", "Infant mortality", "Shutdown"], 1, "During useful life, predictive monitoring is most valuable."),
+    ("Which is a disadvantage of PM?", ["Reduces risk", "May cause over-maintenance", "Requires sensors", "Needs trained experts"], 1, "PM may be done too often, wasting resources."),
+    ("In CBM, what triggers action?", ["Calendar date", "Runtime hours", "Sensor-based data", "Weather forecast"], 2, "CBM relies on actual asset condition from sensors."),
+    ("Best maintenance for LED light in office:", ["RCM", "CBM", "RTF", "PdM"], 2, "Low-cost non-critical items are ideal for Run-to-Failure."),
+    ("OEE includes:", ["Availability, performance, quality", "Load, fuel, temperature", "Speed, torque, voltage", "Time, cost, effort"], 0, "OEE is a productivity metric: A × P × Q."),
+    ("A CMMS is used for:", ["Cooling motors", "Measuring voltage", "Managing maintenance tasks", "Oil filtration"], 2, "CMMS software schedules, tracks, and documents maintenance."),
+    ("Which asset benefits most from RCM?", ["Office printer", "Emergency diesel generator", "Desk lamp", "UPS outlet"], 1, "Critical systems with safety/operational impact need RCM."),
+    ("A low MTBF indicates:", ["Good reliability", "Frequent failures", "High maintenance budget", "Efficient planning"], 1, "Lower MTBF means failures are occurring often."),
+    ("What type of maintenance is usually lowest cost upfront?", ["RCM", "Preventive", "Corrective", "Predictive"], 2, "Corrective has no planning cost—only when failure happens.")
+)
@@ -0,0 +1,183 @@
+"""Parametric bathtub and D-I-P-F curves.
+
+The curves are evaluated with NumPy on a fixed time grid and drawn with the
+matplotlib ``Figure`` API, so pyplot's global figure manager never holds a
+reference to them. Rendered PNGs are kept in an LRU cache keyed on the
+parameter tuple: moving a slider back to an earlier value, or another
+session asking for the same curve, does not draw the figure again.
+"""
+
+import functools
+import io
+from collections import namedtuple
+
+import numpy as np
+
+GRID_POINTS = 400
+RENDER_CACHE_SIZE = 128
+FIGURE_SIZE = (8, 4.8)
+DPI = 110
+
+BathtubParams = namedtuple(
+    "BathtubParams",
+    ["infant_end", "wearout_start", "horizon", "random_rate", "infant_rate", "wearout_beta"],
+    defaults=[3.0, 14.0, 20.0, 0.2, 0.8, 4.0],
+)
+BathtubParams.__doc__ = """Three-segment hazard, times in years and rates in failures per year.
+
+* ``infant_rate``: extra failure rate at commissioning, decaying to 5 % of
+  that value by ``infant_end``;
+* ``random_rate``: constant rate of random failures over the whole life;
+* ``wearout_beta``: Weibull shape of the wear-out failures, whose rate
+  reaches ``random_rate`` at ``wearout_start``.
+"""
+
+DipfParams = namedtuple(
+    "DipfParams",
+    ["onset", "detection", "indication", "prediction", "failure", "shape"],
+    defaults=[20.0, 35.0, 55.0, 70.0, 100.0, 2.5],
+)
+DipfParams.__doc__ = """P-F curve, times in percent of the operating horizon.
+
+Resistance to failure stays at 100 % until ``onset``, then falls as
+``1 - x ** shape`` to 0 % at ``failure``. ``detection``, ``indication`` and
+``prediction`` are the times at which the degradation is first detected,
+shows observable symptoms and can be forecast.
+"""
+
+
+def bathtub_hazard(t, params=BathtubParams()):
+    """Hazard components at times ``t``; returns ``(infant, random, wearout, total)``."""
+    p = BathtubParams(*params)
+    if not 0 < p.infant_end < p.wearout_start < p.horizon:
+        raise ValueError("Need 0 < infant_end < wearout_start < horizon.")
+    if p.wearout_beta <= 1:
+        raise ValueError("The wear-out shape must be greater than 1.")
+    t = np.asarray(t, dtype=np.float64)
+    infant = p.infant_rate * np.exp(-np.log(20.0) * t / p.infant_end)
+    random = np.full_like(t, p.random_rate)
+    # Weibull scale chosen so the wear-out hazard equals the random rate at
+    # the start of the wear-out segment.
+    eta = (p.wearout_beta * p.wearout_start ** (p.wearout_beta - 1) / p.random_rate) ** (1 / p.wearout_beta)
+    wearout = p.wearout_beta / eta * (t / eta) ** (p.wearout_beta - 1)
+    return infant, random, wearout, infant + random + wearout
+
+
+def pf_condition(t, params=DipfParams()):
+    """Resistance to failure in percent at times ``t``."""
+    p = DipfParams(*params)
+    if not 0 <= p.onset < p.detection <= p.indication <= p.prediction < p.failure:
+        raise ValueError("Need onset < detection <= indication <= prediction < failure.")
+    x = np.clip((np.asarray(t, dtype=np.float64) - p.onset) / (p.failure - p.onset), 0.0, 1.0)
+    return 100.0 * (1.0 - x ** p.shape)
+
+
+def _to_png(fig):
+    buf = io.BytesIO()
+    try:
+        fig.savefig(buf, format="png", dpi=DPI, bbox_inches="tight")
+    finally:
+        # Drop the artists now rather than when the figure is collected.
+        fig.clear()
+    return buf.getvalue()
+
+
+def _draw_bathtub(p):
+    from matplotlib.figure import Figure
+
+    t = np.linspace(0.0, p.horizon, GRID_POINTS)
+    infant, random, wearout, total = bathtub_hazard(t, p)
+    top = 1.15 * max(total[0], total[-1])
+
+    fig = Figure(figsize=FIGURE_SIZE)
+    ax = fig.add_subplot()
+    ax.plot(t, total, color="#0000cc", lw=2.5, label="Observed failure rate")
+    ax.plot(t, infant, ":", color="#aa0000", lw=3, label='Early "infant mortality" failures')
+    ax.plot(t, random, color="#008000", lw=2, label="Constant (random) failures")
+    ax.plot(t, wearout, ":", color="#ffaa00", lw=3, label="Wear-out failures")
+    for x in (p.infant_end, p.wearout_start):
+        ax.axvline(x, color="black", ls="--", lw=1.2)
+    for x0, x1, text in ((0, p.infant_end, "Decreasing\nfailure rate"),
+                         (p.infant_end, p.wearout_start, "Constant\nfailure rate"),
+                         (p.wearout_start, p.horizon, "Increasing\nfailure rate")):
+        ax.text((x0 + x1) / 2, top, text, ha="center", va="bottom", fontsize=10, fontweight="bold")
+    ax.set_xlim(0, p.horizon)
+    ax.set_ylim(0, top)
+    ax.set_xlabel("Time (years)", fontweight="bold")
+    ax.set_ylabel("Failure rate (per year)", fontweight="bold")
+    ax.legend(loc="upper center", fontsize=8, frameon=False)
+    ax.spines[["top", "right"]].set_visible(False)
+    return _to_png(fig)
+
+
+def _draw_dipf(p, assets=()):
+    from matplotlib.figure import Figure
+
+    end = p.failure + 0.08 * (p.failure - p.onset)
+    t = np.linspace(0.0, end, GRID_POINTS)
+    condition = pf_condition(t, p)
+    condition[t > p.failure] = np.nan
+
+    fig = Figure(figsize=FIGURE_SIZE)
+    ax = fig.add_subplot()
+    ax.axvspan(p.detection, p.failure, color="#12998e", alpha=0.15,
+               label="Window of opportunity")
+    ax.plot(t, condition, color="#0b5d87", lw=2.5)
+    marks = (("D", p.detection, "Detection", "#f0a830"),
+             ("I", p.indication, "Indication", "#dd5a1c"),
+             ("P", p.prediction, "Prediction", "#12998e"),
+             ("F", p.failure, "Failure", "#c0004d"))
+    times = np.array([m[1] for m in marks])
+    for (letter, _, name, color), x, y in zip(marks, times, pf_condition(times, p)):
+        ax.plot(x, y, "o", ms=13, color=color, zorder=3, clip_on=False)
+        ax.text(x, y, letter, ha="center", va="center", color="white", fontweight="bold", zorder=4)
+        ax.annotate(name, (x, y), xytext=(8, 10), textcoords="offset points", fontsize=9)
+    if assets:
+        labels, x = zip(*assets)
+        y = pf_condition(x, p)
+        colors = np.select([np.less(x, p.detection), np.less(x, p.prediction)], ["#2e8b57", "#f0a830"], "#c0004d")
+        ax.scatter(x, y, s=40, marker="v", c=colors, edgecolors="black", linewidths=0.6, zorder=5,
+                   clip_on=False)
+        for label, xi, yi in zip(labels, x, y):
+            ax.annotate(label, (xi, yi), xytext=(-6, -6), textcoords="offset points", ha="right", va="top",
+                        fontsize=7, rotation=30)
+    ax.annotate("", xy=(p.failure, -6), xytext=(p.prediction, -6),
+                arrowprops={"arrowstyle": "<->"}, annotation_clip=False)
+    ax.text((p.prediction + p.failure) / 2, -10, "P-F interval", ha="center", va="top", fontsize=9)
+    ax.set_xlim(0, end)
+    ax.set_ylim(0, 112)
+    ax.set_xlabel("Operating hours (% of horizon)", fontweight="bold", labelpad=18)
+    ax.set_ylabel("Resistance to failure (%)", fontweight="bold")
+    ax.legend(loc="lower left", fontsize=8, frameon=False)
+    ax.spines[["top", "right"]].set_visible(False)
+    return _to_png(fig)
+
+
+@functools.lru_cache(maxsize=RENDER_CACHE_SIZE)
+def _bathtub_png(params):
+    return _draw_bathtub(params)
+
+
+@functools.lru_cache(maxsize=RENDER_CACHE_SIZE)
+def _dipf_png(params, assets):
+    return _draw_dipf(params, assets)
+
+
+def bathtub_png(params=BathtubParams()):
+    """PNG bytes of the bathtub curve for ``params``, cached on the parameter tuple."""
+    return _bathtub_png(BathtubParams(*map(float, params)))
+
+
+def dipf_png(params=DipfParams(), assets=()):
+    """PNG bytes of the D-I-P-F curve for ``params``, cached on the parameter tuple.
+
+    ``assets`` is a sequence of ``(label, time)`` pairs marked on the curve,
+    e.g. from ``rul.timeline_positions``.
+    """
+    assets = tuple((str(label), round(float(t), 2)) for label, t in assets)
+    return _dipf_png(DipfParams(*map(float, params)), assets)
+
+
+def cache_info():
+    """``functools`` cache statistics of both renderers, by curve."""
+    return {"bathtub": _bathtub_png.cache_info(), "dipf": _dipf_png.cache_info()}
@@ -0,0 +1,543 @@
+"""Content-addressed store of uploaded tables, shared by all sessions.
+
+An upload is hashed (SHA-256 of the file, as ``work_orders.file_digest``)
+and converted once to an uncompressed Arrow IPC file named after the hash,
+as a single record batch with 64-bit string offsets (the layout pandas'
+string dtype uses). The conversion streams: each incoming batch is
+appended column by column to scratch files, which are then mapped back as
+the buffers of the one batch that is written, so memory use does not grow
+with the size of the upload. Reading a dataset
+memory-maps that file read-only: the Arrow table and the DataFrame built
+from it with ``split_blocks`` point into the mapping instead of copying
+it, so every session of the server (and every server process on the
+host) shares one copy in the OS page cache, and the pages are dropped
+under memory pressure instead of being swapped. Sessions keep only the
+hash.
+
+Results computed from a dataset can be stored the same way under a key of
+their inputs (``put_frame``). The store keeps the total size of its files
+under a byte budget by deleting the least recently used ones; a deleted
+file stays readable by the DataFrames that still map it.
+"""
+
+import collections
+import hashlib
+import os
+import threading
+import time
+import uuid
+
+SUFFIX = ".arrow"
+DEFAULT_BUDGET_BYTES = 4 << 30
+CSV_BLOCK_SIZE = 32 << 20
+PARQUET_BATCH_ROWS = 500_000
+# Rows packed into validity and boolean bitmaps at a time (a multiple of 8).
+PACK_ROWS = 1 << 23
+# Upload keys (e.g. Streamlit file ids) remembered per store, so reruns skip re-hashing.
+MAX_KEYS = 1024
+
+_METADATA_KEY = b"maint_advisor"
+
+
+def _digest(file, block_size=1 << 20):
+    """SHA-256 of bytes, a path or a binary file object."""
+    if isinstance(file, (bytes, bytearray, memoryview)):
+        return hashlib.sha256(file).hexdigest()
+    from .work_orders import file_digest
+
+    return file_digest(file, block_size)
+
+
+def _key_digest(key):
+    return hashlib.sha256(repr(key).encode()).hexdigest()
+
+
+def _large_types(schema):
+    """``schema`` with 64-bit string and binary offsets, as pandas' string dtype uses."""
+    import pyarrow as pa
+
+    large = {pa.string(): pa.large_string(), pa.binary(): pa.large_binary()}
+    return pa.schema([field.with_type(large.get(field.type, field.type)) for field in schema],
+                     metadata=schema.metadata)
+
+
+def _batches(file, name, csv_options=None, column_types=None):
+    """Record batches of a CSV or Parquet file, read without loading it whole.
+
+    ``csv_options`` are keyword arguments for ``pyarrow.csv.ConvertOptions``;
+    ``column_types`` overrides the types pyarrow infers from the first block
+    of a CSV file (see ``_csv_column_types``).
+    """
+    from .work_orders import input_file
+
+    file = input_file(file)
+    if name.endswith((".parquet", ".pq")):
+        import pyarrow.parquet as pq
+
+        parquet = pq.ParquetFile(file)
+        return parquet.schema_arrow, parquet.iter_batches(batch_size=PARQUET_BATCH_ROWS)
+    import pyarrow.csv as pv
+
+    options = dict(csv_options or {})
+    options["column_types"] = {**(column_types or {}), **options.get("column_types", {})}
+    reader = pv.open_csv(file, read_options=pv.ReadOptions(block_size=CSV_BLOCK_SIZE),
+                         convert_options=pv.ConvertOptions(**options))
+    return reader.schema, reader
+
+
+def _csv_column_types(file, csv_options=None):
+    """Types that hold every value of each CSV column, from a pass over the whole file.
+
+    pyarrow infers CSV types from the first block only, and a later block
+    with other values (decimals after integers, text after numbers, values
+    after an empty start) fails to convert. This pass reads every column as
+    text and gives each the first type, in pyarrow's inference order, that
+    all of its values cast to, else string. Columns typed by
+    ``csv_options`` keep their type.
+    """
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.csv as pv
+
+    from .work_orders import input_file
+
+    candidates = [pa.int64(), pa.bool_(), pa.date32(), pa.time32("s"), pa.timestamp("s"), pa.timestamp("ns"),
+                  pa.float64()]
+    options = dict(csv_options or {})
+    fixed = options.pop("column_types", {})
+    read_options = pv.ReadOptions(block_size=CSV_BLOCK_SIZE)
+    names = [name for name in pv.open_csv(input_file(file), read_options=read_options).schema.names
+             if name not in fixed]
+    reader = pv.open_csv(input_file(file), read_options=read_options, convert_options=pv.ConvertOptions(
+        column_types={**{name: pa.string() for name in names}, **fixed}, strings_can_be_null=True, **options))
+    # The candidates each column's values have all cast to so far.
+    viable = {name: list(candidates) for name in names}
+    for batch in reader:
+        for name in names:
+            column = batch.column(name)
+            if column.null_count == len(column):
+                continue
+            for type in list(viable[name]):
+                try:
+                    pc.cast(column, type)
+                except (pa.ArrowInvalid, pa.ArrowNotImplementedError):
+                    viable[name].remove(type)
+    return {name: types[0] if types else pa.string() for name, types in viable.items()}
+
+
+def _fixed_width(type):
+    """Byte width of a fixed-width type whose values are one plain buffer, else None."""
+    import pyarrow as pa
+
+    if pa.types.is_boolean(type) or pa.types.is_dictionary(type) or isinstance(type, pa.ExtensionType):
+        return None
+    try:
+        width = type.bit_width
+    except ValueError:
+        return None
+    return width // 8 if width % 8 == 0 else None
+
+
+class _Spool:
+    """Columns of a stream of record batches, appended to scratch files.
+
+    Fixed-width, boolean, (large) string and binary columns are written out
+    as they arrive; ``batch()`` maps the files back as the buffers of one
+    record batch, so assembling it needs no memory beyond the OS page cache.
+    Other columns (lists, structs, dictionaries) are kept as arrays and
+    concatenated in memory.
+    """
+
+    def __init__(self, schema, prefix):
+        import pyarrow as pa
+
+        self.schema = schema
+        self.prefix = prefix
+        self.rows = 0
+        self.paths = []
+        self._columns = []
+        for i, field in enumerate(schema):
+            if pa.types.is_null(field.type):
+                kind = "null"
+            elif pa.types.is_boolean(field.type):
+                kind = "bool"
+            elif pa.types.is_large_string(field.type) or pa.types.is_large_binary(field.type):
+                kind = "binary"
+            elif _fixed_width(field.type):
+                kind = "fixed"
+            else:
+                kind = "other"
+            column = {"kind": kind, "nulls": 0, "arrays": [], "size": 0, "files": {}}
+            if kind not in ("null", "other"):
+                for part in ("valid", "data", "offsets") if kind == "binary" else ("valid", "data"):
+                    column["files"][part] = self._open(f"{i}.{part}")
+                if kind == "binary":
+                    column["files"]["offsets"].write(bytes(8))
+            self._columns.append(column)
+
+    def _open(self, suffix):
+        path = f"{self.prefix}.{suffix}"
+        self.paths.append(path)
+        return open(path, "wb")
+
+    def append(self, batch):
+        import numpy as np
+
+        for column, array in zip(self._columns, batch.columns):
+            kind, files = column["kind"], column["files"]
+            if kind in ("null", "other"):
+                column["arrays"].append(array)
+                continue
+            n, start = len(array), array.offset
+            # Validity is only spooled from the first null on; the rows before it were all valid.
+            if array.null_count and not column["nulls"]:
+                for done in range(0, self.rows, PACK_ROWS):
+                    files["valid"].write(np.ones(min(PACK_ROWS, self.rows - done), np.uint8).data)
+            column["nulls"] += array.null_count
+            if column["nulls"]:
+                files["valid"].write(array.is_valid().to_numpy(zero_copy_only=False).view(np.uint8).data)
+            buffers = array.buffers()
+            if kind == "bool":
+                files["data"].write(array.fill_null(False).to_numpy(zero_copy_only=False).view(np.uint8).data)
+            elif kind == "fixed":
+                width = _fixed_width(array.type)
+                files["data"].write(memoryview(buffers[1])[start * width:(start + n) * width])
+            else:
+                offsets = np.frombuffer(buffers[1], np.int64)[start:start + n + 1]
+                files["offsets"].write((offsets[1:] - offsets[0] + column["size"]).data)
+                if buffers[2] is not None and offsets[-1] > offsets[0]:
+                    files["data"].write(memoryview(buffers[2])[offsets[0]:offsets[-1]])
+                column["size"] += int(offsets[-1] - offsets[0])
+        self.rows += batch.num_rows
+
+    def _map(self, path):
+        import numpy as np
+        import pyarrow as pa
+
+        if not os.path.getsize(path):
+            return pa.py_buffer(b"")
+        return pa.py_buffer(np.memmap(path, np.uint8, "r"))
+
+    def _bitmap(self, path):
+        """A file of one byte per row, packed into an Arrow bitmap in another file."""
+        import numpy as np
+
+        values = np.memmap(path, np.uint8, "r")
+        bits = np.memmap(path + ".bits", np.uint8, "w+", shape=((self.rows + 7) // 8,))
+        self.paths.append(path + ".bits")
+        for start in range(0, self.rows, PACK_ROWS):
+            packed = np.packbits(values[start:start + PACK_ROWS], bitorder="little")
+            bits[start // 8:start // 8 + len(packed)] = packed
+        bits.flush()
+        del values, bits
+        return self._map(path + ".bits")
+
+    def batch(self):
+        """The spooled rows as one record batch over the mapped scratch files."""
+        import pyarrow as pa
+
+        if not self.rows:
+            return pa.RecordBatch.from_pylist([], schema=self.schema)
+        arrays = []
+        for field, column in zip(self.schema, self._columns):
+            kind, files = column["kind"], column["files"]
+            for f in files.values():
+                f.close()
+            if kind in ("null", "other"):
+                arrays.append(pa.concat_arrays(column["arrays"]))
+                continue
+            valid = self._bitmap(files["valid"].name) if column["nulls"] else None
+            if kind == "bool":
+                buffers = [valid, self._bitmap(files["data"].name)]
+            elif kind == "fixed":
+                buffers = [valid, self._map(files["data"].name)]
+            else:
+                buffers = [valid, self._map(files["offsets"].name), self._map(files["data"].name)]
+            arrays.append(pa.Array.from_buffers(field.type, self.rows, buffers, null_count=column["nulls"]))
+        return pa.RecordBatch.from_arrays(arrays, schema=self.schema)
+
+    def close(self):
+        for column in self._columns:
+            for f in column["files"].values():
+                f.close()
+        for path in self.paths:
+            if os.path.exists(path):
+                os.remove(path)
+
+
+class DatasetStore:
+    """Arrow IPC files under ``root``, memory-mapped on demand.
+
+    ``budget_bytes`` bounds the total size of the files; the least recently
+    used datasets are deleted to stay under it. The newest dataset is kept
+    even if it alone is over the budget. Thread-safe; several processes may
+    share one ``root``.
+    """
+
+    def __init__(self, root="datasets", budget_bytes=DEFAULT_BUDGET_BYTES):
+        self.root = os.path.abspath(root)
+        self.budget_bytes = int(budget_bytes)
+        os.makedirs(self.root, exist_ok=True)
+        self._lock = threading.RLock()
+        # digest -> entry dict, least recently used first.
+        self._entries = collections.OrderedDict()
+        self._keys = collections.OrderedDict()
+        self._pending = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        files = [f for f in os.listdir(self.root) if f.endswith(SUFFIX)]
+        for file in sorted(files, key=lambda f: os.path.getmtime(os.path.join(self.root, f))):
+            try:
+                self._index(file[:-len(SUFFIX)])
+            except (OSError, ValueError):
+                continue
+        with self._lock:
+            self._evict()
+
+    def path(self, digest):
+        return os.path.join(self.root, digest + SUFFIX)
+
+    def _index(self, digest):
+        """Add an existing file to the index from its footer, without reading the data."""
+        import json
+
+        import pyarrow as pa
+        import pyarrow.ipc as ipc
+
+        path = self.path(digest)
+        with pa.memory_map(path, "r") as source:
+            reader = ipc.open_file(source)
+            rows = sum(reader.get_batch(i).num_rows for i in range(reader.num_record_batches))
+            schema = reader.schema
+        meta = json.loads((schema.metadata or {}).get(_METADATA_KEY, b"{}"))
+        entry = {"name": meta.get("name", ""), "kind": meta.get("kind", "upload"), "rows": rows,
+                 "columns": len(schema), "bytes": os.path.getsize(path), "table": None,
+                 "last_used": os.path.getmtime(path), "hits": 0}
+        self._entries[digest] = entry
+        return entry
+
+    def __contains__(self, digest):
+        with self._lock:
+            return digest in self._entries or os.path.exists(self.path(digest))
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def total_bytes(self):
+        with self._lock:
+            return sum(entry["bytes"] for entry in self._entries.values())
+
+    # -- writing ------------------------------------------------------------------
+
+    def put(self, file, name=None, key=None, csv_options=None):
+        """Store a CSV or Parquet upload and return its digest.
+
+        ``file`` is bytes, a path or a binary file object. ``key`` (e.g. the
+        upload's id) lets later calls with the same key skip hashing the
+        file again while its dataset is in the store. ``csv_options`` are
+        keyword arguments for ``pyarrow.csv.ConvertOptions`` used to read a
+        CSV file (e.g. ``work_orders.csv_convert_options``); column types
+        not given there are inferred from the whole file.
+        """
+        import pyarrow as pa
+
+        name = str(name or getattr(file, "name", None) or file)
+        extension = name.lower().rpartition(".")[2]
+        if extension in ("parquet", "pq"):
+            csv_options = None
+        if key is not None:
+            key = (key, repr(csv_options))
+        with self._lock:
+            digest = self._keys.get(key) if key is not None else None
+        if digest is None or digest not in self:
+            # The format and reading options are part of the address: the same bytes read differently differ.
+            address = (_digest(file), extension) + ((repr(csv_options),) if csv_options else ())
+            digest = _key_digest(address)
+            meta = {"name": name, "kind": "upload"}
+            try:
+                self._write(digest, lambda: _batches(file, name.lower(), csv_options), meta)
+            except pa.ArrowInvalid:
+                # A CSV column has values of another type after the first block.
+                if extension in ("parquet", "pq"):
+                    raise
+                types = _csv_column_types(file, csv_options)
+                self._write(digest, lambda: _batches(file, name.lower(), csv_options, types), meta)
+        if key is not None:
+            with self._lock:
+                self._keys[key] = digest
+                self._keys.move_to_end(key)
+                while len(self._keys) > MAX_KEYS:
+                    self._keys.popitem(last=False)
+        return digest
+
+    def put_frame(self, frame, key, name=""):
+        """Store a DataFrame computed from other datasets under a digest of ``key``; returns the digest."""
+        digest = _key_digest(key)
+
+        def batches():
+            import pyarrow as pa
+
+            table = pa.Table.from_pandas(frame)
+            return table.schema, table.to_batches()
+
+        self._write(digest, batches, {"name": name, "kind": "derived"})
+        return digest
+
+    def _write(self, digest, batches, meta):
+        """Write a dataset once; concurrent writers of the same digest wait for the first."""
+        import json
+
+        import pyarrow as pa
+        import pyarrow.ipc as ipc
+
+        with self._lock:
+            if digest in self._entries:
+                return
+            pending = self._pending.setdefault(digest, threading.Lock())
+        try:
+            with pending:
+                if os.path.exists(self.path(digest)):
+                    return
+                with self._lock:
+                    self.misses += 1
+                schema, source = batches()
+                # Stored with large offsets so that building a DataFrame does not copy the string columns.
+                schema = _large_types(schema)
+                schema = schema.with_metadata({**(schema.metadata or {}), _METADATA_KEY: json.dumps(meta).encode()})
+                temporary = f"{self.path(digest)}.{os.getpid()}.{uuid.uuid4().hex}.tmp"
+                spool = _Spool(schema, temporary)
+                try:
+                    # Spooled to scratch files first and written as one batch from their mappings: pandas
+                    # can only wrap a column without copying it if it is one buffer.
+                    for batch in source:
+                        spool.append(pa.RecordBatch.from_arrays(
+                            [column.cast(field.type) for column, field in zip(batch.columns, schema)],
+                            schema=schema))
+                    with pa.OSFile(temporary, "wb") as sink, ipc.new_file(sink, schema) as writer:
+                        writer.write_batch(spool.batch())
+                    os.replace(temporary, self.path(digest))
+                finally:
+                    spool.close()
+                    if os.path.exists(temporary):
+                        os.remove(temporary)
+        finally:
+            with self._lock:
+                self._pending.pop(digest, None)
+        with self._lock:
+            if digest not in self._entries:
+                self._index(digest)["last_used"] = time.time()
+            self._evict(keep=digest)
+
+    def _evict(self, keep=None):
+        total = sum(entry["bytes"] for entry in self._entries.values())
+        for digest in list(self._entries):
+            if total <= self.budget_bytes:
+                break
+            if digest == keep:
+                continue
+            total -= self._entries[digest]["bytes"]
+            self.remove(digest)
+            self.evictions += 1
+
+    def remove(self, digest):
+        """Delete a dataset; frames already built from it stay valid."""
+        with self._lock:
+            self._entries.pop(digest, None)
+            try:
+                os.remove(self.path(digest))
+            except OSError:
+                pass
+
+    # -- reading ------------------------------------------------------------------
+
+    def table(self, digest):
+        """The dataset as a memory-mapped, read-only Arrow table; KeyError if it is not stored."""
+        import pyarrow as pa
+        import pyarrow.ipc as ipc
+
+        with self._lock:
+            entry = self._entries.get(digest)
+            if entry is None:
+                try:
+                    entry = self._index(digest)
+                except FileNotFoundError:
+                    raise KeyError(digest) from None
+            if entry["table"] is None:
+                try:
+                    entry["table"] = ipc.open_file(pa.memory_map(self.path(digest), "r")).read_all()
+                except FileNotFoundError:
+                    self._entries.pop(digest, None)
+                    raise KeyError(digest) from None
+            entry["hits"] += 1
+            entry["last_used"] = time.time()
+            self._entries.move_to_end(digest)
+            self.hits += 1
+            return entry["table"]
+
+    def frame(self, digest, columns=None):
+        """The dataset as a DataFrame over the mapped buffers (columns without nulls are not copied)."""
+        table = self.table(digest)
+        if columns is not None:
+            table = table.select(list(columns))
+        return table.to_pandas(split_blocks=True)
+
+    def derived(self, key, compute, name=""):
+        """The stored result for ``key``, computing and storing ``compute()`` on the first call."""
+        try:
+            return self.frame(_key_digest(key))
+        except KeyError:
+            pass
+        return self.frame(self.put_frame(compute(), key, name))
+
+    def usage(self):
+        """One row per dataset, most recently used first, with its size on disk and in memory.
+
+        ``resident_bytes`` is the part of the file mapped and resident in this
+        process (Linux only); the pages are shared with every other process
+        that maps the same file.
+        """
+        import pandas as pd
+
+        resident = _mapped_resident_bytes(self.root)
+        with self._lock:
+            rows = [{"digest": digest[:12], "name": entry["name"], "kind": entry["kind"], "rows": entry["rows"],
+                     "columns": entry["columns"], "disk_bytes": entry["bytes"],
+                     "resident_bytes": resident.get(self.path(digest)) if resident is not None else None,
+                     "mapped": entry["table"] is not None, "hits": entry["hits"],
+                     "last_used": pd.Timestamp(entry["last_used"], unit="s")}
+                    for digest, entry in reversed(self._entries.items())]
+        return pd.DataFrame(rows, columns=["digest", "name", "kind", "rows", "columns", "disk_bytes",
+                                           "resident_bytes", "mapped", "hits", "last_used"])
+
+
+def read_dataset(path, columns=None):
+    """A stored dataset file as a DataFrame over its mapping, for processes without the store (job workers)."""
+    import pyarrow as pa
+    import pyarrow.ipc as ipc
+
+    table = ipc.open_file(pa.memory_map(path, "r")).read_all()
+    if columns is not None:
+        table = table.select(list(columns))
+    return table.to_pandas(split_blocks=True)
+
+
+def _mapped_resident_bytes(root):
+    """Resident bytes per mapped file under ``root``, from /proc/self/smaps; None elsewhere.
+
+    A file mapped more than once counts once, with its largest mapping.
+    """
+    resident = {}
+    path = None
+    try:
+        with open("/proc/self/smaps") as f:
+            for line in f:
+                if line[0] in "0123456789abcdef" and "-" in line.split(" ", 1)[0]:
+                    fields = line.split(None, 5)
+                    path = fields[5].strip() if len(fields) == 6 and fields[5].startswith(root) else None
+                elif path is not None and line.startswith("Rss:"):
+                    resident[path] = max(resident.get(path, 0), int(line.split()[1]) * 1024)
+    except OSError:
+        return None
+    return resident
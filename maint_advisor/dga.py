@@ -0,0 +1,231 @@
+"""Dissolved gas analysis (DGA) of transformer oil samples.
+
+Every sample is classified with three methods at once, as NumPy masks over
+whole columns rather than row by row:
+
+* Duval Triangle 1: the relative shares of CH4, C2H4 and C2H2 fall into one
+  of the zones PD, T1, T2, T3, D1, D2 or DT;
+* Rogers ratios (IEEE C57.104): CH4/H2, C2H2/C2H4 and C2H4/C2H6;
+* IEC 60599 ratios: the same three ratios against the IEC fault table.
+
+Gas generation rates come from sorting the samples by transformer and date
+and differencing neighbouring rows of the same transformer. The latest
+diagnosis of each transformer maps to a failure-history level, so a DGA
+survey can go straight into the fleet strategy recommendation.
+"""
+
+import numpy as np
+
+from .recommendation import FACTORS, FAILURE_HISTORY, read_asset_register
+
+FREQUENT, OCCASIONAL, RARE = FAILURE_HISTORY
+
+GASES = ("h2", "ch4", "c2h6", "c2h4", "c2h2")
+
+# Common lab-report headings for the gas and sample columns.
+COLUMN_ALIASES = {
+    "hydrogen": "h2",
+    "methane": "ch4",
+    "ethane": "c2h6",
+    "ethylene": "c2h4",
+    "acetylene": "c2h2",
+    "asset": "transformer",
+    "transformer_id": "transformer",
+    "equipment": "transformer",
+    "tag": "transformer",
+    "date": "sample_date",
+    "sampled": "sample_date",
+    "sampling_date": "sample_date",
+}
+
+# IEEE C57.104 condition 1 limits (ppm); below all of them a sample is normal.
+NORMAL_LIMITS = {"h2": 100, "ch4": 120, "c2h6": 65, "c2h4": 50, "c2h2": 1}
+
+DUVAL_ZONES = ("PD", "T1", "T2", "T3", "D1", "D2", "DT")
+DUVAL_DESCRIPTIONS = {
+    "PD": "Partial discharges",
+    "T1": "Thermal fault < 300 °C",
+    "T2": "Thermal fault 300–700 °C",
+    "T3": "Thermal fault > 700 °C",
+    "D1": "Discharges of low energy",
+    "D2": "Discharges of high energy",
+    "DT": "Mix of thermal and electrical faults",
+}
+ROGERS_CASES = ("Normal", "Low-energy PD", "Arcing", "Low-temperature thermal",
+                "Thermal < 700 °C", "Thermal > 700 °C", "Unidentified")
+IEC_CASES = ("PD", "D1", "D2", "T1", "T2", "T3", "Unidentified")
+
+# Diagnosis -> failure-history level of the recommendation rules.
+DUVAL_FAILURE_HISTORY = {
+    "PD": OCCASIONAL, "T1": OCCASIONAL, "T2": OCCASIONAL, "DT": OCCASIONAL,
+    "D1": OCCASIONAL, "T3": FREQUENT, "D2": FREQUENT,
+}
+
+
+def _canonical_column(name):
+    name = str(name).strip().lower().replace(" ", "_").replace("-", "_")
+    return COLUMN_ALIASES.get(name, name)
+
+
+def _ratio(a, b):
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(b > 0, a / np.where(b > 0, b, 1.0), np.where(a > 0, np.inf, np.nan))
+
+
+def duval_triangle1(ch4, c2h4, c2h2):
+    """Duval Triangle 1 zone of every sample, as indices into ``DUVAL_ZONES``.
+
+    Samples without any of the three gases get -1.
+    """
+    ch4, c2h4, c2h2 = (np.asarray(g, dtype=np.float64) for g in (ch4, c2h4, c2h2))
+    total = ch4 + c2h4 + c2h2
+    with np.errstate(divide="ignore", invalid="ignore"):
+        p_ch4, p_c2h4, p_c2h2 = (100 * g / total for g in (ch4, c2h4, c2h2))
+    # Zone boundaries of the triangle, checked in this order.
+    zones = np.select(
+        [
+            ~(total > 0),
+            p_ch4 >= 98,
+            (p_c2h4 < 23) & (p_c2h2 > 13),
+            ((p_c2h4 >= 23) & (p_c2h2 >= 29)) | ((p_c2h4 >= 23) & (p_c2h4 <= 40) & (p_c2h2 >= 13)),
+            (p_c2h2 < 4) & (p_c2h4 < 20),
+            (p_c2h2 < 4) & (p_c2h4 >= 20) & (p_c2h4 <= 50),
+            (p_c2h2 < 15) & (p_c2h4 > 50),
+        ],
+        [-1, 0, 4, 5, 1, 2, 3],
+        default=6,
+    )
+    return zones.astype(np.int8)
+
+
+def rogers_ratios(h2, ch4, c2h6, c2h4, c2h2):
+    """Rogers ratio case (IEEE C57.104) of every sample, as indices into ``ROGERS_CASES``."""
+    r1 = _ratio(np.asarray(ch4, dtype=np.float64), np.asarray(h2, dtype=np.float64))
+    r2 = _ratio(np.asarray(c2h2, dtype=np.float64), np.asarray(c2h4, dtype=np.float64))
+    r5 = _ratio(np.asarray(c2h4, dtype=np.float64), np.asarray(c2h6, dtype=np.float64))
+    cases = np.select(
+        [
+            (r2 < 0.1) & (r1 > 0.1) & (r1 < 1.0) & (r5 < 1.0),
+            (r2 < 0.1) & (r1 < 0.1) & (r5 < 1.0),
+            (r2 >= 0.1) & (r2 <= 3.0) & (r1 >= 0.1) & (r1 <= 1.0) & (r5 > 3.0),
+            (r2 < 0.1) & (r1 >= 0.1) & (r1 <= 1.0) & (r5 >= 1.0) & (r5 <= 3.0),
+            (r2 < 0.1) & (r1 > 1.0) & (r5 >= 1.0) & (r5 <= 3.0),
+            (r2 < 0.1) & (r1 > 1.0) & (r5 > 3.0),
+        ],
+        [0, 1, 2, 3, 4, 5],
+        default=6,
+    )
+    return cases.astype(np.int8)
+
+
+def iec_ratios(h2, ch4, c2h6, c2h4, c2h2):
+    """IEC 60599 ratio diagnosis of every sample, as indices into ``IEC_CASES``."""
+    acetylene = _ratio(np.asarray(c2h2, dtype=np.float64), np.asarray(c2h4, dtype=np.float64))
+    methane = _ratio(np.asarray(ch4, dtype=np.float64), np.asarray(h2, dtype=np.float64))
+    ethylene = _ratio(np.asarray(c2h4, dtype=np.float64), np.asarray(c2h6, dtype=np.float64))
+    # "Not significant" entries of the IEC table are left out of the masks.
+    cases = np.select(
+        [
+            (methane < 0.1) & (ethylene < 0.2),
+            (acetylene > 1.0) & (methane >= 0.1) & (methane <= 0.5) & (ethylene > 1.0),
+            (acetylene >= 0.6) & (acetylene <= 2.5) & (methane >= 0.1) & (methane <= 1.0) & (ethylene > 2.0),
+            (methane > 1.0) & (ethylene < 1.0),
+            (acetylene < 0.1) & (methane > 1.0) & (ethylene >= 1.0) & (ethylene <= 4.0),
+            (acetylene < 0.2) & (methane > 1.0) & (ethylene > 4.0),
+        ],
+        [0, 1, 2, 3, 4, 5],
+        default=6,
+    )
+    return cases.astype(np.int8)
+
+
+def gas_generation_rates(transformer, sample_date, gases):
+    """Gas generation rates in ppm/day since the previous sample of the same transformer.
+
+    ``gases`` is a 2-D array ``(samples, gases)``. The samples are sorted by
+    transformer and date once and neighbouring rows are differenced; the
+    first sample of each transformer gets NaN. Rates are returned in the
+    original row order.
+    """
+    import pandas as pd
+
+    codes = pd.factorize(np.asarray(transformer))[0]
+    dates = pd.to_datetime(pd.Series(sample_date)).to_numpy("datetime64[s]")
+    days = np.where(np.isnat(dates), np.nan, dates.astype(np.int64) / 86400.0)
+    order = np.lexsort((days, codes))
+    g = np.asarray(gases, dtype=np.float64)[order]
+    same = codes[order][1:] == codes[order][:-1]
+    elapsed = np.diff(days[order])
+    with np.errstate(divide="ignore", invalid="ignore"):
+        step = np.diff(g, axis=0) / elapsed[:, None]
+    step[~same | ~(elapsed > 0)] = np.nan
+    rates = np.empty_like(g)
+    rates[order] = np.vstack([np.full((1, g.shape[1]), np.nan), step])
+    return rates
+
+
+def classify_samples(data):
+    """Classify every oil sample of a DGA table.
+
+    ``data`` needs the gas columns ``h2``, ``ch4``, ``c2h6``, ``c2h4`` and
+    ``c2h2`` in ppm (common names such as "Hydrogen" are accepted).
+    Optional ``transformer`` and ``sample_date`` columns enable gas
+    generation rates; strategy factor columns (``criticality``, ...) are
+    kept for the recommendation. Returns the normalized table with ``duval``,
+    ``rogers``, ``iec`` (categorical), ``above_limits``, the TDCG (total
+    dissolved combustible gas without CO) and ``<gas>_rate`` columns.
+    """
+    import pandas as pd
+
+    data = data.rename(columns=_canonical_column)
+    missing = [gas for gas in GASES if gas not in data.columns]
+    if missing:
+        raise ValueError(f"DGA table is missing gas columns: {', '.join(missing)}")
+    keep = [c for c in ("transformer", "sample_date", *FACTORS) if c in data.columns and c != "failure_history"]
+    frame = data[keep].copy()
+    values = np.column_stack([pd.to_numeric(data[gas], errors="coerce").to_numpy(np.float64) for gas in GASES])
+    if (values < 0).any():
+        raise ValueError("Gas concentrations must not be negative.")
+    for i, gas in enumerate(GASES):
+        frame[gas] = values[:, i]
+    h2, ch4, c2h6, c2h4, c2h2 = values.T
+
+    frame["tdcg"] = np.nansum(values, axis=1)
+    frame["above_limits"] = (values > np.array([NORMAL_LIMITS[g] for g in GASES])).any(axis=1)
+    frame["duval"] = pd.Categorical.from_codes(duval_triangle1(ch4, c2h4, c2h2), categories=DUVAL_ZONES)
+    frame["rogers"] = pd.Categorical.from_codes(rogers_ratios(h2, ch4, c2h6, c2h4, c2h2), categories=ROGERS_CASES)
+    frame["iec"] = pd.Categorical.from_codes(iec_ratios(h2, ch4, c2h6, c2h4, c2h2), categories=IEC_CASES)
+    if "transformer" in keep and "sample_date" in keep:
+        rates = gas_generation_rates(frame["transformer"], frame["sample_date"],
+                                     np.column_stack([values, frame["tdcg"]]))
+        for i, gas in enumerate(GASES + ("tdcg",)):
+            frame[f"{gas}_rate"] = rates[:, i]
+    return frame
+
+
+def transformer_failure_history(results):
+    """Latest sample of each transformer with a ``failure_history`` level.
+
+    Transformers whose latest sample is below all ``NORMAL_LIMITS`` are
+    ``Rare``; otherwise the Duval zone sets the level (``Frequent`` for
+    high-energy discharges and hot spots above 700 °C). The result has a
+    ``transformer`` column and can be completed with the other factors of
+    ``recommendation.FACTORS`` for ``recommend_fleet``.
+    """
+    if "transformer" not in results.columns:
+        raise ValueError("DGA table needs a 'transformer' column for a per-transformer summary.")
+    latest = results.sort_values("sample_date", kind="stable") if "sample_date" in results.columns else results
+    latest = latest.drop_duplicates("transformer", keep="last").set_index("transformer").sort_index()
+    level = latest["duval"].astype(object).map(DUVAL_FAILURE_HISTORY).fillna(OCCASIONAL)
+    latest["failure_history"] = level.where(latest["above_limits"], RARE)
+    return latest.reset_index()
+
+
+def read_dga_samples(file, name=None):
+    """Read a DGA table from a CSV or Parquet file; dates are parsed if present."""
+    import pandas as pd
+
+    data = read_asset_register(file, name).rename(columns=_canonical_column)
+    if "sample_date" in data.columns:
+        data["sample_date"] = pd.to_datetime(data["sample_date"], format="mixed", errors="coerce")
+    return data
@@ -0,0 +1,438 @@
+"""Background jobs for long fleet computations, on a process pool.
+
+A job is a module-level function called as ``function(progress, *args)`` in
+a worker process, so a long run neither blocks the Streamlit script nor
+starts over when the user touches a widget. Its ID is the SHA-256 of the
+code version (``code_version``), the function's name and the ``repr`` of
+its arguments, which must therefore be plain values (numbers, strings,
+tuples, named tuples): datasets are passed by the path of their stored
+file, not as DataFrames. Identical requests share one job, whoever submits
+them, and a deploy that changes the code does not reuse older results.
+
+The worker pickles the result to ``<root>/<id>.pickle``. A request whose
+result is already on disk is done at once, also after a server restart;
+result files are deleted oldest first above a byte budget.
+
+The worker's ``progress(fraction, message)`` writes ``<id>.progress``, at
+most every ``PROGRESS_INTERVAL`` seconds, and the server reads it when a
+page polls the job. Cancelling a running job creates ``<id>.cancel``; the
+next ``progress`` call in the worker then raises ``JobCancelled``, so job
+functions report progress regularly. A queued job is simply dropped.
+
+At most ``workers`` jobs run at a time. Each owner (a browser session) may
+have ``per_owner`` jobs running and ``max_queued`` waiting, and a free
+worker goes to the waiting owner that was served longest ago, so a session
+that submits many jobs does not hold up the others.
+"""
+
+import collections
+import functools
+import hashlib
+import json
+import multiprocessing
+import os
+import pickle
+import sys
+import threading
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from . import __version__
+
+QUEUED, RUNNING, DONE, FAILED, CANCELLED = "queued", "running", "done", "failed", "cancelled"
+FINISHED = (DONE, FAILED, CANCELLED)
+
+DEFAULT_BUDGET_BYTES = 1 << 30
+PROGRESS_INTERVAL = 0.25
+# Finished jobs remembered in memory, and results kept unpickled.
+MAX_FINISHED = 256
+MAX_RESULTS = 8
+
+_RESULT = ".pickle"
+_PROGRESS = ".progress"
+_CANCEL = ".cancel"
+
+
+class JobCancelled(Exception):
+    """Raised in a worker by ``progress`` once its job is cancelled."""
+
+
+@functools.lru_cache(maxsize=None)
+def code_version(module):
+    """Digest of the package version and the source of every package module, and of ``module``'s file.
+
+    Read once per process; a change to any engine, or to a job function
+    defined outside the package, gives its jobs new IDs.
+    """
+    package = os.path.dirname(os.path.abspath(__file__))
+    paths = [os.path.join(directory, name) for directory, _, names in os.walk(package)
+             for name in names if name.endswith(".py")]
+    path = getattr(sys.modules.get(module), "__file__", None)
+    if path is not None and not os.path.abspath(path).startswith(package + os.sep):
+        paths.append(path)
+    digest = hashlib.sha256(__version__.encode())
+    for path in sorted(paths):
+        with open(path, "rb") as f:
+            digest.update(os.path.relpath(path, package).encode() + b"\0" + f.read())
+    return digest.hexdigest()
+
+
+def job_id(function, args):
+    """The ID of ``function(progress, *args)``: equal requests to the same code get equal IDs."""
+    name = f"{function.__module__}.{function.__qualname__}"
+    return hashlib.sha256(repr((code_version(function.__module__), name, tuple(args))).encode()).hexdigest()
+
+
+def _replace(path, data):
+    temporary = f"{path}.{os.getpid()}.{uuid.uuid4().hex}.tmp"
+    try:
+        with open(temporary, "wb") as f:
+            f.write(data)
+        os.replace(temporary, path)
+    finally:
+        if os.path.exists(temporary):
+            os.remove(temporary)
+
+
+class _Progress:
+    """The ``progress`` callback of a job, in its worker process."""
+
+    def __init__(self, base):
+        self.base = base
+        self.written = 0.0
+
+    def __call__(self, fraction, message=""):
+        if os.path.exists(self.base + _CANCEL):
+            raise JobCancelled()
+        now = time.monotonic()
+        if now - self.written >= PROGRESS_INTERVAL or fraction >= 1:
+            self.written = now
+            _replace(self.base + _PROGRESS, json.dumps([min(max(float(fraction), 0.0), 1.0), message]).encode())
+
+
+def _run(base, function, args):
+    """Worker side of a job: run it and pickle its result next to ``base``."""
+    progress = _Progress(base)
+    progress(0.0)
+    result = function(progress, *args)
+    _replace(base + _RESULT, pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL))
+
+
+class Job:
+    """State of one job; ``progress`` and ``message`` are refreshed by ``JobRunner.status``."""
+
+    def __init__(self, id, name, function, args, owner):
+        self.id = id
+        self.name = name
+        self.function = function
+        self.args = args
+        self.owner = owner
+        self.owners = {owner}
+        self.state = QUEUED
+        self.progress = 0.0
+        self.message = ""
+        self.error = None
+        self.submitted = time.time()
+        self.started = None
+        self.ended = None
+        self.future = None
+
+    @property
+    def finished(self):
+        return self.state in FINISHED
+
+
+class JobRunner:
+    """Runs jobs on a process pool and keeps their results under ``root``.
+
+    Thread-safe: every session thread of the server submits and polls the
+    same runner. Worker processes are started with "spawn" so they do not
+    inherit the server's threads.
+    """
+
+    def __init__(self, root="jobs", workers=None, per_owner=2, max_queued=4, budget_bytes=DEFAULT_BUDGET_BYTES):
+        self.root = os.path.abspath(root)
+        self.workers = int(workers or os.cpu_count() or 1)
+        self.per_owner = int(per_owner)
+        self.max_queued = int(max_queued)
+        self.budget_bytes = int(budget_bytes)
+        os.makedirs(self.root, exist_ok=True)
+        # Left over by a server that stopped while jobs were running.
+        for name in os.listdir(self.root):
+            if name.endswith((_PROGRESS, _CANCEL, ".tmp")):
+                os.remove(os.path.join(self.root, name))
+        self._lock = threading.RLock()
+        self._pool = None
+        self._closed = False
+        self._jobs = {}
+        # owner -> deque of queued jobs, and the dispatch count when the owner was last served.
+        self._queued = {}
+        self._served = {}
+        self._running = collections.Counter()
+        self._results = collections.OrderedDict()
+        self.executed = 0
+        self.deduplicated = 0
+
+    def _base(self, id):
+        return os.path.join(self.root, id)
+
+    # -- submitting ---------------------------------------------------------------
+
+    def submit(self, function, *args, owner=None, name=None, retry=False):
+        """Queue ``function(progress, *args)`` for ``owner`` and return the job ID.
+
+        An identical job that is queued, running or done is shared instead.
+        A failed or cancelled one is returned as it is unless ``retry`` is
+        set, so that polling it again does not restart it. ValueError if the
+        owner already has ``max_queued`` jobs waiting.
+        """
+        id = job_id(function, args)
+        with self._lock:
+            job = self._jobs.get(id)
+            if job is not None and (job.state in (QUEUED, RUNNING, DONE) or not retry):
+                if owner not in job.owners:
+                    job.owners.add(owner)
+                    self.deduplicated += 1
+                return id
+            job = Job(id, name or function.__name__, function, tuple(args), owner)
+            self._jobs[id] = job
+            if os.path.exists(self._base(id) + _RESULT):
+                self.deduplicated += 1
+                self._finish(job, DONE)
+                return id
+            queue = self._queued.setdefault(owner, collections.deque())
+            if len(queue) >= self.max_queued:
+                del self._jobs[id]
+                raise ValueError(f"{len(queue)} jobs are already waiting for this session; "
+                                 "cancel one or wait for them to finish.")
+            queue.append(job)
+            self._dispatch()
+        return id
+
+    def _dispatch(self):
+        """Start queued jobs while workers are free, least recently served owner first."""
+        while not self._closed and sum(self._running.values()) < self.workers:
+            waiting = [o for o in self._queued if self._running[o] < self.per_owner]
+            if not waiting:
+                return
+            owner = min(waiting, key=lambda o: self._served.get(o, -1))
+            job = self._queued[owner].popleft()
+            if not self._queued[owner]:
+                del self._queued[owner]
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context("spawn"))
+            job.state, job.started = RUNNING, time.time()
+            self._running[job.owner] += 1
+            self._served[job.owner] = self.executed
+            self.executed += 1
+            job.future = self._pool.submit(_run, self._base(job.id), job.function, job.args)
+            job.future.add_done_callback(lambda future, job=job: self._done(job, future))
+
+    def _done(self, job, future):
+        with self._lock:
+            self._running[job.owner] -= 1
+            if not self._running[job.owner]:
+                del self._running[job.owner]
+                if job.owner not in self._queued:
+                    self._served.pop(job.owner, None)
+            error = None if future.cancelled() else future.exception()
+            if future.cancelled() or isinstance(error, JobCancelled):
+                self._finish(job, CANCELLED)
+            elif error is not None:
+                if isinstance(error, BrokenProcessPool):
+                    # A worker died (e.g. killed for memory); start a new pool for the next jobs.
+                    self._pool = None
+                    error = ValueError("the worker process stopped unexpectedly, e.g. out of memory.")
+                job.error = error
+                self._finish(job, FAILED)
+            else:
+                self._finish(job, DONE)
+                self._prune(keep=job.id)
+            for suffix in (_PROGRESS, _CANCEL):
+                if os.path.exists(self._base(job.id) + suffix):
+                    os.remove(self._base(job.id) + suffix)
+            self._dispatch()
+
+    def _finish(self, job, state):
+        job.state, job.ended, job.future = state, time.time(), None
+        if state == DONE:
+            job.progress = 1.0
+        finished = [j for j in self._jobs.values() if j.finished]
+        for old in sorted(finished, key=lambda j: j.ended)[:max(0, len(finished) - MAX_FINISHED)]:
+            del self._jobs[old.id]
+
+    def _prune(self, keep=None):
+        """Delete the oldest result files above the byte budget."""
+        files = []
+        for name in os.listdir(self.root):
+            if name.endswith(_RESULT) and name[:-len(_RESULT)] != keep:
+                path = os.path.join(self.root, name)
+                try:
+                    files.append((os.path.getmtime(path), os.path.getsize(path), path))
+                except OSError:
+                    continue
+        total = sum(size for _, size, _ in files)
+        if keep is not None and os.path.exists(self._base(keep) + _RESULT):
+            total += os.path.getsize(self._base(keep) + _RESULT)
+        for _, size, path in sorted(files):
+            if total <= self.budget_bytes:
+                break
+            os.remove(path)
+            total -= size
+
+    # -- polling ------------------------------------------------------------------
+
+    def status(self, id):
+        """The job, with the progress last reported by its worker; KeyError for an unknown ID."""
+        with self._lock:
+            job = self._jobs[id]
+            if job.state == RUNNING:
+                try:
+                    with open(self._base(id) + _PROGRESS) as f:
+                        job.progress, job.message = json.load(f)
+                except (OSError, ValueError):
+                    pass
+            return job
+
+    def result(self, id):
+        """The result of a finished job; raises the job's own exception if it failed.
+
+        Results are shared by every session that asks for them: do not
+        modify them in place.
+        """
+        with self._lock:
+            job = self._jobs[id]
+            if job.state == FAILED:
+                # Raised again on every poll, so without the traceback of the previous raise.
+                raise job.error.with_traceback(None)
+            if job.state != DONE:
+                raise ValueError(f"Job {job.name} is {job.state}.")
+            if id in self._results:
+                self._results.move_to_end(id)
+                return self._results[id]
+        with open(self._base(id) + _RESULT, "rb") as f:
+            result = pickle.load(f)
+        with self._lock:
+            self._results[id] = result
+            while len(self._results) > MAX_RESULTS:
+                self._results.popitem(last=False)
+        return result
+
+    def wait(self, id, timeout=None, interval=0.05):
+        """Block until the job is finished (or ``timeout`` seconds); returns the job."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not self.status(id).finished:
+            if deadline is not None and time.monotonic() > deadline:
+                break
+            time.sleep(interval)
+        return self.status(id)
+
+    def cancel(self, id, owner=None):
+        """Withdraw ``owner``'s request; the job stops once nobody else is waiting for it.
+
+        Without an owner the job is cancelled for everyone.
+        """
+        with self._lock:
+            job = self._jobs.get(id)
+            if job is None or job.finished:
+                return
+            job.owners.discard(owner)
+            if owner is not None and job.owners:
+                return
+            if job.state == QUEUED:
+                queue = self._queued.get(job.owner)
+                if queue is not None and job in queue:
+                    queue.remove(job)
+                    if not queue:
+                        del self._queued[job.owner]
+                self._finish(job, CANCELLED)
+            else:
+                open(self._base(id) + _CANCEL, "wb").close()
+
+    def jobs(self, owner=None):
+        """Snapshot of the known jobs (of one owner), newest first, as a DataFrame."""
+        import pandas as pd
+
+        with self._lock:
+            jobs = [self.status(j.id) for j in self._jobs.values() if owner is None or owner in j.owners]
+            rows = [{"job": j.id[:12], "name": j.name, "state": j.state, "progress": j.progress,
+                     "message": j.message, "sessions": len(j.owners),
+                     "submitted": pd.Timestamp(j.submitted, unit="s"),
+                     "seconds": ((j.ended or time.time()) - j.started) if j.started else None}
+                    for j in sorted(jobs, key=lambda j: j.submitted, reverse=True)]
+        return pd.DataFrame(rows, columns=["job", "name", "state", "progress", "message", "sessions", "submitted",
+                                           "seconds"])
+
+    def shutdown(self, wait=True):
+        """Cancel the queued and running jobs and stop the workers; the runner takes no more jobs."""
+        with self._lock:
+            pool, self._pool, self._closed = self._pool, None, True
+            for queue in self._queued.values():
+                for job in queue:
+                    self._finish(job, CANCELLED)
+            self._queued.clear()
+            for job in self._jobs.values():
+                if job.state == RUNNING:
+                    open(self._base(job.id) + _CANCEL, "wb").close()
+        if pool is not None:
+            pool.shutdown(wait=wait, cancel_futures=True)
+
+
+# -- job functions ------------------------------------------------------------------
+# Called as ``function(progress, *args)`` in a worker; datasets come as stored file paths. They compute
+# in the worker process alone (``workers=1``): the runner already runs up to one job per CPU, and a
+# process pool of their own in each would start cpu_count more processes per job.
+
+FLEET_CHUNK_ROWS = 200_000
+
+
+def fleet_recommendations(progress, path):
+    """The recommendation columns for a stored asset register."""
+    import pandas as pd
+
+    from .datasets import read_dataset
+    from .recommendation import recommend_fleet
+
+    register = read_dataset(path)
+    parts = []
+    for start in range(0, max(len(register), 1), FLEET_CHUNK_ROWS):
+        parts.append(recommend_fleet(register.iloc[start:start + FLEET_CHUNK_ROWS]))
+        done = min(start + FLEET_CHUNK_ROWS, len(register))
+        progress(done / max(len(register), 1), f"{done:,} of {len(register):,} assets")
+    return pd.concat(parts)
+
+
+def work_order_kpis(progress, path):
+    """``(per_asset, per_class, period)`` KPIs of a stored work-order export."""
+    import pyarrow as pa
+    import pyarrow.ipc as ipc
+
+    from .work_orders import WorkOrderAccumulator, iter_work_order_chunks
+
+    table = ipc.open_file(pa.memory_map(path, "r")).read_all()
+    accumulator = WorkOrderAccumulator()
+    done = 0
+    for chunk in iter_work_order_chunks(table):
+        accumulator.update(chunk)
+        done += len(chunk)
+        progress(done / max(table.num_rows, 1), f"{done:,} of {table.num_rows:,} work orders")
+    per_asset, per_class = accumulator.result()
+    return per_asset, per_class, accumulator.period
+
+
+def life_data_analysis(progress, path, three_parameter, resamples):
+    """Weibull fits of every asset class in a stored life-data table."""
+    from .datasets import read_dataset
+    from .weibull import analyze_life_data
+
+    return analyze_life_data(read_dataset(path), three_parameter=three_parameter, resamples=resamples,
+                             workers=1, progress=progress)
+
+
+def policy_simulation(progress, inputs, fleet_size, horizon_years, replications):
+    """``simulation.simulate_policies`` with progress."""
+    from .simulation import simulate_policies
+
+    return simulate_policies(inputs, fleet_size, horizon_years, replications, workers=1, progress=progress)
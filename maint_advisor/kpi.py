@@ -0,0 +1,35 @@
+"""Maintenance KPI formulas.
+
+These are the formulas shown on the Maintenance KPIs Calculator page. They
+work on plain numbers as well as pandas Series and NumPy arrays.
+"""
+
+
+def mtbf(uptime, failures):
+    """Mean Time Between Failures = Total Uptime / Number of Failures."""
+    return uptime / failures
+
+
+def mttr(downtime, repairs):
+    """Mean Time to Repair = Total Downtime / Number of Repairs."""
+    return downtime / repairs
+
+
+def availability(uptime, downtime):
+    """Availability = Uptime / (Uptime + Downtime)."""
+    return uptime / (uptime + downtime)
+
+
+def cost_per_unit(cost, output):
+    """Maintenance Cost per Unit Output = Total Maintenance Cost / Total Output."""
+    return cost / output
+
+
+def schedule_compliance(completed, scheduled):
+    """Schedule Compliance (%) = Completed On Time / Scheduled Jobs x 100."""
+    return completed / scheduled * 100
+
+
+def budget_variance(actual, budget):
+    """Budget Variance (%) = (Actual Spend - Planned Budget) / Planned Budget x 100."""
+    return (actual - budget) / budget * 100
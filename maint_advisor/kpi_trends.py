@@ -0,0 +1,356 @@
+"""Rolling-window KPI trends over an append-only work-order event log.
+
+Work orders are appended to an ``events`` table in a SQLite database and
+folded into running aggregates that are only ever updated with the events
+added since the last fold, so a daily refresh costs time in proportion to
+the new work orders rather than to the history:
+
+* ``daily``: per-asset daily buckets (failures, repairs, downtime, cost,
+  budget, scheduled and on-time jobs);
+* ``class_daily``: the same buckets per asset class, for fleet and class
+  trends;
+* ``rolling``: per-asset sums over the last 30, 90 and 365 days. When the
+  last day moves forward, the buckets of the days leaving each window are
+  subtracted and the new buckets added.
+
+The windows end on the last day with a work order. Conventions follow
+``work_orders``: each work order is one failure, downtime runs from
+``failure_start`` to ``restore_time`` and a work order with a restore time
+is one repair. A work order with a ``due_date`` is a scheduled job, on time
+if restored by then, and ``budget`` is its planned cost. An event counts on
+the day (UTC) of its ``failure_start``, downtime included.
+"""
+
+import contextlib
+import sqlite3
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from .kpi import availability, budget_variance, mtbf, mttr, schedule_compliance
+from .work_orders import REQUIRED_COLUMNS, iter_work_order_chunks
+
+DEFAULT_DB = "kpi_events.db"
+WINDOWS = (30, 90, 365)
+FOLD_ROWS = 500_000
+DAY = 86_400
+
+BUCKET_COLUMNS = ("failures", "repairs", "downtime", "cost", "budget", "scheduled", "on_time")
+KPI_COLUMNS = ("MTBF (h)", "MTTR (h)", "Availability", "Schedule Compliance (%)", "Budget Variance (%)")
+
+_BUCKETS_DDL = ("failures INTEGER NOT NULL, repairs INTEGER NOT NULL, downtime REAL NOT NULL, "
+                "cost REAL NOT NULL, budget REAL NOT NULL, scheduled INTEGER NOT NULL, on_time INTEGER NOT NULL")
+_SUMS = ", ".join(f"SUM({c}) AS {c}" for c in BUCKET_COLUMNS)
+
+
+def _seconds(values):
+    """Timestamps as a float array of Unix seconds, NaN where missing."""
+    stamps = pd.to_datetime(values, errors="coerce", format="mixed")
+    if getattr(stamps.dt, "tz", None) is not None:
+        stamps = stamps.dt.tz_convert("UTC").dt.tz_localize(None)
+    seconds = stamps.astype("datetime64[s]").astype("int64").to_numpy(np.float64)
+    seconds[stamps.isna().to_numpy()] = np.nan
+    return seconds
+
+
+def _nullable(values):
+    """A list for ``executemany`` with None in place of NaN."""
+    values = np.asarray(values, dtype=object)
+    values[pd.isna(values)] = None
+    return values.tolist()
+
+
+def window_kpis(sums, hours):
+    """Add uptime and ``KPI_COLUMNS`` to bucket sums covering ``hours`` of operation."""
+    uptime = (hours - sums["downtime"]).clip(lower=0)
+    sums["uptime"] = uptime
+    sums["MTBF (h)"] = mtbf(uptime, sums["failures"].where(sums["failures"] > 0))
+    sums["MTTR (h)"] = mttr(sums["downtime"], sums["repairs"].where(sums["repairs"] > 0))
+    sums["Availability"] = availability(uptime, sums["downtime"]).where(uptime + sums["downtime"] > 0)
+    sums["Schedule Compliance (%)"] = schedule_compliance(
+        sums["on_time"], sums["scheduled"].where(sums["scheduled"] > 0))
+    sums["Budget Variance (%)"] = budget_variance(sums["cost"], sums["budget"].where(sums["budget"] > 0))
+    return sums
+
+
+def _add(conn, table, keys, frame):
+    """Add the bucket columns of ``frame`` to the rows of ``table`` with the same keys."""
+    columns = [*keys, *BUCKET_COLUMNS]
+    conn.executemany(
+        f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))}) "
+        f"ON CONFLICT ({', '.join(keys)}) DO UPDATE SET "
+        + ", ".join(f"{c} = {c} + excluded.{c}" for c in BUCKET_COLUMNS),
+        # Upserting in key order keeps the B-tree writes local.
+        frame.sort_values(list(keys))[columns].itertuples(index=False, name=None),
+    )
+
+
+class KpiTrendStore:
+    """Work-order event log with incrementally maintained KPI aggregates.
+
+    Parameters
+    ----------
+    path : str
+        SQLite database file.
+    windows : tuple of int
+        Rolling windows in days. Changing them rebuilds the rolling sums
+        from the daily buckets once.
+    fold_rows : int
+        Events read per step when folding, which bounds memory on the first
+        fold of a large log.
+    """
+
+    def __init__(self, path=DEFAULT_DB, windows=WINDOWS, fold_rows=FOLD_ROWS):
+        self.path = path
+        self.windows = tuple(sorted(set(windows)))
+        self.fold_rows = fold_rows
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA cache_size=-65536")
+        self._conn.executescript(
+            "CREATE TABLE IF NOT EXISTS events ("
+            "id INTEGER PRIMARY KEY, asset TEXT NOT NULL, start INTEGER NOT NULL, "
+            "restore INTEGER, due INTEGER, cost REAL, budget REAL);"
+            "CREATE TABLE IF NOT EXISTS assets (asset TEXT PRIMARY KEY, asset_class TEXT NOT NULL);"
+            f"CREATE TABLE IF NOT EXISTS daily (asset TEXT NOT NULL, day INTEGER NOT NULL, {_BUCKETS_DDL}, "
+            "PRIMARY KEY (asset, day)) WITHOUT ROWID;"
+            "CREATE INDEX IF NOT EXISTS daily_day ON daily (day);"
+            "CREATE TABLE IF NOT EXISTS class_daily (asset_class TEXT NOT NULL, day INTEGER NOT NULL, "
+            f"{_BUCKETS_DDL}, PRIMARY KEY (asset_class, day)) WITHOUT ROWID;"
+            f"CREATE TABLE IF NOT EXISTS rolling (asset TEXT NOT NULL, days INTEGER NOT NULL, {_BUCKETS_DDL}, "
+            "PRIMARY KEY (asset, days)) WITHOUT ROWID;"
+            "CREATE TABLE IF NOT EXISTS windows (days INTEGER PRIMARY KEY);"
+            "CREATE TABLE IF NOT EXISTS batches (digest TEXT PRIMARY KEY, rows INTEGER NOT NULL, "
+            "appended_at REAL NOT NULL);"
+            "CREATE TABLE IF NOT EXISTS state (name TEXT PRIMARY KEY, value INTEGER);"
+            "INSERT OR IGNORE INTO state VALUES ('folded', 0), ('last_day', NULL);"
+        )
+        with self._transaction() as conn:
+            stored = tuple(row[0] for row in conn.execute("SELECT days FROM windows ORDER BY days"))
+            if stored != self.windows:
+                self._rebuild_rolling(conn)
+
+    @contextlib.contextmanager
+    def _transaction(self):
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._conn
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    def _query(self, sql, params=()):
+        with self._lock:
+            return pd.read_sql_query(sql, self._conn, params=params)
+
+    def _state(self, conn, name):
+        return conn.execute("SELECT value FROM state WHERE name = ?", (name,)).fetchone()[0]
+
+    def _rebuild_rolling(self, conn):
+        conn.execute("DELETE FROM rolling")
+        conn.execute("DELETE FROM windows")
+        conn.executemany("INSERT INTO windows VALUES (?)", [(w,) for w in self.windows])
+        last_day = self._state(conn, "last_day")
+        if last_day is None:
+            return
+        for window in self.windows:
+            conn.execute(
+                f"INSERT INTO rolling SELECT asset, ?, {_SUMS} FROM daily WHERE day > ? GROUP BY asset",
+                (window, last_day - window))
+
+    def has_batch(self, digest):
+        with self._lock:
+            return self._conn.execute("SELECT 1 FROM batches WHERE digest = ?", (digest,)).fetchone() is not None
+
+    def append(self, chunks, digest=None):
+        """Append work-order chunks to the event log; returns the rows appended.
+
+        With a ``digest`` (e.g. ``work_orders.file_digest``) a batch that was
+        appended before is skipped and 0 is returned, so re-submitting the
+        same export does not count its work orders twice. Work orders
+        without a parseable ``failure_start`` are dropped.
+        """
+        if isinstance(chunks, pd.DataFrame):
+            chunks = [chunks]
+        rows = 0
+        with self._transaction() as conn:
+            if digest is not None and conn.execute(
+                    "SELECT 1 FROM batches WHERE digest = ?", (digest,)).fetchone() is not None:
+                return 0
+            for chunk in chunks:
+                missing = [c for c in REQUIRED_COLUMNS if c not in chunk.columns]
+                if missing:
+                    raise ValueError(f"Work-order export is missing columns: {', '.join(missing)}")
+                start = _seconds(chunk["failure_start"])
+                keep = ~np.isnan(start)
+                chunk = chunk[keep]
+                if chunk.empty:
+                    continue
+                none = pd.Series(np.nan, index=chunk.index)
+                asset = chunk["asset"].astype(str)
+                conn.executemany(
+                    "INSERT INTO events (asset, start, restore, due, cost, budget) VALUES (?, ?, ?, ?, ?, ?)",
+                    zip(asset.tolist(), start[keep].astype(np.int64).tolist(),
+                        _nullable(_seconds(chunk.get("restore_time", none))),
+                        _nullable(_seconds(chunk.get("due_date", none))),
+                        _nullable(pd.to_numeric(chunk.get("cost", none), errors="coerce")),
+                        _nullable(pd.to_numeric(chunk.get("budget", none), errors="coerce"))),
+                )
+                classes = (chunk["asset_class"].astype(str) if "asset_class" in chunk.columns
+                           else pd.Series("Unclassified", index=chunk.index))
+                first = pd.DataFrame({"asset": asset, "asset_class": classes}).drop_duplicates("asset")
+                conn.executemany("INSERT OR IGNORE INTO assets VALUES (?, ?)",
+                                 first.itertuples(index=False, name=None))
+                rows += len(chunk)
+            if digest is not None:
+                conn.execute("INSERT INTO batches VALUES (?, ?, ?)", (digest, rows, time.time()))
+        return rows
+
+    def fold(self):
+        """Fold the events appended since the last fold into the aggregates.
+
+        Returns the number of events folded. Each fold is one write
+        transaction, so appending and folding can run in other processes.
+        """
+        folded = 0
+        with self._transaction() as conn:
+            done = self._state(conn, "folded")
+            last_day = self._state(conn, "last_day")
+            last = conn.execute("SELECT COALESCE(MAX(id), 0) FROM events").fetchone()[0]
+            while done < last:
+                upto = min(done + self.fold_rows, last)
+                buckets = _daily_buckets(pd.read_sql_query(
+                    "SELECT e.asset, a.asset_class, e.start, e.restore, e.due, e.cost, e.budget "
+                    "FROM events e JOIN assets a ON a.asset = e.asset WHERE e.id > ? AND e.id <= ?",
+                    conn, params=(done, upto)))
+                new_last_day = int(buckets["day"].max()) if last_day is None else max(last_day,
+                                                                                       int(buckets["day"].max()))
+                if last_day is not None and new_last_day > last_day:
+                    self._expire(conn, last_day, new_last_day)
+                _add(conn, "daily", ("asset", "day"), buckets)
+                _add(conn, "class_daily", ("asset_class", "day"),
+                     buckets.groupby(["asset_class", "day"], as_index=False)[list(BUCKET_COLUMNS)].sum())
+                for window in self.windows:
+                    recent = buckets[buckets["day"] > new_last_day - window]
+                    _add(conn, "rolling", ("asset", "days"),
+                         recent.groupby("asset", as_index=False)[list(BUCKET_COLUMNS)].sum().assign(days=window))
+                folded += upto - done
+                done, last_day = upto, new_last_day
+            # Assets whose last work order left a window drop out of it.
+            conn.execute("DELETE FROM rolling WHERE failures = 0")
+            conn.execute("UPDATE state SET value = ? WHERE name = 'folded'", (done,))
+            conn.execute("UPDATE state SET value = ? WHERE name = 'last_day'", (last_day,))
+        return folded
+
+    def _expire(self, conn, last_day, new_last_day):
+        """Subtract the days leaving each window when the last day moves forward."""
+        for window in self.windows:
+            first, upto = last_day - window, min(new_last_day - window, last_day)
+            if upto <= first:
+                continue
+            leaving = pd.read_sql_query(
+                f"SELECT asset, {_SUMS} FROM daily WHERE day > ? AND day <= ? GROUP BY asset",
+                conn, params=(first, upto))
+            columns = list(BUCKET_COLUMNS)
+            leaving[columns] = -leaving[columns]
+            _add(conn, "rolling", ("asset", "days"), leaving.assign(days=window))
+
+    def ingest(self, file, name=None, digest=None):
+        """Append a CSV or Parquet work-order export and fold it; returns the rows appended."""
+        rows = self.append(iter_work_order_chunks(file, name), digest)
+        self.fold()
+        return rows
+
+    def version(self):
+        """Events folded so far; changes whenever the aggregates do."""
+        with self._lock:
+            return self._state(self._conn, "folded")
+
+    def last_day(self):
+        """The day the rolling windows end on, as a Timestamp, or None before the first fold."""
+        with self._lock:
+            day = self._state(self._conn, "last_day")
+        return None if day is None else pd.Timestamp(day * DAY, unit="s")
+
+    def assets(self):
+        """Asset -> asset class, as a Series."""
+        return self._query("SELECT asset, asset_class FROM assets ORDER BY asset").set_index("asset")["asset_class"]
+
+    def current(self):
+        """Rolling KPIs per asset for every window, ending on ``last_day``.
+
+        Returns one row per asset and window, indexed by ``(asset, window)``
+        with the window in days; an asset without work orders in a window
+        has no row for it.
+        """
+        frame = self._query(
+            "SELECT r.asset, r.days AS window, a.asset_class, "
+            + ", ".join(f"r.{c}" for c in BUCKET_COLUMNS)
+            + " FROM rolling r JOIN assets a ON a.asset = r.asset ORDER BY r.asset, r.days")
+        return window_kpis(frame, frame["window"] * 24.0).set_index(["asset", "window"])
+
+    def trend(self, assets=None, asset_class=None):
+        """Daily rolling KPIs of the whole fleet, an asset class or a list of assets.
+
+        Returns a DataFrame indexed by ``(date, window)``. Uptime counts 24 h
+        a day for every asset of the selection.
+        """
+        if assets is not None:
+            assets = list(assets)
+            marks = ", ".join("?" * len(assets))
+            daily = self._query(f"SELECT day, {_SUMS} FROM daily WHERE asset IN ({marks}) GROUP BY day", assets)
+            n_assets = self._query(f"SELECT COUNT(*) AS n FROM assets WHERE asset IN ({marks})", assets)
+        elif asset_class is not None:
+            daily = self._query(f"SELECT day, {_SUMS} FROM class_daily WHERE asset_class = ? GROUP BY day",
+                                (asset_class,))
+            n_assets = self._query("SELECT COUNT(*) AS n FROM assets WHERE asset_class = ?", (asset_class,))
+        else:
+            daily = self._query(f"SELECT day, {_SUMS} FROM class_daily GROUP BY day")
+            n_assets = self._query("SELECT COUNT(*) AS n FROM assets")
+        n_assets = int(n_assets["n"].iloc[0])
+        daily = daily.set_index("day").astype(np.float64)
+
+        frames = []
+        if not daily.empty:
+            days = np.arange(daily.index.min(), daily.index.max() + 1)
+            cumulative = daily.reindex(days, fill_value=0.0).cumsum()
+            for window in self.windows:
+                sums = window_kpis(cumulative - cumulative.shift(window, fill_value=0.0),
+                                   window * 24.0 * n_assets)
+                sums.index = pd.to_datetime(sums.index * DAY, unit="s")
+                frames.append(sums.assign(window=window).rename_axis("date").reset_index())
+        if not frames:
+            return pd.DataFrame(columns=["date", "window", *BUCKET_COLUMNS, "uptime", *KPI_COLUMNS]
+                                ).set_index(["date", "window"])
+        return pd.concat(frames, ignore_index=True).set_index(["date", "window"]).sort_index()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def _daily_buckets(events):
+    """Sum a frame of logged events into ``(asset, day)`` bucket rows."""
+    start = events["start"].to_numpy(np.float64)
+    restore = events["restore"].to_numpy(np.float64)
+    due = events["due"].to_numpy(np.float64)
+    restored = ~np.isnan(restore)
+    frame = pd.DataFrame({
+        "asset": events["asset"],
+        "asset_class": events["asset_class"],
+        "day": (start // DAY).astype(np.int64),
+        "failures": 1,
+        "repairs": restored.astype(np.int64),
+        "downtime": np.where(restored, np.clip((restore - start) / 3600, 0, None), 0.0),
+        "cost": events["cost"].fillna(0.0).to_numpy(np.float64),
+        "budget": events["budget"].fillna(0.0).to_numpy(np.float64),
+        "scheduled": (~np.isnan(due)).astype(np.int64),
+        "on_time": (restored & (restore <= due)).astype(np.int64),
+    })
+    return frame.groupby(["asset", "asset_class", "day"], sort=False, as_index=False).sum()
@@ -0,0 +1,238 @@
+"""Lightweight render metrics: a ring buffer, Prometheus export and profiling.
+
+Each page render is recorded as one ``RenderSample`` in a fixed-size
+``collections.deque``, whose appends are atomic, so recording takes no lock
+and costs a few microseconds. Running totals per page (count, wall and CPU
+time, a wall-time histogram) are kept alongside for the Prometheus counters,
+which must not go down when old samples leave the buffer.
+
+``write_prometheus`` renders the totals in the Prometheus text exposition
+format and replaces the target file atomically, as the node_exporter
+textfile collector expects; ``start_exporter`` does that periodically from
+a daemon thread. ``profile`` wraps one render in cProfile or, if installed,
+pyinstrument.
+"""
+
+import collections
+import os
+import threading
+import time
+from collections import namedtuple
+
+RING_SIZE = 4096
+PROFILE_SLOTS = 20
+# Upper bounds of the render-time histogram, in seconds.
+BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+PROFILERS = ("cProfile", "pyinstrument")
+
+RenderSample = namedtuple(
+    "RenderSample",
+    ["timestamp", "page", "session", "rerun", "wall", "cpu", "rss", "cache_hits", "cache_misses"],
+)
+RenderSample.__doc__ = """One page render.
+
+``wall`` and ``cpu`` are seconds (``cpu`` is the CPU time of the script
+thread only), ``rss`` is the resident set size of the process in bytes
+after the render, ``rerun`` is the session's run count and the cache
+counts are the cache lookups made during the render.
+"""
+
+Profile = namedtuple("Profile", ["timestamp", "page", "session", "profiler", "report", "data", "extension"])
+
+
+def resident_memory():
+    """Resident set size of this process in bytes (peak RSS where /proc is missing)."""
+    try:
+        with open("/proc/self/statm", "rb") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        import resource
+        import sys
+
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+def memory_breakdown():
+    """Resident memory by kind in bytes (``anonymous``, ``file`` and ``shared``), or None without /proc.
+
+    Memory-mapped datasets count as ``file``: those pages are shared with
+    every process mapping the same file and can be dropped under pressure.
+    """
+    fields = {"RssAnon:": "anonymous", "RssFile:": "file", "RssShmem:": "shared"}
+    try:
+        with open("/proc/self/status") as f:
+            return {fields[line.split()[0]]: int(line.split()[1]) * 1024 for line in f
+                    if line.split(None, 1)[0] in fields}
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class RenderMetrics:
+    """Render samples and totals shared by all sessions of a process."""
+
+    def __init__(self, capacity=RING_SIZE):
+        self.started = time.time()
+        self.samples = collections.deque(maxlen=capacity)
+        self.profiles = collections.deque(maxlen=PROFILE_SLOTS)
+        self.sessions = 0
+        # Cache name -> [hits, misses]; other cache sources report their own totals.
+        self.caches = collections.defaultdict(lambda: [0, 0])
+        self.cache_sources = {}
+        self._lock = threading.Lock()
+        self._pages = {}
+        self._exporter = None
+
+    def session_started(self):
+        with self._lock:
+            self.sessions += 1
+
+    def cache_lookup(self, name, hit):
+        counts = self.caches[name]
+        counts[0 if hit else 1] += 1
+
+    def cache_totals(self):
+        """Hits and misses of every cache, including the registered sources."""
+        totals = {name: tuple(counts) for name, counts in list(self.caches.items())}
+        for name, source in self.cache_sources.items():
+            totals[name] = source()
+        return totals
+
+    def record(self, sample):
+        self.samples.append(sample)
+        with self._lock:
+            totals = self._pages.get(sample.page)
+            if totals is None:
+                totals = self._pages[sample.page] = [0, 0.0, 0.0, [0] * len(BUCKETS)]
+            totals[0] += 1
+            totals[1] += sample.wall
+            totals[2] += sample.cpu
+            for i, bound in enumerate(BUCKETS):
+                if sample.wall <= bound:
+                    totals[3][i] += 1
+
+    def page_totals(self):
+        """Page -> (renders, wall seconds, CPU seconds, cumulative histogram counts)."""
+        with self._lock:
+            return {page: (n, wall, cpu, tuple(hist)) for page, (n, wall, cpu, hist) in self._pages.items()}
+
+    def frame(self):
+        """The samples in the ring buffer as a DataFrame, oldest first."""
+        import pandas as pd
+
+        return pd.DataFrame(list(self.samples), columns=RenderSample._fields)
+
+    def prometheus_text(self):
+        """All totals in the Prometheus text exposition format."""
+        lines = [
+            "# HELP maint_advisor_renders_total Page renders.",
+            "# TYPE maint_advisor_renders_total counter",
+        ]
+        pages = self.page_totals()
+        lines += [f'maint_advisor_renders_total{{page="{_label(p)}"}} {n}' for p, (n, *_) in pages.items()]
+        lines += ["# HELP maint_advisor_render_cpu_seconds_total CPU time of page renders.",
+                  "# TYPE maint_advisor_render_cpu_seconds_total counter"]
+        lines += [f'maint_advisor_render_cpu_seconds_total{{page="{_label(p)}"}} {cpu:.6f}'
+                  for p, (_, _, cpu, _) in pages.items()]
+        lines += ["# HELP maint_advisor_render_seconds Wall time of page renders.",
+                  "# TYPE maint_advisor_render_seconds histogram"]
+        for page, (n, wall, _, hist) in pages.items():
+            label = _label(page)
+            lines += [f'maint_advisor_render_seconds_bucket{{page="{label}",le="{bound}"}} {count}'
+                      for bound, count in zip(BUCKETS, hist)]
+            lines += [f'maint_advisor_render_seconds_bucket{{page="{label}",le="+Inf"}} {n}',
+                      f'maint_advisor_render_seconds_sum{{page="{label}"}} {wall:.6f}',
+                      f'maint_advisor_render_seconds_count{{page="{label}"}} {n}']
+        lines += ["# HELP maint_advisor_cache_lookups_total Cache lookups by result.",
+                  "# TYPE maint_advisor_cache_lookups_total counter"]
+        for name, (hits, misses) in sorted(self.cache_totals().items()):
+            lines += [f'maint_advisor_cache_lookups_total{{cache="{_label(name)}",result="hit"}} {hits}',
+                      f'maint_advisor_cache_lookups_total{{cache="{_label(name)}",result="miss"}} {misses}']
+        lines += ["# HELP maint_advisor_sessions_total Browser sessions started.",
+                  "# TYPE maint_advisor_sessions_total counter",
+                  f"maint_advisor_sessions_total {self.sessions}",
+                  "# HELP maint_advisor_resident_memory_bytes Resident set size of the server process.",
+                  "# TYPE maint_advisor_resident_memory_bytes gauge",
+                  f"maint_advisor_resident_memory_bytes {resident_memory()}",
+                  "# HELP maint_advisor_start_time_seconds Start time of the metrics, Unix time.",
+                  "# TYPE maint_advisor_start_time_seconds gauge",
+                  f"maint_advisor_start_time_seconds {self.started:.3f}"]
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path):
+        """Write ``prometheus_text`` to ``path`` through a temporary file and a rename."""
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w") as f:
+            f.write(self.prometheus_text())
+        os.replace(tmp, path)
+
+    def start_exporter(self, path, interval=15.0):
+        """Write the Prometheus file every ``interval`` seconds from a daemon thread (once per process)."""
+        with self._lock:
+            if self._exporter is not None:
+                return
+            self._exporter = threading.Thread(target=self._export, args=(path, interval),
+                                              name="metrics-exporter", daemon=True)
+        self._exporter.start()
+
+    def _export(self, path, interval):
+        while True:
+            try:
+                self.write_prometheus(path)
+            except OSError:
+                pass
+            time.sleep(interval)
+
+
+def _label(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class profile:
+    """Context manager profiling the code it wraps.
+
+    ``profiler`` is ``"cProfile"`` or ``"pyinstrument"``; after the block,
+    ``report`` holds a text report, ``data`` the raw profile (cProfile
+    stats for ``pstats``/snakeviz, or pyinstrument's HTML) and
+    ``extension`` a matching file extension. pyinstrument must be installed
+    separately.
+    """
+
+    def __init__(self, profiler="cProfile", top=30):
+        if profiler not in PROFILERS:
+            raise ValueError(f"Unknown profiler {profiler!r}; expected one of {PROFILERS}.")
+        self.profiler = profiler
+        self.top = top
+        self.report = self.data = self.extension = None
+
+    def __enter__(self):
+        if self.profiler == "pyinstrument":
+            from pyinstrument import Profiler
+
+            self._profiler = Profiler()
+            self._profiler.start()
+        else:
+            import cProfile
+
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+        return self
+
+    def __exit__(self, *exc):
+        if self.profiler == "pyinstrument":
+            self._profiler.stop()
+            self.report = self._profiler.output_text()
+            self.data, self.extension = self._profiler.output_html().encode(), "html"
+        else:
+            import io
+            import marshal
+            import pstats
+
+            self._profiler.disable()
+            out = io.StringIO()
+            stats = pstats.Stats(self._profiler, stream=out)
+            stats.sort_stats("cumulative").print_stats(self.top)
+            self.report = out.getvalue()
+            self._profiler.create_stats()
+            self.data, self.extension = marshal.dumps(self._profiler.stats), "prof"
+        return False
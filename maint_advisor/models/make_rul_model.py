@@ -0,0 +1,97 @@
+"""Build the small bundled RUL model, ``models/rul_model.onnx``.
+
+The model is a one-hidden-layer perceptron from four condition features to
+the remaining useful life in operating hours. It is fitted to a synthetic
+degradation law, not to field data: it exists so the RUL page and its
+benchmark work out of the box, and any ONNX model with the same input and
+output can replace it. The input scaling is folded into the first layer,
+so the graph is just ``Gemm -> Relu -> Gemm -> Relu``.
+
+Needs the ``onnx`` package, which the app itself does not. Run from the
+repository root::
+
+    python maint_advisor/models/make_rul_model.py
+"""
+
+import os
+
+import numpy as np
+
+FEATURES = ("operating_hours", "vibration_rms", "bearing_temperature", "health_index")
+HIDDEN = 16
+OPSET = 17
+OUTPUT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "rul_model.onnx")
+
+
+def degradation_law(x):
+    """Remaining life in hours of assets with features ``x`` (one row each)."""
+    hours, vibration, temperature, health = x.T
+    life = 40_000 * (health / 100) ** 1.5 - 0.25 * hours
+    life -= 1_500 * np.clip(vibration - 2.8, 0, None) + 120 * np.clip(temperature - 70, 0, None)
+    return np.clip(life, 0, None)
+
+
+def training_set(n=20_000, seed=0):
+    rng = np.random.default_rng(seed)
+    x = np.column_stack([
+        rng.uniform(0, 60_000, n),
+        rng.gamma(2.0, 1.5, n),
+        rng.normal(65, 10, n),
+        rng.uniform(5, 100, n),
+    ])
+    return x, degradation_law(x)
+
+
+def fit(x, y, seed=0):
+    """Random hidden layer and least-squares output layer; returns the four weight arrays."""
+    rng = np.random.default_rng(seed)
+    mean, std = x.mean(axis=0), x.std(axis=0)
+    w1 = rng.standard_normal((x.shape[1], HIDDEN))
+    b1 = rng.uniform(-1, 1, HIDDEN)
+    # Fold the standardization into the first layer.
+    w1, b1 = w1 / std[:, None], b1 - (mean / std) @ w1
+    hidden = np.maximum(x @ w1 + b1, 0)
+    design = np.column_stack([hidden, np.ones(len(x))])
+    coef = np.linalg.lstsq(design, y, rcond=None)[0]
+    return w1, b1, coef[:-1, None], coef[-1:]
+
+
+def build(weights):
+    import onnx
+    from onnx import TensorProto, helper, numpy_helper
+
+    names = ("w1", "b1", "w2", "b2")
+    graph = helper.make_graph(
+        [
+            helper.make_node("Gemm", ["features", "w1", "b1"], ["hidden_in"]),
+            helper.make_node("Relu", ["hidden_in"], ["hidden"]),
+            helper.make_node("Gemm", ["hidden", "w2", "b2"], ["rul_in"]),
+            helper.make_node("Relu", ["rul_in"], ["rul_hours"]),
+        ],
+        "rul_mlp",
+        [helper.make_tensor_value_info("features", TensorProto.FLOAT, ["batch", len(FEATURES)])],
+        [helper.make_tensor_value_info("rul_hours", TensorProto.FLOAT, ["batch", 1])],
+        [numpy_helper.from_array(w.astype(np.float32), name) for name, w in zip(names, weights)],
+    )
+    model = helper.make_model(graph, opset_imports=[helper.make_opsetid("", OPSET)],
+                              producer_name="maintenance-strategy-app")
+    model.ir_version = 8
+    helper.set_model_props(model, {"features": ",".join(FEATURES), "unit": "hours"})
+    onnx.checker.check_model(model)
+    return model
+
+
+def main():
+    import onnx
+
+    x, y = training_set()
+    weights = fit(x, y)
+    hidden = np.maximum(x @ weights[0] + weights[1], 0)
+    error = np.maximum(hidden @ weights[2] + weights[3], 0)[:, 0] - y
+    onnx.save(build(weights), OUTPUT)
+    print(f"wrote {OUTPUT} ({os.path.getsize(OUTPUT)} bytes), "
+          f"training MAE {np.abs(error).mean():,.0f} h on a mean RUL of {y.mean():,.0f} h")
+
+
+if __name__ == "__main__":
+    main()
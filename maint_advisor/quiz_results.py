@@ -0,0 +1,181 @@
+"""Quiz scoring, attempt storage and item analysis.
+
+Scored attempts are kept in a SQLite database. Which questions were answered
+correctly is stored as a bit mask per attempt, so the instructor statistics
+can load every attempt as one integer column and unpack it into a response
+matrix with NumPy.
+"""
+
+import contextlib
+import json
+import queue
+import sqlite3
+import threading
+import time
+
+from .content import QUIZ_QUESTIONS
+
+DEFAULT_DB = "quiz_results.db"
+
+
+def score_answers(answers, questions=QUIZ_QUESTIONS):
+    """Score one attempt.
+
+    ``answers`` holds the chosen option text for each question, in order.
+    Returns ``(score, correct)`` where ``correct`` is a list of booleans.
+    """
+    correct = [answer == options[correct_idx]
+               for answer, (_, options, correct_idx, _) in zip(answers, questions)]
+    return sum(correct), correct
+
+
+def correct_mask(correct):
+    """Pack a list of per-question booleans into an integer, question 1 in bit 0."""
+    return sum(1 << i for i, ok in enumerate(correct) if ok)
+
+
+def score_attempts(answers, questions=QUIZ_QUESTIONS):
+    """Score many attempts at once.
+
+    ``answers`` has one row per attempt and one column per question, holding
+    the chosen option text (or None). Returns ``(scores, masks)`` as int64
+    arrays, the masks packed as in ``correct_mask``.
+    """
+    import numpy as np
+
+    key = np.array([options[correct_idx] for _, options, correct_idx, _ in questions], dtype=object)
+    answers = np.asarray(answers, dtype=object)
+    if answers.ndim != 2 or answers.shape[1] > len(key):
+        raise ValueError(f"Expected at most {len(key)} answers per attempt, got shape {answers.shape}.")
+    correct = answers == key[:answers.shape[1]]
+    bits = np.left_shift(1, np.arange(answers.shape[1], dtype=np.int64))
+    return correct.sum(axis=1).astype(np.int64), correct.astype(np.int64) @ bits
+
+
+class QuizStore:
+    """SQLite store for scored attempts, shared by all sessions of a process.
+
+    Connections come from a small pool so concurrent submits do not open a
+    new connection each time or share one connection across threads.
+    """
+
+    def __init__(self, path=DEFAULT_DB, pool_size=4):
+        self.path = path
+        self._pool = queue.LifoQueue()
+        self._created = 0
+        self._pool_size = pool_size
+        self._lock = threading.Lock()
+        with self._connection() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS attempts ("
+                "id INTEGER PRIMARY KEY, "
+                "submitted_at REAL NOT NULL, "
+                "session TEXT, "
+                "score INTEGER NOT NULL, "
+                "correct_mask INTEGER NOT NULL, "
+                "answers TEXT NOT NULL)"
+            )
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None,
+                               check_same_thread=False)
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    @contextlib.contextmanager
+    def _connection(self):
+        try:
+            conn = self._pool.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                grow = self._created < self._pool_size
+                if grow:
+                    self._created += 1
+            conn = self._connect() if grow else self._pool.get()
+        try:
+            yield conn
+        finally:
+            self._pool.put(conn)
+
+    def record_attempt(self, answers, session=None, questions=QUIZ_QUESTIONS):
+        """Score and store one attempt; returns ``(score, correct)``."""
+        score, correct = score_answers(answers, questions)
+        with self._connection() as conn:
+            conn.execute(
+                "INSERT INTO attempts (submitted_at, session, score, correct_mask, answers) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (time.time(), session, score, correct_mask(correct), json.dumps(list(answers))),
+            )
+        return score, correct
+
+    def record_many(self, rows):
+        """Bulk insert ``(submitted_at, session, score, correct_mask, answers)`` rows."""
+        with self._connection() as conn:
+            conn.execute("BEGIN")
+            conn.executemany(
+                "INSERT INTO attempts (submitted_at, session, score, correct_mask, answers) "
+                "VALUES (?, ?, ?, ?, ?)",
+                rows,
+            )
+            conn.execute("COMMIT")
+
+    def version(self):
+        """Id of the latest attempt; changes whenever an attempt is added."""
+        with self._connection() as conn:
+            return conn.execute("SELECT COALESCE(MAX(id), 0) FROM attempts").fetchone()[0]
+
+    def response_matrix(self, n_items=len(QUIZ_QUESTIONS)):
+        """All attempts as an ``(attempts, n_items)`` uint8 array of 0/1."""
+        import numpy as np
+
+        with self._connection() as conn:
+            masks = np.fromiter(
+                (row[0] for row in conn.execute("SELECT correct_mask FROM attempts")),
+                dtype=np.int64,
+            )
+        return ((masks[:, None] >> np.arange(n_items)) & 1).astype(np.uint8)
+
+    def close(self):
+        while True:
+            try:
+                self._pool.get_nowait().close()
+            except queue.Empty:
+                break
+
+
+def item_statistics(responses, group_fraction=0.27):
+    """Classical item analysis of a 0/1 response matrix.
+
+    Returns one row per question with
+
+    * ``difficulty``: proportion of attempts answering correctly (p-value);
+    * ``discrimination``: p in the top ``group_fraction`` of attempts by
+      total score minus p in the bottom group (upper-lower index);
+    * ``point_biserial``: correlation between the item and the total score
+      of the other items.
+    """
+    import numpy as np
+    import pandas as pd
+
+    responses = pd.DataFrame(np.asarray(responses, dtype=np.float64),
+                             columns=[f"Q{i + 1}" for i in range(np.shape(responses)[1])])
+    n = len(responses)
+    total = responses.sum(axis=1)
+    order = total.sort_values(kind="stable").index
+    k = max(1, int(round(n * group_fraction))) if n else 0
+    lower = responses.loc[order[:k]].mean()
+    upper = responses.loc[order[n - k:]].mean()
+
+    rest = total.to_numpy()[:, None] - responses.to_numpy()
+    item = responses.to_numpy()
+    item_c = item - item.mean(axis=0)
+    rest_c = rest - rest.mean(axis=0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        r = (item_c * rest_c).sum(axis=0) / np.sqrt((item_c ** 2).sum(axis=0) * (rest_c ** 2).sum(axis=0))
+
+    return pd.DataFrame({
+        "difficulty": responses.mean(),
+        "discrimination": upper - lower,
+        "point_biserial": r,
+    })
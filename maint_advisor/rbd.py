@@ -0,0 +1,368 @@
+"""Reliability block diagrams: system availability and MTBF from component MTBF/MTTR.
+
+A diagram is a tree of ``series``, ``parallel`` and ``k_of_n`` blocks whose
+leaves are components with an MTBF and an MTTR in hours. Components are
+independent two-state repairable items with availability
+``A = MTBF / (MTBF + MTTR)`` and failure frequency ``w = 1 / (MTBF + MTTR)``.
+Every block is evaluated bottom-up from its children:
+
+* availability: product of the children for ``series``, one minus the
+  product of the unavailabilities for ``parallel``, and the probability
+  that at least ``k`` children are up for ``k_of_n``;
+* failure frequency: ``sum_c dA/dA_c * w_c``, where ``dA/dA_c`` is the
+  block's local Birnbaum importance of child ``c`` (the probability that
+  the child is critical);
+* MTBF (mean up time) ``A / w`` and MTTR (mean down time) ``(1 - A) / w``,
+  so ``A = MTBF / (MTBF + MTTR)`` holds for every block as for a component.
+
+The node values and local derivatives are kept, so ``update`` of one
+component re-evaluates only the blocks on its path to the root, and the
+Birnbaum importance of every component is one top-down product over the
+stored derivatives. ``sweep`` evaluates many what-if scenarios at once
+with NumPy arrays, re-evaluating only the blocks above the swept
+components.
+
+A structure is a nested mapping, from JSON or YAML::
+
+    {"name": "Unit 1", "type": "series", "children": [
+        "FWP-FEED",
+        {"type": "k_of_n", "k": 2, "children": ["P-101A", "P-101B", "P-101C"]}]}
+
+A child given as a string (or ``{"component": id}``) is a component of the
+component table; each component may appear once.
+"""
+
+import json
+
+import numpy as np
+import pandas as pd
+
+LEAF, SERIES, PARALLEL, K_OF_N = range(4)
+BLOCK_TYPES = {"series": SERIES, "parallel": PARALLEL, "k_of_n": K_OF_N}
+TYPE_NAMES = {LEAF: "component", SERIES: "series", PARALLEL: "parallel", K_OF_N: "k_of_n"}
+
+# Common headings for the component table columns; the per-asset KPI tables
+# of the work-order reader can be used directly.
+COMPONENT_ALIASES = {
+    "asset": "component",
+    "tag": "component",
+    "id": "component",
+    "mtbf_(h)": "mtbf",
+    "mttr_(h)": "mttr",
+}
+
+
+def _canonical_column(name):
+    key = str(name).strip().lower().replace(" ", "_").replace("-", "_")
+    return COMPONENT_ALIASES.get(key, key)
+
+
+def read_components(file, name=None):
+    """Read a component table (``component``, ``mtbf``, ``mttr``) from CSV or Parquet, or a DataFrame."""
+    if isinstance(file, pd.DataFrame):
+        table = file
+    else:
+        name = str(name or getattr(file, "name", None) or file).lower()
+        table = pd.read_parquet(file) if name.endswith((".parquet", ".pq")) else pd.read_csv(file)
+    if table.index.name is not None:
+        table = table.reset_index()
+    return table.rename(columns=_canonical_column)
+
+
+def load_structure(file, name=None):
+    """Read a structure definition from a JSON or YAML file or file-like object.
+
+    YAML needs PyYAML, which is not a dependency of this package.
+    """
+    name = str(name or getattr(file, "name", None) or file).lower()
+    if isinstance(file, (str, bytes)) or hasattr(file, "__fspath__"):
+        with open(file, "rb") as f:
+            return load_structure(f, name)
+    text = file.read()
+    if isinstance(text, bytes):
+        text = text.decode("utf-8-sig")
+    if name.endswith((".yaml", ".yml")):
+        try:
+            import yaml
+        except ImportError:
+            raise ValueError("Reading YAML structures needs PyYAML (pip install PyYAML); "
+                             "or give the structure as JSON.") from None
+        return yaml.safe_load(text)
+    try:
+        return json.loads(text)
+    except json.JSONDecodeError as exc:
+        raise ValueError(f"Invalid JSON structure: {exc}") from None
+
+
+def _component_rates(mtbf, mttr):
+    """Availability and failure frequency arrays, with the inputs checked."""
+    mtbf = np.asarray(mtbf, dtype=np.float64)
+    mttr = np.asarray(mttr, dtype=np.float64)
+    if not (np.all(mtbf > 0) and np.all(mttr >= 0)):
+        raise ValueError("Component MTBF must be positive and MTTR non-negative.")
+    cycle = mtbf + mttr
+    return mtbf / cycle, 1.0 / cycle
+
+
+def _leave_one_out_products(values):
+    """Product of all rows but one, for each row of a ``(children, batch)`` array.
+
+    Built from prefix and suffix products, so a zero in one row does not
+    turn the others into 0/0.
+    """
+    ones = np.ones((1,) + values.shape[1:])
+    prefix = np.cumprod(np.concatenate([ones, values[:-1]]), axis=0)
+    suffix = np.cumprod(np.concatenate([ones, values[:0:-1]]), axis=0)[::-1]
+    return prefix * suffix
+
+
+def _count_distributions(p, cap):
+    """Prefix distributions of the number of successes, exact for counts ``0 .. cap``.
+
+    ``p`` has shape ``(children, batch)``; returns ``(children + 1, cap + 1, batch)``
+    where entry ``i`` is the distribution over the first ``i`` children.
+    """
+    n = len(p)
+    out = np.zeros((n + 1, cap + 1) + p.shape[1:])
+    out[0, 0] = 1.0
+    for i in range(n):
+        out[i + 1] = out[i] * (1 - p[i])
+        out[i + 1, 1:] += out[i, :-1] * p[i]
+    return out
+
+
+def _k_of_n(a, k):
+    """Availability of a k-out-of-n block and its derivative with respect to each child.
+
+    The derivative for child ``c`` is the probability that exactly ``k - 1``
+    of the other children are up. Counts are tracked up to ``k - 1`` up
+    children, or up to ``n - k`` down children when that is fewer.
+    """
+    n = len(a)
+    count_down = n - k < k - 1
+    p, target = (1 - a, n - k) if count_down else (a, k - 1)
+    prefix = _count_distributions(p, target)
+    suffix = _count_distributions(p[::-1], target)[::-1]
+    # Leave-one-out: exactly `target` among the others, from the prefix before
+    # and the suffix after each child.
+    others = np.einsum("ij...,ij...->i...", prefix[:-1], suffix[1:, ::-1])
+    at_most = prefix[-1].sum(axis=0)  # P(count <= target) over all children
+    # Up when at most n - k children are down, or when not at most k - 1 are up.
+    return (at_most if count_down else 1 - at_most), others
+
+
+def _combine(kind, k, a, w):
+    """Availability, failure frequency and local derivatives of one block."""
+    if kind == SERIES:
+        derivative = _leave_one_out_products(a)
+        availability = derivative[0] * a[0]
+    elif kind == PARALLEL:
+        derivative = _leave_one_out_products(1 - a)
+        availability = 1 - derivative[0] * (1 - a[0])
+    else:
+        availability, derivative = _k_of_n(a, k)
+    return availability, (derivative * w).sum(axis=0), derivative
+
+
+class ReliabilityBlockDiagram:
+    """A reliability block diagram evaluated over a component table.
+
+    Parameters
+    ----------
+    structure : dict
+        Nested block definition, see the module docstring.
+    components : DataFrame
+        One row per component with ``component``, ``mtbf`` and ``mttr``
+        columns (hours). Components not used in ``structure`` are ignored.
+    """
+
+    def __init__(self, structure, components):
+        components = components.rename(columns=_canonical_column)
+        missing = [c for c in ("component", "mtbf", "mttr") if c not in components.columns]
+        if missing:
+            raise ValueError(f"Component table is missing columns: {', '.join(missing)}")
+        table = (components.assign(component=components["component"].astype(str))
+                 .drop_duplicates("component", keep="last").set_index("component"))
+        self._parse(structure)
+        unknown = [c for c in self.leaves if c not in table.index]
+        if unknown:
+            raise ValueError(f"{len(unknown)} components of the structure are not in the component table, "
+                             f"e.g. {', '.join(unknown[:5])}")
+        leaves = np.fromiter(self.leaves.values(), dtype=np.int64, count=len(self.leaves))
+        self.mtbf = np.full(len(self.kinds), np.nan)
+        self.mttr = np.full(len(self.kinds), np.nan)
+        self.mtbf[leaves] = pd.to_numeric(table.loc[list(self.leaves), "mtbf"], errors="coerce").to_numpy()
+        self.mttr[leaves] = pd.to_numeric(table.loc[list(self.leaves), "mttr"], errors="coerce").to_numpy()
+        self.availability = np.empty(len(self.kinds))
+        self.frequency = np.empty(len(self.kinds))
+        # d A(parent) / d A(node), filled in when the parent is evaluated.
+        self.local_importance = np.ones(len(self.kinds))
+        self.availability[leaves], self.frequency[leaves] = _component_rates(self.mtbf[leaves], self.mttr[leaves])
+        # Children always come after their parent, so reverse order is bottom-up.
+        for node in reversed(range(len(self.kinds))):
+            if self.kinds[node] != LEAF:
+                self._evaluate(node)
+
+    @classmethod
+    def from_files(cls, structure_file, components_file, structure_name=None, components_name=None):
+        return cls(load_structure(structure_file, structure_name),
+                   read_components(components_file, components_name))
+
+    def _parse(self, structure):
+        """Number the nodes depth-first, so every child comes after its parent."""
+        self.kinds, self.ks, self.names, self.parents, self.depths = [], [], [], [], []
+        self.children = []
+        self.leaves = {}
+        stack = [(structure, -1, 0)]
+        while stack:
+            spec, parent, depth = stack.pop()
+            node = len(self.kinds)
+            if parent >= 0:
+                self.children[parent].append(node)
+            if isinstance(spec, dict) and "component" in spec:
+                spec = spec["component"]
+            if isinstance(spec, (str, int, float)):
+                component = str(spec)
+                if component in self.leaves:
+                    raise ValueError(f"Component {component!r} appears more than once; blocks must be independent.")
+                self.leaves[component] = node
+                kind, k, name, blocks = LEAF, 0, component, []
+            elif isinstance(spec, dict):
+                kind = BLOCK_TYPES.get(str(spec.get("type", "series")).lower().replace("-", "_"))
+                blocks = spec.get("children", spec.get("blocks"))
+                name = str(spec.get("name", f"{spec.get('type', 'series')} #{node}"))
+                if kind is None:
+                    raise ValueError(f"{name}: unknown block type {spec.get('type')!r}; "
+                                     f"expected one of {', '.join(BLOCK_TYPES)}.")
+                if not blocks:
+                    raise ValueError(f"{name}: a block needs a non-empty 'children' list.")
+                k = int(spec.get("k", 0)) if kind == K_OF_N else 0
+                if kind == K_OF_N and not 1 <= k <= len(blocks):
+                    raise ValueError(f"{name}: k must be between 1 and the number of children ({len(blocks)}).")
+            else:
+                raise ValueError(f"Invalid block definition: {spec!r}")
+            self.kinds.append(kind)
+            self.ks.append(k)
+            self.names.append(name)
+            self.parents.append(parent)
+            self.depths.append(depth)
+            self.children.append([])
+            stack.extend((child, node, depth + 1) for child in reversed(blocks))
+        self.kinds = np.array(self.kinds)
+        self.parents = np.array(self.parents)
+        self.children = [np.array(c, dtype=np.int64) for c in self.children]
+
+    def _evaluate(self, node):
+        children = self.children[node]
+        availability, frequency, derivative = _combine(
+            self.kinds[node], self.ks[node], self.availability[children], self.frequency[children])
+        self.availability[node], self.frequency[node] = availability, frequency
+        self.local_importance[children] = derivative
+
+    def update(self, component, mtbf=None, mttr=None):
+        """Change one component and re-evaluate the blocks above it; returns ``system()``."""
+        try:
+            node = self.leaves[str(component)]
+        except KeyError:
+            raise ValueError(f"Unknown component {component!r}") from None
+        if mtbf is not None:
+            self.mtbf[node] = mtbf
+        if mttr is not None:
+            self.mttr[node] = mttr
+        self.availability[node], self.frequency[node] = _component_rates(self.mtbf[node], self.mttr[node])
+        node = self.parents[node]
+        while node >= 0:
+            self._evaluate(node)
+            node = self.parents[node]
+        return self.system()
+
+    def system(self):
+        """System availability, MTBF and MTTR (hours) and failures per year, as a dict."""
+        return _summary(self.availability[0], self.frequency[0])
+
+    def nodes(self):
+        """One row per block and component, in depth-first order."""
+        return pd.DataFrame({
+            "name": self.names,
+            "type": [TYPE_NAMES[k] for k in self.kinds],
+            "depth": self.depths,
+            "parent": self.parents,
+            **_summary(self.availability, self.frequency),
+        })
+
+    def importance(self):
+        """Component importance, most important first.
+
+        ``birnbaum`` is dA_system/dA_component. ``criticality`` is the
+        probability that the component is down given that the system is
+        down. ``failure_share`` is the share of system failures that the
+        component's failures cause.
+        """
+        birnbaum = np.empty(len(self.kinds))
+        birnbaum[0] = 1.0
+        for node in range(1, len(self.kinds)):
+            birnbaum[node] = birnbaum[self.parents[node]] * self.local_importance[node]
+        leaves = np.fromiter(self.leaves.values(), dtype=np.int64, count=len(self.leaves))
+        b = birnbaum[leaves]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            criticality = b * (1 - self.availability[leaves]) / (1 - self.availability[0])
+            share = b * self.frequency[leaves] / self.frequency[0]
+        table = pd.DataFrame({
+            "component": list(self.leaves),
+            "mtbf": self.mtbf[leaves],
+            "mttr": self.mttr[leaves],
+            "availability": self.availability[leaves],
+            "birnbaum": b,
+            "criticality": criticality,
+            "failure_share": share,
+        })
+        return table.sort_values("birnbaum", ascending=False, kind="stable").reset_index(drop=True)
+
+    def sweep(self, changes):
+        """System results for a batch of what-if scenarios.
+
+        ``changes`` maps component -> ``{"mtbf": values, "mttr": values}``;
+        the value arrays (or scalars) broadcast to one length, one entry per
+        scenario. Only the blocks above the changed components are
+        re-evaluated, on arrays over all scenarios at once. Returns a
+        DataFrame with one row per scenario.
+        """
+        overrides = {}
+        for component, params in changes.items():
+            try:
+                node = self.leaves[str(component)]
+            except KeyError:
+                raise ValueError(f"Unknown component {component!r}") from None
+            overrides[node] = (params.get("mtbf", self.mtbf[node]), params.get("mttr", self.mttr[node]))
+        batch = np.broadcast_shapes(*(np.shape(v) for pair in overrides.values() for v in pair)) or (1,)
+        values = {}
+        for node, (mtbf, mttr) in overrides.items():
+            a, w = _component_rates(np.broadcast_to(mtbf, batch), np.broadcast_to(mttr, batch))
+            values[node] = (a, w)
+        affected = set()
+        for node in overrides:
+            node = self.parents[node]
+            while node >= 0 and node not in affected:
+                affected.add(node)
+                node = self.parents[node]
+        for node in sorted(affected, reverse=True):
+            children = self.children[node]
+            a = np.empty((len(children),) + batch)
+            w = np.empty((len(children),) + batch)
+            for i, child in enumerate(children):
+                a[i], w[i] = values.get(child, (self.availability[child], self.frequency[child]))
+            availability, frequency, _ = _combine(self.kinds[node], self.ks[node], a, w)
+            values[node] = availability, frequency
+        availability, frequency = values.get(0, (np.broadcast_to(self.availability[0], batch),
+                                                 np.broadcast_to(self.frequency[0], batch)))
+        return pd.DataFrame(_summary(availability, frequency))
+
+
+def _summary(availability, frequency):
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return {
+            "availability": availability,
+            "mtbf": availability / frequency,
+            "mttr": (1 - availability) / frequency,
+            "failures_per_year": frequency * 8760,
+        }
@@ -0,0 +1,150 @@
+"""Maintenance strategy recommendation rules.
+
+``recommend`` is the rule chain behind the Strategy Recommendation Tool for a
+single asset. ``recommend_fleet`` applies the same rules to a whole asset
+register: every combination of the five inputs is evaluated once into a
+243-entry decision table, and each row of the register is mapped to it with a
+vectorized index lookup. NumPy and pandas are only imported by the fleet
+functions, so the single-asset page stays light.
+"""
+
+import functools
+import itertools
+
+CRITICALITY = ("High", "Medium", "Low")
+ENVIRONMENT = ("Harsh", "Normal", "Clean")
+FAILURE_HISTORY = ("Frequent", "Occasional", "Rare")
+MAINTENANCE_COST = ("High", "Medium", "Low")
+DOWNTIME_COST = ("High", "Medium", "Low")
+
+# Register columns and their allowed values, in decision-table order.
+FACTORS = {
+    "criticality": CRITICALITY,
+    "environment": ENVIRONMENT,
+    "failure_history": FAILURE_HISTORY,
+    "maintenance_cost": MAINTENANCE_COST,
+    "downtime_cost": DOWNTIME_COST,
+}
+
+RTF = ("Run-to-Failure (RTF)",
+       "Non-critical asset with rare failures. Let it run until it fails.",
+       "Small lights, backup indicators.")
+CBM = ("Condition-Based Maintenance (CBM)",
+       "Critical asset in harsh conditions benefits from monitoring sensors.",
+       "Pumps with vibration sensors, motors with IR thermography.")
+TBM = ("Time-Based Maintenance (TBM)",
+       "Frequent failures warrant a routine schedule.",
+       "Monthly maintenance of air filters.")
+RCM = ("Reliability-Centered Maintenance (RCM)",
+       "Critical and costly failures justify detailed RCM analysis.",
+       "Turbine system, excitation panel.")
+PM = ("Preventive Maintenance (PM)",
+      "Standard scheduled checks fit this scenario.",
+      "Lubrication plans, visual inspections.")
+
+STRATEGIES = (RTF, CBM, TBM, RCM, PM)
+
+
+def recommend(criticality, environment, failure_history, maintenance_cost, downtime_cost):
+    """Return ``(recommendation, reason, examples)`` for one asset."""
+    if criticality == "Low" and failure_history == "Rare":
+        return RTF
+    elif criticality == "High" and environment == "Harsh" and failure_history != "Rare":
+        return CBM
+    elif criticality == "Medium" and failure_history == "Frequent":
+        return TBM
+    elif criticality == "High" and downtime_cost == "High" and maintenance_cost == "High":
+        return RCM
+    else:
+        return PM
+
+
+@functools.lru_cache(maxsize=None)
+def decision_table():
+    """Index into ``STRATEGIES`` for every input combination.
+
+    The flat index of a combination is its position in
+    ``itertools.product(*FACTORS.values())``. Built once per process.
+    """
+    import numpy as np
+
+    table = np.empty(3 ** len(FACTORS), dtype=np.int8)
+    for i, combo in enumerate(itertools.product(*FACTORS.values())):
+        table[i] = STRATEGIES.index(recommend(*combo))
+    table.flags.writeable = False
+    return table
+
+
+def _normalize_column_name(name):
+    return str(name).strip().lower().replace(" ", "_").replace("-", "_")
+
+
+def _factor_codes(values, name, levels):
+    """Map a column to level positions (0-2), ignoring case and whitespace."""
+    import numpy as np
+    import pandas as pd
+
+    codes, uniques = pd.factorize(values)
+    lookup = {level.lower(): i for i, level in enumerate(levels)}
+    mapped = np.array([lookup.get(str(u).strip().lower(), -1) for u in uniques], dtype=np.int64)
+    bad = [u for u, m in zip(uniques, mapped) if m < 0]
+    if bad or (codes < 0).any():
+        if (codes < 0).any():
+            bad.append("<missing>")
+        raise ValueError(
+            f"Column '{name}' has unsupported values {bad[:5]}; "
+            f"expected one of {list(levels)}."
+        )
+    return mapped[codes]
+
+
+def recommend_fleet(register):
+    """Recommend a strategy for every asset in ``register``.
+
+    Parameters
+    ----------
+    register : pandas.DataFrame
+        One row per asset with the columns in ``FACTORS``. Column names are
+        matched case-insensitively, with spaces treated as underscores.
+
+    Returns
+    -------
+    pandas.DataFrame
+        ``recommendation``, ``reason`` and ``examples`` as categorical
+        columns, indexed like ``register``.
+    """
+    import numpy as np
+    import pandas as pd
+
+    columns = {_normalize_column_name(c): c for c in register.columns}
+    missing = [name for name in FACTORS if name not in columns]
+    if missing:
+        raise ValueError(f"Asset register is missing columns: {', '.join(missing)}")
+
+    flat = np.zeros(len(register), dtype=np.int64)
+    for name, levels in FACTORS.items():
+        flat = flat * len(levels) + _factor_codes(register[columns[name]].to_numpy(), name, levels)
+    strategy = decision_table()[flat]
+
+    return pd.DataFrame(
+        {
+            field: pd.Categorical.from_codes(strategy, categories=[s[i] for s in STRATEGIES])
+            for i, field in enumerate(("recommendation", "reason", "examples"))
+        },
+        index=register.index,
+    )
+
+
+def read_asset_register(file, name=None):
+    """Read an asset register from a CSV or Parquet file or file-like object.
+
+    A DataFrame, e.g. from ``datasets.DatasetStore.frame``, is returned as it is.
+    """
+    import pandas as pd
+
+    if isinstance(file, pd.DataFrame):
+        return file
+    name = name or getattr(file, "name", None) or str(file)
+    if str(name).lower().endswith((".parquet", ".pq")):
+        return pd.read_parquet(file)
+    return pd.read_csv(file)
@@ -0,0 +1,234 @@
+"""Cost-optimal preventive replacement intervals for Weibull assets.
+
+Two classic policies, with ``c_p`` the cost of a preventive replacement and
+``c_f`` the cost of a failure replacement:
+
+* age replacement: replace at failure or at age ``T``, whichever comes
+  first. Long-run cost rate
+  ``C(T) = (c_p R(T) + c_f F(T)) / integral_0^T R(t) dt``;
+* block replacement: replace at failure and at every multiple of ``T``
+  regardless of age. Long-run cost rate ``C(T) = (c_p + c_f M(T)) / T``,
+  with ``M`` the renewal function.
+
+Times are scaled by the Weibull scale ``eta``, so every curve depends on the
+shape ``beta`` only. The cost rates of all assets are evaluated on one grid
+of ``T / eta`` values as ``(assets, grid)`` arrays, the best grid point is
+refined on a finer local grid, and the renewal function comes from a
+table over ``beta`` built once per process (shapes above ``BETA_MAX`` are
+solved directly). A finite optimum exists only
+for an increasing hazard (``beta > 1``) and ``c_f > c_p``; otherwise, or if
+preventive replacement does not pay off within ``MAX_SCALED_INTERVAL * eta``,
+the interval is reported as infinite, i.e. run to failure.
+"""
+
+import functools
+import math
+
+import numpy as np
+
+MAX_SCALED_INTERVAL = 3.0
+GRID_POINTS = 400
+REFINE_POINTS = 64
+# Renewal-function table over beta.
+BETA_STEP = 0.01
+BETA_MAX = 10.0
+CHUNK_ASSETS = 4096
+
+
+def _grid():
+    return np.linspace(0.0, MAX_SCALED_INTERVAL, GRID_POINTS + 1)
+
+
+def _renewal(u, beta):
+    """Weibull renewal function on the uniform grid ``u`` for each shape in ``beta``.
+
+    Solves the renewal equation ``M = F + M * dF`` with the Riemann-Stieltjes
+    trapezoid scheme of Xie (1989). Returns an array ``(len(beta), len(u))``.
+    """
+    f = -np.expm1(-u[None, :] ** np.asarray(beta, dtype=np.float64)[:, None])
+    df = np.diff(f, axis=1)
+    m = np.zeros_like(f)
+    for k in range(1, u.size):
+        # Terms j = 2..k use known values M[k-j] and M[k-j+1].
+        mid = m[:, k - 1:0:-1] + m[:, k - 2::-1] if k > 1 else m[:, :0]
+        rest = 0.5 * np.einsum("bj,bj->b", mid, df[:, 1:k])
+        m[:, k] = (f[:, k] + 0.5 * m[:, k - 1] * df[:, 0] + rest) / (1.0 - 0.5 * df[:, 0])
+    return m
+
+
+@functools.lru_cache(maxsize=None)
+def renewal_table():
+    """``(betas, M)``: renewal function on the scaled grid for shapes 1 to ``BETA_MAX``.
+
+    Built once per process; shapes are looked up to the nearest ``BETA_STEP``.
+    """
+    betas = np.round(np.arange(1.0, BETA_MAX + BETA_STEP / 2, BETA_STEP), 2)
+    table = _renewal(_grid(), betas)
+    table.flags.writeable = False
+    return betas, table
+
+
+def _renewal_rows(beta):
+    """Renewal function rows for each shape: from the table up to ``BETA_MAX``, solved above it."""
+    betas, table = renewal_table()
+    index = np.clip(np.rint((beta - betas[0]) / BETA_STEP), 0, betas.size - 1).astype(np.intp)
+    rows = table[index]
+    high = beta > BETA_MAX
+    if high.any():
+        shapes, inverse = np.unique(beta[high], return_inverse=True)
+        rows[high] = _renewal(_grid(), shapes)[inverse]
+    return rows
+
+
+def _interp_rows(x, y, h):
+    """Linear interpolation of rows ``y`` on the uniform grid with step ``h`` at ``x``."""
+    pos = x / h
+    i = np.clip(np.floor(pos).astype(np.intp), 0, y.shape[1] - 2)
+    w = pos - i
+    lo = np.take_along_axis(y, i, axis=1)
+    hi = np.take_along_axis(y, i + 1, axis=1)
+    return lo + w * (hi - lo)
+
+
+def _age_rate(u, beta, cp, cf, integral):
+    survival = np.exp(-u ** beta[:, None])
+    return (cp[:, None] * survival + cf[:, None] * (1 - survival)) / integral
+
+
+def _block_rate(u, cp, cf, m):
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return (cp[:, None] + cf[:, None] * m) / u
+
+
+def _cumulative_integral(u, values, start=None):
+    steps = 0.5 * (values[:, 1:] + values[:, :-1]) * np.diff(u, axis=-1)
+    out = np.concatenate([np.zeros((values.shape[0], 1)), np.cumsum(steps, axis=1)], axis=1)
+    return out if start is None else out + start[:, None]
+
+
+def _optimize_chunk(beta, cp, cf):
+    """Optimal scaled intervals and cost rates (per unit of ``eta``) for one chunk."""
+    u = _grid()
+    h = u[1]
+    rows = np.arange(beta.size)
+    survival = np.exp(-u[None, :] ** beta[:, None])
+    integral = _cumulative_integral(u, survival)
+    m = _renewal_rows(beta)
+    # Run-to-failure cost rate: c_f / MTTF.
+    rtf = cf / np.array([math.gamma(1 + 1 / b) for b in beta])
+
+    out = {}
+    with np.errstate(divide="ignore", invalid="ignore"):
+        age = _age_rate(u, beta, cp, cf, integral)
+    block = _block_rate(u, cp, cf, m)
+    for name, rate in (("age", age), ("block", block)):
+        rate[:, 0] = np.inf
+        k = np.clip(np.argmin(rate, axis=1), 1, GRID_POINTS - 1)
+        # Refine between the neighbouring grid points.
+        fine = u[k - 1][:, None] + np.linspace(0.0, 2 * h, REFINE_POINTS + 1)[None, :]
+        if name == "age":
+            fine_integral = _cumulative_integral(fine, np.exp(-fine ** beta[:, None]),
+                                                 start=integral[rows, k - 1])
+            fine_rate = _age_rate(fine, beta, cp, cf, fine_integral)
+        else:
+            fine_rate = _block_rate(fine, cp, cf, _interp_rows(fine, m, h))
+        j = np.argmin(fine_rate, axis=1)
+        best_u, best_rate = fine[rows, j], fine_rate[rows, j]
+        # No finite optimum: the minimum sits on the edge of the grid or
+        # preventive replacement is no cheaper than running to failure.
+        none = ((beta <= 1) | (cf <= cp) | (np.argmin(rate, axis=1) >= GRID_POINTS - 1)
+                | ~(best_rate < rtf))
+        out[name] = (np.where(none, np.inf, best_u), np.where(none, rtf, best_rate))
+    return out, rtf
+
+
+def optimal_intervals(beta, eta, pm_cost, failure_cost):
+    """Cost-optimal age- and block-replacement intervals for many assets.
+
+    All arguments broadcast to one shape per asset. Returns a DataFrame with
+    ``age_interval``, ``age_cost_rate``, ``block_interval``,
+    ``block_cost_rate`` and ``rtf_cost_rate`` (cost per time unit of
+    ``eta``), and the saving of each policy against running to failure.
+    Intervals are infinite where no preventive replacement pays off.
+    """
+    import pandas as pd
+
+    beta, eta, cp, cf = (np.ravel(a).astype(np.float64)
+                         for a in np.broadcast_arrays(beta, eta, pm_cost, failure_cost))
+    if not (np.all(beta > 0) and np.all(eta > 0)):
+        raise ValueError("Weibull shape and scale must be positive.")
+    if np.any(cp < 0) or np.any(cf < 0):
+        raise ValueError("Costs must not be negative.")
+
+    columns = {name: np.empty(beta.size) for name in
+               ("age_interval", "age_cost_rate", "block_interval", "block_cost_rate", "rtf_cost_rate")}
+    for start in range(0, beta.size, CHUNK_ASSETS):
+        s = slice(start, start + CHUNK_ASSETS)
+        chunk, rtf = _optimize_chunk(beta[s], cp[s], cf[s])
+        for name, (u, rate) in chunk.items():
+            columns[f"{name}_interval"][s] = u * eta[s]
+            columns[f"{name}_cost_rate"][s] = rate / eta[s]
+        columns["rtf_cost_rate"][s] = rtf / eta[s]
+
+    result = pd.DataFrame(columns)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        result["age_saving"] = 1 - result["age_cost_rate"] / result["rtf_cost_rate"]
+        result["block_saving"] = 1 - result["block_cost_rate"] / result["rtf_cost_rate"]
+    return result
+
+
+def cost_rate_curves(beta, eta, pm_cost, failure_cost, points=200):
+    """Age- and block-replacement cost rates of one asset against the interval.
+
+    Returns a DataFrame indexed by interval with ``age``, ``block`` and
+    ``run_to_failure`` columns, for plotting.
+    """
+    import pandas as pd
+
+    u = _grid()
+    beta_ = np.array([float(beta)])
+    cp, cf = np.array([float(pm_cost)]), np.array([float(failure_cost)])
+    integral = _cumulative_integral(u, np.exp(-u[None, :] ** beta_[:, None]))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        age = _age_rate(u, beta_, cp, cf, integral)[0]
+    block = (_block_rate(u, cp, cf, _renewal(u, beta_))[0] if beta_[0] < 1
+             else _block_rate(u, cp, cf, _renewal_rows(beta_))[0])
+    keep = np.unique(np.linspace(1, GRID_POINTS, points).astype(int))
+    return pd.DataFrame({
+        "age": age[keep] / eta,
+        "block": block[keep] / eta,
+        "run_to_failure": cf[0] / math.gamma(1 + 1 / beta_[0]) / eta,
+    }, index=pd.Index(u[keep] * eta, name="interval"))
+
+
+def optimize_fleet(table, pm_cost=None, failure_cost=None):
+    """Optimal intervals for every row of an asset table.
+
+    ``table`` needs ``beta`` and ``eta`` columns, e.g. the Weibull results of
+    the Bathtub Curve page. ``pm_cost`` and ``failure_cost`` columns are used
+    where present; otherwise, and for missing values, the arguments apply.
+    Rows without a usable fit get empty results. Returns ``table`` with the
+    columns of ``optimal_intervals`` appended.
+    """
+    import pandas as pd
+
+    columns = {str(c).strip().lower().replace(" ", "_"): c for c in table.columns}
+    missing = [name for name in ("beta", "eta") if name not in columns]
+    if missing:
+        raise ValueError(f"Asset table is missing columns: {', '.join(missing)}")
+
+    def column(name, default):
+        values = (pd.to_numeric(table[columns[name]], errors="coerce") if name in columns
+                  else pd.Series(np.nan, index=table.index))
+        values = values.fillna(default) if default is not None else values
+        if values.isna().any():
+            raise ValueError(f"Give a default {name.replace('_', ' ')} or a complete '{name}' column.")
+        return values.to_numpy(np.float64)
+
+    beta = pd.to_numeric(table[columns["beta"]], errors="coerce").to_numpy(np.float64)
+    eta = pd.to_numeric(table[columns["eta"]], errors="coerce").to_numpy(np.float64)
+    cp, cf = column("pm_cost", pm_cost), column("failure_cost", failure_cost)
+    usable = (beta > 0) & (eta > 0)
+    result = optimal_intervals(beta[usable], eta[usable], cp[usable], cf[usable])
+    result.index = table.index[usable]
+    return pd.concat([table, result.reindex(table.index)], axis=1)
@@ -0,0 +1,185 @@
+"""Remaining-useful-life (RUL) prediction with ONNX Runtime.
+
+A ``RulPredictor`` loads an ONNX model once into a single
+``InferenceSession`` shared by every thread of the process. Requests are
+not run one by one: a background thread takes the first request from a
+queue, collects the requests already waiting behind it (up to
+``max_batch`` rows, optionally waiting ``max_wait_ms`` for more) and
+answers all of them with one ``run()`` call. Requests that arrive while a
+batch runs form the next one, so an idle service adds no delay and a busy
+one pays the fixed cost of a call once per batch instead of once per
+request.
+
+The model takes a float32 ``(rows, features)`` matrix and returns the RUL
+of each row. Feature names and the output unit are read from the model's
+metadata (``features`` and ``unit``); the bundled ``models/rul_model.onnx``
+is a small demonstration model built by ``models/make_rul_model.py``.
+"""
+
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+import numpy as np
+
+DEFAULT_MODEL = os.path.join(os.path.dirname(os.path.abspath(__file__)), "models", "rul_model.onnx")
+MAX_BATCH = 4096
+MAX_WAIT_MS = 0.0
+
+
+def session_options(intra_op_threads=1):
+    """ONNX Runtime options for a small model served to many sessions.
+
+    One operator runs at a time (the graph is a chain), on
+    ``intra_op_threads`` threads that do not spin between calls, so idle
+    inference threads leave the CPU to the Streamlit server.
+    """
+    import onnxruntime as ort
+
+    options = ort.SessionOptions()
+    options.intra_op_num_threads = intra_op_threads
+    options.inter_op_num_threads = 1
+    options.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+    options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+    options.add_session_config_entry("session.intra_op.allow_spinning", "0")
+    return options
+
+
+class RulPredictor:
+    """One ONNX Runtime session with a micro-batching request queue.
+
+    ``predict`` may be called from any number of threads; requests are
+    merged into batches of at most ``max_batch`` rows, waiting at most
+    ``max_wait_ms`` for more requests after the first one arrives.
+    """
+
+    def __init__(self, model_path=DEFAULT_MODEL, intra_op_threads=1, max_batch=MAX_BATCH,
+                 max_wait_ms=MAX_WAIT_MS):
+        import onnxruntime as ort
+
+        self.session = ort.InferenceSession(model_path, session_options(intra_op_threads),
+                                            providers=["CPUExecutionProvider"])
+        meta = self.session.get_modelmeta().custom_metadata_map
+        model_input = self.session.get_inputs()[0]
+        self.input_name = model_input.name
+        width = model_input.shape[1]
+        self.features = tuple(meta["features"].split(",")) if "features" in meta else \
+            tuple(f"x{i}" for i in range(width))
+        if isinstance(width, int) and width != len(self.features):
+            raise ValueError(f"Model takes {width} features but its metadata names {len(self.features)}.")
+        self.unit = meta.get("unit", "hours")
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self.batches = 0
+        self.rows = 0
+        self._requests = queue.Queue()
+        self._worker = threading.Thread(target=self._serve, name="rul-batcher", daemon=True)
+        self._worker.start()
+
+    def feature_matrix(self, data):
+        """``data`` as a contiguous float32 matrix in the model's feature order.
+
+        ``data`` is a table with one column per feature (extra columns are
+        ignored) or a 2-D array whose columns are already in order.
+        """
+        if hasattr(data, "columns"):
+            missing = [f for f in self.features if f not in data.columns]
+            if missing:
+                raise ValueError(f"Missing feature columns: {', '.join(missing)}")
+            data = data[list(self.features)].apply(_to_numeric).to_numpy()
+        x = np.ascontiguousarray(data, dtype=np.float32)
+        if x.ndim != 2 or x.shape[1] != len(self.features):
+            raise ValueError(f"Expected a (rows, {len(self.features)}) feature matrix, got shape {x.shape}.")
+        if not np.isfinite(x).all():
+            raise ValueError("Feature values must be finite numbers.")
+        return x
+
+    def run(self, x):
+        """One direct ``run()`` call on a feature matrix, bypassing the queue."""
+        return self.session.run(None, {self.input_name: x})[0].reshape(len(x))
+
+    def submit(self, data):
+        """Queue ``data`` for prediction; returns a ``Future`` of the RUL array."""
+        x = self.feature_matrix(data)
+        future = Future()
+        if len(x):
+            self._requests.put((x, future))
+        else:
+            future.set_result(np.empty(0, dtype=np.float32))
+        return future
+
+    def predict(self, data):
+        """RUL of every row of ``data``, in ``self.unit``.
+
+        Inputs larger than ``max_batch`` rows are queued in slices, so one
+        large upload does not hold back the requests of other sessions.
+        """
+        x = self.feature_matrix(data)
+        futures = [self.submit(x[i:i + self.max_batch]) for i in range(0, len(x), self.max_batch)]
+        if not futures:
+            return np.empty(0, dtype=np.float32)
+        return np.concatenate([f.result() for f in futures])
+
+    def _serve(self):
+        while True:
+            request = self._requests.get()
+            if request is None:
+                return
+            batch, rows = [request], len(request[0])
+            deadline = time.perf_counter() + self.max_wait
+            while rows < self.max_batch:
+                remaining = deadline - time.perf_counter()
+                try:
+                    request = self._requests.get(timeout=remaining) if remaining > 0 else \
+                        self._requests.get_nowait()
+                except queue.Empty:
+                    break
+                if request is None:
+                    # Answer what was collected, then stop.
+                    self._requests.put(None)
+                    break
+                batch.append(request)
+                rows += len(request[0])
+            self._run_batch(batch)
+
+    def _run_batch(self, batch):
+        futures = [future for _, future in batch]
+        try:
+            x = batch[0][0] if len(batch) == 1 else np.concatenate([x for x, _ in batch])
+            rul = self.run(x)
+        except Exception as exc:
+            for future in futures:
+                future.set_exception(exc)
+            return
+        self.batches += 1
+        self.rows += len(x)
+        for future, part in zip(futures, np.split(rul, np.cumsum([len(x) for x, _ in batch[:-1]]))):
+            future.set_result(part)
+
+    def close(self):
+        """Stop the batching thread once the queued requests are answered."""
+        self._requests.put(None)
+        self._worker.join()
+
+
+def _to_numeric(column):
+    import pandas as pd
+
+    return pd.to_numeric(column, errors="coerce")
+
+
+def timeline_positions(rul, degradation_hours, params):
+    """Place assets on a D-I-P-F curve from their remaining life.
+
+    An asset with ``rul`` hours left sits ``rul / degradation_hours`` of the
+    onset-to-failure distance before the failure point of
+    ``curves.DipfParams`` ``params``; assets with more life left than the
+    whole degradation period sit on the flat part before the onset.
+    """
+    if degradation_hours <= 0:
+        raise ValueError("The degradation period must be positive.")
+    span = params.failure - params.onset
+    return np.clip(params.failure - np.asarray(rul, dtype=np.float64) / degradation_hours * span,
+                   0.0, params.failure)
@@ -0,0 +1,486 @@
+"""Weekly preventive-maintenance scheduling under crew capacity.
+
+A job needs ``technicians`` technicians of one ``craft`` for ``duration``
+hours on one day between its ``earliest`` and ``due`` days. Each technician
+has a number of working hours per day (the crew calendar). The schedule is
+at day resolution, as a weekly schedule is: every job gets a day and named
+technicians, and the supervisors sequence the work within the day. Jobs
+that share an ``outage_group`` need the same equipment outage and are
+scheduled together on one day, inside the intersection of their windows.
+
+The schedule is built in two steps:
+
+1. list scheduling: the days are walked in order and every day the jobs
+   whose window is open are taken from a priority queue, earliest due day
+   first, then by priority (1 is the most urgent) and shortest first, as
+   compliance counts jobs rather than hours. A job goes to the
+   technicians of its craft with the least free time that is still enough
+   (best fit). Jobs past their due day only get the time left over by the
+   jobs that can still be on time;
+2. local search: for every job that is late or unscheduled, most urgent
+   first, try to bring it inside its window by moving one job that blocks
+   it to another day in that job's own window, or by bumping one less
+   urgent job out of the way when that does not lose compliance.
+
+Schedule Compliance is then the share of the jobs whose window opens in
+the horizon that are scheduled on time, with the formula of ``kpi``.
+``reschedule`` re-plans a few slipped jobs with the same moves, leaving
+the rest of the schedule and everything before ``today`` in place.
+"""
+
+import heapq
+
+import numpy as np
+import pandas as pd
+
+from .kpi import schedule_compliance
+
+DEFAULT_PRIORITY = 3
+DEFAULT_HOURS = 8.0
+# Blocking jobs tried per day when repairing one job in the local search.
+MAX_VICTIMS = 6
+
+# Common CMMS export headings for the job and technician columns.
+COLUMN_ALIASES = {
+    "work_order": "job",
+    "wo": "job",
+    "id": "job",
+    "job_id": "job",
+    "trade": "craft",
+    "skill": "craft",
+    "hours": "duration",
+    "duration_(h)": "duration",
+    "estimated_hours": "duration",
+    "crew_size": "technicians",
+    "people": "technicians",
+    "window_start": "earliest",
+    "start_date": "earliest",
+    "earliest_start": "earliest",
+    "window_end": "due",
+    "due_date": "due",
+    "outage": "outage_group",
+    "group": "outage_group",
+    "name": "technician",
+    "tech": "technician",
+    "employee": "technician",
+    "daily_hours": "hours",
+    "shift_hours": "hours",
+    "date": "day",
+}
+# Technician tables keep ``hours`` as it is; in the job table it is the duration.
+_TECHNICIAN_ALIASES = {key: value for key, value in COLUMN_ALIASES.items() if key != "hours"}
+
+
+def _canonical_column(name, aliases=COLUMN_ALIASES):
+    key = str(name).strip().lower().replace(" ", "_").replace("-", "_")
+    return aliases.get(key, key)
+
+
+def read_table(file, name=None):
+    """Read a job or technician table from CSV or Parquet; a DataFrame is taken as it is."""
+    if isinstance(file, pd.DataFrame):
+        table = file
+    else:
+        name = str(name or getattr(file, "name", None) or file).lower()
+        table = pd.read_parquet(file) if name.endswith((".parquet", ".pq")) else pd.read_csv(file)
+    if table.index.name is not None:
+        table = table.reset_index()
+    return table
+
+
+class WeeklySchedule:
+    """A PM schedule built for a job list and a crew calendar.
+
+    Parameters
+    ----------
+    jobs : DataFrame
+        One row per job with ``craft`` and ``duration`` (hours), and
+        optionally ``job``, ``asset``, ``technicians`` (default 1),
+        ``earliest`` and ``due`` (day numbers from 0, or dates),
+        ``priority`` (1 is the most urgent, default 3) and ``outage_group``.
+    technicians : DataFrame
+        One row per technician with ``technician``, ``craft`` and ``hours``
+        per working day (default 8); or, with a ``day`` column (day number
+        or date), one row per technician and working day.
+    days : int
+        Length of the horizon in days.
+    working_days : int
+        Working days at the start of every 7 days, for calendars without a
+        ``day`` column; with a Monday start, 5 is Monday to Friday.
+    start : date-like, optional
+        Date of day 0. Defaults to the earliest date in the job windows
+        when they are given as dates.
+    improve : bool
+        Run the local search after list scheduling.
+    """
+
+    def __init__(self, jobs, technicians, days=7, working_days=5, start=None, improve=True):
+        jobs = jobs.rename(columns=_canonical_column)
+        technicians = technicians.rename(columns=lambda c: _canonical_column(c, _TECHNICIAN_ALIASES))
+        for table, what, required in ((jobs, "Job", ("craft", "duration")),
+                                      (technicians, "Technician", ("technician", "craft"))):
+            missing = [c for c in required if c not in table.columns]
+            if missing:
+                raise ValueError(f"{what} table is missing columns: {', '.join(missing)}")
+        self.days = int(days)
+        if self.days < 1:
+            raise ValueError("The horizon must be at least one day.")
+        self.start = self._start_date(start, jobs)
+        self._read_technicians(technicians, working_days)
+        self._read_jobs(jobs)
+        self._build_units(jobs)
+        self.unit_day = np.full(len(self.unit_members), -1, dtype=np.int64)
+        self.job_techs = [None] * len(self.job_ids)
+        # Technician-day -> units booked on it, for finding the jobs that block another.
+        self._booked = {}
+        # (day, craft) -> shortest single-technician job that did not fit; cleared when time is freed.
+        self._full = {}
+        self._log = []
+        self._list_schedule()
+        if improve:
+            self._improve(first_day=0)
+        self._log = []
+
+    @classmethod
+    def from_files(cls, jobs_file, technicians_file, jobs_name=None, technicians_name=None, **kwargs):
+        return cls(read_table(jobs_file, jobs_name), read_table(technicians_file, technicians_name), **kwargs)
+
+    # -- inputs ---------------------------------------------------------------
+
+    def _start_date(self, start, jobs):
+        if start is not None:
+            return pd.Timestamp(start).normalize()
+        dates = [pd.to_datetime(jobs[c], errors="coerce") for c in ("earliest", "due")
+                 if c in jobs.columns and not pd.api.types.is_numeric_dtype(jobs[c])]
+        if not dates:
+            return None
+        first = min(d.min() for d in dates)
+        return None if pd.isna(first) else first.normalize()
+
+    def _day_numbers(self, values, default):
+        """Day numbers for a column of day numbers or dates; missing values get ``default``."""
+        if pd.api.types.is_numeric_dtype(values):
+            days = pd.to_numeric(values, errors="coerce")
+        else:
+            if self.start is None:
+                raise ValueError("Dates need a start date: give `start`, or dates in the job windows.")
+            days = (pd.to_datetime(values, errors="coerce") - self.start).dt.days
+        return days.fillna(default).to_numpy().astype(np.int64)
+
+    def day_number(self, value):
+        """The day number of a day number or date."""
+        if isinstance(value, (int, np.integer)):
+            return int(value)
+        if self.start is None:
+            raise ValueError("The schedule has no start date; give day numbers.")
+        return (pd.Timestamp(value).normalize() - self.start).days
+
+    def _read_technicians(self, table, working_days):
+        table = table.dropna(subset=["technician"])
+        table = table.assign(technician=table["technician"].astype(str), craft=table["craft"].astype(str))
+        hours = (pd.to_numeric(table["hours"], errors="coerce").fillna(DEFAULT_HOURS)
+                 if "hours" in table.columns else pd.Series(DEFAULT_HOURS, index=table.index))
+        if (hours < 0).any():
+            raise ValueError("Technician hours must not be negative.")
+        crafts = table.groupby("technician", sort=False)["craft"].first()
+        self.tech_names = crafts.index.to_numpy(dtype=object)
+        self.tech_crafts = crafts.to_numpy(dtype=object)
+        self.available = np.zeros((self.days, len(crafts)))
+        if "day" in table.columns:
+            days = self._day_numbers(table["day"], -1)
+            tech = crafts.index.get_indexer(table["technician"])
+            keep = (days >= 0) & (days < self.days)
+            np.add.at(self.available, (days[keep], tech[keep]), hours.to_numpy()[keep])
+        else:
+            per_tech = hours.groupby(table["technician"], sort=False).first().reindex(crafts.index).to_numpy()
+            working = np.arange(self.days) % 7 < working_days
+            self.available[working] = per_tech
+        self.free = self.available.copy()
+        self.craft_names = sorted(set(self.tech_crafts))
+        self.craft_techs = [np.flatnonzero(self.tech_crafts == c) for c in self.craft_names]
+
+    def _read_jobs(self, jobs):
+        n = len(jobs)
+        self.job_ids = (jobs["job"].astype(str).to_numpy(dtype=object) if "job" in jobs.columns
+                        else np.array([f"J{i + 1}" for i in range(n)], dtype=object))
+        self._job_index = pd.Index(self.job_ids)
+        if not self._job_index.is_unique:
+            raise ValueError("Job ids must be unique.")
+        self.hours = pd.to_numeric(jobs["duration"], errors="coerce").to_numpy(dtype=np.float64)
+        self.need = (pd.to_numeric(jobs["technicians"], errors="coerce").fillna(1).to_numpy().astype(np.int64)
+                     if "technicians" in jobs.columns else np.ones(n, dtype=np.int64))
+        if not (np.all(self.hours > 0) and np.all(self.need >= 1)):
+            raise ValueError("Job durations must be positive and every job needs at least one technician.")
+        self.job_crafts = jobs["craft"].astype(str).to_numpy(dtype=object)
+        # -1 for crafts nobody on the crew has: those jobs stay unscheduled.
+        self.craft_index = pd.Index(self.craft_names).get_indexer(self.job_crafts)
+        self.earliest = np.maximum(self._day_numbers(jobs["earliest"], 0) if "earliest" in jobs.columns
+                                   else np.zeros(n, dtype=np.int64), 0)
+        self.due = (self._day_numbers(jobs["due"], self.days - 1) if "due" in jobs.columns
+                    else np.full(n, self.days - 1, dtype=np.int64))
+        self.priority = (pd.to_numeric(jobs["priority"], errors="coerce").fillna(DEFAULT_PRIORITY).to_numpy()
+                         if "priority" in jobs.columns else np.full(n, DEFAULT_PRIORITY, dtype=np.float64))
+
+    def _build_units(self, jobs):
+        """Group the jobs of each outage group into one unit scheduled on a single day."""
+        n = len(self.job_ids)
+        unit_of = np.arange(n)
+        if "outage_group" in jobs.columns:
+            groups = jobs["outage_group"].to_numpy()
+            grouped = pd.notna(groups)
+            codes, _ = pd.factorize(groups[grouped])
+            unit_of[grouped] = n + codes
+        _, self.job_unit = np.unique(unit_of, return_inverse=True)
+        order = np.lexsort((-self.hours * self.need, self.job_unit))
+        bounds = np.flatnonzero(np.diff(self.job_unit[order])) + 1
+        self.unit_members = np.split(order, bounds)
+        starts = np.r_[0, bounds]
+        self.unit_earliest = np.maximum.reduceat(self.earliest[order], starts)
+        self.unit_due = np.minimum.reduceat(self.due[order], starts)
+        self.unit_priority = np.minimum.reduceat(self.priority[order], starts)
+        self.unit_work = np.add.reduceat((self.hours * self.need)[order], starts)
+        self.unit_size = np.diff(np.r_[starts, n])
+
+    # -- capacity -------------------------------------------------------------
+
+    def _pick(self, job, day):
+        """Best-fit technicians for one job on one day, or None."""
+        craft, hours, need = self.craft_index[job], self.hours[job], self.need[job]
+        if craft < 0 or (need == 1 and hours >= self._full.get((day, craft), np.inf)):
+            return None
+        techs = self.craft_techs[craft]
+        free = self.free[day, techs]
+        fits = np.flatnonzero(free >= hours - 1e-9)
+        if len(fits) < need:
+            if need == 1:
+                self._full[day, craft] = min(hours, self._full.get((day, craft), np.inf))
+            return None
+        if need == 1:
+            return techs[fits[[np.argmin(free[fits])]]]
+        return techs[fits[np.argsort(free[fits], kind="stable")[:need]]]
+
+    def _book(self, unit, day, assignment):
+        for job, techs in assignment:
+            self.free[day, techs] -= self.hours[job]
+            self.job_techs[job] = techs
+            for tech in techs:
+                self._booked.setdefault((day, tech), set()).add(unit)
+        self.unit_day[unit] = day
+
+    def _place(self, unit, day):
+        """Book a unit on a day if all its jobs fit; on failure ``_blocker`` is the job that did not."""
+        assignment = []
+        for job in self.unit_members[unit]:
+            techs = self._pick(job, day)
+            if techs is None:
+                for booked, booked_techs in assignment:
+                    self.free[day, booked_techs] += self.hours[booked]
+                    self._full.pop((day, self.craft_index[booked]), None)
+                self._blocker = job
+                return False
+            self.free[day, techs] -= self.hours[job]
+            assignment.append((job, techs))
+        for job, techs in assignment:
+            self.free[day, techs] += self.hours[job]
+        self._book(unit, day, assignment)
+        self._log.append((unit, -1, None))
+        return True
+
+    def _remove(self, unit, log=True):
+        day = self.unit_day[unit]
+        assignment = [(job, self.job_techs[job]) for job in self.unit_members[unit]]
+        for job, techs in assignment:
+            self.free[day, techs] += self.hours[job]
+            self._full.pop((day, self.craft_index[job]), None)
+            self.job_techs[job] = None
+            for tech in techs:
+                self._booked[day, tech].discard(unit)
+        self.unit_day[unit] = -1
+        if log:
+            self._log.append((unit, day, assignment))
+
+    def _rollback(self, mark):
+        while len(self._log) > mark:
+            unit, day, assignment = self._log.pop()
+            if assignment is None:
+                self._remove(unit, log=False)
+            else:
+                self._book(unit, day, assignment)
+
+    def _on_time(self, unit, day=None):
+        day = self.unit_day[unit] if day is None else day
+        return self.unit_earliest[unit] <= day <= self.unit_due[unit] and day >= 0
+
+    # -- list scheduling and local search --------------------------------------
+
+    def _list_schedule(self):
+        release = np.argsort(self.unit_earliest, kind="stable")
+        released = 0
+        ready, overdue = [], []
+        for day in range(self.days):
+            while released < len(release) and self.unit_earliest[release[released]] <= day:
+                unit = release[released]
+                heapq.heappush(ready, (self.unit_due[unit], self.unit_priority[unit], self.unit_work[unit], unit))
+                released += 1
+            while ready and ready[0][0] < day:
+                _, priority, work, unit = heapq.heappop(ready)
+                heapq.heappush(overdue, (priority, work, unit))
+            for queue in (ready, overdue):
+                deferred = []
+                while queue:
+                    item = heapq.heappop(queue)
+                    if not self._place(item[-1], day):
+                        deferred.append(item)
+                queue.extend(deferred)
+                heapq.heapify(queue)
+        self._log = []
+
+    def _first_fit(self, unit, days, skip=-1):
+        return any(day != skip and self._place(unit, day) for day in days)
+
+    def _window(self, unit, first_day):
+        return range(max(self.unit_earliest[unit], first_day), min(self.unit_due[unit], self.days - 1) + 1)
+
+    def _victims(self, unit, day):
+        """Units on the busiest technicians of the craft that blocked ``unit``, least urgent first."""
+        job = self._blocker
+        techs = self.craft_techs[self.craft_index[job]]
+        busiest = techs[np.argsort(-self.free[day, techs], kind="stable")[:self.need[job] + 1]]
+        victims = set()
+        for tech in busiest:
+            victims.update(self._booked.get((day, tech), ()))
+        victims.discard(unit)
+        return sorted(victims, key=lambda v: (-self.unit_priority[v], self.unit_size[v], -self.unit_work[v], v))
+
+    def _repair(self, unit, first_day):
+        """Try to move a late or unscheduled unit inside its window; keeps the schedule if that fails."""
+        self._log = []
+        window = self._window(unit, first_day)
+        if not window or self.craft_index[self.unit_members[unit]].min() < 0:
+            return False
+        if self.unit_day[unit] >= 0:
+            self._remove(unit)
+        for day in window:
+            if self._place(unit, day):
+                return True
+            for victim in self._victims(unit, day)[:MAX_VICTIMS]:
+                mark = len(self._log)
+                self._remove(victim)
+                # Move the blocking unit to another day in its own window...
+                if self._first_fit(victim, self._window(victim, first_day), skip=day):
+                    if self._place(unit, day):
+                        return True
+                # ...or bump a less urgent one without losing on-time jobs.
+                elif (self.unit_priority[victim] > self.unit_priority[unit]
+                      and self.unit_size[victim] <= self.unit_size[unit] and self._place(unit, day)):
+                    self._first_fit(victim, range(max(self.unit_due[victim] + 1, first_day), self.days))
+                    return True
+                self._rollback(mark)
+        self._rollback(0)
+        return False
+
+    def _improve(self, first_day):
+        for _ in range(2):
+            units = [u for u in range(len(self.unit_members)) if not self._on_time(u)]
+            units.sort(key=lambda u: (self.unit_priority[u], -self.unit_size[u], self.unit_due[u], self.unit_work[u]))
+            moved = sum(self._repair(u, first_day) for u in units)
+            if not moved:
+                break
+
+    def reschedule(self, slipped, today=0):
+        """Re-plan slipped jobs and return the jobs whose day changed.
+
+        ``slipped`` is a list of job ids that cannot be done on their day,
+        or a mapping of job id to the first day (number or date) they can
+        now be done. Jobs booked before ``today`` are treated as done and
+        not moved; other jobs move only to make room for slipped ones.
+        """
+        today = self.day_number(today)
+        if not isinstance(slipped, dict):
+            slipped = dict.fromkeys(slipped, today)
+        before = self.unit_day.copy()
+        units = {}
+        for job, earliest in slipped.items():
+            index = self._job_index.get_indexer([str(job)])[0]
+            if index < 0:
+                raise ValueError(f"Unknown job {job!r}")
+            first = max(self.day_number(earliest), today)
+            self.earliest[index] = max(self.earliest[index], first)
+            unit = self.job_unit[index]
+            self.unit_earliest[unit] = max(self.unit_earliest[unit], first)
+            units[unit] = None
+        for unit in units:
+            if self.unit_day[unit] >= 0:
+                self._remove(unit)
+        for unit in sorted(units, key=lambda u: (self.unit_due[u], self.unit_priority[u], self.unit_work[u])):
+            if not self._first_fit(unit, self._window(unit, today)) and not self._repair(unit, today):
+                self._first_fit(unit, range(max(self.unit_earliest[unit], self.unit_due[unit] + 1, today),
+                                            self.days))
+        self._log = []
+        moved = np.flatnonzero(self.unit_day != before)
+        jobs = np.concatenate([self.unit_members[u] for u in moved]) if len(moved) else np.array([], dtype=np.int64)
+        table = self.assignments().iloc[np.sort(jobs)]
+        return table.assign(previous_day=before[self.job_unit[np.sort(jobs)]]).reset_index(drop=True)
+
+    # -- results ---------------------------------------------------------------
+
+    def assignments(self):
+        """One row per job, in input order, with its day, technicians and status."""
+        day = self.unit_day[self.job_unit]
+        on_time = (day >= 0) & (self.unit_earliest[self.job_unit] <= day) & (day <= self.unit_due[self.job_unit])
+        table = pd.DataFrame({
+            "job": self.job_ids,
+            "craft": self.job_crafts,
+            "duration": self.hours,
+            "technicians": self.need,
+            "priority": self.priority,
+            "earliest": self.earliest,
+            "due": self.due,
+            "day": day,
+            "assigned": [", ".join(self.tech_names[t]) if t is not None else "" for t in self.job_techs],
+            "status": np.where(on_time, "on time", np.where(day >= 0, "late", "unscheduled")),
+        })
+        if self.start is not None:
+            table.insert(table.columns.get_loc("day") + 1, "date",
+                         (self.start + pd.to_timedelta(np.where(day >= 0, day, np.nan), unit="D")))
+        return table
+
+    def _counted(self):
+        """Jobs whose window opens inside the horizon: the scheduled jobs of the compliance KPI."""
+        return self.earliest < self.days
+
+    def compliance(self):
+        """Projected Schedule Compliance and crew utilization, as a dict."""
+        status = self.assignments()["status"].to_numpy()[self._counted()]
+        jobs = len(status)
+        on_time = int((status == "on time").sum())
+        available = float(self.available.sum())
+        booked = available - float(self.free.sum())
+        return {
+            "jobs": jobs,
+            "on_time": on_time,
+            "late": int((status == "late").sum()),
+            "unscheduled": int((status == "unscheduled").sum()),
+            "schedule_compliance": schedule_compliance(on_time, jobs) if jobs else float("nan"),
+            "booked_hours": booked,
+            "available_hours": available,
+            "utilization": booked / available * 100 if available else float("nan"),
+        }
+
+    def utilization(self, by="technician"):
+        """Booked and available hours and utilization (%) per ``technician``, ``craft`` or ``day``."""
+        booked = self.available - self.free
+        if by == "day":
+            frame = pd.DataFrame({"day": np.repeat(np.arange(self.days), len(self.tech_names)),
+                                  "craft": np.tile(self.tech_crafts, self.days),
+                                  "booked_hours": booked.ravel(), "available_hours": self.available.ravel()})
+            table = frame.groupby(["day", "craft"], as_index=False).sum()
+        else:
+            table = pd.DataFrame({"technician": self.tech_names, "craft": self.tech_crafts,
+                                  "booked_hours": booked.sum(axis=0), "available_hours": self.available.sum(axis=0)})
+            if by == "craft":
+                table = table.drop(columns="technician").groupby("craft", as_index=False).sum()
+            elif by != "technician":
+                raise ValueError(f"Unknown grouping {by!r}; expected technician, craft or day.")
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return table.assign(utilization=table["booked_hours"] / table["available_hours"] * 100)
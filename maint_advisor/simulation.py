@@ -0,0 +1,220 @@
+"""Monte Carlo cost simulation of maintenance policies.
+
+Every trial is one asset followed over the horizon. An asset fails after a
+Weibull time to failure and is restored as good as new by a corrective
+repair or a planned action, which starts a new renewal cycle. Cycles are
+simulated for all trials of a chunk at once with NumPy; the loop runs over
+cycles, not over trials. Chunks of trials run on a process pool, each with
+its own child of ``numpy.random.SeedSequence(seed)``, so results depend on
+the seed and chunk size only.
+
+Policies, named after the strategies of the recommendation rules:
+
+* run-to-failure: corrective repair at every failure;
+* time-based: planned replacement when the asset reaches ``pm_interval``
+  hours since the last renewal (age replacement);
+* condition-based: inspections every ``inspection_interval`` hours; a
+  developing failure becomes detectable ``pf_interval`` hours before it
+  happens and each inspection in that window finds it with
+  ``detection_probability``, after which it is repaired as planned work;
+* RCM-style: the task bundle an RCM analysis usually selects for a
+  wear-out failure mode, i.e. condition monitoring and a time-based
+  overhaul together.
+
+The generic "Preventive Maintenance (PM)" recommendation, scheduled
+checks and replacements, is simulated as the time-based policy (see
+``simulated_policy``).
+
+All policies draw from the same streams (common random numbers), so the
+differences between them are estimated more precisely than their levels.
+All times are in hours.
+"""
+
+import multiprocessing
+import os
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from .recommendation import CBM, PM, RCM, RTF, TBM
+
+HOURS_PER_YEAR = 8760.0
+CHUNK_TRIALS = 5_000
+
+POLICIES = (RTF[0], TBM[0], CBM[0], RCM[0])
+
+SimulationInputs = namedtuple(
+    "SimulationInputs",
+    ["beta", "eta", "repair_hours", "corrective_cost", "pm_hours", "pm_cost", "pm_interval",
+     "inspection_interval", "inspection_cost", "detection_probability", "pf_interval",
+     "downtime_cost"],
+    defaults=[2.5, 20_000.0, 48.0, 15_000.0, 8.0, 3_000.0, 12_000.0,
+              720.0, 150.0, 0.8, 2_000.0, 500.0],
+)
+SimulationInputs.__doc__ = """Failure, repair and cost assumptions for one asset type.
+
+* ``beta``, ``eta``: Weibull shape and scale (hours) of the time to failure;
+* ``repair_hours``, ``corrective_cost``: duration and direct cost of a
+  repair after failure;
+* ``pm_hours``, ``pm_cost``: duration and direct cost of a planned action;
+* ``pm_interval``: age at planned replacement for the time-based policies;
+* ``inspection_interval``, ``inspection_cost``, ``detection_probability``
+  and ``pf_interval``: condition monitoring;
+* ``downtime_cost``: cost per hour the asset is down.
+"""
+
+
+
+def simulated_policy(strategy):
+    """The simulated policy that stands for a recommended strategy, or None if none does."""
+    if strategy == PM[0]:
+        return TBM[0]
+    return strategy if strategy in POLICIES else None
+
+
+# Per-chunk totals returned by the workers, in this order.
+_TOTALS = ("cost", "cost_sq", "uptime", "failures", "planned", "inspections")
+
+
+def _policy_flags(policy):
+    """``(age_replacement, condition_monitoring)`` for a policy name."""
+    return {RTF[0]: (False, False), TBM[0]: (True, False),
+            CBM[0]: (False, True), RCM[0]: (True, True)}[policy]
+
+
+def _simulate_policy(p, policy, trials, horizon, rng):
+    """Simulate ``trials`` assets over ``horizon`` hours; returns per-trial arrays."""
+    age_replacement, monitored = _policy_flags(policy)
+    cost = np.zeros(trials)
+    uptime = np.zeros(trials)
+    failures = np.zeros(trials, dtype=np.int64)
+    planned = np.zeros(trials, dtype=np.int64)
+    inspections = np.zeros(trials, dtype=np.int64)
+    clock = np.zeros(trials)
+    active = np.arange(trials)
+
+    while active.size:
+        n = active.size
+        remaining = horizon - clock[active]
+        # Draws happen for every policy, used or not, to keep the streams aligned.
+        life = p.eta * rng.weibull(p.beta, n)
+        first_miss = rng.geometric(p.detection_probability, n) if p.detection_probability > 0 \
+            else np.full(n, np.iinfo(np.int64).max)
+
+        event = life
+        is_failure = np.ones(n, dtype=bool)
+        if monitored:
+            dt = p.inspection_interval
+            # Inspections at k * dt; the first one inside the P-F window is k0.
+            k0 = np.maximum(np.ceil(np.maximum(life - p.pf_interval, 0.0) / dt), 1.0)
+            in_window = np.maximum(np.ceil(life / dt) - k0, 0.0)
+            detected = first_miss <= in_window
+            detect_at = (k0 + first_miss - 1) * dt
+            event = np.where(detected, detect_at, event)
+            is_failure &= ~detected
+        if age_replacement:
+            replaced = p.pm_interval < event
+            event = np.where(replaced, p.pm_interval, event)
+            is_failure &= ~replaced
+
+        # Cycles that end after the horizon are censored: no action is paid.
+        happens = event < remaining
+        up = np.minimum(event, remaining)
+        down = np.where(is_failure, p.repair_hours, p.pm_hours)
+        down = np.where(happens, np.minimum(down, remaining - up), 0.0)
+        action = np.where(is_failure, p.corrective_cost, p.pm_cost)
+        cycle_cost = np.where(happens, action, 0.0) + down * p.downtime_cost
+        if monitored:
+            done = np.floor(up / p.inspection_interval).astype(np.int64)
+            inspections[active] += done
+            cycle_cost += done * p.inspection_cost
+
+        cost[active] += cycle_cost
+        uptime[active] += up
+        failures[active] += happens & is_failure
+        planned[active] += happens & ~is_failure
+        clock[active] += up + down
+        active = active[clock[active] < horizon]
+
+    return cost, uptime, failures, planned, inspections
+
+
+def _simulate_chunk(p, trials, horizon, seed):
+    """Totals of every policy for one chunk of trials, shape ``(policies, totals)``."""
+    out = np.empty((len(POLICIES), len(_TOTALS)))
+    for i, policy in enumerate(POLICIES):
+        cost, uptime, failures, planned, inspections = _simulate_policy(
+            p, policy, trials, horizon, np.random.default_rng(seed))
+        out[i] = (cost.sum(), (cost ** 2).sum(), uptime.sum(),
+                  failures.sum(), planned.sum(), inspections.sum())
+    return out
+
+
+def simulate_policies(inputs=SimulationInputs(), fleet_size=100, horizon_years=10.0,
+                      replications=100, seed=0, workers=None, chunk_trials=CHUNK_TRIALS, progress=None):
+    """Expected cost and availability of every policy for a fleet.
+
+    ``fleet_size * replications`` assets are simulated per policy. Returns a
+    DataFrame indexed by policy with the cost per asset-year and its
+    standard error, the expected cost of the whole fleet over the horizon,
+    availability, and failures, planned actions and inspections per
+    asset-year, sorted from the cheapest policy.
+
+    ``progress(fraction, message)``, if given, is called after every chunk
+    of trials; an exception it raises stops the simulation.
+    """
+    import pandas as pd
+
+    p = SimulationInputs(*map(float, inputs))
+    if not (p.beta > 0 and p.eta > 0 and p.pm_interval > 0 and p.inspection_interval > 0):
+        raise ValueError("Weibull parameters and intervals must be positive.")
+    if not 0 <= p.detection_probability <= 1:
+        raise ValueError("The detection probability must be between 0 and 1.")
+    horizon = float(horizon_years) * HOURS_PER_YEAR
+    trials = int(fleet_size) * int(replications)
+    if horizon <= 0 or trials <= 0:
+        raise ValueError("The fleet, horizon and replications must be positive.")
+
+    sizes = [min(chunk_trials, trials - start) for start in range(0, trials, chunk_trials)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    workers = workers or os.cpu_count() or 1
+    parts = [None] * len(sizes)
+
+    def report(done):
+        if progress is not None:
+            progress(done / len(sizes), f"{min(done * chunk_trials, trials):,} of {trials:,} trials")
+
+    if workers == 1 or len(sizes) == 1:
+        for i, (n, s) in enumerate(zip(sizes, seeds)):
+            parts[i] = _simulate_chunk(p, n, horizon, s)
+            report(i + 1)
+    else:
+        # "spawn" keeps workers independent of the server's threads.
+        with ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+            futures = {pool.submit(_simulate_chunk, p, n, horizon, s): i
+                       for i, (n, s) in enumerate(zip(sizes, seeds))}
+            try:
+                for done, future in enumerate(as_completed(futures), 1):
+                    parts[futures[future]] = future.result()
+                    report(done)
+            except BaseException:
+                for future in futures:
+                    future.cancel()
+                raise
+    totals = pd.DataFrame(np.sum(parts, axis=0), index=pd.Index(POLICIES, name="policy"),
+                          columns=_TOTALS)
+
+    years = horizon / HOURS_PER_YEAR
+    mean_cost = totals["cost"] / trials
+    var_cost = (totals["cost_sq"] / trials - mean_cost ** 2).clip(lower=0) * trials / max(trials - 1, 1)
+    result = pd.DataFrame({
+        "cost_per_asset_year": mean_cost / years,
+        "cost_std_error": np.sqrt(var_cost / trials) / years,
+        "fleet_cost": mean_cost * int(fleet_size),
+        "availability": totals["uptime"] / (trials * horizon),
+        "failures_per_asset_year": totals["failures"] / trials / years,
+        "planned_per_asset_year": totals["planned"] / trials / years,
+        "inspections_per_asset_year": totals["inspections"] / trials / years,
+    })
+    return result.sort_values("cost_per_asset_year")
@@ -0,0 +1,335 @@
+"""Vibration spectrum analysis for long accelerometer recordings.
+
+Recordings are never loaded whole. Raw binary and WAV files are mapped with
+``np.memmap`` (or viewed with ``np.frombuffer`` when the bytes are already in
+memory, e.g. an upload), and CSV files are streamed with pyarrow's CSV
+reader. The signal is cut into overlapping Hann-windowed segments (Welch's
+method); groups of segments are transformed on a thread pool and only the
+running sums of the spectra are kept.
+
+Each segment's FFT gives both
+
+* the averaged power spectral density (Welch PSD), and
+* the envelope spectrum: the bins of a resonance band are shifted to
+  baseband and transformed back with a short inverse FFT, whose magnitude
+  is the envelope (demodulated) signal; its spectrum shows the repetition
+  rates of bearing impacts.
+
+``fault_frequencies`` gives the bearing defect frequencies (BPFO, BPFI, BSF,
+FTF) from the geometry and ``match_fault_frequencies`` looks for them and
+their harmonics in the envelope spectrum.
+"""
+
+import collections
+import math
+import os
+import struct
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+DEFAULT_SEGMENT = 16384
+DEFAULT_OVERLAP = 0.5
+CHUNK_SEGMENTS = 64
+CSV_BLOCK_SIZE = 16 << 20
+RAW_DTYPES = {"float32": np.float32, "int16": np.int16}
+WAV_HEADER_BYTES = 1 << 16
+
+VibrationSpectra = namedtuple(
+    "VibrationSpectra",
+    ["frequencies", "psd", "envelope_frequencies", "envelope", "band", "segments", "samples",
+     "elapsed"],
+)
+VibrationSpectra.__doc__ = """Averaged spectra of one recording.
+
+``psd`` is in signal units squared per Hz, ``envelope`` is the mean
+amplitude spectrum of the envelope in signal units. ``band`` is the
+demodulation band actually used, ``samples`` the number of samples
+analysed and ``elapsed`` the wall time in seconds.
+"""
+
+
+def _is_path(source):
+    return isinstance(source, str) or hasattr(source, "__fspath__")
+
+
+def _buffer(source):
+    """Bytes of an in-memory file without copying them where possible."""
+    if hasattr(source, "getbuffer"):
+        return source.getbuffer()
+    if hasattr(source, "read"):
+        return source.read()
+    return source
+
+
+def _head(source, size):
+    if _is_path(source):
+        with open(source, "rb") as f:
+            return f.read(size)
+    return bytes(_buffer(source)[:size])
+
+
+def _view(source, dtype, offset=0, count=-1):
+    """Zero-copy 1-D view of a file path (memory-mapped) or bytes-like object."""
+    itemsize = np.dtype(dtype).itemsize
+    if _is_path(source):
+        available = (os.path.getsize(source) - offset) // itemsize
+        count = available if count < 0 else min(count, available)
+        if count <= 0:
+            return np.empty(0, dtype=dtype)
+        return np.memmap(source, dtype=dtype, mode="r", offset=offset, shape=(count,))
+    buffer = _buffer(source)
+    available = (len(buffer) - offset) // itemsize
+    count = available if count < 0 else min(count, available)
+    return np.frombuffer(buffer, dtype=dtype, count=max(count, 0), offset=offset)
+
+
+def _wav_layout(head):
+    """``(dtype, channels, sample_rate, data_offset, data_bytes)`` from a WAV header."""
+    if head[:4] != b"RIFF" or head[8:12] != b"WAVE":
+        raise ValueError("Not a WAV file.")
+    fmt, pos = None, 12
+    while pos + 8 <= len(head):
+        chunk, size = head[pos:pos + 4], struct.unpack("<I", head[pos + 4:pos + 8])[0]
+        if chunk == b"fmt ":
+            tag, channels, rate, _, _, bits = struct.unpack("<HHIIHH", head[pos + 8:pos + 24])
+            if tag == 0xFFFE:  # WAVE_FORMAT_EXTENSIBLE: the real tag starts the sub-format GUID
+                tag = struct.unpack("<H", head[pos + 32:pos + 34])[0]
+            fmt = tag, channels, rate, bits
+        elif chunk == b"data":
+            if fmt is None:
+                raise ValueError("WAV file has no format chunk before its data.")
+            tag, channels, rate, bits = fmt
+            dtype = {(1, 16): np.int16, (1, 32): np.int32, (3, 32): np.float32, (3, 64): np.float64}.get((tag, bits))
+            if dtype is None:
+                raise ValueError(f"Unsupported WAV sample format (format {tag}, {bits} bits).")
+            return dtype, channels, rate, pos + 8, size
+        pos += 8 + size + (size & 1)
+    raise ValueError("WAV data chunk not found in the header.")
+
+
+def _integer_scale(dtype):
+    """Factor to full scale +/-1 for integer PCM, 1 for floats."""
+    return 1.0 / -np.iinfo(dtype).min if np.issubdtype(dtype, np.integer) else 1.0
+
+
+def _peek_line(source):
+    if _is_path(source):
+        with open(source, "rb") as f:
+            line = f.readline()
+    else:
+        position = source.tell()
+        line = source.readline()
+        source.seek(position)
+    return line.decode("utf-8-sig").strip()
+
+
+def _csv_blocks(source, column=None, block_size=CSV_BLOCK_SIZE):
+    """Yield one CSV column as float32 arrays, block by block."""
+    import pyarrow as pa
+    import pyarrow.csv as pv
+
+    first = _peek_line(source).split(",")
+    try:
+        [float(value) for value in first]
+        header = False
+    except ValueError:
+        header = True
+    names = [name.strip() for name in first] if header else [f"c{i}" for i in range(len(first))]
+    if column is None:
+        # The last column holds the signal in the usual time,value layout.
+        column = names[-1]
+    elif column not in names:
+        raise ValueError(f"CSV file has no column '{column}'; found {', '.join(names)}.")
+    reader = pv.open_csv(
+        source,
+        read_options=pv.ReadOptions(block_size=block_size, column_names=names,
+                                    skip_rows=1 if header else 0),
+        convert_options=pv.ConvertOptions(include_columns=[column], column_types={column: pa.float32()}),
+    )
+    for batch in reader:
+        yield batch.column(0).to_numpy(zero_copy_only=False)
+
+
+def open_signal(source, name=None, sample_rate=None, dtype="float32", column=None, channel=0):
+    """Open an accelerometer recording without reading it into memory.
+
+    ``source`` is a path or an in-memory file. The format follows the file
+    name: ``.wav`` (PCM 16/32-bit or float, sample rate from the header),
+    ``.csv`` (one value column, the last one unless ``column`` is given) or
+    anything else as headerless raw samples of ``dtype`` (``"float32"`` or
+    ``"int16"``). ``sample_rate`` is only used for CSV and raw input, which
+    carry no rate of their own. Returns ``(samples, sample_rate, scale)`` where
+    ``samples`` is an array view for binary files and an iterator of blocks
+    for CSV, and ``scale`` converts integer samples to full scale +/-1.
+    """
+    name = str(name or getattr(source, "name", None) or source).lower()
+    if name.endswith(".wav"):
+        dtype, channels, rate, offset, size = _wav_layout(_head(source, WAV_HEADER_BYTES))
+        if not 0 <= channel < channels:
+            raise ValueError(f"WAV file has {channels} channel(s).")
+        # Long recordings often carry a wrong or maximal data size.
+        samples = _view(source, dtype, offset, size // np.dtype(dtype).itemsize or -1)
+        return samples[channel::channels], rate, _integer_scale(dtype)
+    if not sample_rate or sample_rate <= 0:
+        raise ValueError("Give the sample rate of the recording.")
+    if name.endswith(".csv"):
+        return _csv_blocks(source, column), sample_rate, 1.0
+    if dtype not in RAW_DTYPES:
+        raise ValueError(f"Raw samples must be one of {', '.join(RAW_DTYPES)}.")
+    dtype = RAW_DTYPES[dtype]
+    return _view(source, dtype), sample_rate, _integer_scale(dtype)
+
+
+def _segment_chunks(samples, nperseg, step, segments):
+    """Yield arrays holding ``segments`` whole overlapping segments each.
+
+    Array input is sliced without copying; block iterators are re-cut with
+    the overlap carried over from one block to the next.
+    """
+    span = (segments - 1) * step + nperseg
+    if isinstance(samples, np.ndarray):
+        for start in range(0, max(len(samples) - nperseg, -1) + 1, segments * step):
+            yield samples[start:start + span]
+        return
+    carry = np.empty(0, dtype=np.float32)
+    for block in samples:
+        data = np.concatenate([carry, np.asarray(block, dtype=np.float32)])
+        start = 0
+        while len(data) - start >= span:
+            yield data[start:start + span]
+            start += segments * step
+        carry = data[start:]
+    if len(carry) >= nperseg:
+        yield carry
+
+
+def _band_bins(sample_rate, nperseg, band):
+    df = sample_rate / nperseg
+    lo = max(1, math.ceil(band[0] / df))
+    hi = min(nperseg // 2, math.floor(band[1] / df))
+    if hi - lo < 4:
+        raise ValueError("The demodulation band is too narrow or above the Nyquist frequency.")
+    length = 1 << max(6, math.ceil(math.log2(2 * (hi - lo + 1))))
+    return lo, hi, length
+
+
+def _chunk_spectra(chunk, nperseg, step, scale, window, lo, hi, length):
+    """Sums of the periodograms and envelope spectra of the segments in ``chunk``."""
+    x = np.asarray(chunk, dtype=np.float32)
+    if scale != 1.0:
+        x = x * np.float32(scale)
+    segments = np.lib.stride_tricks.sliding_window_view(x, nperseg)[::step]
+    segments = segments - segments.mean(axis=1, keepdims=True)
+    spectrum = np.fft.rfft(segments * window, axis=1)
+    power = (spectrum.real ** 2 + spectrum.imag ** 2).sum(axis=0)
+    # Analytic signal of the band, moved to baseband: same magnitude, fewer samples.
+    envelope = np.abs(np.fft.ifft(spectrum[:, lo:hi + 1], n=length, axis=1))
+    envelope -= envelope.mean(axis=1, keepdims=True)
+    envelope_spectrum = np.abs(np.fft.rfft(envelope, axis=1)).sum(axis=0)
+    return power, envelope_spectrum, len(segments)
+
+
+def analyze_vibration(samples, sample_rate, scale=1.0, nperseg=DEFAULT_SEGMENT, overlap=DEFAULT_OVERLAP,
+                      band=None, workers=None, chunk_segments=CHUNK_SEGMENTS):
+    """Welch PSD and envelope spectrum of a recording, on a thread pool.
+
+    ``samples`` is an array (typically a memory map) or an iterator of
+    blocks, as returned by ``open_signal``. ``band`` is the demodulation
+    band in Hz, by default the upper half of the spectrum below 0.4 x the
+    sample rate. At most ``2 * workers`` chunks of ``chunk_segments``
+    segments are in flight, so memory use does not grow with the recording.
+    """
+    step = max(1, int(round(nperseg * (1 - overlap))))
+    band = band or (0.2 * sample_rate, 0.4 * sample_rate)
+    lo, hi, length = _band_bins(sample_rate, nperseg, band)
+    window = np.hanning(nperseg + 1)[:-1].astype(np.float32)
+    workers = workers or os.cpu_count() or 1
+
+    power = np.zeros(nperseg // 2 + 1)
+    envelope = np.zeros(length // 2 + 1)
+    count = 0
+    start = time.perf_counter()
+
+    def add(result):
+        nonlocal count, power, envelope
+        power += result[0]
+        envelope += result[1]
+        count += result[2]
+
+    with ThreadPoolExecutor(workers) as pool:
+        pending = collections.deque()
+        for chunk in _segment_chunks(samples, nperseg, step, chunk_segments):
+            pending.append(pool.submit(_chunk_spectra, chunk, nperseg, step, scale, window, lo, hi, length))
+            if len(pending) >= 2 * workers:
+                add(pending.popleft().result())
+        while pending:
+            add(pending.popleft().result())
+    elapsed = time.perf_counter() - start
+    if not count:
+        raise ValueError(f"The recording is shorter than one segment ({nperseg} samples).")
+
+    df = sample_rate / nperseg
+    psd = power / (count * sample_rate * float((window.astype(np.float64) ** 2).sum()))
+    psd[1:-1] *= 2
+    # Amplitude of each envelope component, corrected for the window's mean gain.
+    envelope *= 2 * length / nperseg / float(window.mean()) * 2 / length / count
+    return VibrationSpectra(
+        frequencies=np.fft.rfftfreq(nperseg, 1 / sample_rate),
+        psd=psd,
+        envelope_frequencies=np.fft.rfftfreq(length, 1 / (length * df)),
+        envelope=envelope,
+        band=(lo * df, hi * df),
+        segments=count,
+        samples=(count - 1) * step + nperseg,
+        elapsed=elapsed,
+    )
+
+
+def fault_frequencies(shaft_hz, n_balls, ball_diameter, pitch_diameter, contact_angle=0.0):
+    """Bearing defect frequencies in Hz for a stationary outer race.
+
+    Returns a dict with ``BPFO`` (outer race), ``BPFI`` (inner race), ``BSF``
+    (ball spin) and ``FTF`` (cage).
+    """
+    if shaft_hz <= 0 or n_balls < 1 or not 0 < ball_diameter < pitch_diameter:
+        raise ValueError("Need a positive shaft speed, at least one ball and 0 < ball < pitch diameter.")
+    ratio = ball_diameter / pitch_diameter * math.cos(math.radians(contact_angle))
+    return {
+        "BPFO": n_balls * shaft_hz / 2 * (1 - ratio),
+        "BPFI": n_balls * shaft_hz / 2 * (1 + ratio),
+        "BSF": pitch_diameter / (2 * ball_diameter) * shaft_hz * (1 - ratio ** 2),
+        "FTF": shaft_hz / 2 * (1 - ratio),
+    }
+
+
+def match_fault_frequencies(frequencies, amplitude, faults, harmonics=3, tolerance=0.02, threshold_db=6.0):
+    """Look for each fault frequency and its harmonics in a spectrum.
+
+    The peak within ``tolerance`` (relative, at least 1.5 bins) of each
+    expected frequency is compared with the median level of the surrounding
+    spectrum (ten times as wide). Returns a DataFrame with one row per fault
+    and harmonic: expected and found frequency, amplitude, ``snr_db`` and
+    ``detected`` (``snr_db >= threshold_db``).
+    """
+    import pandas as pd
+
+    df = frequencies[1] - frequencies[0]
+    rows = []
+    for fault, base in faults.items():
+        for h in range(1, harmonics + 1):
+            target = h * base
+            half = max(tolerance * target, 1.5 * df)
+            near = (frequencies >= target - half) & (frequencies <= target + half)
+            around = (frequencies >= target - 10 * half) & (frequencies <= target + 10 * half) & ~near
+            if not near.any() or target > frequencies[-1]:
+                continue
+            i = np.flatnonzero(near)[np.argmax(amplitude[near])]
+            background = np.median(amplitude[around]) if around.any() else np.nan
+            snr = 20 * np.log10(amplitude[i] / background) if background > 0 else np.nan
+            rows.append((fault, h, target, frequencies[i], amplitude[i], snr))
+    result = pd.DataFrame(rows, columns=["fault", "harmonic", "expected_hz", "peak_hz", "amplitude", "snr_db"])
+    result["detected"] = result["snr_db"] >= threshold_db
+    return result
@@ -0,0 +1,126 @@
+"""Visit counter backed by a SQLite database in WAL mode.
+
+Streamlit reruns the whole script on every widget change, so the counter must
+not touch the disk on each run. Increments are held in memory and added to the
+database in batches under a lock; the stored value is only ever updated with
+``value = value + n`` so several server processes can share the same file
+without losing updates.
+"""
+
+import atexit
+import os
+import sqlite3
+import threading
+import time
+
+DEFAULT_DB = "visit_counter.db"
+LEGACY_FILE = "visit_counter.txt"
+COUNTER_NAME = "visits"
+
+
+def _read_legacy_count(path):
+    """Return the count stored in the old plain-text counter file, or 0."""
+    try:
+        with open(path, "r") as f:
+            return int(f.read().strip() or 0)
+    except (OSError, ValueError):
+        return 0
+
+
+class VisitCounter:
+    """Process-wide visit counter with batched, durable flushes.
+
+    Parameters
+    ----------
+    path : str
+        SQLite database file.
+    batch_size : int
+        Number of pending increments that triggers a flush.
+    flush_interval : float
+        Seconds after which the next increment flushes regardless of batch size.
+    legacy_file : str
+        Plain-text counter used to seed a new database, so existing totals
+        carry over.
+    """
+
+    def __init__(self, path=DEFAULT_DB, batch_size=20, flush_interval=30.0,
+                 legacy_file=LEGACY_FILE):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.flushes = 0
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._last_flush = time.monotonic()
+        self._conn = sqlite3.connect(path, timeout=30, isolation_level=None,
+                                     check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS counters ("
+            "name TEXT PRIMARY KEY, value INTEGER NOT NULL)"
+        )
+        seed = _read_legacy_count(legacy_file) if legacy_file and os.path.exists(legacy_file) else 0
+        self._conn.execute(
+            "INSERT OR IGNORE INTO counters (name, value) VALUES (?, ?)",
+            (COUNTER_NAME, seed),
+        )
+        self._stored = self._read_stored()
+        atexit.register(self.close)
+
+    def _read_stored(self):
+        row = self._conn.execute(
+            "SELECT value FROM counters WHERE name = ?", (COUNTER_NAME,)
+        ).fetchone()
+        return row[0]
+
+    def _flush_locked(self):
+        if self._pending:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.execute(
+                    "UPDATE counters SET value = value + ? WHERE name = ?",
+                    (self._pending, COUNTER_NAME),
+                )
+                self._stored = self._read_stored()
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._pending = 0
+            self.flushes += 1
+        self._last_flush = time.monotonic()
+
+    @property
+    def count(self):
+        """Current total: last stored value plus increments not yet flushed."""
+        with self._lock:
+            return self._stored + self._pending
+
+    @property
+    def pending(self):
+        with self._lock:
+            return self._pending
+
+    def increment(self, n=1):
+        """Record ``n`` new visits and return the updated total."""
+        with self._lock:
+            self._pending += n
+            if (self._pending >= self.batch_size
+                    or time.monotonic() - self._last_flush >= self.flush_interval):
+                self._flush_locked()
+            return self._stored + self._pending
+
+    def flush(self):
+        """Write pending increments to the database now."""
+        with self._lock:
+            self._flush_locked()
+
+    def close(self):
+        """Flush and close the connection. Safe to call more than once."""
+        with self._lock:
+            if self._conn is None:
+                return
+            self._flush_locked()
+            self._conn.close()
+            self._conn = None
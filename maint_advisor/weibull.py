@@ -0,0 +1,342 @@
+"""Weibull life-data analysis with right-censored (suspended) data.
+
+Groups of failure and suspension times are packed into flat arrays sorted by
+group, with the offset where each group starts (no padding, so one large
+group does not inflate the others), and many groups are fitted at once: the
+maximum-likelihood shape parameter solves the profile score equation with a
+safeguarded Newton iteration that runs on every group in parallel, with the
+per-group sums taken by ``np.add.reduceat``, and the scale parameter follows
+in closed form.
+The 3-parameter model profiles the location parameter over a grid with a
+refinement pass. Bootstrap confidence bounds resample each group and run
+on a process pool.
+
+The fitted shape parameter places an asset class on the bathtub curve:
+beta < 1 is infant mortality, beta close to 1 is useful life and beta > 1 is
+wear-out.
+"""
+
+import math
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+BETA_BOUNDS = (0.02, 100.0)
+NEWTON_ITERATIONS = 40
+GAMMA_GRID = 16
+
+INFANT_MORTALITY = "Infant mortality"
+USEFUL_LIFE = "Useful life"
+WEAR_OUT = "Wear-out"
+
+# Strategy hints from the Bathtub Curve page, by phase.
+PHASE_ACTIONS = {
+    INFANT_MORTALITY: "Early inspections/testing, burn-in, commissioning checks",
+    USEFUL_LIFE: "Condition monitoring, scheduled PM, proper operation",
+    WEAR_OUT: "Overhaul, replacement, RCM",
+}
+
+
+def _reduce_rows(ufunc, values, offsets, empty=0):
+    """``ufunc`` reduced over each row of a flat layout; ``empty`` for rows without values."""
+    starts = offsets[:-1]
+    out = np.full(len(starts), empty, dtype=np.result_type(values, empty))
+    # reduceat gives an empty row the value at its start; reduce over the others only.
+    filled = offsets[1:] > starts
+    if filled.any():
+        out[filled] = ufunc.reduceat(values, starts[filled])
+    return out
+
+
+def _offsets(counts):
+    return np.concatenate(([0], np.cumsum(counts))).astype(np.intp)
+
+
+def _fit_rows(t, failed, offsets):
+    """Fit a 2-parameter Weibull to every row of a flat layout.
+
+    Parameters
+    ----------
+    t : ndarray, shape (n,)
+        Positive times, row after row.
+    failed : ndarray of bool, shape (n,)
+        True for failures, False for suspensions.
+    offsets : ndarray of int, shape (rows + 1,)
+        Row ``i`` is ``t[offsets[i]:offsets[i + 1]]``.
+
+    Returns
+    -------
+    beta, eta, loglik : ndarray, shape (rows,)
+        NaN for rows without failures.
+    """
+    counts = np.diff(offsets)
+    rows = len(counts)
+    r = _reduce_rows(np.add, failed.astype(np.int64), offsets)
+    t_max = _reduce_rows(np.maximum, t, offsets, 0.0)
+    t_max = np.where(t_max > 0, t_max, 1.0)
+    # Scaling by the largest time keeps exp(beta * ln s) <= 1 for any beta.
+    ln_s = np.log(t / np.repeat(t_max, counts))
+    sum_ln_f = _reduce_rows(np.add, np.where(failed, ln_s, 0.0), offsets)
+    # Rows without failures have no estimate; give them a finite score so
+    # they do not hold up convergence, and blank them at the end.
+    mean_ln_f = sum_ln_f / np.maximum(r, 1)
+
+    lo = np.full(rows, math.log(BETA_BOUNDS[0]))
+    hi = np.full(rows, math.log(BETA_BOUNDS[1]))
+    x = np.zeros(rows)
+    # Iterate on the rows that have not converged yet, with their values only.
+    active, la, ca = np.arange(rows), ln_s, counts
+    for _ in range(NEWTON_ITERATIONS):
+        if not len(active):
+            break
+        xa, oa = x[active], _offsets(ca)
+        beta = np.exp(xa)
+        w = np.exp(np.repeat(beta, ca) * la)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            w_sum = _reduce_rows(np.add, w, oa)
+            m1 = _reduce_rows(np.add, w * la, oa) / w_sum
+            m2 = _reduce_rows(np.add, w * la ** 2, oa) / w_sum
+            # g(beta) is the profile score; it increases monotonically in beta.
+            g = m1 - 1.0 / beta - mean_ln_f[active]
+            dg_dx = beta * (m2 - m1 ** 2) + 1.0 / beta
+            step = xa - g / dg_dx
+        hi[active] = np.where(g > 0, xa, hi[active])
+        lo[active] = np.where(g > 0, lo[active], xa)
+        inside = (step > lo[active]) & (step < hi[active]) & np.isfinite(step)
+        x_new = np.where(inside, step, 0.5 * (lo[active] + hi[active]))
+        x[active] = x_new
+        moving = np.abs(x_new - xa) >= 1e-9
+        if not moving.all():
+            active, la, ca = active[moving], la[np.repeat(moving, ca)], ca[moving]
+
+    beta = np.exp(x)
+    w_sum = _reduce_rows(np.add, np.exp(np.repeat(beta, counts) * ln_s), offsets)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        eta_s = (w_sum / r) ** (1.0 / beta)
+        ln_eta_s = np.log(eta_s)
+        ln_t_f = sum_ln_f + r * np.log(t_max)
+        loglik = r * np.log(beta) - r * beta * (ln_eta_s + np.log(t_max)) + (beta - 1) * ln_t_f - r
+    eta = eta_s * t_max
+    no_failures = r == 0
+    beta[no_failures] = eta[no_failures] = loglik[no_failures] = np.nan
+    return beta, eta, loglik
+
+
+def _repeat_rows(offsets, k):
+    """Indices into a flat layout that repeat every row ``k`` times, and the offsets of the result."""
+    counts = np.repeat(np.diff(offsets), k)
+    repeated = _offsets(counts)
+    index = np.arange(repeated[-1]) + np.repeat(np.repeat(offsets[:-1], k) - repeated[:-1], counts)
+    return index, repeated
+
+
+def _fit_rows_3p(t, failed, offsets):
+    """3-parameter fit: profile the location parameter gamma over [0, min t)."""
+    rows = len(offsets) - 1
+    t_min = _reduce_rows(np.minimum, t, offsets, np.inf)
+    t_min = np.where(np.isfinite(t_min), t_min, 0.0)
+
+    def evaluate(fractions):
+        k = fractions.shape[1]
+        gamma = t_min[:, None] * fractions
+        index, repeated = _repeat_rows(offsets, k)
+        shifted = t[index] - np.repeat(gamma.ravel(), np.diff(repeated))
+        beta, eta, loglik = _fit_rows(shifted, failed[index], repeated)
+        return gamma, beta.reshape(rows, k), eta.reshape(rows, k), loglik.reshape(rows, k)
+
+    grid = np.tile(np.linspace(0.0, 0.98, GAMMA_GRID), (rows, 1))
+    _, _, _, loglik = evaluate(grid)
+    best = np.nanargmax(np.where(np.isnan(loglik), -np.inf, loglik), axis=1)
+    spacing = 0.98 / (GAMMA_GRID - 1)
+    centre = grid[np.arange(rows), best]
+    fine = np.clip(centre[:, None] + np.linspace(-spacing, spacing, GAMMA_GRID), 0.0, 0.995)
+    gamma, beta, eta, loglik = evaluate(fine)
+    best = np.nanargmax(np.where(np.isnan(loglik), -np.inf, loglik), axis=1)
+    pick = np.arange(rows), best
+    return beta[pick], eta[pick], gamma[pick], loglik[pick]
+
+
+def fit_rows(t, failed, offsets, three_parameter=False):
+    """Fit every row of a flat layout (see ``pack_groups``); returns ``(beta, eta, gamma, loglik)`` arrays."""
+    t = np.asarray(t, dtype=np.float64)
+    failed = np.asarray(failed, dtype=bool)
+    offsets = np.asarray(offsets, dtype=np.intp)
+    if three_parameter:
+        return _fit_rows_3p(t, failed, offsets)
+    beta, eta, loglik = _fit_rows(t, failed, offsets)
+    return beta, eta, np.zeros_like(beta), loglik
+
+
+def pack_groups(groups, times, failed):
+    """Pack long-format life data into flat arrays sorted by group.
+
+    Returns ``(labels, t, failed, offsets)``; group ``i`` is
+    ``t[offsets[i]:offsets[i + 1]]``, in the order of the input.
+    """
+    import pandas as pd
+
+    codes, labels = pd.factorize(np.asarray(groups), sort=True)
+    order = np.argsort(codes, kind="stable")
+    offsets = _offsets(np.bincount(codes, minlength=len(labels)))
+    return (labels, np.asarray(times, dtype=np.float64)[order], np.asarray(failed, dtype=bool)[order],
+            offsets)
+
+
+def _bootstrap_chunk(t, failed, offsets, seeds, resamples, three_parameter, level):
+    """Percentile bounds for beta and eta of each group in a chunk."""
+    alpha = (1 - level) / 2
+    bounds = np.full((len(seeds), 4), np.nan)
+    for g, seed in enumerate(seeds):
+        start, end = offsets[g], offsets[g + 1]
+        n = int(end - start)
+        if n < 2:
+            continue
+        rng = np.random.default_rng(seed)
+        idx = rng.integers(0, n, size=(resamples, n)).ravel()
+        beta, eta, _, _ = fit_rows(t[start:end][idx], failed[start:end][idx],
+                                   np.arange(0, resamples * n + 1, n), three_parameter)
+        ok = np.isfinite(beta)
+        if ok.sum() >= 2:
+            bounds[g] = [*np.quantile(beta[ok], [alpha, 1 - alpha]),
+                         *np.quantile(eta[ok], [alpha, 1 - alpha])]
+    return bounds
+
+
+def bootstrap_bounds(t, failed, offsets, resamples=1000, level=0.9, three_parameter=False,
+                     seed=0, workers=None, chunk_size=64, progress=None):
+    """Bootstrap percentile bounds for every group, on a process pool.
+
+    Each group gets its own child of ``numpy.random.SeedSequence(seed)``, so
+    results do not depend on the number of workers or the chunking.
+    ``progress(fraction, message)``, if given, is called after every chunk
+    of groups; an exception it raises stops the bootstrap.
+
+    Returns an array ``(groups, 4)`` of beta lower/upper and eta lower/upper.
+    """
+    groups = len(offsets) - 1
+    seeds = np.random.SeedSequence(seed).spawn(groups)
+    chunks = [slice(i, i + chunk_size) for i in range(0, groups, chunk_size)]
+    workers = workers or os.cpu_count() or 1
+    parts = [None] * len(chunks)
+
+    def report(done):
+        if progress is not None:
+            progress(done / len(chunks), f"bootstrap: {min(done * chunk_size, groups):,} of {groups:,} groups")
+
+    def arguments(c):
+        # The chunk's values and its offsets, starting from 0.
+        start, end = offsets[c.start], offsets[min(c.stop, groups)]
+        return (t[start:end], failed[start:end], offsets[c.start:c.stop + 1] - start, seeds[c],
+                resamples, three_parameter, level)
+
+    if workers == 1 or len(chunks) == 1:
+        for i, c in enumerate(chunks):
+            parts[i] = _bootstrap_chunk(*arguments(c))
+            report(i + 1)
+    else:
+        # "spawn" keeps workers independent of the server's threads.
+        with ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+            futures = {pool.submit(_bootstrap_chunk, *arguments(c)): i for i, c in enumerate(chunks)}
+            try:
+                for done, future in enumerate(as_completed(futures), 1):
+                    parts[futures[future]] = future.result()
+                    report(done)
+            except BaseException:
+                for future in futures:
+                    future.cancel()
+                raise
+    return np.concatenate(parts) if parts else np.empty((0, 4))
+
+
+def bathtub_phase(beta, lower=None, upper=None, tolerance=0.1):
+    """Bathtub phase for each shape estimate.
+
+    With confidence bounds, a phase other than useful life needs the whole
+    interval on one side of 1. Without them, beta must differ from 1 by more
+    than ``tolerance``.
+    """
+    beta = np.asarray(beta, dtype=np.float64)
+    if lower is None or upper is None:
+        lower = upper = beta
+        infant, wear = beta < 1 - tolerance, beta > 1 + tolerance
+    else:
+        lower, upper = np.asarray(lower, dtype=np.float64), np.asarray(upper, dtype=np.float64)
+        # Fall back to the point estimate where the bootstrap had too few samples.
+        missing = ~(np.isfinite(lower) & np.isfinite(upper))
+        infant = np.where(missing, beta < 1 - tolerance, upper < 1)
+        wear = np.where(missing, beta > 1 + tolerance, lower > 1)
+    phase = np.where(infant, INFANT_MORTALITY, np.where(wear, WEAR_OUT, USEFUL_LIFE)).astype(object)
+    phase[np.isnan(beta)] = None
+    return phase
+
+
+def analyze_life_data(data, three_parameter=False, resamples=0, level=0.9, seed=0, workers=None, progress=None):
+    """Fit every asset class in a life-data table.
+
+    Parameters
+    ----------
+    data : pandas.DataFrame
+        Columns ``asset_class``, ``time`` and ``failed`` (1/0, True/False or
+        F/S). Rows without an asset class are treated as one group.
+    resamples : int
+        Bootstrap resamples per class; 0 skips the confidence bounds.
+    progress : callable, optional
+        ``progress(fraction, message)``, called as the bootstrap advances.
+
+    Returns
+    -------
+    pandas.DataFrame
+        One row per asset class with the parameters, bounds, phase and the
+        matching strategy hint.
+    """
+    import pandas as pd
+
+    data = normalize_life_data(data)
+    labels, t, failed, offsets = pack_groups(data["asset_class"], data["time"], data["failed"])
+    beta, eta, gamma, loglik = fit_rows(t, failed, offsets, three_parameter)
+    failures = _reduce_rows(np.add, failed.astype(np.int64), offsets)
+    result = pd.DataFrame({
+        "failures": failures,
+        "suspensions": np.diff(offsets) - failures,
+        "beta": beta,
+        "eta": eta,
+        "gamma": gamma,
+        "log_likelihood": loglik,
+    }, index=pd.Index(labels, name="asset_class"))
+    if resamples:
+        bounds = bootstrap_bounds(t, failed, offsets, resamples, level, three_parameter, seed, workers,
+                                  progress=progress)
+        result["beta_lower"], result["beta_upper"] = bounds[:, 0], bounds[:, 1]
+        result["eta_lower"], result["eta_upper"] = bounds[:, 2], bounds[:, 3]
+        result["phase"] = bathtub_phase(beta, bounds[:, 0], bounds[:, 1])
+    else:
+        result["phase"] = bathtub_phase(beta)
+    result["suggested_action"] = result["phase"].map(PHASE_ACTIONS)
+    return result
+
+
+def normalize_life_data(data):
+    """Return ``asset_class``, ``time`` and boolean ``failed`` columns."""
+    import pandas as pd
+
+    columns = {str(c).strip().lower().replace(" ", "_"): c for c in data.columns}
+    if "time" not in columns:
+        raise ValueError("Life data needs a 'time' column.")
+    status_column = next((columns[c] for c in ("failed", "status", "event") if c in columns), None)
+    if status_column is None:
+        raise ValueError("Life data needs a 'failed' column (1 = failure, 0 = suspension).")
+    status = data[status_column]
+    if status.dtype == object or pd.api.types.is_string_dtype(status):
+        failed = status.astype(str).str.strip().str.upper().isin(["1", "F", "FAILURE", "FAILED", "TRUE", "YES"])
+    else:
+        failed = status.astype(bool)
+    time = pd.to_numeric(data[columns["time"]], errors="coerce")
+    group = (data[columns["asset_class"]].astype(str) if "asset_class" in columns
+             else pd.Series("All assets", index=data.index))
+    frame = pd.DataFrame({"asset_class": group, "time": time, "failed": failed})
+    frame = frame[frame["time"] > 0]
+    if frame.empty:
+        raise ValueError("Life data has no positive times.")
+    return frame
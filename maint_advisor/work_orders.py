@@ -0,0 +1,259 @@
+"""Streaming work-order ingestion for per-asset KPIs.
+
+``summarize_work_orders`` reads a CMMS work-order export in chunks and
+reduces it into per-asset totals, so memory use depends on the number of
+assets rather than the size of the file. The KPIs are computed with the
+formulas in ``kpi``.
+"""
+
+import csv
+import hashlib
+import os
+
+import pandas as pd
+
+from .kpi import availability, cost_per_unit, mtbf, mttr
+
+WORK_ORDER_COLUMNS = ("asset", "asset_class", "failure_start", "restore_time", "cost", "output",
+                      "budget", "due_date")
+REQUIRED_COLUMNS = ("asset", "failure_start")
+
+# Common CMMS export headings for the work-order columns.
+COLUMN_ALIASES = {
+    "asset_id": "asset",
+    "equipment": "asset",
+    "tag": "asset",
+    "class": "asset_class",
+    "equipment_class": "asset_class",
+    "start": "failure_start",
+    "failure_time": "failure_start",
+    "reported": "failure_start",
+    "restore": "restore_time",
+    "restored": "restore_time",
+    "end": "restore_time",
+    "completed": "restore_time",
+    "total_cost": "cost",
+    "maintenance_cost": "cost",
+    "planned_cost": "budget",
+    "estimated_cost": "budget",
+    "due": "due_date",
+    "target_date": "due_date",
+    "scheduled_date": "due_date",
+}
+
+DEFAULT_CHUNKSIZE = 500_000
+CSV_BLOCK_SIZE = 32 << 20
+
+_TOTAL_COLUMNS = ("downtime", "failures", "repairs", "cost", "output")
+
+
+def _canonical_column(name):
+    key = str(name).strip().lower().replace(" ", "_").replace("-", "_")
+    return COLUMN_ALIASES.get(key, key)
+
+
+def _read_csv_header(file):
+    if hasattr(file, "read"):
+        position = file.tell()
+        line = file.readline()
+        file.seek(position)
+    else:
+        with open(file, "rb") as f:
+            line = f.readline()
+    if isinstance(line, bytes):
+        line = line.decode("utf-8-sig")
+    return next(csv.reader([line]), [])
+
+
+def csv_convert_options(file):
+    """Typed reading of the work-order columns in a CSV export's header.
+
+    Returns keyword arguments for ``pyarrow.csv.ConvertOptions``: the known
+    columns get their work-order type and timestamps are parsed as ISO 8601,
+    ``%Y-%m-%d %H:%M`` or day-first ``%d/%m/%Y %H:%M``. ``file`` is a path or
+    a binary file object, whose position is kept.
+    """
+    import pyarrow as pa
+    import pyarrow.csv as pv
+
+    types = {"asset": pa.string(), "asset_class": pa.string(),
+             "failure_start": pa.timestamp("ns"), "restore_time": pa.timestamp("ns"),
+             "cost": pa.float64(), "output": pa.float64(), "budget": pa.float64(),
+             "due_date": pa.timestamp("ns")}
+    return {
+        "column_types": {c: types[_canonical_column(c)] for c in _read_csv_header(file)
+                         if _canonical_column(c) in WORK_ORDER_COLUMNS},
+        "timestamp_parsers": [pv.ISO8601, "%Y-%m-%d %H:%M", "%d/%m/%Y %H:%M"],
+    }
+
+
+def iter_work_order_chunks(file, name=None, chunksize=DEFAULT_CHUNKSIZE, block_size=CSV_BLOCK_SIZE):
+    """Yield a CSV or Parquet work-order export as a sequence of DataFrames.
+
+    Parquet files are read ``chunksize`` rows at a time and CSV files in
+    blocks of ``block_size`` bytes, both through pyarrow's streaming readers.
+    ``file`` may also be an Arrow table, such as a stored dataset, which is
+    sliced ``chunksize`` rows at a time. Only the known work-order columns
+    are read; headings are normalized with ``COLUMN_ALIASES``.
+    """
+    import pyarrow as pa
+
+    if isinstance(file, pa.Table):
+        columns = [c for c in file.column_names if _canonical_column(c) in WORK_ORDER_COLUMNS]
+        batches = file.select(columns).to_batches(max_chunksize=chunksize)
+        for batch in batches:
+            yield batch.to_pandas().rename(columns=_canonical_column)
+        return
+    name = str(name or getattr(file, "name", None) or file).lower()
+    if name.endswith((".parquet", ".pq")):
+        import pyarrow.parquet as pq
+
+        parquet = pq.ParquetFile(input_file(file))
+        columns = [c for c in parquet.schema_arrow.names if _canonical_column(c) in WORK_ORDER_COLUMNS]
+        batches = parquet.iter_batches(batch_size=chunksize, columns=columns)
+    else:
+        import pyarrow.csv as pv
+
+        options = csv_convert_options(file)
+        batches = pv.open_csv(
+            input_file(file),
+            read_options=pv.ReadOptions(block_size=block_size),
+            convert_options=pv.ConvertOptions(include_columns=list(options["column_types"]), **options),
+        )
+    for batch in batches:
+        yield batch.to_pandas().rename(columns=_canonical_column)
+
+
+class WorkOrderAccumulator:
+    """Running per-asset totals built from successive work-order chunks.
+
+    Each work order is one failure. Downtime is the time from failure start to
+    restore, and a work order with a restore time counts as one repair.
+    """
+
+    def __init__(self):
+        self.rows = 0
+        self._totals = None
+        self._period_start = None
+        self._period_end = None
+
+    def update(self, chunk):
+        """Fold one chunk of work orders into the running totals."""
+        missing = [c for c in REQUIRED_COLUMNS if c not in chunk.columns]
+        if missing:
+            raise ValueError(f"Work-order export is missing columns: {', '.join(missing)}")
+        if chunk.empty:
+            return
+
+        start = pd.to_datetime(chunk["failure_start"], errors="coerce", format="mixed")
+        restore = (pd.to_datetime(chunk["restore_time"], errors="coerce", format="mixed")
+                   if "restore_time" in chunk.columns else pd.Series(pd.NaT, index=chunk.index))
+        downtime = (restore - start).dt.total_seconds().div(3600).clip(lower=0)
+        frame = pd.DataFrame({
+            "asset": chunk["asset"].astype(str),
+            "asset_class": (chunk["asset_class"].astype(str) if "asset_class" in chunk.columns
+                            else "Unclassified"),
+            "downtime": downtime.fillna(0.0),
+            "failures": start.notna().astype("int64"),
+            "repairs": restore.notna().astype("int64"),
+            "cost": pd.to_numeric(chunk.get("cost", 0.0), errors="coerce"),
+            "output": pd.to_numeric(chunk.get("output", 0.0), errors="coerce"),
+        })
+        totals = frame.groupby("asset", sort=False).agg(
+            asset_class=("asset_class", "first"),
+            **{c: (c, "sum") for c in _TOTAL_COLUMNS},
+        )
+        self._merge(totals)
+        self.rows += len(chunk)
+
+        first, last = start.min(), pd.concat([start, restore]).max()
+        if pd.notna(first) and (self._period_start is None or first < self._period_start):
+            self._period_start = first
+        if pd.notna(last) and (self._period_end is None or last > self._period_end):
+            self._period_end = last
+
+    def _merge(self, totals):
+        if self._totals is None:
+            self._totals = totals
+            return
+        combined = pd.concat([self._totals, totals])
+        self._totals = combined.groupby(level=0, sort=False).agg(
+            asset_class=("asset_class", "first"),
+            **{c: (c, "sum") for c in _TOTAL_COLUMNS},
+        )
+
+    @property
+    def period(self):
+        """First failure start and last restore time seen so far."""
+        return self._period_start, self._period_end
+
+    def result(self, period_start=None, period_end=None):
+        """Return ``(per_asset, per_class)`` KPI tables.
+
+        Uptime for each asset is the observation period minus its downtime.
+        The period defaults to the span of the export.
+        """
+        per_asset = (self._totals.copy() if self._totals is not None
+                     else pd.DataFrame(columns=["asset_class", *_TOTAL_COLUMNS]))
+        start = pd.Timestamp(period_start) if period_start is not None else self._period_start
+        end = pd.Timestamp(period_end) if period_end is not None else self._period_end
+        period_hours = (end - start).total_seconds() / 3600 if start is not None and end is not None else 0.0
+        per_asset["uptime"] = (period_hours - per_asset["downtime"]).clip(lower=0)
+        per_asset.index.name = "asset"
+
+        per_class = per_asset.groupby("asset_class").agg(
+            assets=("uptime", "size"),
+            **{c: (c, "sum") for c in ("uptime", *_TOTAL_COLUMNS)},
+        )
+        return _with_kpis(per_asset), _with_kpis(per_class)
+
+
+def _with_kpis(totals):
+    totals["MTBF (h)"] = mtbf(totals["uptime"], totals["failures"].where(totals["failures"] > 0))
+    totals["MTTR (h)"] = mttr(totals["downtime"], totals["repairs"].where(totals["repairs"] > 0))
+    span = totals["uptime"] + totals["downtime"]
+    totals["Availability"] = availability(totals["uptime"], totals["downtime"]).where(span > 0)
+    totals["Cost per Unit"] = cost_per_unit(totals["cost"], totals["output"].where(totals["output"] > 0))
+    return totals
+
+
+def summarize_work_orders(file, name=None, chunksize=DEFAULT_CHUNKSIZE, block_size=CSV_BLOCK_SIZE,
+                          period_start=None, period_end=None):
+    """Stream a work-order export and return ``(per_asset, per_class)`` KPI tables."""
+    accumulator = WorkOrderAccumulator()
+    for chunk in iter_work_order_chunks(file, name, chunksize, block_size):
+        accumulator.update(chunk)
+    return accumulator.result(period_start, period_end)
+
+
+def file_digest(file, block_size=1 << 20):
+    """SHA-256 of a file path or binary file object, read in blocks."""
+    if isinstance(file, (str, bytes)) or hasattr(file, "__fspath__"):
+        with open(file, "rb") as f:
+            return file_digest(f, block_size)
+    h = hashlib.sha256()
+    position = file.tell()
+    file.seek(0)
+    for block in iter(lambda: file.read(block_size), b""):
+        h.update(block)
+    file.seek(position)
+    return h.hexdigest()
+
+
+def input_file(file):
+    """``file`` as a pyarrow input file from its start, read without copies where possible.
+
+    Paths are memory-mapped and in-memory files (bytes, ``BytesIO`` such as
+    Streamlit uploads) wrapped: given a stream instead, pyarrow's CSV and
+    Parquet readers read ahead of the parser and hold much of the file.
+    """
+    import pyarrow as pa
+
+    if isinstance(file, (str, os.PathLike)):
+        return pa.memory_map(os.fspath(file))
+    if isinstance(file, (bytes, bytearray, memoryview)):
+        return pa.BufferReader(file)
+    if hasattr(file, "getbuffer"):
+        return pa.BufferReader(pa.py_buffer(file.getbuffer()))
+    file.seek(0)
+    return file
@@ -0,0 +1,28 @@
+import pytest
+from streamlit.testing.v1 import AppTest
+
+SCRIPT = """
+import streamlit as st
+
+from app_pages.instrumentation import admin_enabled
+
+st.write(str(admin_enabled()))
+"""
+
+
+@pytest.mark.parametrize("token, given, enabled", [
+    (None, None, False),
+    (None, "anything", False),
+    ("s3cret", None, False),
+    ("s3cret", "wrong", False),
+    ("s3cret", "s3cret", True),
+])
+def test_admin_link_needs_the_configured_token(monkeypatch, token, given, enabled):
+    monkeypatch.delenv("MAINT_ADVISOR_ADMIN_TOKEN", raising=False)
+    if token:
+        monkeypatch.setenv("MAINT_ADVISOR_ADMIN_TOKEN", token)
+    app = AppTest.from_string(SCRIPT)
+    if given:
+        app.query_params["admin"] = given
+    app.run()
+    assert app.markdown[0].value == str(enabled)
@@ -0,0 +1,49 @@
+import json
+import os
+
+import pytest
+
+from benchmarks.suite import ENGINE_CASES, THRESHOLDS, find_regressions, measure_engine
+
+BUDGETS = {
+    "tolerance": 0.3,
+    "noise": {"ms": 5, "count": 0},
+    "pages": {"*": {"rerun_ms_p50": 100, "write_syscalls_per_rerun": 0},
+              "Optimal PM Interval": {"rerun_ms_p50": 200}},
+}
+
+
+def pages(**metrics):
+    return {"pages": metrics}
+
+
+def test_budgets_fall_back_to_the_default_page_entry():
+    results = pages(**{"KPIs": {"rerun_ms_p50": 150, "write_syscalls_per_rerun": 0},
+                       "Optimal PM Interval": {"rerun_ms_p50": 150}})
+    assert find_regressions(results, BUDGETS) == ["pages/KPIs: rerun_ms_p50 150 over the budget 100"]
+
+
+def test_baseline_regressions_need_the_tolerance_and_the_noise_floor():
+    baseline = pages(KPIs={"rerun_ms_p50": 10, "write_syscalls_per_rerun": 0})
+    # +40 % but only 4 ms: noise.
+    assert find_regressions(pages(KPIs={"rerun_ms_p50": 14}), BUDGETS, baseline) == []
+    # +20 %: inside the tolerance.
+    assert find_regressions(pages(KPIs={"rerun_ms_p50": 12}), {**BUDGETS, "noise": {}}, baseline) == []
+    (regression,) = find_regressions(pages(KPIs={"rerun_ms_p50": 30}), BUDGETS, baseline)
+    assert regression.startswith("pages/KPIs: rerun_ms_p50 30 vs 10 in the baseline (+200 %)")
+    # Counts have no noise floor: one write per rerun is over a budget of zero.
+    assert len(find_regressions(pages(KPIs={"write_syscalls_per_rerun": 1}), BUDGETS, baseline)) == 2
+
+
+def test_every_engine_case_has_a_budget():
+    with open(THRESHOLDS) as f:
+        engine = json.load(f)["engine"]
+    assert set(ENGINE_CASES) <= set(engine)
+
+
+@pytest.mark.parametrize("case", ["kpi_formulas", "rbd_importance"])
+def test_engine_cases_run_at_a_small_scale(case, monkeypatch):
+    # The suite runs as a script, with the other benchmark modules next to it on the path.
+    monkeypatch.syspath_prepend(os.path.dirname(THRESHOLDS))
+    result = measure_engine(0.01, 1, [case])[case]
+    assert result["rows"] > 0 and result["seconds"] > 0 and result["peak_mb"] >= 0
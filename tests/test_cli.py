@@ -0,0 +1,84 @@
+import itertools
+import json
+import os
+import subprocess
+import sys
+
+import pandas as pd
+import pytest
+
+from maint_advisor.cli import main
+from maint_advisor.content import QUIZ_QUESTIONS
+from maint_advisor.recommendation import FACTORS, recommend_fleet
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def maint_advisor(*args, stdin=""):
+    return subprocess.run([sys.executable, "-m", "maint_advisor", *args], input=stdin, capture_output=True,
+                          text=True, cwd=ROOT)
+
+
+def test_recommend_keeps_the_input_order_across_chunks_and_workers(tmp_path):
+    register = pd.DataFrame(list(itertools.product(*FACTORS.values())), columns=list(FACTORS))
+    register.insert(0, "asset", [f"A-{i}" for i in range(len(register))])
+    register.to_csv(tmp_path / "register.csv", index=False)
+    assert main(["recommend", str(tmp_path / "register.csv"), "-o", str(tmp_path / "out.parquet"),
+                 "--chunk-rows", "50", "--workers", "2"]) == 0
+    result = pd.read_parquet(tmp_path / "out.parquet")
+    assert list(result["asset"]) == list(register["asset"])
+    assert list(result["recommendation"]) == list(recommend_fleet(register)["recommendation"])
+
+
+@pytest.mark.parametrize("suffix", ["jsonl", "csv", "stdin"])
+def test_parquet_output_takes_column_types_from_the_whole_input(tmp_path, suffix):
+    register = pd.DataFrame(list(itertools.product(*FACTORS.values()))[:6], columns=list(FACTORS))
+    # Empty in the first chunk, text later; integers first, decimals later.
+    register["notes"] = [None, None, None, "leak", None, None]
+    register["hours"] = [1, 1, 2.5, 2.5, 2.5, 2.5]
+    jsonl = "".join(json.dumps(row) + "\n" for row in register.to_dict("records"))
+    source = tmp_path / f"register.{'csv' if suffix == 'csv' else 'jsonl'}"
+    register.to_csv(source, index=False) if suffix == "csv" else source.write_text(jsonl)
+    out = tmp_path / "out.parquet"
+    args = ("recommend", "--chunk-rows", "2", "-o", str(out))
+    result = maint_advisor(*args, stdin=jsonl) if suffix == "stdin" else maint_advisor(*args, str(source))
+    assert result.returncode == 0, result.stderr
+    written = pd.read_parquet(out)
+    assert written["notes"].tolist()[3] == "leak" and written["notes"].isna().sum() == 5
+    assert written["hours"].tolist() == [1, 1, 2.5, 2.5, 2.5, 2.5]
+    assert len(written) == 6 and written["recommendation"].notna().all()
+
+
+def test_kpi_reads_stdin_and_leaves_zero_denominators_empty():
+    rows = [{"asset": "P-1", "uptime": 900, "failures": 3, "downtime": 30, "repairs": 3},
+            {"asset": "P-2", "uptime": 1000, "failures": 0, "downtime": 0, "repairs": 0}]
+    result = maint_advisor("kpi", stdin="".join(json.dumps(row) + "\n" for row in rows))
+    assert result.returncode == 0, result.stderr
+    out = [json.loads(line) for line in result.stdout.splitlines()]
+    assert out[0]["mtbf"] == 300 and out[0]["mttr"] == 10
+    assert out[0]["availability"] == pytest.approx(900 / 930)
+    assert out[1]["mtbf"] is None and out[1]["availability"] == 1.0
+
+
+def test_quiz_scores(tmp_path):
+    key = [options[correct] for _, options, correct, _ in QUIZ_QUESTIONS]
+    attempts = tmp_path / "attempts.jsonl"
+    attempts.write_text(json.dumps({"student": "a", "answers": key}) + "\n"
+                        + json.dumps({"student": "b", "answers": key[:10]}) + "\n")
+    out = tmp_path / "scores.csv"
+    assert main(["quiz-score", str(attempts), "-o", str(out)]) == 0
+    scores = pd.read_csv(out)
+    assert list(scores["score"]) == [25, 10] and list(scores["percent"]) == [100.0, 40.0]
+
+
+def test_errors_are_reported_without_a_traceback():
+    result = maint_advisor("kpi", stdin=json.dumps({"asset": "P-1"}) + "\n")
+    assert result.returncode == 1
+    assert result.stderr.startswith("maint-advisor kpi: error: No KPI inputs found")
+
+
+def test_help_does_not_import_the_numeric_libraries():
+    code = ("import sys\nfrom maint_advisor import cli\ntry:\n    cli.main(['--help'])\nexcept SystemExit:\n"
+            "    pass\nprint(sorted({'numpy', 'pandas', 'pyarrow'} & set(sys.modules)))")
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, cwd=ROOT, check=True)
+    assert result.stdout.splitlines()[-1] == "[]"
@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+
+from maint_advisor.curves import (BathtubParams, DipfParams, bathtub_hazard, bathtub_png, cache_info, dipf_png,
+                                  pf_condition)
+
+PNG = b"\x89PNG\r\n\x1a\n"
+
+
+def test_bathtub_segments():
+    p = BathtubParams()
+    infant, random, wearout, total = bathtub_hazard([0.0, p.infant_end, p.wearout_start], p)
+    assert infant[0] == pytest.approx(p.infant_rate)
+    assert infant[1] == pytest.approx(0.05 * p.infant_rate)
+    assert wearout[2] == pytest.approx(p.random_rate)
+    np.testing.assert_allclose(total, infant + random + wearout)
+    t = np.linspace(0, p.horizon, 200)
+    total = bathtub_hazard(t, p)[3]
+    bottom = np.argmin(total)
+    assert p.infant_end < t[bottom] < p.wearout_start
+    assert (np.diff(total[:bottom]) < 0).all() and (np.diff(total[bottom + 1:]) > 0).all()
+
+
+def test_pf_condition():
+    p = DipfParams()
+    condition = pf_condition([0.0, p.onset, p.detection, p.failure, p.failure + 10], p)
+    assert condition[0] == condition[1] == 100.0
+    assert 0 < condition[2] < 100
+    assert condition[3] == condition[4] == 0.0
+
+
+@pytest.mark.parametrize("curve, params", [
+    (bathtub_hazard, BathtubParams(infant_end=15.0)),
+    (bathtub_hazard, BathtubParams(wearout_beta=1.0)),
+    (pf_condition, DipfParams(detection=80.0)),
+])
+def test_inconsistent_parameters_are_rejected(curve, params):
+    with pytest.raises(ValueError):
+        curve([1.0], params)
+
+
+def test_renders_are_cached_on_the_parameters():
+    first = bathtub_png(BathtubParams(random_rate=0.3))
+    misses = cache_info()["bathtub"].misses
+    # Integers and floats of the same value are one cache entry.
+    assert bathtub_png((3, 14, 20, 0.3, 0.8, 4)) is first
+    assert cache_info()["bathtub"].misses == misses
+    assert first.startswith(PNG)
+    marked = dipf_png(assets=[("P-1", 40.004), ("P-2", 90)])
+    assert marked.startswith(PNG) and marked != dipf_png()
+    assert dipf_png(assets=[("P-1", 40.0), ("P-2", 90.0)]) is marked
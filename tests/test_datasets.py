@@ -0,0 +1,138 @@
+import io
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+from maint_advisor import datasets
+from maint_advisor.datasets import DatasetStore, read_dataset
+from maint_advisor.work_orders import csv_convert_options
+
+
+@pytest.fixture
+def store(tmp_path):
+    return DatasetStore(tmp_path / "store")
+
+
+def mixed_table(rows=1_000):
+    rng = np.random.default_rng(0)
+    return pa.table({
+        "asset": pa.array([f"P-{i}" if i % 7 else None for i in range(rows)]),
+        "hours": pa.array(rng.uniform(0, 1e4, rows)),
+        "count": pa.array(np.arange(rows, dtype=np.int32)),
+        "failed": pa.array([bool(i % 3) if i % 11 else None for i in range(rows)]),
+        "installed": pa.array(pd.date_range("2020-01-01", periods=rows, freq="h")),
+        "blob": pa.array([bytes([i % 256]) * (i % 5) for i in range(rows)], pa.binary()),
+        "empty": pa.nulls(rows),
+        "tags": pa.array([[i, i + 1] for i in range(rows)]),
+    })
+
+
+def test_parquet_round_trip_across_batches(store, tmp_path, monkeypatch):
+    # Small batches: later batches bring the first nulls of a column, slices start mid-buffer.
+    monkeypatch.setattr(datasets, "PARQUET_BATCH_ROWS", 97)
+    monkeypatch.setattr(datasets, "PACK_ROWS", 64)
+    table = mixed_table()
+    path = tmp_path / "register.parquet"
+    pq.write_table(table, path, row_group_size=300)
+    stored = store.table(store.put(str(path)))
+    assert stored.num_rows == table.num_rows
+    assert stored.schema.field("asset").type == pa.large_string()
+    for name in table.column_names:
+        assert stored.column(name).to_pylist() == table.column(name).to_pylist(), name
+
+
+def test_zero_rows(store, tmp_path):
+    path = tmp_path / "empty.parquet"
+    pq.write_table(mixed_table().slice(0, 0), path)
+    frame = store.frame(store.put(str(path)))
+    assert frame.empty
+    assert list(frame.columns) == mixed_table().column_names
+
+
+def test_upload_objects_and_bytes_share_an_address(store):
+    data = b"asset,hours\nP-1,10\nP-2,20.5\n"
+    upload = io.BytesIO(data)
+    upload.name = "register.csv"
+    digest = store.put(upload)
+    assert store.put(data, "register.csv") == digest
+    pd.testing.assert_frame_equal(store.frame(digest), pd.DataFrame({"asset": ["P-1", "P-2"],
+                                                                     "hours": [10.0, 20.5]}),
+                                  check_dtype=False)
+
+
+def test_csv_types_are_taken_from_the_whole_file(store, monkeypatch):
+    # Every value of the first block is an integer; a later block has decimals and text.
+    monkeypatch.setattr(datasets, "CSV_BLOCK_SIZE", 1 << 10)
+    lines = ["code,hours,day"] + [f"{i},{i},2024-01-{i % 28 + 1:02d}" for i in range(1_000)]
+    lines += ["X-1,2.5,2024-02-01"]
+    stored = store.table(store.put("\n".join(lines).encode(), "log.csv"))
+    assert stored.schema.field("code").type == pa.large_string()
+    assert stored.schema.field("hours").type == pa.float64()
+    assert stored.schema.field("day").type == pa.date32()
+    assert stored.column("code").to_pylist()[-1] == "X-1"
+    assert stored.num_rows == 1_001
+
+
+def test_work_order_options_read_day_first_dates(store):
+    data = b"Asset,Failure Start,Restore Time\nP-1,03/04/2024 08:00,03/04/2024 10:00\n"
+    upload = io.BytesIO(data)
+    options = csv_convert_options(upload)
+    typed = store.put(upload, "orders.csv", csv_options=options)
+    frame = store.frame(typed)
+    assert frame["Failure Start"].iloc[0] == pd.Timestamp("2024-04-03 08:00")
+    # The same bytes read without the options are another dataset.
+    assert store.put(data, "orders.csv") != typed
+
+
+def test_key_skips_hashing_while_the_dataset_is_stored(store, monkeypatch):
+    digest = store.put(b"a\n1\n", "one.csv", key="upload-1")
+    monkeypatch.setattr(datasets, "_digest", lambda *args: pytest.fail("hashed again"))
+    assert store.put(b"a\n1\n", "one.csv", key="upload-1") == digest
+    store.remove(digest)
+    monkeypatch.undo()
+    assert store.put(b"a\n1\n", "one.csv", key="upload-1") == digest
+    assert digest in store
+
+
+def test_least_recently_used_datasets_are_evicted(tmp_path):
+    store = DatasetStore(tmp_path / "store", budget_bytes=1)
+    first = store.put(b"a\n1\n", "one.csv")
+    second = store.put(b"a\n2\n", "two.csv")
+    assert first not in store and second in store
+    assert store.evictions == 1
+    # The newest dataset stays even over the budget, and a reopened store indexes it.
+    reopened = DatasetStore(tmp_path / "store")
+    assert len(reopened) == 1 and second in reopened
+
+
+def test_frames_map_the_stored_file(store, tmp_path):
+    path = tmp_path / "register.parquet"
+    pq.write_table(pa.table({"hours": np.arange(10_000, dtype=float), "asset": ["P"] * 10_000}), path)
+    digest = store.put(str(path))
+    frame = store.frame(digest)
+    assert not frame["hours"].to_numpy().flags.writeable
+    pd.testing.assert_frame_equal(read_dataset(store.path(digest), ["hours"]), frame[["hours"]])
+
+
+def test_derived_results_are_computed_once(store):
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return pd.DataFrame({"x": [1, 2]})
+
+    first = store.derived(("totals", 1), compute)
+    second = store.derived(("totals", 1), compute)
+    pd.testing.assert_frame_equal(first, second)
+    assert len(calls) == 1
+
+
+def test_concurrent_writes_count_every_miss(store):
+    frames = [pd.DataFrame({"x": range(i, i + 100)}) for i in range(32)]
+    with ThreadPoolExecutor(8) as pool:
+        list(pool.map(lambda i: store.put_frame(frames[i], ("part", i)), range(len(frames))))
+    assert store.misses == len(frames) and len(store) == len(frames)
@@ -0,0 +1,72 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from maint_advisor.dga import (FREQUENT, RARE, classify_samples, duval_triangle1, gas_generation_rates,
+                               transformer_failure_history)
+
+# (ch4, c2h4, c2h2) in ppm -> Duval Triangle 1 zone.
+DUVAL_CASES = {
+    (100, 0, 0): "PD",
+    (80, 10, 0): "T1",
+    (50, 40, 1): "T2",
+    (20, 80, 2): "T3",
+    (30, 10, 60): "D1",
+    (20, 40, 40): "D2",
+    (40, 50, 10): "DT",
+}
+
+
+def test_duval_zones():
+    ch4, c2h4, c2h2 = np.array(list(DUVAL_CASES) + [(0, 0, 0)], dtype=float).T
+    frame = classify_samples(pd.DataFrame({"h2": 10.0, "ch4": ch4, "c2h6": 10.0, "c2h4": c2h4, "c2h2": c2h2}))
+    assert list(frame["duval"][:-1]) == list(DUVAL_CASES.values())
+    assert pd.isna(frame["duval"].iloc[-1])
+    assert duval_triangle1([0], [0], [0])[0] == -1
+
+
+def test_ratio_methods():
+    samples = pd.DataFrame({
+        # Normal ageing, high-energy arcing, a hot spot above 700 °C and partial discharges.
+        "Hydrogen": [100, 100, 10, 1_000],
+        "Methane": [50, 50, 50, 50],
+        "Ethane": [50, 10, 10, 100],
+        "Ethylene": [20, 50, 50, 10],
+        "Acetylene": [0, 50, 0, 0],
+    })
+    frame = classify_samples(samples)
+    assert list(frame["rogers"][:3]) == ["Normal", "Arcing", "Thermal > 700 °C"]
+    assert list(frame["iec"][1:]) == ["D2", "T3", "PD"]
+    assert list(frame["tdcg"]) == [220, 260, 120, 1_160]
+    assert list(frame["above_limits"]) == [False, True, False, True]
+
+
+def test_generation_rates_follow_each_transformer():
+    rates = gas_generation_rates(["A", "B", "A", "A"],
+                                 ["2024-01-11", "2024-01-01", "2024-01-01", "2024-01-31"],
+                                 [[200.0], [50.0], [100.0], [100.0]])
+    np.testing.assert_array_equal(rates[:, 0], [10.0, np.nan, np.nan, -5.0])
+
+
+def test_latest_diagnosis_sets_the_failure_history():
+    samples = pd.DataFrame({
+        "transformer": ["T-1", "T-1", "T-2", "T-2"],
+        "sample_date": pd.to_datetime(["2024-06-01", "2024-01-01", "2024-01-01", "2024-06-01"]),
+        "h2": [10, 500, 10, 10], "ch4": [20, 200, 20, 200], "c2h6": [10, 50, 10, 50],
+        "c2h4": [5, 800, 5, 800], "c2h2": [0, 20, 0, 20],
+    })
+    history = transformer_failure_history(classify_samples(samples))
+    assert list(history["transformer"]) == ["T-1", "T-2"]
+    assert list(history["failure_history"]) == [RARE, FREQUENT]
+
+
+@pytest.mark.parametrize("change, message", [
+    ({"c2h2": None}, "missing gas columns: c2h2"),
+    ({"h2": -1.0}, "must not be negative"),
+])
+def test_bad_tables_are_rejected(change, message):
+    data = pd.DataFrame({"h2": [1.0], "ch4": [1.0], "c2h6": [1.0], "c2h4": [1.0], "c2h2": [1.0]})
+    for column, value in change.items():
+        data = data.drop(columns=column) if value is None else data.assign(**{column: value})
+    with pytest.raises(ValueError, match=message):
+        classify_samples(data)
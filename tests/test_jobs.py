@@ -0,0 +1,157 @@
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from maint_advisor import jobs, simulation, weibull
+from maint_advisor.jobs import CANCELLED, DONE, FAILED, JobRunner
+
+# Job functions run in spawned workers, which import them from this module.
+
+
+def square(progress, x):
+    progress(1.0, "squared")
+    return x * x, time.time()
+
+
+def sleepy(progress, seconds, tag):
+    end = time.time() + seconds
+    while time.time() < end:
+        progress(1 - (end - time.time()) / seconds, tag)
+        time.sleep(0.02)
+    return tag
+
+
+def broken(progress, tag):
+    raise KeyError(tag)
+
+
+@pytest.fixture
+def runner(tmp_path):
+    runner = JobRunner(tmp_path / "jobs", workers=2, per_owner=1, max_queued=2)
+    yield runner
+    runner.shutdown()
+
+
+def test_identical_requests_share_one_job_and_its_stored_result(runner, tmp_path):
+    ids = {runner.submit(square, 7, owner=f"session {i}") for i in range(5)}
+    assert len(ids) == 1
+    (id,) = ids
+    assert runner.wait(id, 60).state == DONE
+    value, computed = runner.result(id)
+    assert value == 49 and runner.executed == 1
+    runner.shutdown()
+    restarted = JobRunner(tmp_path / "jobs", workers=1)
+    assert restarted.status(restarted.submit(square, 7, owner="new")).state == DONE
+    assert restarted.result(id) == (49, computed) and restarted.executed == 0
+
+
+def test_results_of_other_code_are_not_reused(runner, tmp_path, monkeypatch):
+    id = runner.submit(square, 7, owner="a")
+    assert runner.wait(id, 60).state == DONE
+    runner.shutdown()
+    # As after a deploy that changed an engine module.
+    monkeypatch.setattr(jobs, "code_version", lambda module: "changed")
+    restarted = JobRunner(tmp_path / "jobs", workers=1)
+    try:
+        new = restarted.submit(square, 7, owner="a")
+        assert new != id and restarted.wait(new, 60).state == DONE and restarted.executed == 1
+    finally:
+        restarted.shutdown()
+
+
+def test_a_failed_job_is_kept_until_retried(runner):
+    id = runner.submit(broken, "pump", owner="a")
+    job = runner.wait(id, 60)
+    assert job.state == FAILED and isinstance(job.error, KeyError)
+    with pytest.raises(KeyError):
+        runner.result(id)
+    runner.submit(broken, "pump", owner="a")
+    assert runner.executed == 1
+    runner.submit(broken, "pump", owner="a", retry=True)
+    assert runner.wait(id, 60).state == FAILED and runner.executed == 2
+
+
+def test_cancelling_stops_a_job_once_nobody_waits_for_it(runner):
+    id = runner.submit(sleepy, 30, "shared", owner="a")
+    runner.submit(sleepy, 30, "shared", owner="b")
+    while runner.status(id).progress == 0:
+        time.sleep(0.05)
+    runner.cancel(id, "a")
+    time.sleep(0.3)
+    assert not runner.status(id).finished
+    runner.cancel(id, "b")
+    assert runner.wait(id, 10).state == CANCELLED
+
+
+def test_waiting_jobs_are_limited_per_session(runner):
+    runner.submit(sleepy, 5, "running", owner="greedy")
+    runner.submit(sleepy, 5, "queued 1", owner="greedy")
+    runner.submit(sleepy, 5, "queued 2", owner="greedy")
+    with pytest.raises(ValueError, match="already waiting"):
+        runner.submit(sleepy, 5, "queued 3", owner="greedy")
+    runner.submit(sleepy, 5, "other session", owner="other")
+    runner.cancel(runner.submit(sleepy, 5, "running", owner="greedy"))
+
+
+def test_job_functions_do_not_start_process_pools(tmp_path, monkeypatch):
+    def no_pool(*args, **kwargs):
+        raise AssertionError("a job started a process pool of its own")
+
+    monkeypatch.setattr(weibull, "ProcessPoolExecutor", no_pool)
+    monkeypatch.setattr(simulation, "ProcessPoolExecutor", no_pool)
+    monkeypatch.setattr("os.cpu_count", lambda: 4)
+    rng = np.random.default_rng(0)
+    life = pd.DataFrame({"asset_class": np.repeat(["pumps", "fans"], 50),
+                         "time": rng.weibull(2.0, 100) * 1_000, "failed": 1})
+    life.to_csv(tmp_path / "life.csv", index=False)
+    from maint_advisor.datasets import DatasetStore
+
+    store = DatasetStore(tmp_path / "store")
+    path = store.path(store.put(str(tmp_path / "life.csv")))
+    fits = jobs.life_data_analysis(lambda *args: None, path, False, 200)
+    assert list(fits.index) == ["fans", "pumps"] and fits["beta_lower"].notna().all()
+    jobs.policy_simulation(lambda *args: None, simulation.SimulationInputs(), 20, 2, 40)
+
+
+# Guarded like the app's script: spawned workers import the script being run as "__mp_main__".
+FAILING_PAGE = """
+import streamlit as st
+
+from app_pages.jobs import run_job
+from maint_advisor import jobs
+
+if __name__ == "__main__":
+    st.write(run_job("Reading work-order export", jobs.work_order_kpis, "missing.arrow"))
+"""
+
+
+def test_a_failed_job_is_shown_on_the_page_instead_of_raised(tmp_path, monkeypatch):
+    from streamlit.testing.v1 import AppTest
+
+    from app_pages.jobs import get_job_runner
+
+    monkeypatch.setenv("MAINT_ADVISOR_JOB_DIR", str(tmp_path / "jobs"))
+    # Running a script replaces __main__; put pytest's back afterwards.
+    monkeypatch.setitem(sys.modules, "__main__", sys.modules["__main__"])
+    get_job_runner.clear()
+    try:
+        at = AppTest.from_string(FAILING_PAGE, default_timeout=60).run()
+        deadline = time.time() + 60
+        while not at.error and time.time() < deadline:
+            time.sleep(0.2)
+            at.run()
+        assert not at.exception
+        assert at.error[0].value.startswith("Reading work-order export failed: ")
+        assert "missing.arrow" in at.error[0].value
+        assert get_job_runner().executed == 1
+        # Later reruns show the stored failure without polling or resubmitting the job.
+        at.run()
+        assert not at.exception and len(at.error) == 1 and get_job_runner().executed == 1
+        at.button(key=[b.key for b in at.button if b.key.startswith("retry_")][0]).click().run()
+        assert get_job_runner().executed == 2
+    finally:
+        get_job_runner().shutdown()
+        get_job_runner.clear()
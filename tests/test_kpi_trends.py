@@ -0,0 +1,120 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from maint_advisor.cli import main
+from maint_advisor.kpi_trends import DAY, KpiTrendStore
+
+
+def work_orders(n, seed, first="2023-01-01", days=500):
+    rng = np.random.default_rng(seed)
+    start = pd.Timestamp(first) + pd.to_timedelta(rng.integers(0, days * DAY, n), unit="s")
+    restore = start + pd.to_timedelta(rng.integers(3_600, 48 * 3_600, n), unit="s")
+    return pd.DataFrame({
+        "asset": rng.choice(["P-1", "P-2", "C-1"], n),
+        "failure_start": start,
+        "restore_time": restore.where(rng.random(n) > 0.1),
+        "due_date": start + pd.to_timedelta(24, unit="h"),
+        "cost": rng.uniform(100, 1000, n),
+        "budget": 500.0,
+    }).assign(asset_class=lambda f: f["asset"].str[0])
+
+
+def expected(events, windows):
+    """Rolling sums computed from scratch over every event."""
+    day = events["failure_start"].astype("datetime64[s]").astype("int64") // DAY
+    restored = events["restore_time"].notna()
+    downtime = ((events["restore_time"] - events["failure_start"]).dt.total_seconds() / 3600).fillna(0.0)
+    rows = []
+    for window in windows:
+        recent = day > day.max() - window
+        frame = pd.DataFrame({"asset": events["asset"], "failures": 1, "repairs": restored.astype(int),
+                              "downtime": downtime})[recent]
+        rows.append(frame.groupby("asset").sum().assign(window=window))
+    return pd.concat(rows).reset_index().set_index(["asset", "window"]).sort_index()
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = KpiTrendStore(str(tmp_path / "events.db"), windows=(30, 90), fold_rows=50)
+    yield store
+    store.close()
+
+
+def test_incremental_folds_match_a_full_recount(store):
+    batches = [work_orders(300, seed=1, days=300), work_orders(200, seed=2, first="2023-10-01", days=200)]
+    for batch in batches:
+        assert store.append(batch) == len(batch)
+        store.fold()
+    events = pd.concat(batches, ignore_index=True)
+    current = store.current()
+    want = expected(events, (30, 90))
+    pd.testing.assert_frame_equal(current[["failures", "repairs"]], want[["failures", "repairs"]],
+                                  check_dtype=False)
+    np.testing.assert_allclose(current["downtime"], want["downtime"])
+    assert store.version() == len(events)
+    assert store.last_day() == events["failure_start"].max().normalize()
+
+
+def test_an_export_is_counted_once(store):
+    batch = work_orders(100, seed=3)
+    assert store.append(batch, digest="export-1") == 100
+    assert store.append(batch, digest="export-1") == 0
+    assert store.has_batch("export-1")
+    assert store.fold() == 100 and store.fold() == 0
+
+
+def test_changing_the_windows_rebuilds_the_rolling_sums(tmp_path):
+    path = str(tmp_path / "events.db")
+    events = work_orders(200, seed=4)
+    store = KpiTrendStore(path, windows=(30,))
+    store.append(events)
+    store.fold()
+    store.close()
+    store = KpiTrendStore(path, windows=(7, 365))
+    try:
+        current = store.current()
+        assert sorted(current.index.unique("window")) == [7, 365]
+        pd.testing.assert_series_equal(current["failures"], expected(events, (7, 365))["failures"],
+                                       check_dtype=False)
+    finally:
+        store.close()
+
+
+def test_trend_windows_cover_the_whole_fleet(store):
+    events = pd.DataFrame({
+        "asset": ["P-1", "P-2", "P-1"],
+        "asset_class": ["Pump", "Pump", "Pump"],
+        "failure_start": ["2024-01-01 00:00", "2024-01-10 00:00", "2024-02-15 00:00"],
+        "restore_time": ["2024-01-01 06:00", "2024-01-10 12:00", None],
+    })
+    store.append(events)
+    store.fold()
+    trend = store.trend(asset_class="Pump").xs(30, level="window")
+    assert list(trend.loc["2024-01-10", ["failures", "repairs", "downtime"]]) == [2, 2, 18]
+    # Two assets for 30 days, less the downtime.
+    assert trend.loc["2024-01-10", "uptime"] == 2 * 30 * 24 - 18
+    assert trend.loc["2024-02-10", "failures"] == 0
+    assert store.trend(assets=["P-2"]).xs(30, level="window")["failures"].max() == 1
+
+
+def test_rows_without_a_start_are_dropped_and_missing_columns_rejected(store):
+    events = work_orders(10, seed=5)
+    events.loc[:2, "failure_start"] = None
+    assert store.append(events) == 7
+    with pytest.raises(ValueError, match="missing columns: asset"):
+        store.append(events.drop(columns="asset"))
+
+
+def test_cli_skips_an_export_already_in_the_log(tmp_path, capsys):
+    events = work_orders(100, seed=6)
+    # Exports may carry fractional seconds.
+    events["failure_start"] += pd.to_timedelta(0.25, unit="s")
+    events.to_csv(tmp_path / "export.csv", index=False)
+    args = ["trends", str(tmp_path / "export.csv"), "--db", str(tmp_path / "events.db"), "--windows", "30",
+            "-o", str(tmp_path / "out.csv")]
+    assert main(args) == 0
+    first = pd.read_csv(tmp_path / "out.csv")
+    assert main(args) == 0
+    assert "already in the log" in capsys.readouterr().err
+    pd.testing.assert_frame_equal(pd.read_csv(tmp_path / "out.csv"), first)
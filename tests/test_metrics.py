@@ -0,0 +1,49 @@
+import marshal
+
+import pytest
+
+from maint_advisor.metrics import RenderMetrics, RenderSample, profile
+
+
+def sample(page, wall, hits=0, misses=0):
+    return RenderSample(0.0, page, "session", 1, wall, wall / 2, 0, hits, misses)
+
+
+def test_totals_outlive_the_ring_buffer():
+    metrics = RenderMetrics(capacity=3)
+    for wall in (0.005, 0.02, 0.3, 4.0, 9.0):
+        metrics.record(sample("Bathtub Curve", wall))
+    assert len(metrics.samples) == 3 and list(metrics.frame()["wall"]) == [0.3, 4.0, 9.0]
+    renders, wall, cpu, histogram = metrics.page_totals()["Bathtub Curve"]
+    assert renders == 5 and wall == pytest.approx(13.325) and cpu == pytest.approx(13.325 / 2)
+    # Cumulative counts for le = 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5 and 5 s.
+    assert histogram == (1, 2, 2, 2, 2, 3, 3, 3, 4)
+
+
+def test_prometheus_text(tmp_path):
+    metrics = RenderMetrics()
+    metrics.record(sample('KPIs "beta"', 0.02))
+    metrics.cache_lookup("dga.classify", hit=True)
+    metrics.cache_lookup("dga.classify", hit=False)
+    metrics.cache_lookup("dga.classify", hit=True)
+    metrics.cache_sources["curves.bathtub"] = lambda: (7, 1)
+    metrics.session_started()
+    path = tmp_path / "maint_advisor.prom"
+    metrics.write_prometheus(path)
+    lines = path.read_text().splitlines()
+    assert 'maint_advisor_renders_total{page="KPIs \\"beta\\""} 1' in lines
+    assert 'maint_advisor_render_seconds_bucket{page="KPIs \\"beta\\"",le="0.01"} 0' in lines
+    assert 'maint_advisor_render_seconds_bucket{page="KPIs \\"beta\\"",le="+Inf"} 1' in lines
+    assert 'maint_advisor_cache_lookups_total{cache="dga.classify",result="hit"} 2' in lines
+    assert 'maint_advisor_cache_lookups_total{cache="curves.bathtub",result="miss"} 1' in lines
+    assert "maint_advisor_sessions_total 1" in lines
+    assert [p.name for p in tmp_path.iterdir()] == ["maint_advisor.prom"]
+
+
+def test_cprofile_data_is_loadable():
+    with profile(top=5) as p:
+        sum(i * i for i in range(10_000))
+    assert p.extension == "prof" and "cumulative" in p.report
+    assert isinstance(marshal.loads(p.data), dict)
+    with pytest.raises(ValueError, match="Unknown profiler"):
+        profile("yappi")
@@ -0,0 +1,88 @@
+import io
+import os
+import subprocess
+import sys
+
+import pandas as pd
+import pytest
+import streamlit as st
+from streamlit.testing.v1 import AppTest
+
+from app_pages import PAGES
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP = os.path.join(ROOT, "Maintenace_strategy_APP1.py")
+
+IMPORTED_AT_START = """
+import sys
+
+from streamlit.testing.v1 import AppTest
+
+AppTest.from_file(sys.argv[1], default_timeout=60).run()
+print(" ".join(sorted(m for m in sys.modules if m.startswith("app_pages."))))
+"""
+
+TABLE_ID = """
+import streamlit as st
+
+from app_pages.overview import comparison_table
+
+st.write(str(id(comparison_table())))
+"""
+
+RUL_PAGE = """
+from app_pages import rul
+
+rul.render()
+"""
+
+
+def test_static_tables_are_shared_by_sessions():
+    first, second = AppTest.from_string(TABLE_ID).run(), AppTest.from_string(TABLE_ID).run()
+    assert first.markdown[0].value == second.markdown[0].value
+    assert first.run().markdown[0].value == first.markdown[0].value
+
+
+@pytest.fixture(scope="module")
+def app(tmp_path_factory):
+    # The app keeps its visit counter in the working directory.
+    cwd = os.getcwd()
+    os.chdir(tmp_path_factory.mktemp("app"))
+    try:
+        yield AppTest.from_file(APP, default_timeout=60).run()
+    finally:
+        os.chdir(cwd)
+
+
+@pytest.mark.parametrize("topic", list(PAGES))
+def test_every_topic_renders(app, topic):
+    app.sidebar.radio[0].set_value(topic).run()
+    assert not app.exception, app.exception[0].value if app.exception else None
+    assert app.header or app.subheader or app.title
+
+
+def test_only_the_first_page_is_imported_at_start(tmp_path):
+    result = subprocess.run([sys.executable, "-c", IMPORTED_AT_START, APP], cwd=tmp_path,
+                            env={**os.environ, "PYTHONPATH": ROOT}, capture_output=True, text=True, check=True)
+    assert result.stdout.split() == ["app_pages.instrumentation", "app_pages.overview"]
+
+
+def test_rul_predictions_are_not_recomputed_by_other_widgets(tmp_path, monkeypatch):
+    from app_pages.rul import SAMPLE_ASSETS
+
+    monkeypatch.chdir(tmp_path)
+    data = pd.concat([pd.DataFrame(SAMPLE_ASSETS)] * 20, ignore_index=True).to_csv(index=False).encode()
+
+    def upload(*args, **kwargs):
+        file = io.BytesIO(data)
+        file.name, file.file_id = "fleet.csv", "fleet-upload"
+        return file
+
+    monkeypatch.setattr(st, "file_uploader", upload)
+    page = AppTest.from_string(RUL_PAGE, default_timeout=60).run()
+    assert not page.exception and page.dataframe[0].value.shape[0] == 100
+    session = page.caption[-1].value
+    page.number_input[0].set_value(20_000).run()
+    assert not page.exception
+    # The shared session's row count is unchanged: no second inference.
+    assert page.caption[-1].value == session
@@ -0,0 +1,52 @@
+import threading
+
+import numpy as np
+import pytest
+
+from maint_advisor.content import QUIZ_QUESTIONS
+from maint_advisor.quiz_results import QuizStore, item_statistics, score_answers, score_attempts
+
+KEY = [options[correct] for _, options, correct, _ in QUIZ_QUESTIONS]
+WRONG = [options[(correct + 1) % len(options)] for _, options, correct, _ in QUIZ_QUESTIONS]
+
+
+def test_batch_scoring_matches_one_attempt_at_a_time():
+    rng = np.random.default_rng(0)
+    answers = np.where(rng.random((200, len(KEY))) < 0.6, KEY, WRONG).astype(object)
+    answers[0, 3] = None
+    scores, masks = score_attempts(answers)
+    for row, score, mask in zip(answers, scores, masks):
+        expected, correct = score_answers(row)
+        assert score == expected
+        assert [bool(mask >> i & 1) for i in range(len(KEY))] == correct
+    with pytest.raises(ValueError, match="at most 25 answers"):
+        score_attempts(np.array([KEY + KEY]))
+
+
+def test_attempts_from_many_threads_are_all_stored(tmp_path):
+    store = QuizStore(tmp_path / "quiz.db", pool_size=2)
+
+    def submit(k):
+        for _ in range(20):
+            store.record_attempt(KEY[:k] + WRONG[k:], session=str(k))
+
+    threads = [threading.Thread(target=submit, args=(k,)) for k in (0, 5, 25)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    responses = store.response_matrix()
+    assert responses.shape == (60, 25) and store.version() == 60
+    np.testing.assert_array_equal(np.sort(responses.sum(axis=1)), np.repeat([0, 5, 25], 20))
+    store.close()
+
+
+def test_item_statistics():
+    # Q1 is answered correctly by the stronger half only, Q2 by everyone, Q3 by the weaker half only.
+    strong, weak = [1, 1, 0, 1, 1], [0, 1, 1, 0, 0]
+    stats = item_statistics([strong] * 6 + [weak] * 6, group_fraction=0.5)
+    assert list(stats["difficulty"]) == [0.5, 1.0, 0.5, 0.5, 0.5]
+    assert list(stats["discrimination"]) == [1.0, 0.0, -1.0, 1.0, 1.0]
+    assert stats.loc["Q1", "point_biserial"] == pytest.approx(1.0)
+    assert np.isnan(stats.loc["Q2", "point_biserial"])
+    assert stats.loc["Q3", "point_biserial"] == pytest.approx(-1.0)
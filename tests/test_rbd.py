@@ -0,0 +1,106 @@
+import io
+import itertools
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from maint_advisor.rbd import ReliabilityBlockDiagram, load_structure
+
+STRUCTURE = {"name": "Unit 1", "type": "series", "children": [
+    "FEED",
+    {"name": "Pumps", "type": "k_of_n", "k": 2, "children": ["P-A", "P-B", "P-C"]},
+    {"name": "Coolers", "type": "parallel", "children": [
+        "E-1", {"type": "series", "children": ["E-2", "V-2"]}]},
+    {"name": "Valves", "type": "k_of_n", "k": 4, "children": ["V-A", "V-B", "V-C", "V-D", "V-E"]},
+]}
+COMPONENTS = pd.DataFrame({
+    "Asset": ["FEED", "P-A", "P-B", "P-C", "E-1", "E-2", "V-2", "V-A", "V-B", "V-C", "V-D", "V-E", "unused"],
+    "MTBF (h)": [5000, 800, 900, 1000, 300, 400, 2000, 1500, 1600, 1700, 1800, 1900, 1],
+    "MTTR (h)": [10, 40, 50, 60, 30, 20, 5, 15, 15, 15, 15, 15, 1],
+})
+
+
+def up(state):
+    """The system of STRUCTURE given each component's state."""
+    pumps = state["P-A"] + state["P-B"] + state["P-C"] >= 2
+    coolers = state["E-1"] or (state["E-2"] and state["V-2"])
+    valves = sum(state[v] for v in ("V-A", "V-B", "V-C", "V-D", "V-E")) >= 4
+    return state["FEED"] and pumps and coolers and valves
+
+
+def enumerate_states(availability):
+    """System availability and each component's Birnbaum importance over all 2^n states."""
+    names = list(availability)
+    system, birnbaum = 0.0, dict.fromkeys(names, 0.0)
+    for states in itertools.product((0, 1), repeat=len(names)):
+        state = dict(zip(names, states))
+        p = np.prod([availability[c] if s else 1 - availability[c] for c, s in state.items()])
+        system += p * up(state)
+        for c in names:
+            if state[c]:
+                # P(the others in this state) when c is critical to it.
+                birnbaum[c] += p / availability[c] * (up(state) - up({**state, c: 0}))
+    return system, birnbaum
+
+
+@pytest.fixture
+def rbd():
+    return ReliabilityBlockDiagram(STRUCTURE, COMPONENTS)
+
+
+def test_matches_an_enumeration_of_every_state(rbd):
+    table = COMPONENTS.set_index("Asset").drop("unused")
+    availability = (table["MTBF (h)"] / table.sum(axis=1)).to_dict()
+    frequency = (1 / table.sum(axis=1)).to_dict()
+    system, birnbaum = enumerate_states(availability)
+    result = rbd.system()
+    assert result["availability"] == pytest.approx(system, rel=1e-12)
+    importance = rbd.importance().set_index("component")
+    for component, value in birnbaum.items():
+        assert importance.loc[component, "birnbaum"] == pytest.approx(value, abs=1e-12)
+    w = sum(birnbaum[c] * frequency[c] for c in birnbaum)
+    assert result["failures_per_year"] == pytest.approx(w * 8760)
+    assert result["mtbf"] / (result["mtbf"] + result["mttr"]) == pytest.approx(system)
+    assert importance["failure_share"].sum() == pytest.approx(1.0)
+    assert importance.index[0] == "FEED" and importance["birnbaum"].is_monotonic_decreasing
+
+
+def test_update_and_sweep_agree_with_a_fresh_diagram(rbd):
+    changed = COMPONENTS.assign(**{"MTBF (h)": COMPONENTS["MTBF (h)"].where(COMPONENTS["Asset"] != "P-B", 2500)})
+    fresh = ReliabilityBlockDiagram(STRUCTURE, changed)
+    assert rbd.update("P-B", mtbf=2500) == pytest.approx(fresh.system())
+    pd.testing.assert_frame_equal(rbd.nodes(), fresh.nodes())
+    scenarios = rbd.sweep({"E-1": {"mtbf": [300, 600, 1200]}, "V-C": {"mttr": 5}})
+    for i, mtbf in enumerate([300, 600, 1200]):
+        rbd.update("E-1", mtbf=mtbf)
+        rbd.update("V-C", mttr=5)
+        assert scenarios.iloc[i].to_dict() == pytest.approx(rbd.system())
+
+
+def test_parallel_and_series_closed_forms():
+    components = pd.DataFrame({"component": ["a", "b"], "mtbf": [90.0, 40.0], "mttr": [10.0, 10.0]})
+    series = ReliabilityBlockDiagram({"type": "series", "children": ["a", "b"]}, components).system()
+    parallel = ReliabilityBlockDiagram({"type": "parallel", "children": ["a", "b"]}, components).system()
+    assert series["availability"] == pytest.approx(0.9 * 0.8)
+    assert parallel["availability"] == pytest.approx(1 - 0.1 * 0.2)
+    # A parallel pair fails when the surviving unit fails while the other is down.
+    assert parallel["failures_per_year"] == pytest.approx((0.2 / 100 + 0.1 / 50) * 8760)
+
+
+def test_structures_load_from_json():
+    structure = load_structure(io.BytesIO(json.dumps(STRUCTURE).encode()), "unit.json")
+    assert ReliabilityBlockDiagram(structure, COMPONENTS).nodes()["name"][0] == "Unit 1"
+
+
+@pytest.mark.parametrize("structure, message", [
+    ({"type": "series", "children": ["FEED", "FEED"]}, "more than once"),
+    ({"type": "k_of_n", "k": 3, "children": ["P-A", "P-B"]}, "k must be between"),
+    ({"type": "bridge", "children": ["P-A"]}, "unknown block type"),
+    ({"type": "parallel", "children": []}, "non-empty"),
+    ({"type": "series", "children": ["P-A", "P-Z"]}, "not in the component table"),
+])
+def test_bad_structures_are_rejected(structure, message):
+    with pytest.raises(ValueError, match=message):
+        ReliabilityBlockDiagram(structure, COMPONENTS)
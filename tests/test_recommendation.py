@@ -0,0 +1,34 @@
+import itertools
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from maint_advisor.recommendation import FACTORS, recommend, recommend_fleet
+
+
+def test_fleet_matches_the_rule_chain_for_every_combination():
+    combos = list(itertools.product(*FACTORS.values()))
+    register = pd.DataFrame(combos, columns=list(FACTORS), index=pd.RangeIndex(len(combos)) * 10)
+    fleet = recommend_fleet(register)
+    assert fleet.index.equals(register.index)
+    expected = [recommend(*combo) for combo in combos]
+    assert list(zip(fleet["recommendation"], fleet["reason"], fleet["examples"])) == expected
+
+
+def test_column_names_and_values_are_matched_loosely():
+    register = pd.DataFrame({"Criticality": [" high", "LOW"], "Environment": ["Harsh", "clean"],
+                             "Failure History": ["Frequent", "Rare"], "maintenance-cost": ["Low", "Low"],
+                             "Downtime Cost": ["Low", "Low"]})
+    assert list(recommend_fleet(register)["recommendation"]) == [
+        "Condition-Based Maintenance (CBM)", "Run-to-Failure (RTF)"]
+
+
+def test_bad_registers_are_rejected():
+    register = pd.DataFrame({name: [levels[0]] for name, levels in FACTORS.items()})
+    with pytest.raises(ValueError, match="missing columns: environment"):
+        recommend_fleet(register.drop(columns="environment"))
+    with pytest.raises(ValueError, match="'criticality' has unsupported values \\['Severe'\\]"):
+        recommend_fleet(register.assign(criticality="Severe"))
+    with pytest.raises(ValueError, match="<missing>"):
+        recommend_fleet(register.assign(criticality=np.nan))
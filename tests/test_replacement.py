@@ -0,0 +1,72 @@
+import math
+
+import numpy as np
+import pytest
+
+from maint_advisor.replacement import BETA_MAX, _renewal, optimal_intervals, optimize_fleet
+
+
+def brute_force(beta, pm_cost, failure_cost, points=30_001):
+    """Age and block optima (scaled by eta) on a fine grid."""
+    u = np.linspace(0.0, 3.0, points)
+    survival = np.exp(-u ** beta)
+    integral = np.concatenate([[0.0], np.cumsum(0.5 * (survival[1:] + survival[:-1]) * np.diff(u))])
+    m = _renewal(np.linspace(0.0, 3.0, 3_001), [beta])[0]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        age = (pm_cost * survival + failure_cost * (1 - survival)) / integral
+        block = (pm_cost + failure_cost * np.interp(u, np.linspace(0.0, 3.0, 3_001), m)) / u
+    age[0] = block[0] = np.inf
+    return age.min(), block.min()
+
+
+def test_exponential_renewal_function_is_linear():
+    u = np.linspace(0.0, 3.0, 401)
+    np.testing.assert_allclose(_renewal(u, [1.0])[0], u, atol=1e-4)
+
+
+@pytest.mark.parametrize("beta", [2.0, 3.5, BETA_MAX, 15.0, 20.0])
+def test_optimal_cost_rates_match_a_brute_force_search(beta):
+    result = optimal_intervals(beta, 1.0, 100.0, 1_000.0).iloc[0]
+    age, block = brute_force(beta, 100.0, 1_000.0)
+    assert result["age_cost_rate"] == pytest.approx(age, rel=1e-3)
+    assert result["block_cost_rate"] == pytest.approx(block, rel=5e-3)
+
+
+def test_shapes_above_the_table_are_not_clipped():
+    result = optimal_intervals([BETA_MAX, 15.0, 20.0], 1_000.0, 100.0, 1_000.0)
+    assert result["block_interval"].is_monotonic_increasing
+    assert result["block_interval"].nunique() == 3
+
+
+def test_intervals_scale_with_eta():
+    small, large = (optimal_intervals(2.5, eta, 100.0, 1_000.0).iloc[0] for eta in (1.0, 5_000.0))
+    assert large["age_interval"] == pytest.approx(small["age_interval"] * 5_000.0)
+    assert large["age_cost_rate"] == pytest.approx(small["age_cost_rate"] / 5_000.0)
+
+
+def test_no_finite_interval_without_wear_out_or_saving():
+    result = optimal_intervals([0.8, 1.0, 3.0], 1_000.0, [100.0, 100.0, 1_000.0], 1_000.0)
+    assert np.isinf(result["age_interval"]).all()
+    assert np.isinf(result["block_interval"]).all()
+    np.testing.assert_allclose(result["age_cost_rate"], result["rtf_cost_rate"])
+    assert result["rtf_cost_rate"].iloc[2] == pytest.approx(1.0 / math.gamma(1 + 1 / 3.0))
+
+
+def test_invalid_parameters_are_rejected():
+    with pytest.raises(ValueError):
+        optimal_intervals(0.0, 1_000.0, 100.0, 1_000.0)
+    with pytest.raises(ValueError):
+        optimal_intervals(2.0, 1_000.0, -1.0, 1_000.0)
+
+
+def test_fleet_table_uses_cost_columns_and_skips_unusable_rows():
+    import pandas as pd
+
+    table = pd.DataFrame({"Beta": [2.5, np.nan, 3.0], "eta": [1_000.0, 500.0, 2_000.0],
+                          "pm_cost": [100.0, 100.0, np.nan]})
+    result = optimize_fleet(table, failure_cost=1_000.0, pm_cost=200.0)
+    assert np.isnan(result.loc[1, "age_interval"])
+    expected = optimal_intervals(3.0, 2_000.0, 200.0, 1_000.0).iloc[0]
+    assert result.loc[2, "age_interval"] == pytest.approx(expected["age_interval"])
+    with pytest.raises(ValueError):
+        optimize_fleet(table[["eta"]])
@@ -0,0 +1,68 @@
+import threading
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from maint_advisor.curves import DipfParams
+from maint_advisor.rul import RulPredictor, timeline_positions
+
+
+@pytest.fixture(scope="module")
+def predictor():
+    predictor = RulPredictor(max_batch=64, max_wait_ms=50)
+    yield predictor
+    predictor.close()
+
+
+def features(predictor, rows, seed=0):
+    return np.random.default_rng(seed).uniform(0.0, 1.0, (rows, len(predictor.features))).astype(np.float32)
+
+
+def test_queued_requests_are_answered_in_batches(predictor):
+    requests = [features(predictor, k, seed=k) for k in range(1, 21)]
+    batches = predictor.batches
+    futures = [predictor.submit(x) for x in requests]
+    for x, future in zip(requests, futures):
+        np.testing.assert_allclose(future.result(10), predictor.run(x), rtol=1e-6)
+    assert predictor.batches - batches < len(requests)
+
+
+def test_concurrent_and_large_requests(predictor):
+    x = features(predictor, 1_000)
+    expected = predictor.run(x)
+    results = [None] * 4
+
+    def predict(i):
+        results[i] = predictor.predict(x[i * 250:(i + 1) * 250])
+
+    threads = [threading.Thread(target=predict, args=(i,)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    np.testing.assert_allclose(np.concatenate(results), expected, rtol=1e-6)
+    # Larger than max_batch: queued in slices and put back together in order.
+    np.testing.assert_allclose(predictor.predict(x), expected, rtol=1e-6)
+    assert predictor.predict(x[:0]).shape == (0,)
+
+
+def test_feature_tables_are_checked(predictor):
+    names = list(predictor.features)
+    table = pd.DataFrame(features(predictor, 3), columns=names).assign(extra="ignored")
+    np.testing.assert_array_equal(predictor.feature_matrix(table[names[::-1] + ["extra"]]),
+                                  predictor.feature_matrix(table[names]))
+    with pytest.raises(ValueError, match=f"Missing feature columns: {names[0]}"):
+        predictor.feature_matrix(table.drop(columns=names[0]))
+    with pytest.raises(ValueError, match="finite"):
+        predictor.feature_matrix(table.assign(**{names[0]: "n/a"}))
+    with pytest.raises(ValueError, match="feature matrix"):
+        predictor.feature_matrix(np.zeros((2, len(names) + 1)))
+
+
+def test_timeline_positions():
+    p = DipfParams()
+    np.testing.assert_allclose(timeline_positions([0.0, 500.0, 5_000.0], 1_000.0, p),
+                               [p.failure, (p.onset + p.failure) / 2, 0.0])
+    with pytest.raises(ValueError):
+        timeline_positions([1.0], 0.0, p)
@@ -0,0 +1,115 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from maint_advisor.scheduling import WeeklySchedule
+
+CREW = pd.DataFrame({
+    "Name": ["Ana", "Ben", "Cal", "Dee", "Eli"],
+    "Trade": ["Mechanical", "Mechanical", "Mechanical", "Electrical", "Electrical"],
+    "Shift Hours": [8, 8, 4, 8, 8],
+})
+
+
+def random_jobs(n, seed, days=14):
+    rng = np.random.default_rng(seed)
+    earliest = rng.integers(0, days - 2, n)
+    return pd.DataFrame({
+        "WO": [f"WO-{i}" for i in range(n)],
+        "Trade": rng.choice(["Mechanical", "Electrical"], n, p=[0.6, 0.4]),
+        "Estimated Hours": rng.choice([1.0, 2.0, 3.5, 6.0], n),
+        "Crew Size": rng.choice([1, 1, 1, 2], n),
+        "earliest": earliest,
+        "due": earliest + rng.integers(0, 5, n),
+        "priority": rng.integers(1, 6, n),
+        "outage_group": np.where(rng.random(n) < 0.15, rng.choice(["U1", "U2", "U3"], n), None),
+    })
+
+
+def check_capacity_and_crafts(schedule, jobs):
+    """Every booking fits the crew calendar and goes to technicians of the job's craft."""
+    table = schedule.assignments()
+    crafts = dict(zip(CREW["Name"], CREW["Trade"]))
+    booked = np.zeros_like(schedule.available)
+    names = list(schedule.tech_names)
+    for row in table[table["day"] >= 0].itertuples():
+        techs = row.assigned.split(", ")
+        assert len(set(techs)) == row.technicians
+        assert {crafts[t] for t in techs} == {row.craft}
+        for tech in techs:
+            booked[row.day, names.index(tech)] += row.duration
+    assert (booked <= schedule.available + 1e-9).all()
+    np.testing.assert_allclose(schedule.available - schedule.free, booked)
+    # Jobs of one outage group share a day.
+    days = table["day"].groupby(jobs["outage_group"].to_numpy()).nunique()
+    assert (days <= 1).all()
+    return table
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_schedules_respect_capacity_crafts_and_outages(seed):
+    jobs = random_jobs(80, seed)
+    schedule = WeeklySchedule(jobs, CREW, days=14)
+    table = check_capacity_and_crafts(schedule, jobs)
+    # No work at the weekend with the default five working days.
+    assert not table["day"].isin([5, 6, 12, 13]).any()
+    summary = schedule.compliance()
+    assert summary["on_time"] == (table["status"] == "on time").sum()
+    assert summary["jobs"] == summary["on_time"] + summary["late"] + summary["unscheduled"]
+    work = table["duration"] * table["technicians"]
+    assert summary["booked_hours"] == pytest.approx(work[table["day"] >= 0].sum())
+    greedy = WeeklySchedule(jobs, CREW, days=14, improve=False)
+    assert summary["on_time"] >= greedy.compliance()["on_time"]
+
+
+def test_local_search_moves_a_blocking_job():
+    # Day 0 goes to the urgent two-hour job A, which leaves no room for B there; B then
+    # takes day 1 before C, whose window runs past the horizon, and C finds no room.
+    jobs = pd.DataFrame({"job": ["A", "B", "C"], "craft": "Mechanical", "duration": [2.0, 8.0, 6.0],
+                         "technicians": [2, 2, 1], "earliest": [0, 0, 1], "due": [1, 1, 2], "priority": [1, 3, 2]})
+    crew = pd.DataFrame({"technician": ["Ana", "Ben"], "craft": ["Mechanical"] * 2, "hours": [8, 8]})
+    greedy = WeeklySchedule(jobs, crew, days=2, working_days=7, improve=False)
+    assert list(greedy.assignments()["status"]) == ["on time", "on time", "unscheduled"]
+    schedule = WeeklySchedule(jobs, crew, days=2, working_days=7)
+    assert list(schedule.assignments()["day"]) == [1, 0, 1]
+    assert schedule.compliance()["schedule_compliance"] == 100
+
+
+def test_jobs_without_a_qualified_technician_stay_unscheduled():
+    jobs = pd.DataFrame({"job": ["J1", "J2", "J3"], "craft": ["Instrument", "Electrical", "Electrical"],
+                         "duration": [1.0, 2.0, 9.0]})
+    table = WeeklySchedule(jobs, CREW).assignments()
+    assert list(table["status"]) == ["unscheduled", "on time", "unscheduled"]
+    assert table.loc[1, "assigned"] in ("Dee", "Eli")
+
+
+def test_dated_calendar_and_reschedule():
+    crew = pd.DataFrame({"technician": ["Ana", "Ana", "Ben", "Ben"], "craft": "Mechanical", "hours": [8, 8, 8, 8],
+                         "day": ["2024-03-04", "2024-03-06", "2024-03-05", "2024-03-07"]})
+    jobs = pd.DataFrame({"job": ["J1", "J2", "J3"], "craft": "Mechanical", "duration": [6.0, 6.0, 6.0],
+                         "earliest": ["2024-03-04"] * 3, "due": ["2024-03-08"] * 3})
+    schedule = WeeklySchedule(jobs, crew, days=5)
+    table = schedule.assignments()
+    assert schedule.start == pd.Timestamp("2024-03-04")
+    assert sorted(table["day"]) == [0, 1, 2]
+    assert (table["date"] == schedule.start + pd.to_timedelta(table["day"], unit="D")).all()
+    first = table.loc[table["day"] == 0, "job"].item()
+    moved = schedule.reschedule({first: "2024-03-05"}, today="2024-03-05")
+    # Days 1 and 2 are full, so the slipped job takes the free day 3 and nothing else moves.
+    assert list(moved["job"]) == [first] and list(moved["previous_day"]) == [0]
+    after = schedule.assignments().set_index("job")
+    assert after.loc[first, "day"] == 3 and after.loc[first, "assigned"] == "Ben"
+    assert (after["status"] == "on time").all()
+
+
+@pytest.mark.parametrize("change, message", [
+    ({"duration": 0.0}, "durations must be positive"),
+    ({"job": "same"}, "unique"),
+    ({"craft": None}, "missing columns: craft"),
+])
+def test_bad_job_tables_are_rejected(change, message):
+    jobs = pd.DataFrame({"job": ["J1", "J2"], "craft": "Mechanical", "duration": [1.0, 2.0]})
+    for column, value in change.items():
+        jobs = jobs.drop(columns=column) if value is None else jobs.assign(**{column: value})
+    with pytest.raises(ValueError, match=message):
+        WeeklySchedule(jobs, CREW)
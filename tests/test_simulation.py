@@ -0,0 +1,52 @@
+import pandas as pd
+import pytest
+
+from maint_advisor.recommendation import CBM, PM, RCM, RTF, TBM
+from maint_advisor.simulation import POLICIES, SimulationInputs, simulate_policies, simulated_policy
+
+
+def test_every_recommendation_has_a_simulated_policy():
+    for strategy in (RTF, CBM, TBM, RCM):
+        assert simulated_policy(strategy[0]) == strategy[0]
+    assert simulated_policy(PM[0]) == TBM[0]
+    assert simulated_policy("Something else") is None
+
+
+def test_results_depend_on_the_seed_not_the_workers():
+    one = simulate_policies(SimulationInputs(), 20, 5, 10, workers=1, chunk_trials=50)
+    two = simulate_policies(SimulationInputs(), 20, 5, 10, workers=2, chunk_trials=50)
+    pd.testing.assert_frame_equal(one, two)
+    assert sorted(one.index) == sorted(POLICIES)
+    assert one["cost_per_asset_year"].is_monotonic_increasing
+
+
+def test_run_to_failure_matches_the_renewal_rate():
+    # Exponential lives: one failure per (eta + repair) hours on average.
+    inputs = SimulationInputs(beta=1.0, eta=1_000.0, repair_hours=10.0, downtime_cost=0.0)
+    result = simulate_policies(inputs, 100, 10, 20, workers=1)
+    rate = 8760.0 / 1_010.0
+    assert result.loc[RTF[0], "failures_per_asset_year"] == pytest.approx(rate, rel=0.02)
+    assert result.loc[RTF[0], "availability"] == pytest.approx(1_000.0 / 1_010.0, abs=0.002)
+    assert result.loc[RTF[0], "planned_per_asset_year"] == 0
+
+
+def test_progress_reports_every_chunk_and_can_stop_the_run():
+    seen = []
+    simulate_policies(SimulationInputs(), 10, 1, 10, workers=1, chunk_trials=25,
+                      progress=lambda fraction, message: seen.append(fraction))
+    assert seen == [0.25, 0.5, 0.75, 1.0]
+
+    def stop(fraction, message):
+        raise KeyboardInterrupt
+
+    with pytest.raises(KeyboardInterrupt):
+        simulate_policies(SimulationInputs(), 10, 1, 10, workers=1, chunk_trials=25, progress=stop)
+
+
+def test_invalid_inputs_are_rejected():
+    with pytest.raises(ValueError):
+        simulate_policies(SimulationInputs(beta=0.0), workers=1)
+    with pytest.raises(ValueError):
+        simulate_policies(SimulationInputs(detection_probability=1.5), workers=1)
+    with pytest.raises(ValueError):
+        simulate_policies(SimulationInputs(), fleet_size=0, workers=1)
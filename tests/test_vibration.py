@@ -0,0 +1,94 @@
+import wave
+
+import numpy as np
+import pytest
+
+from maint_advisor.vibration import analyze_vibration, fault_frequencies, match_fault_frequencies, open_signal
+
+RATE = 25_600
+
+
+def write_wav(path, rate, seconds=1.0, frequency=1_000.0):
+    t = np.arange(int(rate * seconds)) / rate
+    samples = (0.5 * np.sin(2 * np.pi * frequency * t) * 32767).astype("<i2")
+    with wave.open(str(path), "wb") as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(rate)
+        f.writeframes(samples.tobytes())
+    return samples
+
+
+def test_wav_keeps_its_own_sample_rate(tmp_path):
+    path = tmp_path / "recording.wav"
+    written = write_wav(path, 48_000)
+    samples, rate, scale = open_signal(path, sample_rate=25_600)
+    assert rate == 48_000
+    np.testing.assert_array_equal(samples, written)
+    assert scale == pytest.approx(1 / 32768)
+
+
+def test_wav_spectrum_peaks_at_the_tone(tmp_path):
+    path = tmp_path / "recording.wav"
+    write_wav(path, 48_000, seconds=2.0)
+    samples, rate, scale = open_signal(path, sample_rate=25_600)
+    spectra = analyze_vibration(samples, rate, scale, nperseg=4096, workers=1)
+    assert spectra.frequencies[np.argmax(spectra.psd)] == pytest.approx(1_000.0, abs=rate / 4096)
+
+
+def test_csv_uses_the_given_sample_rate(tmp_path):
+    path = tmp_path / "recording.csv"
+    path.write_text("time,value\n" + "".join(f"{i},{i % 7}\n" for i in range(100)))
+    blocks, rate, scale = open_signal(path, sample_rate=10_000)
+    assert rate == 10_000 and scale == 1.0
+    np.testing.assert_array_equal(np.concatenate(list(blocks)), np.arange(100) % 7)
+
+
+def test_headerless_input_needs_a_sample_rate(tmp_path):
+    path = tmp_path / "recording.f32"
+    np.zeros(16, dtype=np.float32).tofile(path)
+    with pytest.raises(ValueError):
+        open_signal(path)
+
+
+def bearing_signal(seconds, defect_hz, seed=0):
+    """Decaying 8 kHz resonance rung at ``defect_hz``, in white noise."""
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(RATE * seconds)) / RATE
+    ring = np.exp(-t[:256] * 2_000) * np.sin(2 * np.pi * 8_000 * t[:256])
+    impacts = np.zeros(len(t))
+    impacts[(np.arange(0, seconds, 1 / defect_hz) * RATE).astype(int)] = 1.0
+    return (np.convolve(impacts, ring)[:len(t)] + 0.2 * rng.standard_normal(len(t))).astype(np.float32)
+
+
+def test_psd_integrates_to_the_signal_power():
+    t = np.arange(RATE * 4) / RATE
+    x = (2.0 * np.sin(2 * np.pi * 500 * t)).astype(np.float32)
+    spectra = analyze_vibration(x, RATE, nperseg=4096, workers=1)
+    df = spectra.frequencies[1]
+    assert spectra.psd.sum() * df == pytest.approx(2.0, rel=0.01)
+    assert spectra.segments == (len(x) - 4096) // 2048 + 1
+
+
+def test_blocks_and_arrays_give_the_same_spectra():
+    x = bearing_signal(3.0, 87.0)
+    whole = analyze_vibration(x, RATE, nperseg=2048, workers=2, chunk_segments=4)
+    blocks = analyze_vibration(iter(np.array_split(x, 7)), RATE, nperseg=2048, workers=1, chunk_segments=5)
+    assert blocks.segments == whole.segments
+    np.testing.assert_allclose(blocks.psd, whole.psd, rtol=1e-5)
+    np.testing.assert_allclose(blocks.envelope, whole.envelope, rtol=1e-5, atol=1e-9)
+
+
+def test_envelope_spectrum_finds_an_outer_race_defect():
+    faults = fault_frequencies(shaft_hz=29.95, n_balls=9, ball_diameter=7.94, pitch_diameter=39.04)
+    assert faults["BPFO"] + faults["BPFI"] == pytest.approx(9 * 29.95)
+    assert faults["FTF"] * 9 == pytest.approx(faults["BPFO"])
+    x = bearing_signal(10.0, faults["BPFO"])
+    spectra = analyze_vibration(x, RATE, nperseg=8192, band=(6_000, 10_000), workers=1)
+    found = match_fault_frequencies(spectra.envelope_frequencies, spectra.envelope, faults, harmonics=2)
+    detected = found.groupby("fault")["detected"].all()
+    assert detected["BPFO"] and not detected["BPFI"]
+    first = found[(found["fault"] == "BPFO") & (found["harmonic"] == 1)].iloc[0]
+    assert first["peak_hz"] == pytest.approx(faults["BPFO"], abs=spectra.envelope_frequencies[1])
+    with pytest.raises(ValueError):
+        fault_frequencies(30.0, 9, 40.0, 39.0)
@@ -0,0 +1,48 @@
+import multiprocessing
+import threading
+
+from maint_advisor.visit_counter import VisitCounter
+
+
+def count_visits(path, n):
+    counter = VisitCounter(path, batch_size=7, legacy_file=None)
+    for _ in range(n):
+        counter.increment()
+    counter.close()
+
+
+def test_increments_are_flushed_in_batches(tmp_path):
+    counter = VisitCounter(tmp_path / "visits.db", batch_size=5, flush_interval=3600, legacy_file=None)
+    for expected in range(1, 5):
+        assert counter.increment() == expected
+    assert counter.flushes == 0 and counter.pending == 4
+    counter.increment()
+    assert counter.flushes == 1 and counter.pending == 0
+    counter.increment()
+    counter.close()
+    counter.close()
+    assert VisitCounter(tmp_path / "visits.db", legacy_file=None).count == 6
+
+
+def test_a_new_database_starts_from_the_legacy_file(tmp_path):
+    legacy = tmp_path / "visit_counter.txt"
+    legacy.write_text("41\n")
+    counter = VisitCounter(tmp_path / "visits.db", legacy_file=legacy)
+    assert counter.increment() == 42
+    counter.close()
+    legacy.write_text("1000\n")
+    assert VisitCounter(tmp_path / "visits.db", legacy_file=legacy).count == 42
+
+
+def test_threads_and_processes_do_not_lose_updates(tmp_path):
+    path = str(tmp_path / "visits.db")
+    shared = VisitCounter(path, batch_size=7, legacy_file=None)
+    threads = [threading.Thread(target=lambda: [shared.increment() for _ in range(500)]) for _ in range(4)]
+    processes = [multiprocessing.get_context("spawn").Process(target=count_visits, args=(path, 300))
+                 for _ in range(2)]
+    for worker in threads + processes:
+        worker.start()
+    for worker in threads + processes:
+        worker.join()
+    shared.close()
+    assert VisitCounter(path, legacy_file=None).count == 4 * 500 + 2 * 300
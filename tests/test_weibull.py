@@ -0,0 +1,107 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from maint_advisor.weibull import (INFANT_MORTALITY, USEFUL_LIFE, WEAR_OUT, analyze_life_data, bathtub_phase,
+                                   bootstrap_bounds, fit_rows, normalize_life_data, pack_groups)
+
+
+def log_likelihood(t, failed, beta, eta):
+    """Right-censored Weibull log-likelihood, written out directly."""
+    z = (t / eta) ** beta
+    return np.sum(np.log(beta / eta) + (beta - 1) * np.log(t[failed] / eta)) - z.sum()
+
+
+@pytest.fixture
+def life_data():
+    rng = np.random.default_rng(3)
+    sizes = {"pumps": 40, "motors": 5, "fans": 2_000, "valves": 1}
+    group = np.repeat(list(sizes), list(sizes.values()))
+    life = rng.weibull(2.0, len(group)) * 1_000.0
+    censor = rng.uniform(200.0, 3_000.0, len(group))
+    return group, np.minimum(life, censor), life <= censor
+
+
+def test_groups_are_packed_without_padding(life_data):
+    group, times, failed = life_data
+    labels, t, f, offsets = pack_groups(group, times, failed)
+    assert list(labels) == ["fans", "motors", "pumps", "valves"]
+    assert t.shape == f.shape == (len(times),)
+    np.testing.assert_array_equal(np.diff(offsets), [2_000, 5, 40, 1])
+    np.testing.assert_array_equal(t[offsets[2]:offsets[3]], times[group == "pumps"])
+
+
+def test_fits_maximize_the_likelihood(life_data):
+    group, times, failed = life_data
+    labels, t, f, offsets = pack_groups(group, times, failed)
+    beta, eta, gamma, loglik = fit_rows(t, f, offsets)
+    assert (gamma == 0).all()
+    for i in range(3):
+        ti, fi = t[offsets[i]:offsets[i + 1]], f[offsets[i]:offsets[i + 1]]
+        assert loglik[i] == pytest.approx(log_likelihood(ti, fi, beta[i], eta[i]))
+        for db, de in [(1.01, 1.0), (0.99, 1.0), (1.0, 1.01), (1.0, 0.99)]:
+            assert log_likelihood(ti, fi, beta[i] * db, eta[i] * de) < loglik[i]
+    # The large group recovers the true parameters.
+    assert beta[0] == pytest.approx(2.0, rel=0.1)
+    assert eta[0] == pytest.approx(1_000.0, rel=0.05)
+
+
+def test_groups_are_fitted_independently(life_data):
+    group, times, failed = life_data
+    labels, t, f, offsets = pack_groups(group, times, failed)
+    together = fit_rows(t, f, offsets)
+    for i in range(len(labels)):
+        rows = slice(offsets[i], offsets[i + 1])
+        alone = fit_rows(t[rows], f[rows], [0, offsets[i + 1] - offsets[i]])
+        np.testing.assert_allclose([a[0] for a in alone], [a[i] for a in together], rtol=1e-9)
+
+
+def test_groups_without_failures_have_no_estimate():
+    beta, eta, _, loglik = fit_rows([10.0, 20.0, 5.0, 7.0, 9.0], [False, False, True, True, False], [0, 2, 5])
+    assert np.isnan(beta[0]) and np.isnan(eta[0]) and np.isnan(loglik[0])
+    assert np.isfinite(beta[1])
+
+
+def test_three_parameter_fit_finds_the_location():
+    rng = np.random.default_rng(5)
+    t = 500.0 + rng.weibull(1.5, 3_000) * 1_000.0
+    beta, eta, gamma, loglik = fit_rows(t, np.ones(t.size, dtype=bool), [0, t.size], three_parameter=True)
+    assert gamma[0] == pytest.approx(500.0, rel=0.05)
+    assert beta[0] == pytest.approx(1.5, rel=0.1)
+    assert loglik[0] >= fit_rows(t, np.ones(t.size, dtype=bool), [0, t.size])[3][0]
+
+
+def test_bootstrap_bounds_do_not_depend_on_workers_or_chunks(life_data):
+    group, times, failed = life_data
+    labels, t, f, offsets = pack_groups(group, times, failed)
+    one = bootstrap_bounds(t, f, offsets, resamples=100, workers=1, chunk_size=1)
+    two = bootstrap_bounds(t, f, offsets, resamples=100, workers=2, chunk_size=2)
+    np.testing.assert_array_equal(one, two)
+    beta = fit_rows(t, f, offsets)[0]
+    assert (one[:3, 0] < beta[:3]).all() and (beta[:3] < one[:3, 1]).all()
+    assert np.isnan(one[3]).all()
+
+
+def test_bathtub_phase():
+    phases = bathtub_phase([0.5, 1.05, 2.0, np.nan])
+    assert list(phases) == [INFANT_MORTALITY, USEFUL_LIFE, WEAR_OUT, None]
+    # With bounds, the whole interval must be on one side of 1.
+    assert list(bathtub_phase([2.0, 2.0], [0.9, 1.2], [3.0, 3.0])) == [USEFUL_LIFE, WEAR_OUT]
+
+
+def test_analyze_life_data_table():
+    data = pd.DataFrame({"Asset Class": ["A"] * 4 + ["B"] * 3, "Time": [100, 200, 300, 400, 50, 60, -1],
+                         "Status": ["F", "F", "S", "F", "F", "S", "F"]})
+    result = analyze_life_data(data)
+    assert list(result.index) == ["A", "B"]
+    assert list(result["failures"]) == [3, 1] and list(result["suspensions"]) == [1, 1]
+    assert result["suggested_action"].notna().all()
+
+
+def test_life_data_needs_time_and_status():
+    with pytest.raises(ValueError):
+        normalize_life_data(pd.DataFrame({"failed": [1]}))
+    with pytest.raises(ValueError):
+        normalize_life_data(pd.DataFrame({"time": [1.0]}))
+    with pytest.raises(ValueError):
+        normalize_life_data(pd.DataFrame({"time": [0.0], "failed": [1]}))
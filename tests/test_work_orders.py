@@ -0,0 +1,71 @@
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from maint_advisor.work_orders import iter_work_order_chunks, summarize_work_orders
+
+
+@pytest.fixture
+def export():
+    rng = np.random.default_rng(1)
+    n = 3_000
+    start = pd.Timestamp("2024-01-01") + pd.to_timedelta(rng.integers(0, 365 * 24 * 60, n), unit="min")
+    return pd.DataFrame({
+        "asset": np.char.add("A", rng.integers(0, 50, n).astype(str)),
+        "asset_class": np.char.add("C", rng.integers(0, 4, n).astype(str)),
+        "failure_start": start,
+        "restore_time": start + pd.to_timedelta(rng.integers(10, 48 * 60, n), unit="min"),
+        "cost": rng.gamma(2.0, 500.0, n).round(2),
+    })
+
+
+def expected_totals(export):
+    downtime = (export["restore_time"] - export["failure_start"]).dt.total_seconds() / 3600
+    return export.assign(downtime=downtime).groupby("asset").agg(
+        downtime=("downtime", "sum"), failures=("asset", "size"), cost=("cost", "sum"))
+
+
+@pytest.mark.parametrize("form", ["csv path", "csv upload", "parquet path", "parquet upload"])
+def test_chunked_totals_match_an_in_memory_groupby(export, tmp_path, form):
+    kind, source = form.split()
+    path = tmp_path / f"orders.{kind}"
+    if kind == "csv":
+        export.to_csv(path, index=False, date_format="%Y-%m-%d %H:%M")
+    else:
+        export.to_parquet(path)
+    file = str(path)
+    if source == "upload":
+        file = io.BytesIO(path.read_bytes())
+        file.name = path.name
+    per_asset, per_class = summarize_work_orders(file, chunksize=700, block_size=16 << 10)
+    expected = expected_totals(export)
+    got = per_asset.loc[expected.index]
+    np.testing.assert_allclose(got["downtime"], expected["downtime"])
+    np.testing.assert_array_equal(got["failures"], expected["failures"])
+    np.testing.assert_allclose(got["cost"], expected["cost"])
+    assert per_class["failures"].sum() == len(export)
+
+
+def test_csv_chunks_follow_the_block_size(export, tmp_path):
+    path = tmp_path / "orders.csv"
+    export.to_csv(path, index=False)
+    chunks = list(iter_work_order_chunks(str(path), block_size=16 << 10))
+    assert len(chunks) > 5
+    assert sum(len(chunk) for chunk in chunks) == len(export)
+
+
+def test_headings_are_normalized_and_dates_read_day_first():
+    data = (b"Equipment,Class,Reported,Completed,Total Cost,Notes\n"
+            b"P-1,Pumps,03/04/2024 08:00,03/04/2024 10:30,120.5,seal\n")
+    (chunk,) = iter_work_order_chunks(io.BytesIO(data), "orders.csv")
+    assert list(chunk.columns) == ["asset", "asset_class", "failure_start", "restore_time", "cost"]
+    assert chunk["failure_start"].iloc[0] == pd.Timestamp("2024-04-03 08:00")
+    per_asset, _ = summarize_work_orders(io.BytesIO(data), "orders.csv")
+    assert per_asset.loc["P-1", "downtime"] == pytest.approx(2.5)
+
+
+def test_missing_required_columns_are_reported():
+    with pytest.raises(ValueError, match="failure_start"):
+        summarize_work_orders(io.BytesIO(b"asset,cost\nP-1,10\n"), "orders.csv")